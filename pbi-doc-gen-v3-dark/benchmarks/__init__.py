@@ -0,0 +1 @@
+"""Micro-Benchmarks – Aufruf z.B. mit: python -m benchmarks.bench_source_scanner"""
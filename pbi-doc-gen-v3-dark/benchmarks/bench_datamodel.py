@@ -0,0 +1,62 @@
+"""
+Benchmark: Modell-Extraktion aus einer .pbix – DataModel-Leser vs. pbi-tools.
+
+Misst fuer eine echte .pbix die Zeit bis zum fertigen BimImportResult,
+einmal direkt ueber das DataModel (pbixray, kein Prozessstart) und einmal
+ueber ``pbi-tools extract``. Nicht installierte Varianten werden
+uebersprungen.
+
+Run:  python -m benchmarks.bench_datamodel <report.pbix> [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.bim_parser import BimImportResult
+from src.datamodel_reader import datamodel_available, has_datamodel, parse_datamodel
+from src.pbitools_parser import parse_pbix_with_pbitools, pbitools_available
+
+
+def _time(label: str, func: Callable[[], BimImportResult], repeat: int) -> None:
+    best = float("inf")
+    result = BimImportResult()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    print(
+        f"{label:<12} {best:8.3f} s   "
+        f"{len(result.tables)} Tabellen, {len(result.measures)} Measures, "
+        f"{len(result.relationships)} Beziehungen"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("pbix", type=Path)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if not has_datamodel(args.pbix):
+        sys.exit(f"{args.pbix}: kein XPress9-DataModel gefunden")
+
+    if datamodel_available():
+        _time("datamodel", lambda: parse_datamodel(args.pbix), args.repeat)
+    else:
+        print("datamodel    uebersprungen (pip install pbixray)")
+
+    if pbitools_available():
+        _time("pbi-tools", lambda: parse_pbix_with_pbitools(args.pbix), args.repeat)
+    else:
+        print("pbi-tools    uebersprungen (nicht installiert)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: Markdown-Generierung – Laufzeit und Spitzen-RSS je Modellgroesse.
+
+Erzeugt Projekte mit 100, 1.000 und 10.000 Measures (je ca. ``--dax-kb`` KB
+DAX) und misst ``update_docs(force=True)`` (Measures/Queries/Seiten
+gestreamt) gegen den frueheren Weg (``gen_*`` als ein String + ``_write``).
+Jede Messung laeuft in einem eigenen Prozess, damit ``ru_maxrss`` nur die
+jeweilige Variante abbildet. Spitzen-RSS gibt es nur auf Unix (``resource``).
+
+Run:  python -m benchmarks.bench_generator [--sizes 100 1000 10000] [--dax-kb 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
+from benchmarks.bench_project_store import build_project
+from src.generator import SECTIONS, _write, update_docs
+
+VARIANTS = ("String (frueher)", "Streaming")
+
+
+def _peak_rss_mb() -> float | None:
+    if not HAS_RESOURCE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux liefert KB, macOS Bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _legacy_generate(project, root: Path) -> None:
+    for relpath, (generate, _fields) in SECTIONS.items():
+        _write(root / relpath, generate(project))
+
+
+def run_child(measures: int, dax_kb: int, variant: str) -> dict:
+    """Eine Messung im aktuellen Prozess; Ergebnis als JSON auf stdout."""
+    project = build_project(measures, dax_kb)
+    baseline = _peak_rss_mb()
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        if variant == VARIANTS[0]:
+            _legacy_generate(project, Path(tmp))
+        else:
+            update_docs(project, Path(tmp), force=True)
+        seconds = time.perf_counter() - start
+        size = sum(f.stat().st_size for f in Path(tmp).rglob("*.md")) / 1e6
+    return {"seconds": seconds, "size_mb": size,
+            "baseline_mb": baseline, "peak_mb": _peak_rss_mb()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--dax-kb", type=int, default=2)
+    parser.add_argument("--child", nargs=2, metavar=("MEASURES", "VARIANT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(int(args.child[0]), args.dax_kb, args.child[1])))
+        return
+
+    print(f"Measures je ~{args.dax_kb} KB DAX; RSS = Spitze waehrend der Generierung "
+          f"minus Spitze nach Projektaufbau")
+    print(f"{'Measures':>9}  {'Variante':<18}{'Zeit':>8}{'Markdown':>11}{'RSS':>11}")
+    for size in args.sizes:
+        for variant in VARIANTS:
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_generator", "--dax-kb", str(args.dax_kb),
+                 "--child", str(size), variant],
+                check=True, capture_output=True, text=True,
+                cwd=Path(__file__).resolve().parent.parent,
+            )
+            r = json.loads(out.stdout)
+            rss = (f"{r['peak_mb'] - r['baseline_mb']:8.1f} MB"
+                   if r["peak_mb"] is not None else "       n/a")
+            print(f"{size:>9}  {variant:<18}{r['seconds']:7.2f}s{r['size_mb']:8.1f} MB{rss}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: BIM-Import eines synthetischen Grossmodells (ModelIndex).
+
+Erzeugt ein Modell mit 10.000 Tabellen und 50.000 Measures (jedes fuenfte
+versteckt, Beziehungen zwischen Nachbartabellen) und misst parse_bim_model
+sowie parse_bim (gestreamt aus einer temporaeren Datei). Zum Vergleich wird
+der fruehere Filter fuer versteckte Measures gemessen (Liste je verstecktem
+Measure neu aufbauen); er wird auf ``--legacy-sample`` versteckte Measures
+begrenzt und linear hochgerechnet.
+
+Run:  python -m benchmarks.bench_model_index [--tables 10000] [--measures 50000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.bim_parser import parse_bim, parse_bim_model
+
+
+def build_model(tables: int, measures: int) -> dict:
+    per_table = max(1, measures // tables)
+    model_tables = []
+    for t in range(tables):
+        name = f"Fact_{t}" if t % 4 == 0 else f"Dim_{t}"
+        model_tables.append({
+            "name": name,
+            "columns": [
+                {"name": "Key", "dataType": "int64", "isKey": True},
+                {"name": "Date", "dataType": "dateTime"},
+                {"name": "Year", "dataType": "int64"},
+                {"name": "Month", "dataType": "int64"},
+                {"name": "Amount", "dataType": "double"},
+            ],
+            "measures": [
+                {
+                    "name": f"M{t}_{m}",
+                    "expression": f"CALCULATE(SUM('{name}'[Amount]), ALL('{name}')) + [M{t}_{m - 1}]"
+                    if m else f"SUM('{name}'[Amount])",
+                    "isHidden": (t * per_table + m) % 5 == 0,
+                }
+                for m in range(per_table)
+            ],
+            "partitions": [{"source": {
+                "type": "m",
+                "expression": f'let Source = Sql.Database("srv{t % 50}", "db") in Source',
+            }}],
+        })
+    relationships = [
+        {"fromTable": model_tables[t]["name"], "fromColumn": "Key",
+         "toTable": model_tables[t + 1]["name"], "toColumn": "Key"}
+        for t in range(0, tables - 1, 2)
+    ]
+    return {"model": {"name": "Synthetic", "tables": model_tables, "relationships": relationships}}
+
+
+def _best(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tables", type=int, default=10_000)
+    parser.add_argument("--measures", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--legacy-sample", type=int, default=500)
+    args = parser.parse_args()
+
+    data = build_model(args.tables, args.measures)
+    opts = dict(skip_hidden_measures=True)
+    result = parse_bim_model(data, **opts)
+    print(f"Modell: {len(result.tables)} Tabellen, "
+          f"{len(result.model_index.measures)} Measures "
+          f"({len(result.model_index.hidden_measures)} versteckt)")
+
+    print(f"parse_bim_model        {_best(lambda: parse_bim_model(data, **opts), args.repeat):8.3f} s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "model.bim"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        size_mb = path.stat().st_size / 1e6
+        print(f"parse_bim ({size_mb:.0f} MB)     {_best(lambda: parse_bim(path, **opts), args.repeat):8.3f} s")
+
+    # Filter fuer versteckte Measures: frueher vs. Index
+    measures = list(result.model_index.measures.items())
+    hidden = sorted(result.model_index.hidden_measures)
+    sample = hidden[:args.legacy_sample]
+
+    def legacy() -> None:
+        remaining = measures
+        for key in sample:
+            remaining = [(k, m) for k, m in remaining if k != key]
+
+    index = result.model_index
+    legacy_time = _best(legacy, 1) * len(hidden) / max(1, len(sample))
+    indexed_time = _best(lambda: [m for (table, name), m in measures if not index.is_hidden(table, name)], args.repeat)
+    print(f"Hidden-Filter frueher  {legacy_time:8.3f} s (hochgerechnet)")
+    print(f"Hidden-Filter Index    {indexed_time:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
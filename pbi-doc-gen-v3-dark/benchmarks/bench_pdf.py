@@ -0,0 +1,77 @@
+"""
+Benchmark: PDF-Export – Laufzeit normal vs. Grossdokument-Modus.
+
+Erzeugt Projekte mit ``--sizes`` Measures (je ``--dax-lines`` Zeilen DAX)
+und ebenso vielen Tabellen und Beziehungen sowie drei Queries mit
+``size`` Zeilen M-Code und misst ``generate_pdf`` mit ``large=False``
+und ``large=True``. Der normale Modus wird oberhalb von ``--max-normal``
+Measures uebersprungen (er waechst quadratisch).
+
+Run:  python -m benchmarks.bench_pdf [--sizes 250 1000 4000] [--max-normal 4000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models import Measure, ModelRelationship, ModelTable, PowerQuery, Project
+from src.pdf_export import generate_pdf
+
+
+def build_project(size: int, dax_lines: int) -> Project:
+    dax = "\n".join(f"VAR v{j} = CALCULATE(SUM('Fact Sales'[Amount]), 'Dim Date'[Year] = {2000 + j})"
+                    for j in range(dax_lines)) + "\nRETURN v0"
+    project = Project()
+    project.meta.report_name = "Benchmark"
+    project.measures = [Measure(name=f"Measure {m}", display_folder=f"Ordner {m % 20}",
+                                description="Kennzahl fuer Umsatz & Marge je Monat", dax_code=dax)
+                        for m in range(size)]
+    project.data_model.tables = [ModelTable(name=f"Table {t}", table_type="fact", keys="ID",
+                                            description="Faktentabelle mit Buchungen " * 3)
+                                 for t in range(size)]
+    project.data_model.relationships = [
+        ModelRelationship(from_table=f"Table {t}", from_column="DateKey", to_table="Dim Date",
+                          to_column="DateKey", cardinality="N:1", filter_direction="Single")
+        for t in range(size)
+    ]
+    project.power_queries = [
+        PowerQuery(query_name=f"Query {q}", purpose="Laden", m_code="\n".join(
+            f'    Step{j} = Table.AddColumn(Step{j - 1}, "C{j}", each [Amount] * {j}),'
+            for j in range(size)))
+        for q in range(3)
+    ]
+    return project
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 1_000, 4_000])
+    parser.add_argument("--dax-lines", type=int, default=10)
+    parser.add_argument("--max-normal", type=int, default=4_000)
+    args = parser.parse_args()
+
+    print(f"{'Measures':>9}{'normal':>10}{'gross':>10}{'Seiten (gross)':>16}")
+    for size in args.sizes:
+        project = build_project(size, args.dax_lines)
+        timings = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            for large in (False, True):
+                if not large and size > args.max_normal:
+                    continue
+                path = Path(tmp) / f"{large}.pdf"
+                start = time.perf_counter()
+                generate_pdf(project, path, large=large)
+                timings[large] = time.perf_counter() - start
+            pages = path.read_bytes().count(b"/Type /Page\n")
+        normal = f"{timings[False]:8.2f}s" if False in timings else "       -  "
+        print(f"{size:>9}{normal:>10}{timings[True]:8.2f}s{pages:>16}")
+
+
+if __name__ == "__main__":
+    main()
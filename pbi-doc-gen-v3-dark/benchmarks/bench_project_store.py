@@ -0,0 +1,83 @@
+"""
+Benchmark: Projekt speichern/laden – YAML (pure Python, libyaml) vs. .pbdg.
+
+Erzeugt ein Projekt mit ``--measures`` Measures (je ca. ``--dax-kb`` KB DAX)
+und misst save/load fuer den frueheren YAML-Weg (``yaml.dump`` +
+``yaml.safe_load``), den YAML-Weg mit libyaml-C-Loader/-Dumper und den
+binaeren Projektspeicher.
+
+Run:  python -m benchmarks.bench_project_store [--measures 5000] [--dax-kb 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import yaml
+
+from src.models import Measure, ModelTable, Project
+from src.storage import load_project, save_project
+
+
+def build_project(measures: int, dax_kb: int) -> Project:
+    body = "\n".join(
+        f"    VAR v{i} = CALCULATE(SUM('Fact Sales'[Amount]), 'Dim Date'[Year] = {2000 + i})"
+        for i in range(dax_kb * 1024 // 80)
+    )
+    project = Project()
+    project.meta.report_name = "Benchmark"
+    project.data_model.tables = [ModelTable(name=f"Table {t}", table_type="fact") for t in range(200)]
+    project.measures = [
+        Measure(name=f"Measure {m}", display_folder="KPIs", description="Kennzahl",
+                dax_code=f"{body}\nRETURN v0 + {m}")
+        for m in range(measures)
+    ]
+    return project
+
+
+def _legacy_save(project: Project, path: Path) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.dump(project.to_dict(), f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+
+
+def _legacy_load(path: Path) -> Project:
+    with open(path, encoding="utf-8") as f:
+        return Project.from_dict(yaml.safe_load(f))
+
+
+def _time(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--measures", type=int, default=5_000)
+    parser.add_argument("--dax-kb", type=int, default=4)
+    args = parser.parse_args()
+
+    project = build_project(args.measures, args.dax_kb)
+    print(f"Projekt: {len(project.measures)} Measures, je ~{args.dax_kb} KB DAX")
+    print(f"{'Format':<22}{'save':>9}{'load':>9}{'Groesse':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        variants = [
+            ("YAML (frueher)", Path(tmp) / "legacy.yml", _legacy_save, _legacy_load),
+            ("YAML (libyaml)", Path(tmp) / "project.yml", save_project, load_project),
+            ("Binaer (.pbdg)", Path(tmp) / "project.pbdg", save_project, load_project),
+        ]
+        for label, path, save, load in variants:
+            save_s = _time(lambda: save(project, path))
+            load_s = _time(lambda: load(path))
+            size = path.stat().st_size / 1e6
+            print(f"{label:<22}{save_s:8.2f}s{load_s:8.2f}s{size:9.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: Suchindex der HTML-Seite – Aufbauzeit je Symbol und Groesse.
+
+Erzeugt Projekte mit ``--sizes`` Measures (DAX mit Tabellen-/Spalten-
+referenzen) plus Tabellen, Queries und Seiten, baut den invertierten Index
+(``build_search_index``) und die Shards und misst die Zeit. Konstante
+Mikrosekunden je Symbol ueber alle Groessen zeigen den linearen Aufbau.
+``--site`` schreibt zusaetzlich die komplette Seite und misst sie.
+
+Run:  python -m benchmarks.bench_search_index [--sizes 5000 20000 50000] [--site]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models import Measure, ModelRelationship, ModelTable, PowerQuery, Project, ReportPage, Visual
+from src.site_generator import build_search_index, generate_site
+
+
+def build_project(symbols: int) -> Project:
+    """~80 % Measures, Rest Tabellen, Queries und Seiten."""
+    measures = symbols * 8 // 10
+    tables = max(1, symbols // 20)
+    project = Project()
+    project.meta.report_name = "Benchmark"
+    project.data_model.tables = [ModelTable(name=f"Fact Table {t}", table_type="fact") for t in range(tables)]
+    project.data_model.relationships = [
+        ModelRelationship(from_table=f"Fact Table {t}", from_column=f"Key{t}",
+                          to_table="Dim Date", to_column="Date")
+        for t in range(tables)
+    ]
+    project.measures = [
+        Measure(
+            name=f"Sales Amount {m}", display_folder=f"Folder {m % 40}",
+            dax_code=(f"VAR base{m} = CALCULATE(SUM('Fact Table {m % tables}'[Amount{m % 50}]), "
+                      f"'Dim Date'[Year] = 2024)\nRETURN DIVIDE(base{m}, [Sales Amount {m // 2}])"),
+        )
+        for m in range(measures)
+    ]
+    project.power_queries = [PowerQuery(query_name=f"Load Source {q}", query_group=f"Group {q % 10}")
+                             for q in range(symbols // 10)]
+    project.report_pages = [ReportPage(page_name=f"Page {pg}", visuals=[Visual(name=f"Chart {pg}")])
+                            for pg in range(symbols // 20)]
+    return project
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5_000, 20_000, 50_000])
+    parser.add_argument("--site", action="store_true", help="Auch die komplette Seite schreiben")
+    args = parser.parse_args()
+
+    print(f"{'Symbole':>9}{'Index':>9}{'µs/Symb.':>10}{'Terme':>9}{'Shards':>8}"
+          f"{'Index-MB':>10}{'max. Shard':>12}{'Seite':>9}")
+    for size in args.sizes:
+        project = build_project(size)
+        start = time.perf_counter()
+        index = build_search_index(project)
+        shards = index.shards()
+        seconds = time.perf_counter() - start
+
+        encoded = {key: json.dumps(terms, separators=(",", ":")) for key, terms in shards.items()}
+        docs = json.dumps(index.docs, separators=(",", ":"), ensure_ascii=False)
+        total_mb = (len(docs) + sum(map(len, encoded.values()))) / 1e6
+        largest_kb = max(map(len, encoded.values())) / 1e3
+
+        site = ""
+        if args.site:
+            with tempfile.TemporaryDirectory() as tmp:
+                start = time.perf_counter()
+                generate_site(project, Path(tmp))
+                site = f"{time.perf_counter() - start:8.2f}s"
+        print(f"{len(index.docs):>9}{seconds:8.2f}s{seconds / len(index.docs) * 1e6:10.1f}"
+              f"{len(index.postings):>9}{len(shards):>8}{total_mb:10.1f}{largest_kb:9.0f} KB{site:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: Datenquellen-Erkennung in einem synthetischen Section1.m.
+
+Vergleicht die fruehere Pattern-Schleife (ein voller Regex-Durchlauf pro
+Konnektor) mit dem SourceScanner, jeweils mit den Standard-Konnektoren und
+mit zusaetzlich registrierten. Zwei Datensaetze: 50 wiederkehrende Server
+(typisch) und lauter verschiedene Server (unguenstigster Fall fuer die
+Deduplizierung ueber den Treffertext).
+
+Run:  python -m benchmarks.bench_source_scanner [--mb 50] [--extra 30]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models import DataSource
+from src.pbix_parser import SOURCE_PATTERNS, _ONPREM_TYPES
+from src.source_scanner import SourceScanner
+
+_BLOCK = '''shared Query{i} = let
+    Source = Sql.Database("srv{j}", "db{j}"),
+    Nav = Source{{[Schema="dbo",Item="T{i}"]}}[Data],
+    #"Changed Type" = Table.TransformColumnTypes(Nav,{{{{"A", type text}}, {{"B", Int64.Type}}}}),
+    #"Filtered Rows" = Table.SelectRows(#"Changed Type", each [A] <> null and Text.Length([A]) > 2),
+    #"Added Custom" = Table.AddColumn(#"Filtered Rows", "C", each [B] * 2),
+    Api = Web.Contents("https://api.example.com/{j}")
+in
+    #"Added Custom";
+
+'''
+
+
+def build_section(target_bytes: int, distinct: int = 50) -> str:
+    """Section1.m mit ``distinct`` verschiedenen Servern (0 = alle verschieden)."""
+    parts: List[str] = ["section Section1;\n\n"]
+    size = 0
+    i = 0
+    while size < target_bytes:
+        block = _BLOCK.format(i=i, j=i % distinct if distinct else i)
+        parts.append(block)
+        size += len(block)
+        i += 1
+    return "".join(parts)
+
+
+def extra_patterns(count: int):
+    """Synthetische Konnektoren, die im Text nicht vorkommen."""
+    result = []
+    for i in range(count):
+        name = f"Connector{i}.Database"
+        result.append((
+            re.compile(re.escape(name) + r'\s*\(\s*"([^"]+)"'),
+            lambda m, n=name: DataSource(source_type=n, connection_info=m.group(1)),
+        ))
+    return result
+
+
+def legacy_detect(m_code: str, patterns) -> List[DataSource]:
+    """Frueheres Verfahren: ein finditer-Durchlauf pro Pattern."""
+    sources: List[DataSource] = []
+    seen: set = set()
+    for pattern, factory in patterns:
+        for match in pattern.finditer(m_code):
+            ds = factory(match)
+            key = f"{ds.source_type}::{ds.connection_info}"
+            if key not in seen:
+                seen.add(key)
+                if ds.source_type in _ONPREM_TYPES:
+                    ds.gateway_required = True
+                sources.append(ds)
+    return sources
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=50.0, help="Groesse von Section1.m in MB")
+    parser.add_argument("--extra", type=int, default=30, help="Zusaetzliche Konnektoren")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'Variante':<40}{'Konnektoren':>12}{'Zeit [s]':>10}{'MB/s':>10}")
+    for data_label, distinct in (("50 Server", 50), ("alle Server verschieden", 0)):
+        text = build_section(int(args.mb * 1_000_000), distinct)
+        mb = len(text) / 1_000_000
+        print(f"\nSection1.m: {mb:.1f} MB, {data_label}")
+
+        for label, patterns in (
+            ("Standard", list(SOURCE_PATTERNS)),
+            (f"Standard + {args.extra}", list(SOURCE_PATTERNS) + extra_patterns(args.extra)),
+        ):
+            scanner = SourceScanner(patterns, onprem_types=_ONPREM_TYPES)
+            legacy = legacy_detect(text, patterns)
+            scanned = scanner.scan(text)
+            # Gleiche Quellen; der Scanner liefert sie in Textreihenfolge
+            assert sorted((s.source_type, s.connection_info) for s in legacy) == \
+                   sorted((s.source_type, s.connection_info) for s in scanned)
+
+            t_legacy = _time(lambda: legacy_detect(text, patterns), args.repeat)
+            t_scan = _time(lambda: scanner.scan(text), args.repeat)
+            for name, elapsed in (("Pattern-Schleife", t_legacy), ("SourceScanner", t_scan)):
+                print(f"{name + ', ' + label:<40}{len(patterns):>12}{elapsed:>10.3f}{mb / elapsed:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,9 @@
 #!/usr/bin/env python3
 """Convenience launcher for the GUI."""
-from src.ui.mainwindow import run
-run()
+import multiprocessing
+
+if __name__ == "__main__":
+    # Frozen builds (PyInstaller): worker processes re-run this script
+    multiprocessing.freeze_support()
+    from src.ui.mainwindow import run
+    run()
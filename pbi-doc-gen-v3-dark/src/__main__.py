@@ -1,3 +1,21 @@
-"""Allow running as: python -m src"""
+"""Allow running as: python -m src  |  python -m src batch ...  |  python -m src convert <quelle> <ziel>"""
+import multiprocessing
+import sys
+
+# Frozen builds (PyInstaller): worker processes (BIM, ImportSession, batch) re-run the entry point
+multiprocessing.freeze_support()
+
+if len(sys.argv) > 1 and sys.argv[1] == "batch":
+    from .batch import main as batch_main
+    sys.exit(batch_main(sys.argv[2:]))
+
+if len(sys.argv) > 1 and sys.argv[1] == "convert":
+    if len(sys.argv) != 4:
+        sys.exit("Aufruf: python -m src convert <quelle.yml|.json|.pbdg> <ziel.yml|.json|.pbdg>")
+    from pathlib import Path
+    from .storage import convert_project
+    print(f"  ✅ Konvertiert: {convert_project(Path(sys.argv[2]), Path(sys.argv[3]))}")
+    sys.exit(0)
+
 from .main import main
 main()
@@ -0,0 +1,349 @@
+"""
+Batch-Dokumentation – viele Reports ohne GUI dokumentieren.
+
+Nimmt einen Ordner (rekursiv) oder eine Manifest-Datei mit .pbix/.pbit/.bim
+Pfaden entgegen und fuehrt je Report Import -> ``update_docs`` -> optional
+``generate_site`` und ``generate_pdf`` aus, verteilt auf einen Prozesspool.
+
+Ausgabe je Report unter ``<output>/<slug>/``: ``project.yml``, ``docs/``
+und ggf. ``site/`` (HTML mit Suche) und ``<slug>.pdf``. Zusaetzlich im Ausgabeordner:
+
+  - ``batch_state.json``:   Fingerprint von Eingabe und Optionen je Report.
+    Ein erneuter Lauf ueberspringt Reports, deren Eingabe und Optionen
+    sich seit dem letzten erfolgreichen Lauf nicht geaendert haben.
+    Der Zustand wird nach jedem Report atomar geschrieben, ein
+    abgebrochener Lauf setzt also dort fort, wo er stand.
+  - ``batch_summary.json``: Status, Dauer je Schritt und Warnungen je Report.
+
+Manifest: eine Datei pro Zeile (``#`` = Kommentar) oder eine JSON-Liste;
+relative Pfade gelten relativ zum Manifest.
+
+Run:  python -m src batch <ordner|manifest> [-o ausgabe] [-j 4] [--pdf] [--site] [--force]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from . import bim_parser, pbix_parser
+from .generator import update_docs
+from .import_manager import ImportOptions, import_file
+from .models import Project
+from .parse_cache import file_fingerprint, zip_fingerprint
+from .site_generator import generate_site
+from .storage import save_project
+
+BATCH_SUFFIXES = (".pbix", ".pbit", ".bim")
+STATE_FILE = "batch_state.json"
+SUMMARY_FILE = "batch_summary.json"
+
+
+@dataclass
+class BatchOptions:
+    """Steuerung eines Batch-Laufs."""
+    output_dir: Path = Path("batch_output")
+    workers: int = 0                        # 0 = alle Kerne
+    pdf: bool = False                       # Zusaetzlich PDF erzeugen?
+    force: bool = False                     # Auch unveraenderte Reports neu erzeugen
+    sharded: bool = False                   # Measures/Queries/Seiten in Einzeldateien aufteilen
+    site: bool = False                      # Zusaetzlich HTML-Seite mit Suchindex erzeugen
+    import_options: ImportOptions = field(default_factory=ImportOptions)
+
+
+@dataclass
+class _Job:
+    input: Path
+    output: Path
+    pdf: bool
+    import_options: ImportOptions
+    sharded: bool = False
+    site: bool = False
+
+
+# ══════════════════════════════════════════════════════════════════
+# Eingaben und Fingerprints
+# ══════════════════════════════════════════════════════════════════
+
+def collect_inputs(source: Path) -> List[Path]:
+    """Reports aus einem Ordner (rekursiv, sortiert) oder einer Manifest-Datei."""
+    source = Path(source)
+    if source.is_dir():
+        return sorted(p for p in source.rglob("*") if p.suffix.lower() in BATCH_SUFFIXES and p.is_file())
+
+    text = source.read_text(encoding="utf-8")
+    if source.suffix.lower() == ".json":
+        entries = [str(e) for e in json.loads(text)]
+    else:
+        entries = [line.strip() for line in text.splitlines()]
+        entries = [e for e in entries if e and not e.startswith("#")]
+    return [p if p.is_absolute() else source.parent / p for p in map(Path, entries)]
+
+
+def input_fingerprint(path: Path) -> str:
+    """Central-Directory-Hash bei .pbix/.pbit (ohne Entpacken), sonst SHA-256."""
+    if path.suffix.lower() in (".pbix", ".pbit"):
+        try:
+            return zip_fingerprint(path)
+        except Exception:
+            pass
+    return file_fingerprint(path)
+
+
+def options_fingerprint(options: BatchOptions) -> str:
+    """Hash ueber alle ergebnisrelevanten Optionen und die Parser-Versionen."""
+    relevant = {
+        "pdf": options.pdf,
+        "sharded": options.sharded,
+        "site": options.site,
+        # Profiling aendert das Ergebnis nicht
+        "import": {k: v for k, v in asdict(options.import_options).items() if k != "profile_dir"},
+        "bim_parser": bim_parser.PARSER_VERSION,
+        "pbix_parser": pbix_parser.PARSER_VERSION,
+    }
+    raw = json.dumps(relevant, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _slugs(inputs: List[Path]) -> Dict[Path, str]:
+    """Ordnername je Report; gleiche Dateinamen erhalten einen Pfad-Hash."""
+    counts: Dict[str, int] = {}
+    for path in inputs:
+        counts[path.stem.lower()] = counts.get(path.stem.lower(), 0) + 1
+    slugs = {}
+    for path in inputs:
+        slug = re.sub(r"[^\w.-]+", "_", path.stem).strip("_") or "report"
+        if counts[path.stem.lower()] > 1:
+            slug += "_" + hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:8]
+        slugs[path] = slug
+    return slugs
+
+
+def _write_json(path: Path, data: dict) -> None:
+    """Atomar schreiben (Temp-Datei + ``os.replace``)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _read_json(path: Path) -> dict:
+    try:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+# ══════════════════════════════════════════════════════════════════
+# Ein Report (laeuft im Prozesspool)
+# ══════════════════════════════════════════════════════════════════
+
+def process_report(job: _Job) -> dict:
+    """Import -> Markdown -> optional PDF fuer einen Report. Fehler landen im Ergebnis."""
+    entry: dict = {
+        "input": str(job.input),
+        "output": str(job.output),
+        "status": "ok",
+        "timings": {},
+        "warnings": [],
+    }
+    try:
+        start = time.perf_counter()
+        project = Project()
+        report = import_file(job.input, project, job.import_options)
+        entry["timings"]["import"] = time.perf_counter() - start
+        entry["stages"] = [asdict(st) for st in report.stages]
+        if report.profile_path is not None:
+            entry["profile"] = str(report.profile_path)
+        entry["warnings"].extend(report.warnings)
+        if not report.success or not report.imported:
+            # Parser melden unlesbare Dateien nur als Warnung -> leeres Projekt
+            entry["status"] = "failed"
+            entry["error"] = "Import fehlgeschlagen" if not report.success else "Keine Inhalte importiert"
+            return entry
+        if not project.meta.report_name:
+            project.meta.report_name = job.input.stem
+
+        start = time.perf_counter()
+        save_project(project, job.output / "project.yml")
+        update = update_docs(project, job.output / "docs", sharded=job.sharded)
+        entry["timings"]["docs"] = time.perf_counter() - start
+        entry["docs_changed"] = [str(p.relative_to(update.root)) for p in update.changed]
+
+        if job.site:
+            start = time.perf_counter()
+            generate_site(project, job.output / "site")
+            entry["timings"]["site"] = time.perf_counter() - start
+
+        if job.pdf:
+            try:
+                from .pdf_export import generate_pdf
+            except ImportError as exc:
+                entry["warnings"].append(f"PDF uebersprungen: {exc}")
+            else:
+                start = time.perf_counter()
+                generate_pdf(project, job.output / f"{job.output.name}.pdf")
+                entry["timings"]["pdf"] = time.perf_counter() - start
+    except Exception as exc:
+        entry["status"] = "failed"
+        entry["error"] = f"{type(exc).__name__}: {exc}"
+    return entry
+
+
+# ══════════════════════════════════════════════════════════════════
+# Batch-Lauf
+# ══════════════════════════════════════════════════════════════════
+
+def run_batch(
+    inputs: List[Path],
+    options: Optional[BatchOptions] = None,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Dokumentiert alle ``inputs`` und liefert die Zusammenfassung
+    (identisch mit ``batch_summary.json``). ``progress`` wird je
+    abgeschlossenem oder uebersprungenem Report aufgerufen.
+    """
+    options = options or BatchOptions()
+    out = Path(options.output_dir)
+    state_path = out / STATE_FILE
+    state = _read_json(state_path)
+    opts_hash = options_fingerprint(options)
+    slugs = _slugs(inputs)
+    started = time.perf_counter()
+
+    entries: Dict[str, dict] = {}
+    pending: List[tuple[_Job, str]] = []
+    for path in inputs:
+        key = str(path.resolve())
+        if not path.is_file():
+            entries[key] = {"input": str(path), "status": "failed", "timings": {},
+                            "warnings": [], "error": "Datei nicht gefunden"}
+            continue
+        fingerprint = input_fingerprint(path)
+        previous = state.get(key, {})
+        output = out / slugs[path]
+        if (not options.force and previous.get("input") == fingerprint
+                and previous.get("options") == opts_hash and output.is_dir()):
+            entries[key] = {"input": str(path), "output": str(output), "status": "skipped",
+                            "timings": {}, "warnings": []}
+            if progress:
+                progress(entries[key])
+            continue
+        entries[key] = {}
+        pending.append((_Job(path, output, options.pdf, options.import_options, options.sharded, options.site), fingerprint))
+
+    def finished(job: _Job, fingerprint: str, entry: dict) -> None:
+        key = str(job.input.resolve())
+        entries[key] = entry
+        # Ohne erzeugtes PDF (reportlab fehlt) beim naechsten Lauf erneut versuchen
+        complete = not job.pdf or "pdf" in entry["timings"]
+        if entry["status"] == "ok" and complete:
+            state[key] = {"input": fingerprint, "options": opts_hash}
+        else:
+            state.pop(key, None)
+        _write_json(state_path, state)
+        if progress:
+            progress(entry)
+
+    workers = min(options.workers or os.cpu_count() or 1, max(1, len(pending)))
+    if workers <= 1:
+        for job, fingerprint in pending:
+            finished(job, fingerprint, process_report(job))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(process_report, job): (job, fingerprint) for job, fingerprint in pending}
+            for future in as_completed(futures):
+                job, fingerprint = futures[future]
+                try:
+                    entry = future.result()
+                except Exception as exc:    # z.B. abgestuerzter Worker-Prozess
+                    entry = {"input": str(job.input), "output": str(job.output), "status": "failed",
+                             "timings": {}, "warnings": [], "error": f"{type(exc).__name__}: {exc}"}
+                finished(job, fingerprint, entry)
+
+    reports = list(entries.values())
+    summary = {
+        "workers": workers,
+        "elapsed": time.perf_counter() - started,
+        "totals": {
+            status: sum(1 for r in reports if r["status"] == status)
+            for status in ("ok", "skipped", "failed")
+        },
+        "reports": reports,
+    }
+    _write_json(out / SUMMARY_FILE, summary)
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # Frozen builds: die Report-Worker starten diesen Einstiegspunkt neu
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(
+        prog="python -m src batch",
+        description=__doc__.splitlines()[1],
+    )
+    parser.add_argument("source", type=Path, help="Ordner mit Reports oder Manifest-Datei")
+    parser.add_argument("-o", "--output", type=Path, default=Path("batch_output"))
+    parser.add_argument("-j", "--workers", type=int, default=0, help="Prozesse (0 = alle Kerne)")
+    parser.add_argument("--pdf", action="store_true", help="Zusaetzlich PDF erzeugen")
+    parser.add_argument("--force", action="store_true", help="Unveraenderte Reports nicht ueberspringen")
+    parser.add_argument("--site", action="store_true", help="Zusaetzlich HTML-Seite mit Suche erzeugen")
+    parser.add_argument("--shard", action="store_true",
+                        help="Measures je Ordner, Queries je Gruppe, Seiten je Datei ablegen")
+    parser.add_argument("--measures-as-kpis", action="store_true")
+    parser.add_argument("--skip-hidden-measures", action="store_true")
+    parser.add_argument("--no-pbitools", action="store_true")
+    parser.add_argument("--profile", metavar="ORDNER", default="",
+                        help="cProfile-Dump (.pstats) je Import in ORDNER schreiben")
+    args = parser.parse_args(argv)
+
+    options = BatchOptions(
+        output_dir=args.output,
+        workers=args.workers,
+        pdf=args.pdf,
+        force=args.force,
+        sharded=args.shard,
+        site=args.site,
+        import_options=ImportOptions(
+            import_measures_as_kpis=args.measures_as_kpis,
+            skip_hidden_measures=args.skip_hidden_measures,
+            use_pbitools=not args.no_pbitools,
+            profile_dir=args.profile,
+        ),
+    )
+    inputs = collect_inputs(args.source)
+    print(f"  {len(inputs)} Report(s) gefunden.")
+
+    icons = {"ok": "✅", "skipped": "⏭ ", "failed": "❌"}
+
+    def progress(entry: dict) -> None:
+        detail = entry.get("error", "")
+        seconds = sum(entry["timings"].values())
+        print(f"  {icons[entry['status']]} {Path(entry['input']).name}"
+              + (f"  ({seconds:.1f} s)" if seconds else "")
+              + (f"  {detail}" if detail else ""))
+
+    summary = run_batch(inputs, options, progress)
+    totals = summary["totals"]
+    print(f"\n  Fertig in {summary['elapsed']:.1f} s: {totals['ok']} erzeugt, "
+          f"{totals['skipped']} unveraendert, {totals['failed']} fehlgeschlagen.")
+    print(f"  Zusammenfassung: {Path(options.output_dir) / SUMMARY_FILE}")
+    return 1 if totals["failed"] else 0
@@ -12,16 +12,24 @@ Sie enthaelt das komplette Datenmodell eines Power BI / SSAS Tabular Models:
 
 from __future__ import annotations
 
-import json
+import os
 import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
 
+from .dependency_graph import DependencyGraph
+from .instrumentation import StageStats, stage
+from .json_stream import JsonStream
 from .models import (
     ModelTable, ModelRelationship, Measure, PowerQuery, DataSource, _new_id,
 )
 
+# Bei jeder Aenderung am Parse-Ergebnis erhoehen (invalidiert den Parse-Cache)
+PARSER_VERSION = "3.3"
+
 # ══════════════════════════════════════════════════════════════════
 # Import-Ergebnis
 # ══════════════════════════════════════════════════════════════════
@@ -38,6 +46,33 @@ class BimImportResult:
     report_name: str = ""
     date_logic_notes: str = ""
     warnings: List[str] = field(default_factory=list)
+    # Measure -> Measure/Spalte; Measure.dependencies ist die Textform davon
+    dependency_graph: Optional[DependencyGraph] = None
+    model_index: Optional["ModelIndex"] = None
+    # Messwerte je Stufe ("bim.read", "bim.finish", ...)
+    stages: List[StageStats] = field(default_factory=list)
+
+
+@dataclass
+class ModelIndex:
+    """
+    Nachschlage-Index ueber das Modell, einmalig beim Lesen aufgebaut.
+    Alle Stufen nach dem Einlesen fragen diesen Index statt die Listen
+    bzw. das JSON erneut zu durchsuchen.
+    """
+    tables: Dict[str, ModelTable] = field(default_factory=dict)
+    # (Tabelle, Measure) -> Measure; gleichnamige Measures verschiedener Tabellen bleiben getrennt
+    measures: Dict[Tuple[str, str], Measure] = field(default_factory=dict)
+    hidden_measures: Set[Tuple[str, str]] = field(default_factory=set)  # auch aus uebersprungenen Tabellen
+
+    def is_hidden(self, table: str, measure_name: str) -> bool:
+        return (table, measure_name) in self.hidden_measures
+
+    def merge(self, other: "ModelIndex") -> None:
+        """Index eines Worker-Pakets uebernehmen (Paket-Reihenfolge bleibt erhalten)."""
+        self.tables.update(other.tables)
+        self.measures.update(other.measures)
+        self.hidden_measures |= other.hidden_measures
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -79,161 +114,292 @@ def _map_cardinality_pair(from_card: str, to_card: str) -> str:
 # Datenquellen-Erkennung aus M-Code
 # ══════════════════════════════════════════════════════════════════
 
-# Import der Patterns aus pbix_parser (fuer Wiederverwendung)
-def _detect_sources_from_m(m_code: str) -> List[DataSource]:
-    """Erkennt Datenquellen aus M-Code (Wiederverwendung der pbix_parser-Logik)."""
-    from .pbix_parser import SOURCE_PATTERNS, _ONPREM_TYPES
-    sources: List[DataSource] = []
-    seen: set[str] = set()
-    for pattern, factory in SOURCE_PATTERNS:
-        for match in pattern.finditer(m_code):
-            ds = factory(match)
-            key = f"{ds.source_type}::{ds.connection_info}"
-            if key not in seen:
-                seen.add(key)
-                if ds.source_type in _ONPREM_TYPES:
-                    ds.gateway_required = True
-                sources.append(ds)
-    return sources
+def _detect_sources_from_m(m_code: str, seen: Optional[set] = None) -> List[DataSource]:
+    """Erkennt Datenquellen aus M-Code (gemeinsamer Scanner aus pbix_parser)."""
+    from .pbix_parser import SOURCE_SCANNER
+    return SOURCE_SCANNER.scan(m_code, seen)
 
 
 # ══════════════════════════════════════════════════════════════════
 # Tabellen parsen
 # ══════════════════════════════════════════════════════════════════
 
-def _parse_tables(
-    model: dict,
-    warnings: List[str],
-    skip_hidden: bool = True,
-    detect_types: bool = True,
-) -> tuple[List[ModelTable], List[Measure], List[PowerQuery], List[DataSource], str]:
-    """Parst Tabellen, Measures, Partitionen aus model.tables."""
-    tables: List[ModelTable] = []
-    measures: List[Measure] = []
-    queries: List[PowerQuery] = []
-    sources: List[DataSource] = []
-    date_logic_parts: List[str] = []
-    seen_sources: set[str] = set()
-
-    all_measure_names: Set[str] = set()
-    # Sammle zuerst alle Measure-Namen fuer Dependency-Erkennung
-    for tbl in model.get("tables", []):
-        for m in tbl.get("measures", []):
+# Tabellen je Arbeitspaket im Worker-Modus; kleinere Modelle bleiben seriell
+_BATCH_TABLES = 32
+
+
+def resolve_workers(workers: int) -> int:
+    """0 = alle Kerne, sonst die angegebene Anzahl (mindestens 1)."""
+    return (os.cpu_count() or 1) if workers <= 0 else workers
+
+
+class _ModelCollector:
+    """
+    Wertet model.tables[] Tabelle fuer Tabelle aus, damit ein Streaming-Leser
+    jede Tabelle nach der Auswertung verwerfen kann. Measure-Abhaengigkeiten
+    werden erst in ``finish`` aufgeloest, wenn alle Measure-Namen bekannt sind.
+
+    Mit ``workers > 1`` werden Tabellen in Paketen zu ``_BATCH_TABLES`` an
+    einen Prozess-Pool gegeben. Die Pakete werden in Eingangsreihenfolge
+    zusammengefuehrt; Datenquellen werden dabei global dedupliziert, das
+    Ergebnis ist identisch zum seriellen Lauf. Faellt der Pool aus (z.B.
+    ``BrokenProcessPool``, Pickling-Fehler, kein Prozessstart moeglich),
+    wird mit einer Warnung seriell weitergearbeitet – auch die bereits
+    abgegebenen, noch offenen Pakete.
+    """
+
+    def __init__(
+        self,
+        warnings: List[str],
+        skip_hidden: bool = True,
+        detect_types: bool = True,
+        graph: Optional[DependencyGraph] = None,
+        workers: int = 1,
+    ):
+        self.warnings = warnings
+        self.skip_hidden = skip_hidden
+        self.detect_types = detect_types
+        self.graph = graph if graph is not None else DependencyGraph()
+        self.tables: List[ModelTable] = []
+        self.measures: List[Measure] = []
+        self.queries: List[PowerQuery] = []
+        self.sources: List[DataSource] = []
+        self.date_logic_parts: List[str] = []
+        self.index = ModelIndex()
+        self.seen_sources: set[str] = set()
+        self._measure_tables: List[str] = []
+        self.workers = resolve_workers(workers)
+        self._batch: List[dict] = []
+        self._pending: deque[tuple[Future, List[dict]]] = deque()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def add_table(self, tbl_data: dict) -> None:
+        tbl_name = tbl_data.get("name", "")
+        # Alle Measure-Namen (auch uebersprungener Tabellen) fuer Dependency-Erkennung
+        for m in tbl_data.get("measures", []):
             name = m.get("name", "")
             if name:
-                all_measure_names.add(name)
-
-    for tbl_data in model.get("tables", []):
+                self.graph.declare_measure(name, tbl_name)
+                if m.get("isHidden", False):
+                    self.index.hidden_measures.add((tbl_name, name))
+        if self.workers > 1:
+            self._batch.append(tbl_data)
+            if len(self._batch) >= _BATCH_TABLES:
+                self._submit()
+            return
+        self._parse_table(tbl_data, tbl_name)
+
+    def _parse_table(self, tbl_data: dict, tbl_name: str) -> None:
         try:
-            tbl_name = tbl_data.get("name", "")
-            if not tbl_name:
-                continue
+            self._add_table(tbl_data, tbl_name)
+        except Exception as exc:
+            self.warnings.append(f"Tabelle '{tbl_name or '?'}' uebersprungen: {exc}")
 
-            # System-Tabellen ueberspringen
-            if tbl_name.startswith("LocalDateTable") or tbl_name.startswith("DateTableTemplate"):
-                continue
+    def _add_table(self, tbl_data: dict, tbl_name: str) -> None:
+        if not tbl_name:
+            return
 
-            is_hidden = tbl_data.get("isHidden", False)
-            if is_hidden and skip_hidden:
-                continue
+        # System-Tabellen ueberspringen
+        if tbl_name.startswith("LocalDateTable") or tbl_name.startswith("DateTableTemplate"):
+            return
 
-            # Spalten
-            columns = tbl_data.get("columns", [])
-            col_names = []
-            key_cols = []
-            has_date_col = False
-            numeric_count = 0
-
-            for col in columns:
-                col_name = col.get("name", "")
-                if not col_name:
-                    continue
-                col_names.append(col_name)
-                if col.get("isKey", False):
-                    key_cols.append(col_name)
-                dt = col.get("dataType", "").lower()
-                if dt in ("dateTime", "datetime"):
-                    has_date_col = True
-                if col_name.lower() in ("date", "datum"):
-                    has_date_col = True
-                if dt in ("int64", "double", "decimal"):
-                    numeric_count += 1
-
-            key_str = ""
-            if key_cols:
-                key_str = f"PK: {', '.join(key_cols)}"
-
-            # Beschreibung
-            description = tbl_data.get("description", "")
-            if not description:
-                # Annotations pruefen
-                for ann in tbl_data.get("annotations", []):
-                    if ann.get("name", "").lower() in ("description", "desc"):
-                        description = ann.get("value", "")
-                        break
-
-            if not description:
-                desc_parts = [f"Spalten: {', '.join(col_names[:8])}"]
-                if len(col_names) > 8:
-                    desc_parts[0] += f" (+{len(col_names) - 8} weitere)"
-                if is_hidden:
-                    desc_parts.append("[versteckt]")
-                description = " | ".join(desc_parts)
-
-            # Tabellentyp-Heuristik
-            table_type = ""
-            if detect_types:
-                table_type = _detect_table_type(tbl_name, tbl_data, columns, has_date_col)
-
-            # Datumstabellen-Logik
-            if table_type == "Kalender" or has_date_col:
-                date_cols = [c.get("name", "") for c in columns
-                             if c.get("dataType", "").lower() in ("datetime", "dateTime")
-                             or c.get("name", "").lower() in ("date", "datum")]
-                if date_cols:
-                    date_logic_parts.append(
-                        f"Datumstabelle '{tbl_name}': Spalten {', '.join(date_cols)}"
-                    )
-
-            tables.append(ModelTable(
-                name=tbl_name,
-                table_type=table_type,
-                description=description,
-                keys=key_str,
-            ))
+        is_hidden = tbl_data.get("isHidden", False)
+        if is_hidden and self.skip_hidden:
+            return
 
-            # ── Measures ─────────────────────────────
-            for m_data in tbl_data.get("measures", []):
-                try:
-                    m = _parse_measure(m_data, tbl_name, all_measure_names, warnings)
-                    if m:
-                        measures.append(m)
-                except Exception as exc:
-                    m_name = m_data.get("name", "?")
-                    warnings.append(f"Measure '{m_name}' uebersprungen: {exc}")
-
-            # ── Partitionen -> Power Queries / Data Sources ──
-            for part in tbl_data.get("partitions", []):
-                try:
-                    pq, ds_list = _parse_partition(part, tbl_name, seen_sources, warnings)
-                    if pq:
-                        queries.append(pq)
-                    sources.extend(ds_list)
-                except Exception as exc:
-                    warnings.append(f"Partition in '{tbl_name}' uebersprungen: {exc}")
+        # Spalten (ein Durchlauf fuer Schluessel, Datumsspalten und Index)
+        col_types: Dict[str, str] = {}
+        key_cols = []
+        date_cols = []
 
+        for col in tbl_data.get("columns", []):
+            col_name = col.get("name", "")
+            if not col_name:
+                continue
+            dt = col.get("dataType", "")
+            col_types[col_name] = dt
+            if col.get("isKey", False):
+                key_cols.append(col_name)
+            if dt.lower() == "datetime" or col_name.lower() in ("date", "datum"):
+                date_cols.append(col_name)
+        col_names = list(col_types)
+        has_date_col = bool(date_cols)
+
+        key_str = ""
+        if key_cols:
+            key_str = f"PK: {', '.join(key_cols)}"
+
+        # Beschreibung
+        description = tbl_data.get("description", "")
+        if not description:
+            # Annotations pruefen
+            for ann in tbl_data.get("annotations", []):
+                if ann.get("name", "").lower() in ("description", "desc"):
+                    description = ann.get("value", "")
+                    break
+
+        if not description:
+            desc_parts = [f"Spalten: {', '.join(col_names[:8])}"]
+            if len(col_names) > 8:
+                desc_parts[0] += f" (+{len(col_names) - 8} weitere)"
+            if is_hidden:
+                desc_parts.append("[versteckt]")
+            description = " | ".join(desc_parts)
+
+        # Tabellentyp-Heuristik
+        table_type = ""
+        if self.detect_types:
+            table_type = _detect_table_type(
+                tbl_name, {c.lower() for c in col_names},
+                len(tbl_data.get("measures", [])), has_date_col,
+            )
+
+        # Datumstabellen-Logik
+        if date_cols:
+            self.date_logic_parts.append(
+                f"Datumstabelle '{tbl_name}': Spalten {', '.join(date_cols)}"
+            )
+
+        table = ModelTable(
+            name=tbl_name,
+            table_type=table_type,
+            description=description,
+            keys=key_str,
+        )
+        self.tables.append(table)
+        self.index.tables[tbl_name] = table
+
+        # ── Measures ─────────────────────────────
+        for m_data in tbl_data.get("measures", []):
+            try:
+                m = _parse_measure(m_data, tbl_name, self.warnings)
+                if m:
+                    self.measures.append(m)
+                    self._measure_tables.append(tbl_name)
+                    self.index.measures[(tbl_name, m.name)] = m
+            except Exception as exc:
+                m_name = m_data.get("name", "?")
+                self.warnings.append(f"Measure '{m_name}' uebersprungen: {exc}")
+
+        # ── Partitionen -> Power Queries / Data Sources ──
+        for part in tbl_data.get("partitions", []):
+            try:
+                pq, ds_list = _parse_partition(part, tbl_name, self.seen_sources, self.warnings)
+                if pq:
+                    self.queries.append(pq)
+                self.sources.extend(ds_list)
+            except Exception as exc:
+                self.warnings.append(f"Partition in '{tbl_name}' uebersprungen: {exc}")
+
+    # ── Worker-Modus ─────────────────────────────
+
+    def _submit(self) -> None:
+        batch, self._batch = self._batch, []
+        try:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            future = self._pool.submit(
+                _parse_table_batch, batch, self.skip_hidden, self.detect_types,
+            )
         except Exception as exc:
-            tbl_name = tbl_data.get("name", "?")
-            warnings.append(f"Tabelle '{tbl_name}' uebersprungen: {exc}")
-
-    date_logic = "\n".join(date_logic_parts) if date_logic_parts else ""
-    return tables, measures, queries, sources, date_logic
+            self._fallback(exc)
+            self._parse_batch(batch)
+            return
+        self._pending.append((future, batch))
+        # Begrenzt die Zahl gepufferter Pakete (Speicher beim Streaming)
+        while len(self._pending) > self.workers * 2:
+            self._collect()
+
+    def _collect(self) -> None:
+        """Aeltestes offenes Paket uebernehmen; bei Pool-Fehler seriell."""
+        future, batch = self._pending[0]
+        try:
+            part = future.result()
+        except Exception as exc:
+            # Das Paket bleibt vorn in der Warteschlange -> Reihenfolge bleibt erhalten
+            self._fallback(exc)
+            return
+        self._pending.popleft()
+        self._merge(part)
+
+    def _fallback(self, exc: Exception) -> None:
+        """Pool verwerfen; alle weiteren Tabellen werden seriell ausgewertet."""
+        self.warnings.append(
+            f"Prozess-Pool fehlgeschlagen ({type(exc).__name__}: {exc}) – "
+            "Tabellen werden seriell ausgewertet."
+        )
+        self.workers = 1
+        pending, self._pending = self._pending, deque()
+        self.close()
+        # Offene Pakete in Reihenfolge: fertige uebernehmen, den Rest seriell
+        for future, batch in pending:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self._merge(future.result())
+            else:
+                self._parse_batch(batch)
+
+    def _parse_batch(self, batch: List[dict]) -> None:
+        for tbl_data in batch:
+            self._parse_table(tbl_data, tbl_data.get("name", ""))
+
+    def _merge(self, part: "_ModelCollector") -> None:
+        self.warnings.extend(part.warnings)
+        self.tables.extend(part.tables)
+        self.measures.extend(part.measures)
+        self._measure_tables.extend(part._measure_tables)
+        self.queries.extend(part.queries)
+        self.date_logic_parts.extend(part.date_logic_parts)
+        self.index.merge(part.index)
+        for ds in part.sources:
+            key = _source_key(ds)
+            if key not in self.seen_sources:
+                self.seen_sources.add(key)
+                self.sources.append(ds)
+
+    def _drain(self) -> None:
+        if self._pool is None:
+            # Zu wenige Tabellen fuer ein volles Paket (oder Pool ausgefallen) -> seriell
+            batch, self._batch = self._batch, []
+            self._parse_batch(batch)
+            return
+        if self._batch:
+            self._submit()
+        while self._pending:
+            self._collect()
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            for future, _batch in self._pending:
+                future.cancel()
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def finish(self) -> tuple[List[ModelTable], List[Measure], List[PowerQuery], List[DataSource], str]:
+        self._drain()
+        for measure, table in zip(self.measures, self._measure_tables):
+            targets = self.graph.add_measure(measure.name, table, measure.dax_code)
+            measure.dependencies = _format_dependencies(self.graph, targets)
+        date_logic = "\n".join(self.date_logic_parts) if self.date_logic_parts else ""
+        return self.tables, self.measures, self.queries, self.sources, date_logic
+
+
+def _parse_table_batch(tables: List[dict], skip_hidden: bool, detect_types: bool) -> _ModelCollector:
+    """Worker-Prozess: ein Paket Tabellen parsen (ohne Abhaengigkeiten)."""
+    part = _ModelCollector([], skip_hidden, detect_types)
+    for tbl_data in tables:
+        part._parse_table(tbl_data, tbl_data.get("name", ""))
+    part.graph = None  # wird im Hauptprozess aufgebaut
+    return part
+
+
+_DATE_PART_COLUMNS = frozenset({"year", "month", "day", "quarter", "jahr", "monat", "tag", "quartal"})
 
 
 def _detect_table_type(
     name: str,
-    tbl_data: dict,
-    columns: list,
+    col_names_lower: Set[str],
+    measure_count: int,
     has_date_col: bool,
 ) -> str:
     """Heuristik fuer Tabellentyp-Erkennung."""
@@ -244,9 +410,7 @@ def _detect_table_type(
     if any(ind in name_lower for ind in date_indicators):
         return "Kalender"
     if has_date_col:
-        date_col_names = {"year", "month", "day", "quarter", "jahr", "monat", "tag", "quartal"}
-        col_names_lower = {c.get("name", "").lower() for c in columns}
-        if len(date_col_names & col_names_lower) >= 2:
+        if len(_DATE_PART_COLUMNS & col_names_lower) >= 2:
             return "Kalender"
 
     # Fakt-Heuristik
@@ -254,7 +418,6 @@ def _detect_table_type(
     if any(ind in name_lower for ind in fact_indicators):
         return "Fakt"
     # Viele Measures deuten auf Fakt hin
-    measure_count = len(tbl_data.get("measures", []))
     if measure_count >= 3:
         return "Fakt"
 
@@ -278,7 +441,6 @@ def _detect_table_type(
 def _parse_measure(
     m_data: dict,
     table_name: str,
-    all_measure_names: Set[str],
     warnings: List[str],
 ) -> Optional[Measure]:
     """Einzelnes Measure aus BIM-JSON parsen."""
@@ -306,9 +468,7 @@ def _parse_measure(
     elif format_string and description:
         description = f"{description} (Format: {format_string})"
 
-    # Dependencies erkennen
-    deps = _detect_dependencies(expression, name, all_measure_names)
-
+    # Dependencies werden im Anschluss ueber den Graphen ergaenzt
     # Filter-Kontext-Hinweise
     filter_notes = _detect_filter_context(expression)
 
@@ -317,30 +477,15 @@ def _parse_measure(
         dax_code=expression,
         display_folder=display_folder,
         description=description,
-        dependencies=deps,
         filter_context_notes=filter_notes,
     )
 
 
-def _detect_dependencies(dax: str, own_name: str, all_measure_names: Set[str]) -> str:
-    """Erkennt referenzierte Measures und Spalten im DAX-Code."""
-    deps: List[str] = []
-
-    # Referenzierte Measures: [MeasureName]
-    bracket_refs = re.findall(r'\[([^\[\]]+)\]', dax)
-    for ref in bracket_refs:
-        if ref in all_measure_names and ref != own_name:
-            if ref not in deps:
-                deps.append(ref)
-
-    # Spaltenreferenzen: Table[Column]
-    col_refs = re.findall(r"(\w+)\[(\w+)\]", dax)
-    for tbl, col in col_refs:
-        ref_str = f"{tbl}[{col}]"
-        if ref_str not in deps:
-            deps.append(ref_str)
-
-    return ", ".join(deps) if deps else ""
+def _format_dependencies(graph: DependencyGraph, targets: List[str]) -> str:
+    """Direkte Abhaengigkeiten als Text: erst Measures, dann qualifizierte Spalten."""
+    measures = [t for t in targets if graph.kinds[t] == "measure"]
+    columns = [t for t in targets if graph.kinds[t] != "measure" and not t.startswith("[")]
+    return ", ".join(measures + columns)
 
 
 def _detect_filter_context(dax: str) -> str:
@@ -377,6 +522,11 @@ def _detect_filter_context(dax: str) -> str:
 # Partitionen parsen
 # ══════════════════════════════════════════════════════════════════
 
+def _source_key(ds: DataSource) -> str:
+    """Deduplizierungs-Schluessel, wie ihn auch ``SourceScanner.scan`` nutzt."""
+    return f"{ds.source_type}::{ds.connection_info}"
+
+
 def _parse_partition(
     part: dict,
     table_name: str,
@@ -403,15 +553,8 @@ def _parse_partition(
             m_code=expression,
             output_table=table_name,
         )
-        ds_list = _detect_sources_from_m(expression)
-        # Deduplizierung
-        new_ds = []
-        for ds in ds_list:
-            key = f"{ds.source_type}::{ds.connection_info}"
-            if key not in seen_sources:
-                seen_sources.add(key)
-                new_ds.append(ds)
-        ds_list = new_ds
+        # Deduplizierung ueber alle Partitionen via seen_sources
+        ds_list = _detect_sources_from_m(expression, seen_sources)
 
     elif source_type in ("query", "sql"):
         # Native SQL Query
@@ -423,14 +566,16 @@ def _parse_partition(
         )
         # DataSource aus der Query
         ds_data = source.get("dataSource", "")
-        if ds_data and ds_data not in seen_sources:
-            seen_sources.add(ds_data)
-            ds_list.append(DataSource(
+        if ds_data:
+            ds = DataSource(
                 source_type="SQL",
                 name=f"SQL: {ds_data}",
                 connection_info=ds_data,
                 gateway_required=True,
-            ))
+            )
+            if _source_key(ds) not in seen_sources:
+                seen_sources.add(_source_key(ds))
+                ds_list.append(ds)
 
     return pq, ds_list
 
@@ -524,11 +669,10 @@ def _parse_roles(model: dict, warnings: List[str]) -> str:
 # ══════════════════════════════════════════════════════════════════
 
 def _refine_table_types(
-    tables: List[ModelTable],
+    index: ModelIndex,
     relationships: List[ModelRelationship],
 ):
     """Verfeinert Tabellentypen anhand der Beziehungsstruktur."""
-    table_map = {t.name: t for t in tables}
     outgoing: dict[str, int] = {}  # Tabelle -> Anzahl ausgehender FK-Beziehungen
     incoming: dict[str, int] = {}  # Tabelle -> Anzahl eingehender Beziehungen
 
@@ -536,7 +680,7 @@ def _refine_table_types(
         outgoing[rel.from_table] = outgoing.get(rel.from_table, 0) + 1
         incoming[rel.to_table] = incoming.get(rel.to_table, 0) + 1
 
-    for name, tbl in table_map.items():
+    for name, tbl in index.tables.items():
         if tbl.table_type:
             continue  # Bereits klassifiziert
         out = outgoing.get(name, 0)
@@ -556,13 +700,18 @@ def parse_bim(
     skip_hidden_tables: bool = True,
     skip_hidden_measures: bool = False,
     detect_table_types: bool = True,
+    workers: int = 1,
 ) -> BimImportResult:
     """
     Parst eine .bim-Datei (Tabular Model JSON) und gibt
     ein vollstaendig befuelltes Ergebnis zurueck.
 
     Unterstuetzt auch .json-Dateien die das BIM-Format haben
-    (z.B. database.json aus pbi-tools).
+    (z.B. database.json aus pbi-tools). Die Datei wird gestreamt:
+    model.tables[] wird Tabelle fuer Tabelle dekodiert und ausgewertet,
+    der Speicherbedarf richtet sich nach der groessten Tabelle.
+
+    ``workers`` > 1 (0 = alle Kerne) verteilt die Tabellen auf Prozesse.
     """
     result = BimImportResult()
 
@@ -570,21 +719,98 @@ def parse_bim(
         result.warnings.append(f"Datei nicht gefunden: {bim_path}")
         return result
 
+    result.dependency_graph = DependencyGraph()
+    collector = _ModelCollector(
+        result.warnings, skip_hidden_tables, detect_table_types, result.dependency_graph, workers,
+    )
+    data: dict = {}
     try:
-        text = bim_path.read_text(encoding="utf-8")
-    except UnicodeDecodeError:
-        try:
-            text = bim_path.read_text(encoding="utf-8-sig")
-        except Exception as exc:
-            result.warnings.append(f"Datei nicht lesbar: {exc}")
-            return result
+        with stage(result.stages, "bim.read") as st, open(bim_path, "rb") as fp:
+            for key, value in iter_bim_members(fp):
+                if key == "table":
+                    collector.add_table(value)
+                    st.objects += 1
+                elif key.startswith("model."):
+                    data.setdefault("model", {})[key[len("model."):]] = value
+                else:
+                    data[key] = value
+            st.bytes_read = fp.tell()
+    except OSError as exc:
+        collector.close()
+        return BimImportResult(warnings=[f"Datei nicht lesbar: {exc}"])
+    except ValueError as exc:
+        collector.close()
+        return BimImportResult(warnings=[f"Kein gueltiges JSON: {exc}"])
 
-    try:
-        data = json.loads(text)
-    except json.JSONDecodeError as exc:
-        result.warnings.append(f"Kein gueltiges JSON: {exc}")
+    model = data.get("model", data)
+    if "tables" not in model and "relationships" not in model:
+        result.warnings.append("Kein BIM/Tabular-Model-Format erkannt (fehlende 'tables' oder 'model').")
         return result
 
+    result.report_name = model.get("name", "") or model.get("description", "") or data.get("name", "")
+    if not result.report_name:
+        result.report_name = bim_path.stem
+    return _finish_model(result, collector, model, skip_hidden_measures, detect_table_types)
+
+
+# Model-Member, die fuer den Import gebraucht werden (ausser tables)
+_MODEL_MEMBERS = ("name", "description", "relationships", "roles")
+
+
+def iter_bim_members(fp: BinaryIO) -> Iterator[tuple[str, Any]]:
+    """
+    Streamt ein BIM-Dokument (``{"model": {...}}`` oder direkt das Model).
+
+    Liefert ``("tables", None)`` beim Betreten von model.tables[], danach
+    ``("table", <Tabelle>)`` je Eintrag, sowie die kleinen Member aus
+    ``_MODEL_MEMBERS`` als ``(Name, Wert)``. Member innerhalb von "model"
+    erhalten das Praefix ``model.``. Alles andere wird ueberlesen.
+
+    Raises:
+        ValueError: kein gueltiges JSON
+    """
+    stream = JsonStream(fp)
+    if stream.peek() != "{":
+        raise ValueError("JSON-Objekt erwartet")
+    for key in stream.iter_object():
+        if key == "model" and stream.peek() == "{":
+            for model_key in stream.iter_object():
+                yield from _model_member(stream, model_key, "model.")
+        else:
+            # Model-Objekt direkt auf oberster Ebene
+            yield from _model_member(stream, key, "")
+
+
+def _model_member(stream: JsonStream, key: str, prefix: str) -> Iterator[tuple[str, Any]]:
+    if key == "tables" and stream.peek() == "[":
+        yield prefix + "tables", None
+        for tbl_data in stream.iter_array_values():
+            if isinstance(tbl_data, dict):
+                yield "table", tbl_data
+    elif key in _MODEL_MEMBERS:
+        yield prefix + key, stream.read_value()
+    else:
+        stream.skip_value()
+
+
+def parse_bim_model(
+    data: dict,
+    fallback_name: str = "",
+    skip_hidden_tables: bool = True,
+    skip_hidden_measures: bool = False,
+    detect_table_types: bool = True,
+    workers: int = 1,
+    result: Optional[BimImportResult] = None,
+) -> BimImportResult:
+    """
+    Wertet ein bereits geladenes BIM-Dokument aus (``{"model": {...}}``
+    oder direkt das Model-Objekt). Gemeinsamer Kern fuer .bim-Dateien und
+    andere Quellen, die das Modell im BIM-Schema liefern. ``workers`` wie
+    bei ``parse_bim``.
+    """
+    if result is None:
+        result = BimImportResult()
+
     # BIM-Format erkennen: {"model": {...}} oder direkt {"tables": [...]}
     model = data.get("model", data)
     if "tables" not in model and "relationships" not in model:
@@ -594,47 +820,92 @@ def parse_bim(
     # Report-Name
     result.report_name = model.get("name", "") or model.get("description", "") or data.get("name", "")
     if not result.report_name:
-        result.report_name = bim_path.stem
+        result.report_name = fallback_name
 
     # Tabellen, Measures, Queries, Sources
-    tables, measures, queries, sources, date_logic = _parse_tables(
-        model, result.warnings,
-        skip_hidden=skip_hidden_tables,
-        detect_types=detect_table_types,
+    result.dependency_graph = DependencyGraph()
+    collector = _ModelCollector(
+        result.warnings, skip_hidden_tables, detect_table_types, result.dependency_graph, workers,
     )
-    result.tables = tables
-    result.measures = measures
-    result.power_queries = queries
-    result.data_sources = sources
-    result.date_logic_notes = date_logic
-
-    # Hidden Measures filtern
-    if skip_hidden_measures:
-        for tbl_data in model.get("tables", []):
-            for m_data in tbl_data.get("measures", []):
-                if m_data.get("isHidden", False):
-                    m_name = m_data.get("name", "")
-                    result.measures = [m for m in result.measures if m.name != m_name]
-
-    # Relationships
-    result.relationships = _parse_relationships(model, result.warnings)
-
-    # Tabellentypen verfeinern
-    if detect_table_types:
-        _refine_table_types(result.tables, result.relationships)
-
-    # RLS
-    result.rls_notes = _parse_roles(model, result.warnings)
-
+    try:
+        with stage(result.stages, "bim.tables") as st:
+            for tbl_data in model.get("tables", []):
+                collector.add_table(tbl_data)
+                st.objects += 1
+    except BaseException:
+        collector.close()
+        raise
+    return _finish_model(result, collector, model, skip_hidden_measures, detect_table_types)
+
+
+def _finish_model(
+    result: BimImportResult,
+    collector: _ModelCollector,
+    model: dict,
+    skip_hidden_measures: bool,
+    detect_table_types: bool,
+) -> BimImportResult:
+    """Abhaengigkeiten aufloesen, Beziehungen/RLS auswerten, Typen verfeinern."""
+    with stage(result.stages, "bim.finish") as st:
+        tables, measures, queries, sources, date_logic = collector.finish()
+        result.tables = tables
+        result.measures = measures
+        result.power_queries = queries
+        result.data_sources = sources
+        result.date_logic_notes = date_logic
+        result.model_index = collector.index
+
+        # Hidden Measures filtern
+        if skip_hidden_measures:
+            result.measures = [
+                m for m, table in zip(measures, collector._measure_tables)
+                if not collector.index.is_hidden(table, m.name)
+            ]
+
+        # Relationships
+        result.relationships = _parse_relationships(model, result.warnings)
+
+        # Tabellentypen verfeinern
+        if detect_table_types:
+            _refine_table_types(collector.index, result.relationships)
+
+        # RLS
+        result.rls_notes = _parse_roles(model, result.warnings)
+        st.objects = len(result.measures) + len(result.relationships)
     return result
 
 
+class _HeadReader:
+    """Datei-Objekt, das nach ``limit`` Bytes EOF meldet."""
+
+    def __init__(self, fp: BinaryIO, limit: int):
+        self._fp = fp
+        self._left = limit
+
+    def read(self, size: int = -1) -> bytes:
+        if self._left <= 0:
+            return b""
+        if size < 0 or size > self._left:
+            size = self._left
+        data = self._fp.read(size)
+        self._left -= len(data)
+        return data
+
+
+# Tabellen stehen im Model vor Ausdruecken/Annotations; 64 KB reichen
+_SNIFF_BYTES = 1 << 16
+
+
 def is_bim_format(path: Path) -> bool:
-    """Prueft ob eine JSON-Datei das BIM/Tabular-Model-Format hat."""
+    """
+    Prueft ob eine JSON-Datei das BIM/Tabular-Model-Format hat.
+    Liest hoechstens die ersten 64 KB, unabhaengig von der Dateigroesse.
+    """
     try:
-        text = path.read_text(encoding="utf-8")
-        data = json.loads(text)
-        model = data.get("model", data)
-        return "tables" in model or "relationships" in model
+        with open(path, "rb") as fp:
+            for key, _value in iter_bim_members(_HeadReader(fp, _SNIFF_BYTES)):
+                if key.rsplit(".", 1)[-1] in ("tables", "relationships"):
+                    return True
     except Exception:
         return False
+    return False
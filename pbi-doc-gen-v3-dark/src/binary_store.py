@@ -0,0 +1,188 @@
+"""
+Binary project store (``.pbdg``) – fast save/load for large projects.
+
+The YAML file stays the human-readable export; the binary format is meant
+for frequent saves (GUI autosave, batch runs). Layout:
+
+    file    := b"PBDG" version:u8 record*
+    record  := kind:u8 length:u32le payload
+    payload := compact UTF-8 JSON of one object
+
+Record kind 0 comes first and holds every non-list part of the project
+(meta, CI branding, governance, ...). Every other kind holds exactly one
+list item (a measure, a table, a page, ...). Saving serializes item by item without the
+``asdict`` deep copy of the whole project; loading streams the records and
+builds each item directly, so no intermediate document tree is kept.
+Unknown record kinds are skipped, which keeps older readers compatible
+with files that carry additional collections.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import tempfile
+from dataclasses import fields, is_dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Tuple
+
+from .models import (
+    Project, KPI, DataSource, PowerQuery, ModelTable, ModelRelationship,
+    Measure, ReportPage, ChangeLogEntry, Screenshot,
+)
+
+MAGIC = b"PBDG"
+FORMAT_VERSION = 1
+BINARY_SUFFIX = ".pbdg"
+
+_HEADER = struct.Struct("<BI")
+_PROJECT_RECORD = 0
+
+# Record kind -> (attribute path in Project, item class). Append only; never renumber.
+_COLLECTIONS: Dict[int, Tuple[Tuple[str, ...], type]] = {
+    1: (("kpis",), KPI),
+    2: (("data_sources",), DataSource),
+    3: (("power_queries",), PowerQuery),
+    4: (("data_model", "tables"), ModelTable),
+    5: (("data_model", "relationships"), ModelRelationship),
+    6: (("measures",), Measure),
+    7: (("report_pages",), ReportPage),
+    8: (("change_log",), ChangeLogEntry),
+    9: (("screenshots",), Screenshot),
+}
+
+_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+
+def _field_names(cls: type) -> Tuple[str, ...]:
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = tuple(f.name for f in fields(cls))
+    return names
+
+
+def _shallow(obj: Any) -> dict:
+    """Field dict without copying; nested dataclasses are handled by ``_default``."""
+    return {name: getattr(obj, name) for name in _field_names(type(obj))}
+
+
+def _default(obj: Any) -> Any:
+    if is_dataclass(obj):
+        return _shallow(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_default)
+
+
+def encode_json(obj: Any) -> bytes:
+    """Compact UTF-8 JSON; dataclasses are encoded field by field without ``asdict``."""
+    return _encoder.encode(obj).encode("utf-8")
+
+
+def _resolve(project: Project, path: Tuple[str, ...]) -> list:
+    owner: Any = project
+    for attr in path:
+        owner = getattr(owner, attr)
+    return owner
+
+
+def _project_record(project: Project) -> dict:
+    """Everything except the collections stored as separate records."""
+    listed = {path for path, _cls in _COLLECTIONS.values()}
+    record = {}
+    for name in _field_names(Project):
+        if (name,) in listed:
+            continue
+        value = _shallow(getattr(project, name))
+        for path in listed:
+            if len(path) == 2 and path[0] == name:
+                value.pop(path[1], None)
+        record[name] = value
+    return record
+
+
+# ══════════════════════════════════════════════════════════════════
+# Write
+# ══════════════════════════════════════════════════════════════════
+
+def _write_record(fh: BinaryIO, kind: int, obj: Any) -> None:
+    payload = encode_json(obj)
+    fh.write(_HEADER.pack(kind, len(payload)))
+    fh.write(payload)
+
+
+def write_binary(project: Project, fh: BinaryIO) -> None:
+    """Serialize ``project`` to an open binary stream."""
+    fh.write(MAGIC + bytes([FORMAT_VERSION]))
+    _write_record(fh, _PROJECT_RECORD, _project_record(project))
+    for kind, (path, _cls) in _COLLECTIONS.items():
+        for item in _resolve(project, path):
+            _write_record(fh, kind, _shallow(item))
+
+
+def save_binary(project: Project, path: Path) -> Path:
+    """Write atomically (temp file + ``os.replace``); a crash never leaves a half file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            write_binary(project, fh)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return path
+
+
+# ══════════════════════════════════════════════════════════════════
+# Read
+# ══════════════════════════════════════════════════════════════════
+
+def iter_records(fh: BinaryIO) -> Iterator[Tuple[int, dict]]:
+    """Yield ``(kind, payload)`` per record. Raises ValueError on a damaged file."""
+    head = fh.read(len(MAGIC) + 1)
+    if head[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a binary project file (missing PBDG header)")
+    if head[len(MAGIC)] > FORMAT_VERSION:
+        raise ValueError(f"Unsupported binary project version: {head[len(MAGIC)]}")
+    while True:
+        header = fh.read(_HEADER.size)
+        if not header:
+            return
+        if len(header) < _HEADER.size:
+            raise ValueError("Truncated binary project file")
+        kind, length = _HEADER.unpack(header)
+        payload = fh.read(length)
+        if len(payload) < length:
+            raise ValueError("Truncated binary project file")
+        yield kind, json.loads(payload)
+
+
+def read_binary(fh: BinaryIO) -> Project:
+    """Build a Project from a binary stream, one record at a time."""
+    records = iter_records(fh)
+    kind, payload = next(records, (None, None))
+    if kind != _PROJECT_RECORD:
+        raise ValueError("Binary project file does not start with the project record")
+    project = Project.from_dict(payload)
+    targets = {kind: (_resolve(project, path), cls) for kind, (path, cls) in _COLLECTIONS.items()}
+    for kind, payload in records:
+        target = targets.get(kind)
+        if target is not None:
+            target[0].append(target[1].from_dict(payload))
+    return project
+
+
+def load_binary(path: Path) -> Project:
+    with open(path, "rb") as fh:
+        return read_binary(fh)
+
+
+def is_binary_project(path: Path) -> bool:
+    try:
+        with open(path, "rb") as fh:
+            return fh.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
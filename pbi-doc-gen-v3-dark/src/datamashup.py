@@ -0,0 +1,275 @@
+"""
+DataMashup-Leser nach [MS-QDEFF] (Power Query Data Exchange Format).
+
+Der DataMashup-Stream einer .pbix ist kein reines ZIP, sondern ein
+binaerer Container mit Laengenpraefixen (alle Laengen uint32 little endian):
+
+    Version                  (uint32, immer 0)
+    PackagePartsLength       + PackageParts       (OPC-ZIP mit Formulas/Section1.m)
+    PermissionsLength        + Permissions        (XML)
+    MetadataLength           + Metadata
+        MetadataVersion      (uint32)
+        MetadataXmlLength    + MetadataXml        (LocalPackageMetadataFile)
+        MetadataContentLength+ MetadataContent    (ZIP, hier ignoriert)
+    PermissionBindingsLength + PermissionBindings (DPAPI, ignoriert)
+
+Die Package Parts werden als ``memoryview``-Slice ohne Kopie an
+``zipfile.ZipFile`` uebergeben. Die Metadaten liefern je Abfrage
+Lade-Flags und Abfragegruppen, die das reine ZIP nicht enthaelt.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import struct
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import unquote
+
+_U32 = struct.Struct("<I")
+_ZIP_SIGNATURE = b"PK\x03\x04"
+
+
+@dataclass
+class QueryMetadata:
+    """Metadaten einer Abfrage aus dem Metadata-Abschnitt."""
+    name: str = ""
+    load_enabled: Optional[bool] = None
+    is_private: Optional[bool] = None
+    query_group: str = ""
+    result_type: str = ""
+
+
+@dataclass
+class DataMashup:
+    """Zerlegter DataMashup-Stream."""
+    version: int = 0
+    package_parts: Optional[memoryview] = None
+    permissions: str = ""
+    metadata_xml: str = ""
+    queries: Dict[str, QueryMetadata] = field(default_factory=dict)
+    query_groups: Dict[str, str] = field(default_factory=dict)   # ID -> Pfad "A / B"
+    header_valid: bool = False
+
+
+class MemoryViewReader(io.RawIOBase):
+    """Read-only, seekbares Datei-Objekt ueber einem ``memoryview`` (ohne Kopie)."""
+
+    def __init__(self, view: memoryview):
+        self._view = view.cast("B") if view.format != "B" else view
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._view) + offset
+        else:
+            raise ValueError(f"Ungueltiges whence: {whence}")
+        if pos < 0:
+            raise ValueError("Negative Position")
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer) -> int:
+        chunk = self._view[self._pos:self._pos + len(buffer)]
+        size = len(chunk)
+        buffer[:size] = chunk
+        self._pos += size
+        return size
+
+
+# ══════════════════════════════════════════════════════════════════
+# Header
+# ══════════════════════════════════════════════════════════════════
+
+def _read_block(view: memoryview, offset: int) -> tuple[memoryview, int]:
+    """Liest einen Block mit uint32-Laengenpraefix ab ``offset``."""
+    if offset + 4 > len(view):
+        raise ValueError("DataMashup: Laengenfeld ausserhalb der Daten")
+    (length,) = _U32.unpack_from(view, offset)
+    start = offset + 4
+    end = start + length
+    if end > len(view):
+        raise ValueError("DataMashup: Blocklaenge ueberschreitet Datenende")
+    return view[start:end], end
+
+
+def read_datamashup(raw: bytes, warnings: List[str]) -> DataMashup:
+    """
+    Zerlegt den DataMashup-Stream.
+
+    Ist der Header nicht MS-QDEFF-konform (aeltere oder fremd erzeugte
+    Dateien), wird das ZIP ueber seine Signatur gesucht – ebenfalls ohne
+    die Daten zu kopieren.
+    """
+    view = memoryview(raw)
+    mashup = DataMashup()
+
+    try:
+        (mashup.version,) = _U32.unpack_from(view, 0)
+        if mashup.version != 0:
+            raise ValueError(f"DataMashup: unbekannte Version {mashup.version}")
+        parts, offset = _read_block(view, 4)
+        if bytes(parts[:4]) != _ZIP_SIGNATURE:
+            raise ValueError("DataMashup: Package Parts sind kein ZIP")
+        mashup.package_parts = parts
+        mashup.header_valid = True
+
+        permissions, offset = _read_block(view, offset)
+        metadata, offset = _read_block(view, offset)
+    except (ValueError, struct.error):
+        if mashup.package_parts is None:
+            zip_start = raw.find(_ZIP_SIGNATURE)
+            if zip_start >= 0:
+                mashup.package_parts = view[zip_start:]
+        return mashup
+
+    mashup.permissions = _decode_text(permissions)
+    try:
+        _parse_metadata_block(metadata, mashup)
+    except (ValueError, struct.error, ET.ParseError) as exc:
+        warnings.append(f"DataMashup: Metadaten nicht lesbar: {exc}")
+    return mashup
+
+
+def _decode_text(view: memoryview) -> str:
+    data = bytes(view)
+    if data.startswith(b"\xef\xbb\xbf"):
+        return data[3:].decode("utf-8", errors="replace")
+    return data.decode("utf-8", errors="replace")
+
+
+# ══════════════════════════════════════════════════════════════════
+# Metadaten
+# ══════════════════════════════════════════════════════════════════
+
+def _parse_metadata_block(block: memoryview, mashup: DataMashup) -> None:
+    if len(block) < 8:
+        return
+    xml_view, _ = _read_block(block, 4)
+    mashup.metadata_xml = _decode_text(xml_view)
+    if mashup.metadata_xml.strip():
+        _parse_metadata_xml(mashup.metadata_xml, mashup)
+
+
+def _entry_value(value: str):
+    """
+    Dekodiert einen Entry-Wert: Praefix ``l`` = Zahl/Flag, ``s`` = Text,
+    ``d`` = Datum, ``c`` = Kontext; ohne Praefix unveraendert.
+    """
+    if not value:
+        return value
+    kind, body = value[0], value[1:]
+    if kind == "l":
+        try:
+            return int(body)
+        except ValueError:
+            return body
+    if kind in ("s", "d", "c"):
+        return body
+    return value
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_metadata_xml(xml_text: str, mashup: DataMashup) -> None:
+    root = ET.fromstring(xml_text)
+    group_entries: List[dict] = []
+
+    for item in root.iter():
+        if _local_name(item.tag) != "Item":
+            continue
+        item_type = item_path = ""
+        entries: Dict[str, object] = {}
+        for child in item.iter():
+            tag = _local_name(child.tag)
+            if tag == "ItemType":
+                item_type = (child.text or "").strip()
+            elif tag == "ItemPath":
+                item_path = (child.text or "").strip()
+            elif tag == "Entry":
+                entries[child.get("Type", "")] = _entry_value(child.get("Value", ""))
+
+        if item_type == "AllFormulas":
+            raw_groups = entries.get("QueryGroups")
+            if isinstance(raw_groups, str) and raw_groups:
+                try:
+                    group_entries = json.loads(raw_groups)
+                except ValueError:
+                    group_entries = []
+        elif item_type == "Formula" and item_path:
+            # "Section1/Mein%20Query" – Schritte ("Section1/Q/Schritt") ignorieren
+            parts = item_path.split("/")
+            if len(parts) != 2:
+                continue
+            name = unquote(parts[1])
+            mashup.queries[name] = QueryMetadata(
+                name=name,
+                load_enabled=_load_flag(entries),
+                is_private=_bool_entry(entries, "IsPrivate"),
+                query_group=str(entries.get("QueryGroupID", "") or ""),
+                result_type=str(entries.get("ResultType", "") or ""),
+            )
+
+    mashup.query_groups = _group_paths(group_entries)
+    for meta in mashup.queries.values():
+        if meta.query_group:
+            meta.query_group = mashup.query_groups.get(meta.query_group, "")
+
+
+def _bool_entry(entries: Dict[str, object], key: str) -> Optional[bool]:
+    value = entries.get(key)
+    if isinstance(value, int):
+        return bool(value)
+    return None
+
+
+def _load_flag(entries: Dict[str, object]) -> Optional[bool]:
+    """Laden aktiv, wenn irgendein Fill-/Load-Flag gesetzt ist."""
+    flags = [
+        _bool_entry(entries, key)
+        for key in ("FillEnabled", "FillToDataModelEnabled", "LoadEnabled")
+    ]
+    known = [f for f in flags if f is not None]
+    return any(known) if known else None
+
+
+def _group_paths(groups: List[dict]) -> Dict[str, str]:
+    """Abfragegruppen-ID -> Pfad inkl. Elterngruppen ("Staging / SQL")."""
+    by_id = {
+        g.get("queryGroupId", ""): g
+        for g in groups if isinstance(g, dict) and g.get("queryGroupId")
+    }
+    paths: Dict[str, str] = {}
+
+    def path(group_id: str, depth: int = 0) -> str:
+        if group_id in paths:
+            return paths[group_id]
+        group = by_id.get(group_id)
+        if group is None or depth > len(by_id):
+            return ""
+        parent = group.get("parentId")
+        name = group.get("name", "")
+        result = f"{path(parent, depth + 1)} / {name}" if parent and parent in by_id else name
+        paths[group_id] = result
+        return result
+
+    for group_id in by_id:
+        path(group_id)
+    return paths
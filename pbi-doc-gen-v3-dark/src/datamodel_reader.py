@@ -0,0 +1,267 @@
+"""
+DataModel-Leser – Measures, Beziehungen und RLS direkt aus der .pbix.
+
+Das ZIP-Member ``DataModel`` ist ein VertiPaq-Backup, komprimiert mit
+XPress9 (Header "This backup was created using XpressCompression.").
+Darin liegt die Metadaten-Datenbank (metadata.sqlitedb) mit Tabellen,
+Spalten, Measures, Beziehungen, Rollen und Spaltenstatistiken.
+
+XPress9 ist ein proprietaeres LZ77/Huffman-Format ohne oeffentliche
+Spezifikation; ein Dekoder in reinem Python waere weder pflegbar noch
+schnell. Dieser Leser nutzt daher das optionale Paket ``pbixray``
+(``pip install pbixray``), das den Dekoder als kompilierte Erweiterung
+mitbringt – plattformunabhaengig, ohne externen Prozess und ohne
+pbi-tools. Die Ergebnisse werden in das BIM-Schema uebersetzt und mit
+``parse_bim_model`` ausgewertet, damit Heuristiken (Tabellentypen,
+Abhaengigkeiten, Filterkontext) identisch zum .bim-Import bleiben.
+
+Ohne ``pbixray`` meldet ``datamodel_available()`` False und der Import
+faellt auf pbi-tools bzw. den reinen PBIX-Parser zurueck.
+"""
+
+from __future__ import annotations
+
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .bim_parser import BimImportResult, parse_bim_model
+
+try:
+    from pbixray import PBIXRay
+    HAS_PBIXRAY = True
+except ImportError:
+    PBIXRay = None
+    HAS_PBIXRAY = False
+
+XPRESS9_SIGNATURE = "This backup was created using XpressCompression."
+_DATAMODEL_MEMBERS = ("DataModel", "DataModel/DataModel")
+
+
+def datamodel_available() -> bool:
+    """True, wenn der DataModel-Leser (pbixray) installiert ist."""
+    return HAS_PBIXRAY
+
+
+def find_datamodel_member(zf: zipfile.ZipFile) -> Optional[str]:
+    names = set(zf.namelist())
+    for candidate in _DATAMODEL_MEMBERS:
+        if candidate in names:
+            return candidate
+    return None
+
+
+def is_xpress9_backup(head: bytes) -> bool:
+    """Prueft den UTF-16-LE-Header eines DataModel-Streams."""
+    signature = XPRESS9_SIGNATURE.encode("utf-16-le")
+    return head[:len(signature)] == signature
+
+
+def has_datamodel(pbix_path: Path) -> bool:
+    """True, wenn die .pbix ein XPress9-komprimiertes DataModel enthaelt."""
+    try:
+        with zipfile.ZipFile(str(pbix_path), "r") as zf:
+            member = find_datamodel_member(zf)
+            if member is None:
+                return False
+            with zf.open(member) as fp:
+                return is_xpress9_backup(fp.read(len(XPRESS9_SIGNATURE) * 2))
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+
+# ══════════════════════════════════════════════════════════════════
+# pbixray -> BIM-Schema
+# ══════════════════════════════════════════════════════════════════
+
+def _records(frame: Any) -> List[Dict[str, Any]]:
+    """DataFrame (oder Liste von Dicts) -> Liste von Dicts."""
+    if frame is None:
+        return []
+    if hasattr(frame, "to_dict"):
+        return list(frame.to_dict("records"))
+    return [dict(row) for row in frame]
+
+
+def _text(value: Any) -> str:
+    # pandas liefert fehlende Werte als NaN/None
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return str(value)
+
+
+def _cardinality_pair(value: str) -> tuple[str, str]:
+    """``"M:1"`` -> ("many", "one")."""
+    sides = _text(value).upper().split(":")
+    if len(sides) != 2:
+        return "many", "one"
+    return tuple("one" if side == "1" else "many" for side in sides)
+
+
+# pandas-Datentyp (pbixray ``PandasDataType``) -> TOM-Datentyp (.bim ``dataType``)
+_TOM_DATA_TYPES = {
+    "int64": "int64",
+    "float64": "double",
+    "decimal": "decimal",
+    "object": "string",
+    "string": "string",
+    "bool": "boolean",
+    "boolean": "boolean",
+    "bytes": "binary",
+}
+
+
+def _tom_data_type(pandas_type: Any) -> str:
+    """``"datetime64[ns]"`` -> ``"dateTime"``, ``"Int64"`` -> ``"int64"``, …"""
+    text = _text(pandas_type).lower()
+    if text.startswith("datetime"):
+        return "dateTime"
+    return _TOM_DATA_TYPES.get(text, text)
+
+
+def _hidden(row: Dict[str, Any]) -> Optional[bool]:
+    """``IsHidden`` der Zeile; None, wenn die pbixray-Version es nicht liefert."""
+    value = row.get("IsHidden")
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    return bool(value)
+
+
+def _safe(model: Any, attr: str, warnings: List[str]) -> Iterable[Dict[str, Any]]:
+    try:
+        return _records(getattr(model, attr, None))
+    except Exception as exc:
+        warnings.append(f"DataModel: '{attr}' nicht lesbar: {exc}")
+        return []
+
+
+def model_to_bim(model: Any, warnings: List[str]) -> dict:
+    """
+    Uebersetzt ein ``PBIXRay``-Objekt in ein BIM-Dokument.
+
+    Genutzt werden ``schema``, ``statistics`` (Kardinalitaet je Spalte),
+    ``dax_measures``, ``power_query``, ``relationships`` und – falls die
+    installierte Version es kennt – ``rls``. Datentypen werden von pandas
+    auf TOM abgebildet (``datetime64[ns]`` -> ``dateTime``), damit die
+    Heuristiken (z.B. Kalendertabellen) wie beim .bim-Import greifen.
+    ``isHidden`` wird nur gesetzt, wenn die Zeilen ``IsHidden`` enthalten;
+    fuer Tabellen liefert pbixray das Flag nicht.
+    """
+    tables: Dict[str, dict] = {}
+
+    def table(name: str) -> dict:
+        if name not in tables:
+            tables[name] = {"name": name, "columns": [], "measures": [], "partitions": []}
+        return tables[name]
+
+    for name in getattr(model, "tables", None) or []:
+        table(_text(name))
+
+    cardinalities = {
+        (_text(r.get("TableName")), _text(r.get("ColumnName"))): r.get("Cardinality")
+        for r in _safe(model, "statistics", warnings)
+    }
+    for row in _safe(model, "schema", warnings):
+        tbl, col = _text(row.get("TableName")), _text(row.get("ColumnName"))
+        if not tbl or not col:
+            continue
+        column = {"name": col, "dataType": _tom_data_type(row.get("PandasDataType"))}
+        if _hidden(row) is not None:
+            column["isHidden"] = _hidden(row)
+        if cardinalities.get((tbl, col)) is not None:
+            column["annotations"] = [
+                {"name": "Cardinality", "value": _text(cardinalities[(tbl, col)])}
+            ]
+        table(tbl)["columns"].append(column)
+
+    for row in _safe(model, "dax_measures", warnings):
+        tbl = _text(row.get("TableName"))
+        measure = {
+            "name": _text(row.get("Name")),
+            "expression": _text(row.get("Expression")),
+            "description": _text(row.get("Description")),
+            "displayFolder": _text(row.get("DisplayFolder")),
+        }
+        if _hidden(row) is not None:
+            measure["isHidden"] = _hidden(row)
+        table(tbl)["measures"].append(measure)
+
+    for row in _safe(model, "power_query", warnings):
+        tbl = _text(row.get("TableName"))
+        table(tbl)["partitions"].append({
+            "name": tbl,
+            "source": {"type": "m", "expression": _text(row.get("Expression"))},
+        })
+
+    relationships = []
+    for row in _safe(model, "relationships", warnings):
+        from_card, to_card = _cardinality_pair(row.get("Cardinality"))
+        cross = _text(row.get("CrossFilteringBehavior")).lower()
+        relationships.append({
+            "fromTable": _text(row.get("FromTableName")),
+            "fromColumn": _text(row.get("FromColumnName")),
+            "toTable": _text(row.get("ToTableName")),
+            "toColumn": _text(row.get("ToColumnName")),
+            "fromCardinality": from_card,
+            "toCardinality": to_card,
+            "crossFilteringBehavior": "bothDirections" if cross in ("both", "2") else "oneDirection",
+            "isActive": bool(row.get("IsActive", True)),
+        })
+
+    roles: Dict[str, dict] = {}
+    for row in _safe(model, "rls", warnings):
+        name = _text(row.get("RoleName"))
+        role = roles.setdefault(name, {"name": name, "modelPermission": "read",
+                                       "tablePermissions": []})
+        role["tablePermissions"].append({
+            "name": _text(row.get("TableName")),
+            "filterExpression": _text(row.get("FilterExpression")),
+        })
+
+    return {"model": {
+        "tables": list(tables.values()),
+        "relationships": relationships,
+        "roles": list(roles.values()),
+    }}
+
+
+def parse_datamodel(
+    pbix_path: Path,
+    skip_hidden_tables: bool = True,
+    skip_hidden_measures: bool = False,
+    detect_table_types: bool = True,
+) -> BimImportResult:
+    """
+    Liest das DataModel einer .pbix ohne externes Tool.
+
+    Raises:
+        RuntimeError: pbixray nicht installiert oder DataModel nicht lesbar
+    """
+    if not HAS_PBIXRAY:
+        raise RuntimeError("DataModel-Leser nicht verfuegbar (pip install pbixray).")
+    if not has_datamodel(pbix_path):
+        raise RuntimeError(f"'{pbix_path.name}' enthaelt kein XPress9-DataModel.")
+
+    warnings: List[str] = []
+    try:
+        model = PBIXRay(str(pbix_path))
+    except Exception as exc:
+        raise RuntimeError(f"DataModel nicht lesbar: {exc}") from exc
+
+    data = model_to_bim(model, warnings)
+    tables = data["model"]["tables"]
+    if skip_hidden_tables:
+        warnings.append("DataModel-Leser: ausgeblendete Tabellen sind nicht erkennbar "
+                        "und werden mit importiert.")
+    if skip_hidden_measures and any(
+            "isHidden" not in m for t in tables for m in t["measures"]):
+        warnings.append("DataModel-Leser: ausgeblendete Measures sind nicht erkennbar "
+                        "und werden mit importiert.")
+    result = BimImportResult(warnings=warnings)
+    return parse_bim_model(
+        data, pbix_path.stem,
+        skip_hidden_tables=skip_hidden_tables,
+        skip_hidden_measures=skip_hidden_measures,
+        detect_table_types=detect_table_types,
+        result=result,
+    )
@@ -0,0 +1,100 @@
+"""
+Lexer fuer DAX-Ausdruecke (Measures, berechnete Spalten).
+
+Zerlegt einen Ausdruck in einem linearen Durchlauf und kennt die
+lexikalischen Besonderheiten, an denen einfache Regex-Suchen scheitern:
+
+- Text-Literale ``"..."`` mit ``""`` als Escape
+- Quotierte Tabellennamen ``'Dim Datum'`` mit ``''`` als Escape
+- Spalten-/Measure-Referenzen ``[Name]`` mit ``]]`` als Escape
+- Zeilen- (``//``, ``--``) und Blockkommentare (``/* ... */``)
+
+``iter_references`` liefert alle Referenzen ausserhalb von Strings und
+Kommentaren: ``Tabelle[Spalte]`` bzw. ``'Tabelle'[Spalte]`` (qualifiziert)
+und ``[Name]`` (Measure oder unqualifizierte Spalte).
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Iterator
+
+# Reihenfolge der Alternativen = Prioritaet; alle Alternativen beginnen mit
+# einem anderen Zeichen, ausser "other", das den Rest in Laeufen erfasst.
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<comment>//[^\n]*|--[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<string>"[^"]*(?:""[^"]*)*"?)
+  | (?P<table>'[^']*(?:''[^']*)*'?)
+  | (?P<bracket>\[[^\]]*(?:\]\][^\]]*)*\]?)
+  | (?P<ident>[^\W\d][\w.]*)
+  | (?P<number>\d[\w.]*)
+  | (?P<other>[^\w'"\[/\-]+|[\w/\-])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+@dataclass(frozen=True)
+class DaxToken:
+    kind: str      # "comment" | "string" | "table" | "bracket" | "ident" | "number" | "other"
+    text: str
+    start: int
+
+
+@dataclass(frozen=True)
+class DaxReference:
+    """``table`` ist leer bei ``[Name]`` ohne Tabelle."""
+    table: str
+    name: str
+
+    def __str__(self) -> str:
+        return format_column(self.table, self.name) if self.table else f"[{self.name}]"
+
+
+def format_column(table: str, column: str) -> str:
+    """``Tabelle[Spalte]``; Tabellennamen mit Sonderzeichen werden quotiert."""
+    column = column.replace("]", "]]")
+    if re.fullmatch(r"[^\W\d]\w*", table):
+        return f"{table}[{column}]"
+    return "'" + table.replace("'", "''") + f"'[{column}]"
+
+
+def tokenize(dax: str) -> Iterator[DaxToken]:
+    """Liefert alle Tokens (inkl. Kommentaren, ohne Whitespace-Sonderbehandlung)."""
+    for match in _TOKEN_RE.finditer(dax):
+        yield DaxToken(match.lastgroup or "other", match.group(), match.start())
+
+
+def _unquote_table(text: str) -> str:
+    body = text[1:-1] if len(text) > 1 and text.endswith("'") else text[1:]
+    return body.replace("''", "'")
+
+
+def _unquote_bracket(text: str) -> str:
+    body = text[1:-1] if len(text) > 1 and text.endswith("]") else text[1:]
+    return body.replace("]]", "]")
+
+
+def iter_references(dax: str) -> Iterator[DaxReference]:
+    """
+    Alle Referenzen in Textreihenfolge. Eine Tabelle qualifiziert eine
+    Referenz nur, wenn die Klammer direkt folgt (``Sales[Betrag]``) –
+    so wird ``RETURN [Measure]`` nicht als Tabelle "RETURN" gelesen.
+    """
+    prev_kind = ""
+    prev_text = ""
+    prev_end = -1
+    for match in _TOKEN_RE.finditer(dax):
+        kind = match.lastgroup
+        if kind == "bracket":
+            name = _unquote_bracket(match.group())
+            if prev_end == match.start() and prev_kind in ("ident", "table"):
+                table = _unquote_table(prev_text) if prev_kind == "table" else prev_text
+                yield DaxReference(table, name)
+            else:
+                yield DaxReference("", name)
+        prev_kind = kind
+        prev_text = match.group()
+        prev_end = match.end()
@@ -0,0 +1,195 @@
+"""
+Abhaengigkeitsgraph fuer Measures und Spalten eines Tabular-Models.
+
+Knoten sind Measures (Anzeigename) und Spalten (``Tabelle[Spalte]`` bzw.
+``[Spalte]``, wenn im DAX keine Tabelle angegeben ist). Kanten zeigen vom
+Measure auf das, was es referenziert. Der Graph wird beim BIM-Import in
+einem Durchlauf ueber alle Ausdruecke aufgebaut (Laufzeit linear in der
+DAX-Gesamtlaenge) und beantwortet danach:
+
+- ``dependencies(x, transitive=True)`` – worauf baut x (transitiv) auf?
+- ``impact(x)`` – was bricht, wenn x geaendert/geloescht wird?
+- ``cycles()`` – zirkulaere Measure-Referenzen (Tarjan, iterativ)
+
+Measure-Namen sind wie in DAX case-insensitiv.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+from .dax_lexer import format_column, iter_references
+
+MEASURE = "measure"
+COLUMN = "column"
+
+
+@dataclass
+class DependencyGraph:
+    """Gerichteter Graph Measure -> (Measure | Spalte)."""
+    kinds: Dict[str, str] = field(default_factory=dict)           # Knoten -> MEASURE/COLUMN
+    home_tables: Dict[str, str] = field(default_factory=dict)     # Measure -> Tabelle
+    _out: Dict[str, List[str]] = field(default_factory=dict, repr=False)
+    _in: Dict[str, List[str]] = field(default_factory=dict, repr=False)
+    _measure_keys: Dict[str, str] = field(default_factory=dict, repr=False)  # lower -> Name
+    _closure: Dict[str, Set[str]] = field(default_factory=dict, repr=False)
+
+    # ── Aufbau ────────────────────────────────────
+
+    def declare_measure(self, name: str, table: str = "") -> None:
+        """Macht einen Measure-Namen bekannt (vor dem Aufloesen der Referenzen)."""
+        self._measure_keys.setdefault(name.lower(), name)
+        self._add_node(self._measure_keys[name.lower()], MEASURE)
+        if table:
+            self.home_tables.setdefault(self._measure_keys[name.lower()], table)
+
+    def measure_name(self, name: str) -> Optional[str]:
+        """Anzeigename eines bekannten Measures (case-insensitiv) oder None."""
+        return self._measure_keys.get(name.lower())
+
+    def add_measure(self, name: str, table: str, dax: str) -> List[str]:
+        """
+        Traegt ein Measure samt seiner direkten Referenzen ein.
+        Liefert die direkten Abhaengigkeiten in Textreihenfolge.
+        """
+        self.declare_measure(name, table)
+        source = self._measure_keys[name.lower()]
+        targets: List[str] = []
+        seen: Set[str] = set()
+        for ref in iter_references(dax):
+            target = self._resolve(ref.table, ref.name)
+            if target == source or target in seen:
+                continue
+            seen.add(target)
+            targets.append(target)
+            self._add_edge(source, target)
+        self._closure.clear()
+        return targets
+
+    def _resolve(self, table: str, name: str) -> str:
+        measure = self.measure_name(name)
+        if measure is not None:
+            # Tabelle[Measure] ist erlaubt, sofern es die Heimattabelle ist
+            home = self.home_tables.get(measure, "")
+            if not table or not home or home.lower() == table.lower():
+                return measure
+        column = format_column(table, name) if table else f"[{name}]"
+        self._add_node(column, COLUMN)
+        return column
+
+    def _add_node(self, node: str, kind: str) -> None:
+        if node not in self.kinds:
+            self.kinds[node] = kind
+            self._out[node] = []
+            self._in[node] = []
+
+    def _add_edge(self, source: str, target: str) -> None:
+        self._out[source].append(target)
+        self._in[target].append(source)
+
+    # ── Abfragen ──────────────────────────────────
+
+    def _key(self, node: str) -> str:
+        return self.measure_name(node) or node
+
+    def __contains__(self, node: str) -> bool:
+        return self._key(node) in self.kinds
+
+    def measures(self) -> List[str]:
+        return [n for n, kind in self.kinds.items() if kind == MEASURE]
+
+    def dependencies(self, node: str, transitive: bool = False) -> List[str]:
+        """Direkte oder transitive Abhaengigkeiten von ``node``."""
+        node = self._key(node)
+        if node not in self.kinds:
+            return []
+        if not transitive:
+            return list(self._out[node])
+        if node not in self._closure:
+            self._closure[node] = self._reach(node, self._out)
+        return sorted(self._closure[node])
+
+    def dependents(self, node: str) -> List[str]:
+        """Measures, die ``node`` direkt referenzieren."""
+        node = self._key(node)
+        return list(self._in.get(node, []))
+
+    def impact(self, node: str) -> List[str]:
+        """Alle Measures, die (transitiv) von ``node`` abhaengen."""
+        node = self._key(node)
+        if node not in self.kinds:
+            return []
+        return sorted(self._reach(node, self._in))
+
+    @staticmethod
+    def _reach(start: str, edges: Dict[str, List[str]]) -> Set[str]:
+        seen: Set[str] = set()
+        stack = list(edges[start])
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            stack.extend(edges[current])
+        seen.discard(start)
+        return seen
+
+    def cycles(self) -> List[List[str]]:
+        """
+        Zirkulaere Referenzen als Liste von Knotengruppen (starke
+        Zusammenhangskomponenten mit mehr als einem Knoten oder Selbstbezug).
+        Iterativer Tarjan – keine Rekursionsgrenze bei tiefen Ketten.
+        """
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        found: List[List[str]] = []
+        counter = 0
+
+        for root in self.kinds:
+            if root in index:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, pos = work.pop()
+                if pos == 0:
+                    index[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack.add(node)
+                targets = self._out[node]
+                if pos < len(targets):
+                    work.append((node, pos + 1))
+                    target = targets[pos]
+                    if target not in index:
+                        work.append((target, 0))
+                    elif target in on_stack:
+                        low[node] = min(low[node], index[target])
+                    continue
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component: List[str] = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in self._out[node]:
+                        found.append(sorted(component))
+        return found
+
+
+def build_dependency_graph(measures: Iterable[tuple[str, str, str]]) -> DependencyGraph:
+    """Graph aus ``(Name, Tabelle, DAX)``-Tupeln; alle Namen werden vorab bekannt gemacht."""
+    items = list(measures)
+    graph = DependencyGraph()
+    for name, table, _dax in items:
+        graph.declare_measure(name, table)
+    for name, table, dax in items:
+        graph.add_measure(name, table, dax)
+    return graph
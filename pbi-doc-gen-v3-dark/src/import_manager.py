@@ -4,25 +4,39 @@ Import-Manager – Orchestrierung und Merge-Logik.
 Zentrale Schnittstelle fuer den Import von .pbix, .bim, .pbit und .json
 Dateien in das bestehende Projekt-Datenmodell.
 
-Unterstuetzte Merge-Modi:
+Unterstuetzte Merge-Modi (siehe merge_engine):
   - replace: Bestehende Daten komplett ersetzen
   - merge:   Nur fehlende Eintraege ergaenzen (bestehende behalten)
+  - update:  Fehlende ergaenzen, geaenderte Felder bestehender aktualisieren
   - append:  Alles hinzufuegen (Duplikate moeglich)
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 
 from .models import (
     Project, KPI, Measure, DataSource, PowerQuery,
-    ModelTable, ModelRelationship, ReportPage, _new_id,
+    ModelTable, ModelRelationship, ReportPage, KeyIndex, _new_id,
 )
-from .pbix_parser import PbixImportResult, parse_pbix
+from .instrumentation import ImportProfiler, StageStats, profile_dir, stage
+from .importers import import_measures_from_file, import_queries_from_file
+from .merge_engine import COLLECTIONS, ChangeSet, _NameKey, merge_items, merge_scalar, update_fields
+from .pbix_parser import PbixImportResult, parse_pbix, changed_parts, PART_MEMBERS
 from .bim_parser import BimImportResult, parse_bim, is_bim_format
-from .pbitools_parser import pbitools_available, parse_pbix_with_pbitools
+from .pbitools_parser import ExtractionCache, pbitools_available, parse_pbix_with_pbitools
+from .parse_cache import ParseCache, parse_bim_cached, parse_pbix_cached
+from .pbix_scan import DEFAULT_TIME_BUDGET, scan_pbix
+from .datamodel_reader import datamodel_available, has_datamodel, parse_datamodel
+from .pbir_parser import PbirImportResult, parse_pbir, resolve_report_dir
+
+# Hinweis fuer Modellinhalte, die eine .pbix allein nicht liefert
+_MODEL_HINT = "nur mit .bim, pbi-tools oder DataModel-Leser (pip install pbixray)"
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -32,24 +46,40 @@ from .pbitools_parser import pbitools_available, parse_pbix_with_pbitools
 @dataclass
 class ImportOptions:
     """Steuerung des Import-Verhaltens."""
-    merge_mode: str = "replace"             # "replace" | "merge" | "append"
+    merge_mode: str = "replace"             # "replace" | "merge" | "update" | "append"
     import_measures_as_kpis: bool = False    # Measures auch als KPIs anlegen?
     skip_hidden_tables: bool = True          # Versteckte Tabellen ignorieren?
     skip_hidden_measures: bool = False
     detect_table_types: bool = True          # Heuristik fuer Fakt/Dim-Erkennung
     extract_data_sources: bool = True
     use_pbitools: bool = True               # pbi-tools verwenden falls verfuegbar?
+    use_datamodel_reader: bool = True        # DataModel direkt lesen (pbixray) falls verfuegbar?
+    use_cache: bool = False                  # Parse-Ergebnisse auf Platte cachen?
+    parse_workers: int = 1                   # Prozesse fuer BIM-Tabellen (0 = alle Kerne)
+    profile_dir: str = ""                    # cProfile-Dump je Import (sonst $PBI_DOC_GEN_PROFILE)
 
 
 @dataclass
 class ImportReport:
     """Bericht ueber den abgeschlossenen Import."""
     success: bool = True
-    file_type: str = ""                     # "pbix", "bim", "pbitools", "pbit"
+    file_type: str = ""                     # "pbix", "bim", "pbitools", "datamodel", "pbit"
     imported: dict = field(default_factory=dict)   # {"measures": 15, "tables": 8, ...}
     skipped: dict = field(default_factory=dict)    # {"hidden_tables": 3, ...}
     warnings: List[str] = field(default_factory=list)
     not_available: List[str] = field(default_factory=list)
+    # Inkrementeller Import: unveraenderte PBIX-Teile und das Parse-Ergebnis
+    # (als ``previous`` fuer den naechsten Import derselben Datei)
+    unchanged_parts: List[str] = field(default_factory=list)
+    pbix_result: Optional[PbixImportResult] = None
+    pbir_result: Optional[PbirImportResult] = None
+    # Neu/aktualisiert/unveraendert je Sammlung; ``changed_project_fields()`` fuers Speichern
+    changes: ChangeSet = field(default_factory=ChangeSet)
+    # ImportSession: Parse-Dauer je Datei in Sekunden
+    file_timings: Dict[str, float] = field(default_factory=dict)
+    # Messwerte je Stufe (Parser + import.parse/import.merge) und ggf. cProfile-Dump
+    stages: List[StageStats] = field(default_factory=list)
+    profile_path: Optional[Path] = None
 
     def summary_text(self) -> str:
         """Menschenlesbare Zusammenfassung."""
@@ -73,6 +103,15 @@ class ImportReport:
             if items:
                 parts.append("Importiert: " + ", ".join(items) + ".")
 
+        updated = {k: len(v) for k, v in self.changes.updated.items() if v}
+        if updated:
+            labels = {"tables": "Tabellen", "relationships": "Beziehungen", "queries": "Queries",
+                      "data_sources": "Datenquellen", "report_pages": "Berichtsseiten",
+                      "measures": "Measures", "kpis": "KPIs"}
+            items = [f"{n} {labels[k]}" for k, n in updated.items() if k in labels]
+            if items:
+                parts.append("Aktualisiert: " + ", ".join(items) + ".")
+
         if self.skipped:
             items = []
             for key, count in self.skipped.items():
@@ -81,12 +120,35 @@ class ImportReport:
             if items:
                 parts.append("Uebersprungen: " + ", ".join(items) + ".")
 
+        if self.unchanged_parts:
+            labels = {
+                "layout": "Berichtsseiten",
+                "mashup": "Queries/Datenquellen",
+                "schema": "Tabellen",
+            }
+            parts.append(
+                "Unveraendert (nicht neu uebernommen): "
+                + ", ".join(labels.get(p, p) for p in self.unchanged_parts) + "."
+            )
+
         if self.not_available:
             parts.append(
                 "⚠️ Nicht verfuegbar bei diesem Dateityp: "
                 + ", ".join(self.not_available) + "."
             )
 
+        if self.stages:
+            parts.append("Stufen: " + ", ".join(st.describe() for st in self.stages) + ".")
+
+        if self.profile_path is not None:
+            parts.append(f"Profil: {self.profile_path}")
+
+        if self.file_timings:
+            parts.append(
+                "Dauer je Datei: "
+                + ", ".join(f"{name} {sec:.2f} s" for name, sec in self.file_timings.items()) + "."
+            )
+
         if self.warnings:
             parts.append(f"⚠️ {len(self.warnings)} Warnung(en).")
 
@@ -101,10 +163,16 @@ def detect_file_type(file_path: Path) -> str:
     """
     Erkennt den Dateityp anhand der Endung und des Inhalts.
 
-    Returns: "pbix", "pbit", "bim", "json_bim", "unknown"
+    Returns: "pbix", "pbit", "pbip", "pbir", "bim", "json_bim", "unknown"
     """
     suffix = file_path.suffix.lower()
 
+    if file_path.is_dir():
+        return "pbir" if resolve_report_dir(file_path, []) else "unknown"
+    if suffix == ".pbip":
+        return "pbip"
+    if file_path.name.lower() == "definition.pbir":
+        return "pbir"
     if suffix == ".pbix":
         return "pbix"
     elif suffix == ".pbit":
@@ -137,23 +205,126 @@ class ImportPreview:
     relationship_count: int = 0
     has_rls: bool = False
     pbitools_available: bool = False
+    is_estimate: bool = False               # Schnell-Vorschau: Zeitbudget erschoepft
     warnings: List[str] = field(default_factory=list)
     not_available: List[str] = field(default_factory=list)
 
 
-def preview_import(file_path: Path) -> ImportPreview:
+def _parse_pbix_file(
+    file_path: Path,
+    options: ImportOptions,
+    previous: Optional[PbixImportResult] = None,
+) -> PbixImportResult:
+    if options.use_cache:
+        return parse_pbix_cached(file_path, ParseCache())
+    return parse_pbix(file_path, previous=previous)
+
+
+def _parse_bim_file(file_path: Path, options: ImportOptions) -> BimImportResult:
+    kwargs = dict(
+        skip_hidden_tables=options.skip_hidden_tables,
+        skip_hidden_measures=options.skip_hidden_measures,
+        detect_table_types=options.detect_table_types,
+        workers=options.parse_workers,
+    )
+    if options.use_cache:
+        return parse_bim_cached(file_path, ParseCache(), **kwargs)
+    return parse_bim(file_path, **kwargs)
+
+
+def _extract_model(
+    file_path: Path,
+    options: ImportOptions,
+    warnings: List[str],
+) -> tuple[Optional[BimImportResult], str]:
+    """
+    Modell (Measures, Beziehungen, RLS) einer .pbix lesen: zuerst direkt aus
+    dem DataModel, sonst per pbi-tools. Gibt (Ergebnis, Quelle) zurueck;
+    Quelle ist "datamodel" oder "pbitools", ohne Ergebnis (None, "").
+    """
+    if options.use_datamodel_reader and datamodel_available() and has_datamodel(file_path):
+        try:
+            return parse_datamodel(
+                file_path,
+                skip_hidden_tables=options.skip_hidden_tables,
+                skip_hidden_measures=options.skip_hidden_measures,
+                detect_table_types=options.detect_table_types,
+            ), "datamodel"
+        except Exception as exc:
+            warnings.append(f"DataModel-Leser fehlgeschlagen: {exc}")
+
+    if options.use_pbitools:
+        cache = ExtractionCache.shared() if options.use_cache else None
+        # Gecachte Extraktion braucht kein installiertes pbi-tools
+        cached = cache is not None and cache.lookup(cache.key_for(file_path)) is not None
+        if cached or pbitools_available():
+            try:
+                return parse_pbix_with_pbitools(file_path, cache), "pbitools"
+            except Exception as exc:
+                warnings.append(f"pbi-tools Extraktion fehlgeschlagen: {exc}")
+
+    return None, ""
+
+
+def _parse_pbix_and_model(
+    file_path: Path,
+    options: ImportOptions,
+    previous: Optional[PbixImportResult],
+    model_warnings: List[str],
+) -> tuple[PbixImportResult, Optional[BimImportResult], str]:
+    """
+    PBIX-Parser und Modell-Extraktion laufen gleichzeitig: die Extraktion
+    (pbi-tools ist ein eigener Prozess) startet im Hintergrund, bevor
+    ``parse_pbix`` beginnt; beide Ergebnisse werden danach zusammengefuehrt.
+    """
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        model_future = pool.submit(_extract_model, file_path, options, model_warnings)
+        pbix_result = _parse_pbix_file(file_path, options, previous)
+        bim_result, source = model_future.result()
+    return pbix_result, bim_result, source
+
+
+def preview_import(
+    file_path: Path,
+    use_cache: bool = False,
+    fast: bool = False,
+    time_budget: Optional[float] = DEFAULT_TIME_BUDGET,
+) -> ImportPreview:
     """
     Erzeugt eine Vorschau ohne das Projekt zu veraendern.
     Schnelle Analyse fuer den Import-Dialog.
+
+    Mit ``use_cache`` landet das Parse-Ergebnis im Parse-Cache, sodass der
+    anschliessende ``import_file``-Aufruf die Datei nicht erneut parst.
+
+    Mit ``fast`` wird eine .pbix/.pbit nur per Token-Scan gezaehlt
+    (``pbix_scan``), ohne Visual-/Query-Objekte und ohne pbi-tools.
+    Reicht ``time_budget`` (Sekunden) nicht, sind die Zahlen hochgerechnet
+    und ``is_estimate`` ist gesetzt.
     """
     preview = ImportPreview()
     preview.pbitools_available = pbitools_available()
+    parse_options = ImportOptions(use_cache=use_cache)
 
     ftype = detect_file_type(file_path)
     preview.file_type = ftype
 
-    if ftype in ("pbix", "pbit"):
-        result = parse_pbix(file_path)
+    if ftype in ("pbix", "pbit") and fast:
+        scan = scan_pbix(file_path, time_budget)
+        preview.report_name = file_path.stem
+        preview.page_count = scan.page_count
+        preview.visual_count = scan.visual_count
+        preview.query_count = scan.query_count
+        preview.source_count = scan.source_count
+        preview.table_count = scan.table_count
+        preview.is_estimate = scan.is_estimate
+        preview.warnings = scan.warnings
+
+        for label in ("DAX Measures", "Beziehungen", "RLS-Rollen"):
+            preview.not_available.append(f"{label} ({_MODEL_HINT})")
+
+    elif ftype in ("pbix", "pbit"):
+        result, bim_result, _source = _parse_pbix_and_model(file_path, parse_options, None, [])
         preview.report_name = result.report_name
         preview.page_count = len(result.report_pages)
         preview.visual_count = sum(len(p.visuals) for p in result.report_pages)
@@ -161,30 +332,43 @@ def preview_import(file_path: Path) -> ImportPreview:
         preview.source_count = len(result.data_sources)
         preview.table_count = len(result.tables)
 
-        preview.not_available.append("DAX Measures (nur mit .bim oder pbi-tools)")
-        preview.not_available.append("Beziehungen (nur mit .bim oder pbi-tools)")
-        preview.not_available.append("RLS-Rollen (nur mit .bim oder pbi-tools)")
-
-        if preview.pbitools_available:
-            try:
-                bim_result = parse_pbix_with_pbitools(file_path)
-                preview.measure_count = len(bim_result.measures)
-                preview.relationship_count = len(bim_result.relationships)
-                preview.table_count = max(preview.table_count, len(bim_result.tables))
-                preview.query_count = max(preview.query_count, len(bim_result.power_queries))
-                preview.source_count = max(preview.source_count, len(bim_result.data_sources))
-                preview.has_rls = bool(bim_result.rls_notes)
-                preview.not_available.clear()
-                # pbi-tools Warnungen statt PBIX-Parser Warnungen
-                preview.warnings = bim_result.warnings
-            except Exception:
-                # Fallback: PBIX-Parser Warnungen behalten
-                preview.warnings = result.warnings
+        for label in ("DAX Measures", "Beziehungen", "RLS-Rollen"):
+            preview.not_available.append(f"{label} ({_MODEL_HINT})")
+
+        if bim_result is not None:
+            preview.measure_count = len(bim_result.measures)
+            preview.relationship_count = len(bim_result.relationships)
+            preview.table_count = max(preview.table_count, len(bim_result.tables))
+            preview.query_count = max(preview.query_count, len(bim_result.power_queries))
+            preview.source_count = max(preview.source_count, len(bim_result.data_sources))
+            preview.has_rls = bool(bim_result.rls_notes)
+            preview.not_available.clear()
+            # Modell-Warnungen statt PBIX-Parser Warnungen
+            preview.warnings = bim_result.warnings
         else:
+            # Fallback: PBIX-Parser Warnungen behalten
             preview.warnings = result.warnings
 
+    elif ftype in ("pbip", "pbir"):
+        pbir = parse_pbir(file_path)
+        preview.report_name = pbir.report_name
+        preview.page_count = len(pbir.report_pages)
+        preview.visual_count = sum(len(p.visuals) for p in pbir.report_pages)
+        preview.warnings = list(pbir.warnings)
+        if pbir.semantic_model is not None:
+            model = _parse_bim_file(pbir.semantic_model, parse_options)
+            preview.measure_count = len(model.measures)
+            preview.table_count = len(model.tables)
+            preview.relationship_count = len(model.relationships)
+            preview.query_count = len(model.power_queries)
+            preview.source_count = len(model.data_sources)
+            preview.has_rls = bool(model.rls_notes)
+            preview.warnings.extend(model.warnings)
+        else:
+            preview.not_available.append("Datenmodell (kein model.bim im Projekt)")
+
     elif ftype in ("bim", "json_bim"):
-        result = parse_bim(file_path)
+        result = _parse_bim_file(file_path, parse_options)
         preview.report_name = result.report_name
         preview.measure_count = len(result.measures)
         preview.table_count = len(result.tables)
@@ -208,30 +392,31 @@ def preview_import(file_path: Path) -> ImportPreview:
 
 def _merge_list(existing: list, new_items: list, mode: str, key_attr: str) -> tuple[list, int]:
     """
-    Merged eine Liste basierend auf dem Modus.
-    Gibt (merged_list, skip_count) zurueck.
+    Merged eine einzelne Liste ohne Projekt-Index (Schluessel ``key_attr``,
+    ohne Gross-/Kleinschreibung). Gibt (merged_list, skip_count) zurueck.
+    Importe ins Projekt laufen ueber ``merge_engine.merge_items``.
     """
     if mode == "replace":
         return list(new_items), 0
 
+    merged = list(existing)
     if mode == "append":
-        return existing + list(new_items), 0
-
-    # mode == "merge": Nur fehlende ergaenzen
-    existing_keys = set()
-    for item in existing:
-        key = getattr(item, key_attr, "")
-        if key:
-            existing_keys.add(key.lower())
+        merged.extend(new_items)
+        return merged, 0
 
-    merged = list(existing)
+    key_func = _NameKey(key_attr)
+    index = KeyIndex(key_func)
+    index.sync(merged)
     skipped = 0
     for item in new_items:
-        key = getattr(item, key_attr, "")
-        if key and key.lower() in existing_keys:
-            skipped += 1
+        key = key_func(item)
+        pos = index.get(key) if key else None
+        if pos is None:
+            index.append(item)
+        elif mode == "update":
+            update_fields(merged[pos], item)
         else:
-            merged.append(item)
+            skipped += 1
 
     return merged, skipped
 
@@ -240,24 +425,52 @@ def _merge_list(existing: list, new_items: list, mode: str, key_attr: str) -> tu
 # Hauptfunktion
 # ══════════════════════════════════════════════════════════════════
 
+_REPORT_TYPES = ("pbix", "pbit", "pbip", "pbir")
+
+
+@dataclass
+class ImportPayload:
+    """Geparste, noch nicht gemergte Inhalte einer Importquelle."""
+    collections: Dict[str, list] = field(default_factory=dict)   # Sammlung (merge_engine) -> Eintraege
+    scalars: Dict[str, str] = field(default_factory=dict)        # report_name, rls_notes, date_logic_notes
+
+
+# Merge-Reihenfolge und Schluessel fuer ``ImportReport.skipped``
+_MERGE_ORDER = (
+    ("report_pages", "report_pages_existierend"),
+    ("tables", "tabellen_existierend"),
+    ("relationships", ""),
+    ("measures", "measures_existierend"),
+    ("queries", "queries_existierend"),
+    ("data_sources", "datenquellen_existierend"),
+)
+
+
 def import_file(
     file_path: Path,
     project: Project,
     options: Optional[ImportOptions] = None,
+    previous: Optional[Union[PbixImportResult, PbirImportResult]] = None,
 ) -> ImportReport:
     """
     Zentrale Import-Funktion. Erkennt Dateityp und ruft den richtigen Parser auf.
 
     Unterstuetzte Dateitypen:
-    - .pbix  -> pbix_parser (+ pbitools_parser falls verfuegbar)
+    - .pbix  -> pbix_parser (+ datamodel_reader bzw. pbitools_parser falls verfuegbar)
     - .bim   -> bim_parser
     - .json  -> Erkennung ob BIM-Format oder pbi-tools-Extrakt
     - .pbit  -> Template, gleiche Struktur wie .pbix
+    - .pbip / definition.pbir / Report-Ordner -> pbir_parser (+ model.bim)
 
     Args:
         file_path: Pfad zur Importdatei
         project: Bestehendes Projekt (wird in-place modifiziert)
         options: Import-Optionen (Standard: replace-Modus)
+        previous: Ergebnis des letzten Imports derselben .pbix in dieses
+            Projekt (``report.pbix_result``). Dann werden nur geaenderte
+            ZIP-Member neu geparst und nur deren Teile gemerged; die
+            unveraenderten Teile stehen bereits im Projekt. Bei PBIP/PBIR
+            ``report.pbir_result``: nur geaenderte Dateien werden gelesen.
 
     Returns:
         ImportReport mit Zusammenfassung
@@ -265,187 +478,373 @@ def import_file(
     if options is None:
         options = ImportOptions()
 
+    stages: List[StageStats] = []
+    with ImportProfiler(profile_dir(options.profile_dir), Path(file_path).stem) as profiler:
+        with stage(stages, "import.parse"):
+            report, payload = _parse_for_import(file_path, options, previous)
+        if report.success:
+            with stage(stages, "import.merge") as st:
+                _apply_payload(project, payload, options, report)
+                st.objects = sum(report.imported.values())
+    report.stages.extend(stages)
+    report.profile_path = profiler.path
+    return report
+
+
+def _parse_for_import(
+    file_path: Path,
+    options: ImportOptions,
+    previous: Optional[Union[PbixImportResult, PbirImportResult]] = None,
+    text_kind: str = "",
+) -> tuple[ImportReport, ImportPayload]:
+    """
+    Parst eine Quelle, ohne das Projekt anzufassen. ``text_kind``
+    ("measures" | "queries") liest Textdateien im Format von ``importers``.
+    """
     report = ImportReport()
+    payload = ImportPayload()
+
+    if text_kind:
+        report.file_type = f"{text_kind}_txt"
+        try:
+            if text_kind == "measures":
+                payload.collections["measures"] = import_measures_from_file(file_path)
+            else:
+                payload.collections["queries"] = import_queries_from_file(file_path)
+        except (OSError, UnicodeDecodeError) as exc:
+            report.success = False
+            report.warnings.append(f"Datei nicht lesbar: {exc}")
+        return report, payload
+
     ftype = detect_file_type(file_path)
     report.file_type = ftype
 
     if ftype == "unknown":
         report.success = False
         report.warnings.append(f"Unbekannter Dateityp: {file_path.suffix}")
-        return report
+        return report, payload
 
     # ── Parsen ────────────────────────────────────────
     pbix_result: Optional[PbixImportResult] = None
     bim_result: Optional[BimImportResult] = None
 
     if ftype in ("pbix", "pbit"):
-        # Immer erstmal pure Python parsen
-        pbix_result = parse_pbix(file_path)
-
-        # pbi-tools falls verfuegbar und gewuenscht
-        if options.use_pbitools and pbitools_available():
-            try:
-                bim_result = parse_pbix_with_pbitools(file_path)
-                report.file_type = "pbitools"
-                report.warnings.extend(bim_result.warnings)
-                # PBIX-Parser-Warnungen unterdruecken – pbi-tools hat alles
-            except Exception as exc:
-                report.warnings.append(f"pbi-tools Extraktion fehlgeschlagen: {exc}")
-                report.warnings.append("Fallback auf reinen PBIX-Parser.")
-                report.warnings.extend(pbix_result.warnings)
+        # Immer pure Python parsen; parallel dazu das Modell direkt aus dem
+        # DataModel bzw. per pbi-tools, falls moeglich
+        model_warnings: List[str] = []
+        pbix_result, bim_result, source = _parse_pbix_and_model(
+            file_path, options, previous, model_warnings,
+        )
+        report.pbix_result = pbix_result
+        report.warnings.extend(model_warnings)
+        if bim_result is not None:
+            report.file_type = source
+            report.warnings.extend(bim_result.warnings)
+            # PBIX-Parser-Warnungen unterdruecken – das Modell hat alles
         else:
+            if model_warnings:
+                report.warnings.append("Fallback auf reinen PBIX-Parser.")
             report.warnings.extend(pbix_result.warnings)
 
-    elif ftype in ("bim", "json_bim"):
-        bim_result = parse_bim(
-            file_path,
-            skip_hidden_tables=options.skip_hidden_tables,
-            skip_hidden_measures=options.skip_hidden_measures,
-            detect_table_types=options.detect_table_types,
+    elif ftype in ("pbip", "pbir"):
+        pbir_result = parse_pbir(
+            file_path, previous if isinstance(previous, PbirImportResult) else None,
         )
+        report.pbir_result = pbir_result
+        report.warnings.extend(pbir_result.warnings)
+        # Berichtsseiten laufen durch denselben Merge wie bei .pbix
+        pbix_result = PbixImportResult(
+            report_pages=pbir_result.report_pages,
+            report_name=pbir_result.report_name,
+        )
+        if pbir_result.semantic_model is not None:
+            bim_result = _parse_bim_file(pbir_result.semantic_model, options)
+            report.warnings.extend(bim_result.warnings)
+
+    elif ftype in ("bim", "json_bim"):
+        bim_result = _parse_bim_file(file_path, options)
         report.warnings.extend(bim_result.warnings)
 
-    # ── Merge in Projekt ──────────────────────────────
-    mode = options.merge_mode
-    imported = {}
-    skipped = {}
+    for parsed in (pbix_result, bim_result):
+        if parsed is not None:
+            report.stages.extend(parsed.stages)
+
+    # ── Inkrementell: unveraenderte Teile nicht erneut mergen ──
+    unchanged: set = set()
+    if isinstance(previous, PbixImportResult) and ftype in ("pbix", "pbit"):
+        unchanged = set(PART_MEMBERS) - changed_parts(previous, pbix_result)
+        report.unchanged_parts = [p for p in PART_MEMBERS if p in unchanged]
+    skip_layout = "layout" in unchanged
+    # Tabellen/Queries/Quellen stammen bei pbi-tools aus dem BIM-Ergebnis
+    skip_mashup = "mashup" in unchanged and bim_result is None
+    skip_schema = "schema" in unchanged and bim_result is None
+
+    collections = payload.collections
 
     # Report-Name
-    name = ""
     if bim_result and bim_result.report_name:
-        name = bim_result.report_name
-    elif pbix_result and pbix_result.report_name:
-        name = pbix_result.report_name
-    if name and (mode == "replace" or not project.meta.report_name):
-        project.meta.report_name = name
-
-    # ── Report Pages (nur aus PBIX) ──────────────────
-    if pbix_result and pbix_result.report_pages:
-        merged, skip_count = _merge_list(
-            project.report_pages, pbix_result.report_pages,
-            mode, "page_name",
-        )
-        project.report_pages = merged
-        imported["report_pages"] = len(pbix_result.report_pages)
-        if skip_count:
-            skipped["report_pages_existierend"] = skip_count
+        payload.scalars["report_name"] = bim_result.report_name
+    elif pbix_result and pbix_result.report_name and not skip_layout:
+        payload.scalars["report_name"] = pbix_result.report_name
+
+    # Report Pages (nur aus PBIX)
+    if pbix_result and pbix_result.report_pages and not skip_layout:
+        collections["report_pages"] = pbix_result.report_pages
     elif ftype in ("bim", "json_bim"):
         report.not_available.append("Berichtsseiten/Visuals")
 
-    # ── Tabellen ──────────────────────────────────────
-    tables = []
+    # Tabellen
     if bim_result and bim_result.tables:
-        tables = bim_result.tables
-    elif pbix_result and pbix_result.tables:
-        tables = pbix_result.tables
-
-    if tables:
-        merged, skip_count = _merge_list(
-            project.data_model.tables, tables,
-            mode, "name",
-        )
-        project.data_model.tables = merged
-        imported["tables"] = len(tables)
-        if skip_count:
-            skipped["tabellen_existierend"] = skip_count
+        collections["tables"] = bim_result.tables
+    elif pbix_result and pbix_result.tables and not skip_schema:
+        collections["tables"] = pbix_result.tables
 
-    # ── Relationships (nur aus BIM) ───────────────────
+    # Relationships und Measures (nur aus BIM)
     if bim_result and bim_result.relationships:
-        if mode == "replace":
-            project.data_model.relationships = list(bim_result.relationships)
-        elif mode == "append":
-            project.data_model.relationships.extend(bim_result.relationships)
-        else:  # merge
-            existing_keys = set()
-            for r in project.data_model.relationships:
-                existing_keys.add(f"{r.from_table}.{r.from_column}->{r.to_table}.{r.to_column}")
-            for r in bim_result.relationships:
-                key = f"{r.from_table}.{r.from_column}->{r.to_table}.{r.to_column}"
-                if key not in existing_keys:
-                    project.data_model.relationships.append(r)
-        imported["relationships"] = len(bim_result.relationships)
-    elif ftype in ("pbix", "pbit") and report.file_type != "pbitools":
+        collections["relationships"] = bim_result.relationships
+    elif ftype in _REPORT_TYPES and bim_result is None:
         report.not_available.append("Beziehungen")
 
-    # ── Measures (nur aus BIM) ────────────────────────
     if bim_result and bim_result.measures:
-        merged, skip_count = _merge_list(
-            project.measures, bim_result.measures,
-            mode, "name",
-        )
-        project.measures = merged
-        imported["measures"] = len(bim_result.measures)
-        if skip_count:
-            skipped["measures_existierend"] = skip_count
-
-        # Optional: Measures auch als KPIs
-        if options.import_measures_as_kpis:
-            kpi_count = 0
-            for m in bim_result.measures:
-                kpi = KPI(
+        collections["measures"] = bim_result.measures
+    elif ftype in _REPORT_TYPES and bim_result is None:
+        report.not_available.append("DAX Measures")
+
+    # Power Queries
+    if bim_result and bim_result.power_queries:
+        collections["queries"] = bim_result.power_queries
+    elif pbix_result and pbix_result.power_queries and not skip_mashup:
+        collections["queries"] = pbix_result.power_queries
+
+    # Datenquellen
+    if options.extract_data_sources:
+        if bim_result and bim_result.data_sources:
+            collections["data_sources"] = bim_result.data_sources
+        elif pbix_result and pbix_result.data_sources and not skip_mashup:
+            collections["data_sources"] = pbix_result.data_sources
+
+    # RLS und Datumslogik
+    if bim_result:
+        payload.scalars["rls_notes"] = bim_result.rls_notes
+        payload.scalars["date_logic_notes"] = bim_result.date_logic_notes
+
+    return report, payload
+
+
+def _apply_payload(
+    project: Project,
+    payload: ImportPayload,
+    options: ImportOptions,
+    report: ImportReport,
+) -> None:
+    """Merged geparste Inhalte in das Projekt und fuellt ``report``."""
+    mode = options.merge_mode
+    imported = {}
+    skipped = {}
+    changes = report.changes
+
+    merge_scalar(project.meta, "report_name", payload.scalars.get("report_name", ""), mode, changes)
+
+    for collection, skip_key in _MERGE_ORDER:
+        items = payload.collections.get(collection)
+        if not items:
+            continue
+        skip_count = merge_items(project, collection, items, mode, changes)
+        imported[collection] = len(items)
+        if skip_count and skip_key:
+            skipped[skip_key] = skip_count
+
+        # Optional: Measures auch als KPIs. Fehlende werden ergaenzt; im Update-Modus
+        # fuellen sie nur leere Felder, gepflegte Beschreibungen bleiben erhalten.
+        if collection == "measures" and options.import_measures_as_kpis:
+            kpis = [
+                KPI(
                     name=m.name,
                     business_description=m.description,
                     technical_definition=m.dax_code,
                     filters_context=m.filter_context_notes,
                 )
-                if mode == "merge":
-                    existing_names = {k.name.lower() for k in project.kpis}
-                    if kpi.name.lower() not in existing_names:
-                        project.kpis.append(kpi)
-                        kpi_count += 1
-                else:
-                    project.kpis.append(kpi)
-                    kpi_count += 1
+                for m in items
+            ]
+            kpi_mode = "update" if mode == "update" else "merge"
+            before = changes.count("added", "kpis")
+            merge_items(project, "kpis", kpis, kpi_mode, changes, overwrite=False)
+            kpi_count = changes.count("added", "kpis") - before
             if kpi_count:
                 imported["kpis"] = kpi_count
-    elif ftype in ("pbix", "pbit") and report.file_type != "pbitools":
-        report.not_available.append("DAX Measures")
 
-    # ── Power Queries ─────────────────────────────────
-    queries = []
-    if bim_result and bim_result.power_queries:
-        queries = bim_result.power_queries
-    elif pbix_result and pbix_result.power_queries:
-        queries = pbix_result.power_queries
-
-    if queries:
-        merged, skip_count = _merge_list(
-            project.power_queries, queries,
-            mode, "query_name",
-        )
-        project.power_queries = merged
-        imported["queries"] = len(queries)
-        if skip_count:
-            skipped["queries_existierend"] = skip_count
+    merge_scalar(project.governance, "rls_notes", payload.scalars.get("rls_notes", ""), mode, changes)
+    merge_scalar(project.data_model, "date_logic_notes",
+                 payload.scalars.get("date_logic_notes", ""), mode, changes)
 
-    # ── Datenquellen ──────────────────────────────────
-    if options.extract_data_sources:
-        sources = []
-        if bim_result and bim_result.data_sources:
-            sources = bim_result.data_sources
-        elif pbix_result and pbix_result.data_sources:
-            sources = pbix_result.data_sources
-
-        if sources:
-            merged, skip_count = _merge_list(
-                project.data_sources, sources,
-                mode, "connection_info",
-            )
-            project.data_sources = merged
-            imported["data_sources"] = len(sources)
-            if skip_count:
-                skipped["datenquellen_existierend"] = skip_count
+    report.imported = imported
+    report.skipped = skipped
 
-    # ── RLS ───────────────────────────────────────────
-    if bim_result and bim_result.rls_notes:
-        if mode == "replace" or not project.governance.rls_notes:
-            project.governance.rls_notes = bim_result.rls_notes
 
-    # ── Date Logic ────────────────────────────────────
-    if bim_result and bim_result.date_logic_notes:
-        if mode == "replace" or not project.data_model.date_logic_notes:
-            project.data_model.date_logic_notes = bim_result.date_logic_notes
+# ══════════════════════════════════════════════════════════════════
+# Import-Session: mehrere Dateien parallel parsen, einmal mergen
+# ══════════════════════════════════════════════════════════════════
 
-    report.imported = imported
-    report.skipped = skipped
-    return report
+_TEXT_KINDS = {"MEASURE:": "measures", "QUERY:": "queries"}
+
+
+def _sniff_text_kind(file_path: Path) -> str:
+    """Erkennt Measure-/Query-Textdateien (Format von ``importers``) an der ersten Zeile."""
+    if file_path.suffix.lower() != ".txt":
+        return ""
+    try:
+        with open(file_path, encoding="utf-8", errors="replace") as fp:
+            for line in fp:
+                line = line.strip()
+                if not line or line == "---":
+                    continue
+                for marker, kind in _TEXT_KINDS.items():
+                    if line.startswith(marker):
+                        return kind
+                return ""
+    except OSError:
+        pass
+    return ""
+
+
+@dataclass
+class _SessionSource:
+    path: Path
+    priority: int = 0
+    kind: str = ""          # "" = Dateityp erkennen, sonst "measures" | "queries"
+
+
+def _parse_session_source(
+    source: _SessionSource,
+    options: ImportOptions,
+) -> tuple[ImportReport, ImportPayload, float]:
+    """
+    Worker: eine Quelle parsen (laeuft im Prozesspool).
+
+    Zurueck in den Hauptprozess gehen nur Payload, Warnungen und Messwerte;
+    die vollstaendigen Parse-Ergebnisse (``pbix_result``/``pbir_result``
+    samt Layout und Dateizustand) braucht die Session nicht und werden
+    nicht mit gepickelt.
+    """
+    start = time.perf_counter()
+    report, payload = _parse_for_import(source.path, options, text_kind=source.kind)
+    report.pbix_result = report.pbir_result = None
+    return report, payload, time.perf_counter() - start
+
+
+class ImportSession:
+    """
+    Importiert mehrere Dateien in einem Schritt.
+
+    Alle registrierten Quellen (.pbix, .bim, PBIP, Measure-/Query-Textdateien)
+    werden parallel in einem Prozesspool geparst. Konflikte – derselbe
+    Schluessel (z.B. Measure-Name) aus mehreren Quellen – entscheidet die
+    Prioritaet: hoehere gewinnt, bei Gleichstand die zuerst registrierte.
+    Anschliessend wird das kombinierte Ergebnis einmal in das Projekt
+    gemerged; ``run()`` liefert einen einzigen ImportReport mit der
+    Parse-Dauer je Datei (``file_timings``).
+
+    Im replace-Modus ersetzt das kombinierte Ergebnis die Projekt-Listen –
+    anders als nacheinander ausgefuehrte Einzelimporte, bei denen die
+    letzte Datei gewinnt.
+    """
+
+    def __init__(self, project: Project, options: Optional[ImportOptions] = None,
+                 max_workers: int = 0):
+        self.project = project
+        self.options = options or ImportOptions()
+        self.max_workers = max_workers      # 0 = alle Kerne
+        self.sources: List[_SessionSource] = []
+
+    def add(self, file_path: Path, priority: int = 0, kind: str = "") -> None:
+        """
+        Registriert eine Quelle. ``kind`` ("measures" | "queries") erzwingt
+        das Textformat; ohne Angabe werden .txt-Dateien am Inhalt erkannt.
+        """
+        file_path = Path(file_path)
+        if kind and kind not in _TEXT_KINDS.values():
+            raise ValueError(f"Unbekannte Quellart: {kind}")
+        self.sources.append(_SessionSource(file_path, priority, kind or _sniff_text_kind(file_path)))
+
+    def _parse_all(self) -> List[tuple[ImportReport, ImportPayload, float]]:
+        # BIM-Tabellen nicht zusaetzlich parallelisieren (keine verschachtelten Pools)
+        options = replace(self.options, parse_workers=1)
+        workers = self.max_workers or os.cpu_count() or 1
+        workers = min(workers, len(self.sources))
+        if workers <= 1:
+            return [_parse_session_source(src, options) for src in self.sources]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_parse_session_source, src, options) for src in self.sources]
+            return [f.result() for f in futures]
+
+    def run(self) -> ImportReport:
+        """Parst alle Quellen, loest Konflikte auf und merged einmal."""
+        report = ImportReport(file_type="session")
+        if not self.sources:
+            report.success = False
+            report.warnings.append("Keine Dateien registriert.")
+            return report
+
+        results = self._parse_all()
+        parsed: List[tuple[_SessionSource, ImportPayload]] = []
+        missing: Optional[set] = None
+        for source, (sub, payload, seconds) in zip(self.sources, results):
+            name = source.path.name
+            report.file_timings[name] = seconds
+            report.stages.extend(replace(st, name=f"{name}:{st.name}") for st in sub.stages)
+            report.warnings.extend(f"{name}: {w}" for w in sub.warnings)
+            if not sub.success:
+                continue
+            parsed.append((source, payload))
+            missing = set(sub.not_available) if missing is None else missing & set(sub.not_available)
+
+        if not parsed:
+            report.success = False
+            return report
+        report.not_available = sorted(missing or ())
+
+        combined = self._combine(parsed, report.warnings)
+        with stage(report.stages, "import.merge") as st:
+            _apply_payload(self.project, combined, self.options, report)
+            st.objects = sum(report.imported.values())
+        return report
+
+    @staticmethod
+    def _combine(
+        parsed: List[tuple[_SessionSource, ImportPayload]],
+        warnings: List[str],
+    ) -> ImportPayload:
+        """Fuehrt die Quellen zusammen; je Schluessel gewinnt die hoechste Prioritaet."""
+        combined = ImportPayload()
+        for collection, _skip_key in _MERGE_ORDER:
+            key_func = COLLECTIONS[collection][1]
+            items: list = []
+            winners: Dict = {}      # Schluessel -> (Position, Prioritaet)
+            conflicts = 0
+            for source, payload in parsed:
+                for item in payload.collections.get(collection, ()):
+                    key = key_func(item)
+                    if not key:
+                        items.append(item)
+                        continue
+                    hit = winners.get(key)
+                    if hit is None:
+                        winners[key] = (len(items), source.priority)
+                        items.append(item)
+                        continue
+                    conflicts += 1
+                    if source.priority > hit[1]:
+                        items[hit[0]] = item
+                        winners[key] = (hit[0], source.priority)
+            if items:
+                combined.collections[collection] = items
+            if conflicts:
+                warnings.append(f"{conflicts} Konflikt(e) bei {collection} nach Prioritaet aufgeloest.")
+
+        # Einzelwerte: hoechste Prioritaet mit Inhalt, bei Gleichstand die erste Quelle
+        ranked = sorted(parsed, key=lambda sp: -sp[0].priority)
+        for _source, payload in ranked:
+            for name, value in payload.scalars.items():
+                if value and name not in combined.scalars:
+                    combined.scalars[name] = value
+        return combined
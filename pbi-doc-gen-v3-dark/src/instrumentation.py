@@ -0,0 +1,108 @@
+"""
+Instrumentierung – Dauer, gelesene Bytes und Objektanzahl je Import-Stufe.
+
+Die Parser tragen ihre Stufen in ``result.stages`` ein (z.B. ``pbix.layout``,
+``pbix.mashup``, ``pbix.schema``, ``bim.read``, ``pbitools.extract``),
+``import_file`` ergaenzt ``import.parse`` und ``import.merge``. Der
+ImportReport sammelt alles in ``report.stages``; ``summary_text()`` zeigt
+die Liste an. Der Overhead ist ein ``perf_counter()``-Paar je Stufe.
+
+Profiling: Ist ``$PBI_DOC_GEN_PROFILE`` (Zielordner) oder
+``ImportOptions.profile_dir`` gesetzt, schreibt jeder Import einen
+cProfile-Dump ``<datei>-<zeitstempel>.pstats`` – auswertbar mit
+``python -m pstats <dump>`` oder snakeviz. Erfasst wird nur der
+aufrufende Thread; Hintergrund-Extraktion und Prozesspools fehlen im Dump.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+PROFILE_DIR_ENV = "PBI_DOC_GEN_PROFILE"
+
+
+@dataclass
+class StageStats:
+    """Messwerte einer Stufe."""
+    name: str
+    seconds: float = 0.0
+    bytes_read: int = 0         # unkomprimierte Eingabe-Bytes der Stufe
+    objects: int = 0            # erzeugte Objekte (Seiten, Queries, Tabellen, ...)
+
+    def describe(self) -> str:
+        details = []
+        if self.bytes_read:
+            details.append(format_bytes(self.bytes_read))
+        if self.objects:
+            details.append(f"{self.objects} Obj.")
+        suffix = f" ({', '.join(details)})" if details else ""
+        return f"{self.name} {self.seconds:.2f} s{suffix}"
+
+
+@contextmanager
+def stage(stages: List[StageStats], name: str) -> Iterator[StageStats]:
+    """
+    Misst die Dauer des Blocks und haengt die Stufe an ``stages`` an.
+    Bytes und Objektanzahl setzt der Block selbst auf dem gelieferten Objekt.
+    """
+    stats = StageStats(name)
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.seconds = time.perf_counter() - start
+        stages.append(stats)
+
+
+def format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+# ══════════════════════════════════════════════════════════════════
+# Profiling
+# ══════════════════════════════════════════════════════════════════
+
+def profile_dir(explicit: str = "") -> Optional[Path]:
+    """Zielordner fuer cProfile-Dumps: Option vor ``$PBI_DOC_GEN_PROFILE``, sonst None."""
+    target = explicit or os.environ.get(PROFILE_DIR_ENV, "")
+    return Path(target) if target else None
+
+
+class ImportProfiler:
+    """
+    Context-Manager: profiliert den Block mit cProfile, wenn ``directory``
+    gesetzt ist, und legt den Dump dort ab (``path`` danach gesetzt).
+    Ohne Verzeichnis ein No-op.
+    """
+
+    def __init__(self, directory: Optional[Path], label: str):
+        self.directory = directory
+        self.label = label
+        self.path: Optional[Path] = None
+        self._profile: Optional[cProfile.Profile] = None
+
+    def __enter__(self) -> "ImportProfiler":
+        if self.directory is not None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._profile is None:
+            return
+        self._profile.disable()
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / f"{self.label}-{stamp}.pstats"
+        self._profile.dump_stats(str(self.path))
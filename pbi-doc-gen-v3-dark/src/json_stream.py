@@ -0,0 +1,200 @@
+"""
+Inkrementelles JSON-Lesen fuer sehr grosse Power-BI-Artefakte.
+
+Report/Layout oder database.json bestehen aus einem einzigen JSON-Objekt,
+das mehrere hundert MB gross werden kann. ``JsonStream`` liest ein solches
+Dokument stueckweise aus einem Datei-Objekt (z.B. ``zipfile.ZipFile.open``)
+und dekodiert immer nur einen Wert auf einmal – etwa eine Berichtsseite
+oder eine Tabelle. Der Speicherbedarf richtet sich damit nach dem groessten
+Einzelwert, nicht nach der Dateigroesse.
+
+Das Encoding wird einmalig anhand von BOM bzw. Null-Byte-Muster erkannt.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, BinaryIO, Iterator, Optional
+
+_DEFAULT_CHUNK = 1 << 16
+_WHITESPACE = " \t\r\n"
+# Laengstes Token, das am Pufferende abgeschnitten sein kann ("false", \uXXXX, Zahlen)
+_TRUNCATION_MARGIN = 32
+
+
+def detect_encoding(head: bytes) -> str:
+    """
+    Erkennt das Encoding eines JSON-Dokuments anhand der ersten Bytes.
+
+    JSON beginnt immer mit einem ASCII-Zeichen. Ohne BOM verraten daher die
+    Null-Bytes, ob UTF-16 (LE/BE) vorliegt.
+    """
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if head.startswith(codecs.BOM_UTF16_LE):
+        return "utf-16-le"
+    if head.startswith(codecs.BOM_UTF16_BE):
+        return "utf-16-be"
+    if len(head) >= 2:
+        if head[0] != 0 and head[1] == 0:
+            return "utf-16-le"
+        if head[0] == 0 and head[1] != 0:
+            return "utf-16-be"
+    return "utf-8"
+
+
+class JsonStream:
+    """
+    Pull-Parser ueber einem binaeren Datei-Objekt.
+
+    Objekte und Arrays werden ueber ``iter_object``/``iter_array`` betreten;
+    der Aufrufer konsumiert jeden Member-Wert anschliessend mit
+    ``read_value``, ``skip_value`` oder einer verschachtelten Iteration.
+    """
+
+    def __init__(
+        self,
+        fp: BinaryIO,
+        encoding: Optional[str] = None,
+        chunk_size: int = _DEFAULT_CHUNK,
+    ):
+        self._fp = fp
+        self._chunk_size = max(16, chunk_size)
+        head = fp.read(4)
+        self.encoding = encoding or detect_encoding(head)
+        self._decoder = codecs.getincrementaldecoder(self.encoding)()
+        self._json = json.JSONDecoder()
+        self._pos = 0
+        self._eof = not head
+        self.bytes_read = len(head)
+        self._buf = self._decoder.decode(head, final=self._eof)
+        # BOM bei utf-16 wird als U+FEFF dekodiert
+        if self._buf.startswith("\ufeff"):
+            self._pos = 1
+
+    # ── Puffer ────────────────────────────────────────────────────
+
+    def _fill(self, min_chars: int = 0) -> bool:
+        """Liest weitere Daten nach. Gibt False zurueck, wenn EOF erreicht ist."""
+        if self._eof:
+            return False
+        size = max(self._chunk_size, min_chars * 2)
+        raw = self._fp.read(size)
+        self.bytes_read += len(raw)
+        if not raw:
+            self._eof = True
+        text = self._decoder.decode(raw, final=self._eof)
+        # Bereits konsumierten Teil verwerfen
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        return not self._eof or bool(text)
+
+    def _skip_ws(self) -> None:
+        while True:
+            buf, pos, n = self._buf, self._pos, len(self._buf)
+            while pos < n and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < n or not self._fill():
+                return
+
+    def peek(self) -> str:
+        """Naechstes Nicht-Whitespace-Zeichen (leer bei EOF)."""
+        self._skip_ws()
+        return self._buf[self._pos] if self._pos < len(self._buf) else ""
+
+    def _expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(
+                f"JSON: '{char}' erwartet, '{found or 'EOF'}' gefunden"
+            )
+        self._pos += 1
+
+    # ── Werte ─────────────────────────────────────────────────────
+
+    def read_value(self) -> Any:
+        """Dekodiert den naechsten vollstaendigen JSON-Wert."""
+        self._skip_ws()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as exc:
+                # Nur ein am Pufferende abgeschnittener Wert rechtfertigt
+                # Nachladen. Ein Syntaxfehler mitten im Puffer bleibt einer,
+                # egal wie viel noch gelesen wird.
+                if not self._is_truncation(exc):
+                    raise
+                # Wert noch unvollstaendig im Puffer -> Puffer mindestens verdoppeln
+                if not self._fill(len(self._buf) - self._pos):
+                    raise
+                continue
+            # Zahlen/Literale am Pufferende koennten abgeschnitten sein
+            if end >= len(self._buf) and not self._eof:
+                self._fill(len(self._buf) - self._pos)
+                continue
+            self._pos = end
+            return value
+
+    def _is_truncation(self, exc: json.JSONDecodeError) -> bool:
+        if self._eof:
+            return False
+        # Offener String: Fehlerposition ist dessen Anfang, das Ende fehlt
+        if exc.msg.startswith("Unterminated string"):
+            return True
+        # Sonst liegt der Fehler bei abgeschnittenen Daten in den letzten
+        # Zeichen (angefangenes Literal, Zahl oder \u-Escape)
+        return exc.pos >= len(self._buf) - _TRUNCATION_MARGIN
+
+    def skip_value(self) -> None:
+        """Ueberspringt den naechsten JSON-Wert."""
+        self.read_value()
+
+    # ── Container ────────────────────────────────────────────────
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Betritt ein Objekt und liefert dessen Schluessel nacheinander.
+
+        Nach jedem Schluessel muss der Aufrufer den zugehoerigen Wert
+        konsumieren, bevor die Iteration fortgesetzt wird.
+        """
+        self._expect("{")
+        first = True
+        while True:
+            char = self.peek()
+            if char == "}":
+                self._pos += 1
+                return
+            if not first:
+                self._expect(",")
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise ValueError("JSON: Objektschluessel ist kein String")
+            self._expect(":")
+            first = False
+            yield key
+
+    def iter_array(self) -> Iterator[int]:
+        """
+        Betritt ein Array und liefert den Index jedes Elements.
+
+        Wie bei ``iter_object`` muss der Aufrufer jedes Element konsumieren.
+        """
+        self._expect("[")
+        index = 0
+        while True:
+            char = self.peek()
+            if char == "]":
+                self._pos += 1
+                return
+            if index:
+                self._expect(",")
+            yield index
+            index += 1
+
+    def iter_array_values(self) -> Iterator[Any]:
+        """Betritt ein Array und liefert die dekodierten Elemente einzeln."""
+        for _ in self.iter_array():
+            yield self.read_value()
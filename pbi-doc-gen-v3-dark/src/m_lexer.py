@@ -0,0 +1,96 @@
+"""
+Lexer fuer Power Query M (Section-Dokumente wie Section1.m).
+
+Zerlegt ein Section-Dokument in einem linearen Durchlauf und kennt dabei
+die lexikalischen Besonderheiten, an denen einfache Regex-Splits scheitern:
+
+- Text-Literale ``"..."`` mit verdoppelten Anfuehrungszeichen als Escape
+- Zeilen- (``//``) und Blockkommentare (``/* ... */``)
+- Quoted Identifier ``#"Mein Name"`` sowie ``#table``, ``#date``, …
+
+``iter_shared_members`` liefert jedes ``shared``-Member eines Section-
+Dokuments mit exakter Quellposition, ohne dass Semikolons in Strings,
+Kommentaren oder Identifiern das Dokument falsch aufteilen.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Iterator
+
+_STRING = r'"[^"]*(?:""[^"]*)*"?'
+# Identifier duerfen mit jedem Unicode-Buchstaben beginnen (z.B. Umlaute)
+# und Punkte enthalten (``Table.AddColumn``), aber nicht darauf enden.
+_IDENTIFIER = r"[^\W\d][\w.]*(?<!\.)"
+
+# Fuer das Aufteilen in Member wird jedes Member als Ganzes von einem
+# Regex erfasst, sodass die Schleife in Python nur einmal pro Member
+# laeuft. Der Ausdruck besteht aus Laeufen "harmloser" Zeichen, Strings
+# (auch ``#"..."``) und Kommentaren; alle Alternativen beginnen mit einem
+# anderen Zeichen und sind possessiv, es gibt also kein Backtracking.
+# Ein ``;`` ist in M nur als Member-Abschluss zulaessig (Klammerebenen
+# brauchen daher nicht gezaehlt zu werden). Ein fehlendes ``;`` endet vor
+# dem naechsten ``shared``.
+_SHARED = r"(?<![\w.\#])shared(?![\w.])"
+_COMMENT = r"//[^\r\n]*+|/\*(?>.*?(?:\*/|\Z))"
+_MEMBER_RE = re.compile(
+    rf"""
+    {_COMMENT}
+  | {_STRING}
+  | {_SHARED}\s++
+    (?P<name>\#{_STRING}|{_IDENTIFIER})\s*+=
+    (?P<expression>(?:[^";/s]++|{_STRING}|{_COMMENT}|/|(?!{_SHARED})s)*+)
+    (?:;|(?={_SHARED})|\Z)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+@dataclass
+class SharedMember:
+    """Ein ``shared Name = Ausdruck;`` Member mit Quellpositionen."""
+    name: str
+    start: int            # Position von ``shared``
+    end: int              # Position hinter dem abschliessenden ``;``
+    expression_start: int
+    expression_end: int   # Position vor dem ``;``
+    source: str = ""
+
+    @property
+    def expression(self) -> str:
+        return self.source[self.expression_start:self.expression_end].strip()
+
+
+def unquote_identifier(text: str) -> str:
+    """
+    Entfernt die Quotierung eines ``#"..."``-Identifiers und loest
+    verdoppelte Anfuehrungszeichen auf. Normale Identifier bleiben unveraendert.
+    """
+    if text.startswith('#"'):
+        body = text[2:-1] if text.endswith('"') and len(text) > 2 else text[2:]
+        return body.replace('""', '"')
+    return text
+
+
+def iter_shared_members(text: str) -> Iterator[SharedMember]:
+    """
+    Liefert alle ``shared``-Member eines Section-Dokuments in Textreihenfolge.
+
+    Ein Member endet am ersten ``;`` ausserhalb von Strings und Kommentaren.
+    ``shared`` ist in M ein reserviertes Wort; fehlt das ``;``, endet das
+    laufende Member vor dem naechsten ``shared``, statt den Rest des
+    Dokuments zu verschlucken.
+    """
+    for match in _MEMBER_RE.finditer(text):
+        raw_name = match.group("name")
+        if raw_name is None:
+            continue  # Kommentar oder String auf Section-Ebene
+        yield SharedMember(
+            name=unquote_identifier(raw_name),
+            start=match.start(),
+            end=match.end(),
+            expression_start=match.start("expression"),
+            expression_end=match.end("expression"),
+            source=text,
+        )
@@ -8,6 +8,7 @@ Run:  python -m src.main
 
 from __future__ import annotations
 
+import multiprocessing
 import sys
 from pathlib import Path
 
@@ -18,7 +19,7 @@ if __name__ == "__main__" and __package__ is None:
 
 from .models import Project
 from .storage import save_project, load_project, project_exists, DEFAULT_PROJECT_FILE
-from .generator import generate_docs
+from .generator import update_docs
 from .prompts import (
     prompt_project_meta, prompt_kpi, prompt_data_source,
     prompt_power_query, prompt_data_model, prompt_measure,
@@ -125,6 +126,8 @@ def import_export_menu(project: Project) -> None:
 # ---------------------------------------------------------------------------
 
 def main() -> None:
+    # Frozen builds: Worker-Prozesse (BIM, ImportSession) starten diesen Einstiegspunkt neu
+    multiprocessing.freeze_support()
     print(BANNER)
     project = _load_or_new()
 
@@ -192,8 +195,10 @@ def main() -> None:
 
             elif choice == "11":
                 print("\n  ⏳ Generiere Dokumentation …")
-                out = generate_docs(project)
-                print(f"  ✅ Dokumentation generiert in: {out.resolve()}")
+                update = update_docs(project)
+                print(f"  ✅ Dokumentation generiert in: {update.root.resolve()}")
+                print(f"     {len(update.changed)} Datei(en) geaendert, "
+                      f"{len(update.unchanged)} unveraendert.")
                 print("     Öffne docs/index.md als Einstiegspunkt.")
 
             elif choice == "12":
@@ -0,0 +1,242 @@
+"""
+Merge-Engine – importierte Objekte per Schluessel in das Projekt uebernehmen.
+
+Jede Projekt-Liste (Measures, Tabellen, Beziehungen, ...) hat einen
+persistenten Hash-Index (``Project.key_index``), der ueber mehrere Importe
+hinweg bestehen bleibt. Ein Upsert kostet damit O(1), unabhaengig von der
+Projektgroesse.
+
+Merge-Modi:
+  - replace: Liste komplett ersetzen
+  - merge:   Nur fehlende Eintraege ergaenzen (bestehende behalten)
+  - update:  Fehlende ergaenzen, bestehende mit geaenderten Feldern aktualisieren
+  - append:  Alles hinzufuegen (Duplikate moeglich)
+
+Jeder Merge protokolliert in einem ``ChangeSet``, welche Eintraege neu,
+aktualisiert, unveraendert, entfernt oder uebersprungen sind. Daraus ergibt
+sich, welche Projektfelder gespeichert werden muessen; welche Doku-Abschnitte
+neu entstehen, entscheidet ``update_docs`` ueber seine Fingerprints.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, Hashable, List, Set, Tuple
+
+from .models import Project
+
+MERGE_MODES = ("replace", "merge", "update", "append")
+
+
+# ══════════════════════════════════════════════════════════════════
+# Schluessel je Sammlung
+# ══════════════════════════════════════════════════════════════════
+
+class _NameKey:
+    """Schluessel aus einem Namensattribut, ohne Gross-/Kleinschreibung."""
+
+    def __init__(self, attr: str):
+        self.attr = attr
+
+    def __call__(self, item: Any) -> str:
+        return (getattr(item, self.attr, "") or "").lower()
+
+
+def relationship_key(rel: Any) -> Tuple[str, str, str, str]:
+    return (rel.from_table, rel.from_column, rel.to_table, rel.to_column)
+
+
+def _label(key_func: Callable[[Any], Hashable], item: Any) -> str:
+    """Anzeigename fuer das Change-Set (Originalschreibweise)."""
+    if isinstance(key_func, _NameKey):
+        return getattr(item, key_func.attr, "") or ""
+    return f"{item.from_table}[{item.from_column}] -> {item.to_table}[{item.to_column}]"
+
+
+# Sammlung -> (Attributpfad im Projekt, Schluesselfunktion)
+COLLECTIONS: Dict[str, Tuple[Tuple[str, ...], Callable[[Any], Hashable]]] = {
+    "report_pages": (("report_pages",), _NameKey("page_name")),
+    "tables": (("data_model", "tables"), _NameKey("name")),
+    "relationships": (("data_model", "relationships"), relationship_key),
+    "measures": (("measures",), _NameKey("name")),
+    "kpis": (("kpis",), _NameKey("name")),
+    "queries": (("power_queries",), _NameKey("query_name")),
+    "data_sources": (("data_sources",), _NameKey("connection_info")),
+}
+
+
+# Einzelwert -> Projektfeld, in dem er steht
+SCALAR_OWNERS: Dict[str, str] = {
+    "report_name": "meta",
+    "rls_notes": "governance",
+    "date_logic_notes": "data_model",
+}
+
+
+def _owner(project: Project, path: Tuple[str, ...]) -> Any:
+    owner: Any = project
+    for attr in path[:-1]:
+        owner = getattr(owner, attr)
+    return owner
+
+
+# ══════════════════════════════════════════════════════════════════
+# Change-Set
+# ══════════════════════════════════════════════════════════════════
+
+@dataclass
+class ChangeSet:
+    """Ergebnis eines Imports je Sammlung: Schluessel nach Art der Aenderung."""
+    added: Dict[str, List[str]] = field(default_factory=dict)
+    updated: Dict[str, List[str]] = field(default_factory=dict)
+    unchanged: Dict[str, List[str]] = field(default_factory=dict)
+    removed: Dict[str, List[str]] = field(default_factory=dict)
+    skipped: Dict[str, List[str]] = field(default_factory=dict)
+
+    def record(self, kind: str, collection: str, label: str) -> None:
+        getattr(self, kind).setdefault(collection, []).append(label)
+
+    def count(self, kind: str, collection: str) -> int:
+        return len(getattr(self, kind).get(collection, []))
+
+    @property
+    def has_changes(self) -> bool:
+        return any(self.added.values()) or any(self.updated.values()) or any(self.removed.values())
+
+    def changed_collections(self) -> Set[str]:
+        return {
+            name
+            for kind in (self.added, self.updated, self.removed)
+            for name, keys in kind.items() if keys
+        }
+
+    def changed_project_fields(self) -> Set[str]:
+        """Geaenderte Projektfelder (``Project``-Attribute), z.B. fuer das Speichern."""
+        return {
+            COLLECTIONS[name][0][0] if name in COLLECTIONS else SCALAR_OWNERS[name]
+            for name in self.changed_collections()
+            if name in COLLECTIONS or name in SCALAR_OWNERS
+        }
+
+
+# ══════════════════════════════════════════════════════════════════
+# Vergleich und Feld-Update
+# ══════════════════════════════════════════════════════════════════
+
+_FIELD_CACHE: Dict[type, Tuple[str, ...]] = {}
+
+
+def _compared_fields(cls: type) -> Tuple[str, ...]:
+    names = _FIELD_CACHE.get(cls)
+    if names is None:
+        names = tuple(f.name for f in fields(cls) if f.name != "id")
+        _FIELD_CACHE[cls] = names
+    return names
+
+
+def _same(old: Any, new: Any) -> bool:
+    if type(old) is not type(new):
+        return False
+    return all(getattr(old, n) == getattr(new, n) for n in _compared_fields(type(old)))
+
+
+def update_fields(target: Any, source: Any, overwrite: bool = True) -> bool:
+    """
+    Uebernimmt geaenderte Felder von ``source`` nach ``target``.
+    Leere Werte im Import ueberschreiben keine gepflegten Inhalte;
+    die ``id`` des bestehenden Eintrags bleibt erhalten. Mit
+    ``overwrite=False`` werden nur leere Felder von ``target`` gefuellt.
+    """
+    changed = False
+    for name in _compared_fields(type(target)):
+        value = getattr(source, name, None)
+        if value in ("", None, [], {}):
+            continue
+        current = getattr(target, name)
+        if not overwrite and current not in ("", None, [], {}):
+            continue
+        if current != value:
+            setattr(target, name, value)
+            changed = True
+    return changed
+
+
+# ══════════════════════════════════════════════════════════════════
+# Merge
+# ══════════════════════════════════════════════════════════════════
+
+def merge_items(
+    project: Project,
+    collection: str,
+    new_items: List[Any],
+    mode: str,
+    changes: ChangeSet,
+    overwrite: bool = True,
+) -> int:
+    """
+    Merged ``new_items`` in die Projekt-Sammlung ``collection``.
+    Gibt die Anzahl uebersprungener (bereits vorhandener) Eintraege zurueck.
+    ``overwrite=False`` fuellt im Update-Modus nur leere Felder bestehender
+    Eintraege (abgeleitete Inhalte wie KPIs aus Measures).
+    """
+    if mode not in MERGE_MODES:
+        raise ValueError(f"Unbekannter Merge-Modus: {mode}")
+    path, key_func = COLLECTIONS[collection]
+    owner = _owner(project, path)
+    index = project.key_index(collection, key_func)
+    items: list = getattr(owner, path[-1])
+    index.sync(items)
+
+    if mode == "replace":
+        seen: Set[Hashable] = set()
+        for item in new_items:
+            key = key_func(item)
+            pos = index.get(key) if key else None
+            if pos is None:
+                changes.record("added", collection, _label(key_func, item))
+            elif _same(items[pos], item):
+                changes.record("unchanged", collection, _label(key_func, item))
+            else:
+                changes.record("updated", collection, _label(key_func, item))
+            seen.add(key)
+        for item in items:
+            key = key_func(item)
+            if key and key not in seen:
+                changes.record("removed", collection, _label(key_func, item))
+        setattr(owner, path[-1], list(new_items))
+        index.sync(getattr(owner, path[-1]))
+        return 0
+
+    skipped = 0
+    for item in new_items:
+        key = key_func(item)
+        pos = index.get(key) if key and mode != "append" else None
+        if pos is None:
+            index.append(item)
+            changes.record("added", collection, _label(key_func, item))
+        elif mode == "merge":
+            skipped += 1
+            changes.record("skipped", collection, _label(key_func, item))
+        elif update_fields(items[pos], item, overwrite):
+            changes.record("updated", collection, _label(key_func, item))
+        else:
+            changes.record("unchanged", collection, _label(key_func, item))
+    return skipped
+
+
+def merge_scalar(
+    owner: Any,
+    attr: str,
+    value: str,
+    mode: str,
+    changes: ChangeSet,
+) -> None:
+    """Einzelwert uebernehmen: replace/update immer, sonst nur wenn leer."""
+    if not value:
+        return
+    current = getattr(owner, attr)
+    if current == value:
+        changes.record("unchanged", attr, attr)
+    elif mode in ("replace", "update") or not current:
+        setattr(owner, attr, value)
+        changes.record("updated", attr, attr)
@@ -11,7 +11,7 @@ from __future__ import annotations
 import uuid
 from dataclasses import dataclass, field, asdict
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Callable, Dict, Hashable, List, Optional
 
 
 def _new_id() -> str:
@@ -137,6 +137,7 @@ class PowerQuery:
     major_transformations: str = ""
     m_code: str = ""
     output_table: str = ""
+    query_group: str = ""
     notes: str = ""
 
     @classmethod
@@ -344,6 +345,68 @@ class ChangeGuidance:
         return cls(**{k: v for k, v in d.items() if k in cls.__dataclass_fields__})
 
 
+# ── Key indexes ─────────────────────────────────────────────────
+
+class KeyIndex:
+    """
+    Hash index key -> position over one of the project's lists.
+
+    The index is kept up to date by whoever appends through it. It
+    rebuilds itself if the list object was replaced or its length changed
+    behind its back, and every hit is verified against the item at that
+    position, so a stale index never returns a wrong item. In-place
+    edits of a key (same list, same length) are not detected; whoever
+    edits items directly calls ``Project.invalidate_indexes(items)``.
+    """
+
+    def __init__(self, key_func: Callable[[object], Hashable]):
+        self.key_func = key_func
+        self._items: Optional[list] = None
+        self._length = -1
+        self._positions: Dict[Hashable, int] = {}
+
+    def sync(self, items: list) -> None:
+        if items is self._items and len(items) == self._length:
+            return
+        positions: Dict[Hashable, int] = {}
+        for pos, item in enumerate(items):
+            key = self.key_func(item)
+            if key:
+                positions.setdefault(key, pos)
+        self._items = items
+        self._length = len(items)
+        self._positions = positions
+
+    def covers(self, items: list) -> bool:
+        return items is self._items
+
+    def reset(self) -> None:
+        """Forget all positions; the next ``sync`` rebuilds them."""
+        self._items = None
+        self._length = -1
+        self._positions = {}
+
+    def get(self, key: Hashable) -> Optional[int]:
+        """Position of the first item with ``key`` (call ``sync`` first)."""
+        pos = self._positions.get(key)
+        if pos is None or self._items is None:
+            return None
+        if pos >= len(self._items) or self.key_func(self._items[pos]) != key:
+            items, self._items = self._items, None
+            self.sync(items)
+            return self._positions.get(key)
+        return pos
+
+    def append(self, item: object) -> None:
+        """Append ``item`` to the indexed list and record its key."""
+        assert self._items is not None, "sync() before append()"
+        key = self.key_func(item)
+        if key:
+            self._positions.setdefault(key, len(self._items))
+        self._items.append(item)
+        self._length = len(self._items)
+
+
 # ── Root project ────────────────────────────────────────────────
 
 @dataclass
@@ -367,6 +430,22 @@ class Project:
     def to_dict(self) -> dict:
         return asdict(self)
 
+    def key_index(self, collection: str, key_func: Callable[[object], Hashable]) -> KeyIndex:
+        """Persistent index for ``collection`` (not serialized, not a dataclass field)."""
+        indexes: Dict[str, KeyIndex] = self.__dict__.setdefault("_key_indexes", {})
+        if collection not in indexes:
+            indexes[collection] = KeyIndex(key_func)
+        return indexes[collection]
+
+    def invalidate_indexes(self, items: Optional[list] = None) -> None:
+        """
+        Reset key indexes after items were edited in place (e.g. renamed in
+        a form): only the index over ``items``, or all of them.
+        """
+        for index in self.__dict__.get("_key_indexes", {}).values():
+            if items is None or index.covers(items):
+                index.reset()
+
     @classmethod
     def from_dict(cls, d: dict) -> "Project":
         meta = ProjectMeta.from_dict(d.pop("meta", {}))
@@ -0,0 +1,243 @@
+"""
+Content-adressierter Cache fuer Parser-Ergebnisse.
+
+Der Import-Dialog ruft erst ``preview_import`` und dann ``import_file``
+auf – ohne Cache wird dieselbe Datei zweimal vollstaendig geparst, beim
+naechsten Oeffnen erneut. Dieser Cache legt ``PbixImportResult`` bzw.
+``BimImportResult`` serialisiert auf der Platte ab.
+
+Schluessel:
+  - .pbix/.pbit: CRC32 + Groesse aller ZIP-Member aus dem Central Directory
+    (kostenlos lesbar, ohne ein Member zu entpacken)
+  - .bim/.json:  SHA-256 des Dateiinhalts
+  - dazu Parser-Art, ``PARSER_VERSION`` des Parsers und die Parser-Optionen.
+    Eine neue Parser-Version macht alte Eintraege damit automatisch
+    unerreichbar; sie altern per LRU heraus.
+
+Eintraege werden mit ``pickle`` abgelegt – der Cache-Ordner gehoert dem
+Benutzer und wird nur von diesem Programm beschrieben. Schreiben erfolgt
+atomar (Temp-Datei + ``os.replace``), die Groesse ist begrenzt
+(LRU nach Zugriffszeit = mtime).
+
+Zusaetzlich merkt sich der Cache je Dateipfad den zuletzt abgelegten
+Eintrag. Aendert sich eine .pbix, wird sie mit diesem Eintrag als
+``previous`` inkrementell geparst (nur geaenderte ZIP-Member).
+
+Ablageort: ``$PBI_DOC_GEN_CACHE_DIR`` oder das Benutzer-Cache-Verzeichnis.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Any, List, Optional
+
+from . import bim_parser, pbix_parser
+from .bim_parser import BimImportResult
+from .instrumentation import StageStats, stage
+from .pbix_parser import PbixImportResult
+
+CACHE_DIR_ENV = "PBI_DOC_GEN_CACHE_DIR"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_SUFFIX = ".pkl"
+_LATEST_SUFFIX = ".latest"
+_HASH_CHUNK = 1 << 20
+
+
+def default_cache_dir() -> Path:
+    """``$PBI_DOC_GEN_CACHE_DIR`` oder ``<Benutzer-Cache>/pbi-doc-gen/parse-cache``."""
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override)
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+    root = Path(base) if base else Path.home() / ".cache"
+    return root / "pbi-doc-gen" / "parse-cache"
+
+
+# ══════════════════════════════════════════════════════════════════
+# Fingerprints
+# ══════════════════════════════════════════════════════════════════
+
+def zip_fingerprint(path: Path) -> str:
+    """Hash ueber Name, CRC32 und Groesse aller Member (nur Central Directory)."""
+    digest = hashlib.sha256()
+    with zipfile.ZipFile(str(path), "r") as zf:
+        fingerprints = pbix_parser.member_fingerprints(zf)
+    for name in sorted(fingerprints):
+        digest.update(f"{name}\0{fingerprints[name]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: Path) -> str:
+    """SHA-256 des Dateiinhalts."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ══════════════════════════════════════════════════════════════════
+# Cache
+# ══════════════════════════════════════════════════════════════════
+
+class ParseCache:
+    """Groessenbegrenzter On-Disk-Cache (LRU) fuer Parser-Ergebnisse."""
+
+    suffix = _SUFFIX
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(kind: str, version: str, content: str, options: Optional[dict] = None) -> str:
+        opts = ",".join(f"{k}={options[k]!r}" for k in sorted(options or {}))
+        raw = f"{kind}\0{version}\0{content}\0{opts}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Eintrag laden (und als zuletzt benutzt markieren) oder None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                value = pickle.load(fh)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Defekter/inkompatibler Eintrag -> verwerfen
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Eintrag atomar schreiben und danach auf ``max_bytes`` verkleinern."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as fh:
+                    pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, self._path(key))
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        except OSError:
+            return  # Cache ist optional – Fehler beim Schreiben ignorieren
+        self.evict()
+
+    def evict(self) -> None:
+        """Aelteste Eintraege loeschen, bis die Gesamtgroesse passt."""
+        entries = []
+        total = 0
+        for path in self.directory.glob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        entries.sort()
+        for _mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def _latest_path(self, kind: str, version: str, source: Path) -> Path:
+        raw = f"{kind}\0{version}\0{Path(source).resolve()}"
+        return self.directory / f"{hashlib.sha256(raw.encode('utf-8')).hexdigest()}{_LATEST_SUFFIX}"
+
+    def get_latest(self, kind: str, version: str, source: Path) -> Optional[Any]:
+        """Zuletzt fuer ``source`` abgelegter Eintrag (beliebiger Dateistand) oder None."""
+        try:
+            key = self._latest_path(kind, version, source).read_text(encoding="ascii").strip()
+        except OSError:
+            return None
+        return self.get(key) if key else None
+
+    def set_latest(self, kind: str, version: str, source: Path, key: str) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._latest_path(kind, version, source).write_text(key, encoding="ascii")
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        for pattern in (f"*{self.suffix}", f"*{_LATEST_SUFFIX}"):
+            for path in self.directory.glob(pattern):
+                path.unlink(missing_ok=True)
+
+
+# ══════════════════════════════════════════════════════════════════
+# Gecachte Parser-Aufrufe
+# ══════════════════════════════════════════════════════════════════
+
+def parse_pbix_cached(pbix_path: Path, cache: Optional[ParseCache] = None) -> PbixImportResult:
+    """
+    ``parse_pbix`` mit Cache; nicht lesbare Dateien werden direkt geparst.
+
+    Bei einem Fehltreffer dient der letzte Eintrag fuer denselben Pfad als
+    ``previous`` – nur geaenderte ZIP-Member werden neu geparst.
+    """
+    cache = cache or ParseCache()
+    try:
+        content = zip_fingerprint(pbix_path)
+    except (OSError, zipfile.BadZipFile):
+        return pbix_parser.parse_pbix(pbix_path)
+
+    key = cache.make_key("pbix", pbix_parser.PARSER_VERSION, content)
+    stages: List[StageStats] = []
+    with stage(stages, "cache.pbix"):
+        result = cache.get(key)
+    if isinstance(result, PbixImportResult):
+        result.stages = stages      # Messwerte des urspruenglichen Laufs gelten nicht
+        return result
+
+    previous = cache.get_latest("pbix", pbix_parser.PARSER_VERSION, pbix_path)
+    if not isinstance(previous, PbixImportResult):
+        previous = None
+    result = pbix_parser.parse_pbix(pbix_path, previous=previous)
+    cache.put(key, result)
+    cache.set_latest("pbix", pbix_parser.PARSER_VERSION, pbix_path, key)
+    return result
+
+
+def parse_bim_cached(
+    bim_path: Path,
+    cache: Optional[ParseCache] = None,
+    **options,
+) -> BimImportResult:
+    """
+    ``parse_bim`` mit Cache; die Parser-Optionen sind Teil des Schluessels
+    (ausser ``workers``, das Ergebnis haengt nicht davon ab).
+    """
+    cache = cache or ParseCache()
+    try:
+        content = file_fingerprint(bim_path)
+    except OSError:
+        return bim_parser.parse_bim(bim_path, **options)
+
+    key_options = {k: v for k, v in options.items() if k != "workers"}
+    key = cache.make_key("bim", bim_parser.PARSER_VERSION, content, key_options)
+    stages: List[StageStats] = []
+    with stage(stages, "cache.bim"):
+        result = cache.get(key)
+    if isinstance(result, BimImportResult):
+        result.stages = stages
+        return result
+
+    result = bim_parser.parse_bim(bim_path, **options)
+    cache.put(key, result)
+    return result
@@ -0,0 +1,318 @@
+"""
+PBIP/PBIR-Import – Power-BI-Projekte im Ordnerformat.
+
+Ein Power-BI-Projekt (.pbip) speichert den Bericht nicht als ZIP, sondern
+als Ordner:
+
+  Projekt.pbip                          (JSON, verweist auf den Report-Ordner)
+  Projekt.Report/
+    definition.pbir                     (JSON, verweist auf das Semantic Model)
+    definition/                         (PBIR: eine Datei je Seite und Visual)
+      report.json
+      pages/pages.json                  (pageOrder)
+      pages/<Seite>/page.json
+      pages/<Seite>/visuals/<Visual>/visual.json
+    report.json                         (PBIR-Legacy: Layout wie in der .pbix)
+  Projekt.SemanticModel/
+    model.bim                           (BIM; TMDL wird nicht unterstuetzt)
+
+Grosse Berichte bestehen aus tausenden kleinen visual.json-Dateien. Diese
+werden mit einem Thread-Pool gelesen und sofort ausgewertet; das JSON wird
+nicht aufbewahrt. Das Ergebnis merkt sich je Datei nur mtime und Groesse
+sowie den ausgewerteten Eintrag (Visual, Seitenname, Seitenreihenfolge);
+mit ``previous`` werden bei einem erneuten Import nur geaenderte Dateien
+neu gelesen. Nicht lesbare Dateien werden als Warnung gemeldet.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .models import ReportPage, Visual
+from .pbix_parser import LayoutReader, _build_page, _parse_visual_container
+
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+@dataclass
+class PbirImportResult:
+    """Strukturiertes Ergebnis des PBIR-Parsers."""
+    report_pages: List[ReportPage] = field(default_factory=list)
+    report_name: str = ""
+    report_dir: Optional[Path] = None
+    semantic_model: Optional[Path] = None   # model.bim, falls vorhanden
+    warnings: List[str] = field(default_factory=list)
+    # Relativer Pfad -> (mtime_ns, Groesse) bzw. ausgewerteter Eintrag,
+    # fuer inkrementelles Lesen
+    file_state: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    file_values: Dict[str, Any] = field(default_factory=dict)
+    files_read: int = 0
+
+
+# ══════════════════════════════════════════════════════════════════
+# Ordnerstruktur aufloesen
+# ══════════════════════════════════════════════════════════════════
+
+def _load_json(path: Path) -> Any:
+    return json.loads(path.read_text(encoding="utf-8-sig"))
+
+
+def is_pbir_folder(path: Path) -> bool:
+    """True fuer einen Report-Ordner (mit definition.pbir) bzw. die Datei selbst."""
+    if path.is_file():
+        return path.name.lower() == "definition.pbir"
+    return (path / "definition.pbir").is_file()
+
+
+def resolve_report_dir(path: Path, warnings: List[str]) -> Optional[Path]:
+    """Findet den Report-Ordner zu einer .pbip-Datei, definition.pbir oder einem Ordner."""
+    if path.is_file() and path.suffix.lower() == ".pbip":
+        try:
+            for artifact in _load_json(path).get("artifacts", []):
+                rel = (artifact.get("report") or {}).get("path")
+                if rel and (path.parent / rel).is_dir():
+                    return (path.parent / rel).resolve()
+        except (OSError, ValueError, AttributeError) as exc:
+            warnings.append(f"{path.name}: nicht lesbar: {exc}")
+        fallback = path.with_suffix(".Report")
+        return fallback if fallback.is_dir() else None
+
+    if path.is_file() and path.name.lower() == "definition.pbir":
+        return path.parent
+    if path.is_dir():
+        if (path / "definition.pbir").is_file():
+            return path
+        for child in sorted(path.glob("*.Report")):
+            if (child / "definition.pbir").is_file():
+                return child
+    return None
+
+
+def _resolve_semantic_model(report_dir: Path, warnings: List[str]) -> Optional[Path]:
+    model_dir: Optional[Path] = None
+    try:
+        definition = _load_json(report_dir / "definition.pbir")
+        rel = ((definition.get("datasetReference") or {}).get("byPath") or {}).get("path")
+        if rel:
+            model_dir = (report_dir / rel).resolve()
+    except (OSError, ValueError, AttributeError) as exc:
+        warnings.append(f"definition.pbir nicht lesbar: {exc}")
+
+    if model_dir is None:
+        candidate = report_dir.with_name(report_dir.name[:-len(".Report")] + ".SemanticModel") \
+            if report_dir.name.endswith(".Report") else None
+        model_dir = candidate if candidate and candidate.is_dir() else None
+    if model_dir is None:
+        return None
+
+    bim = model_dir / "model.bim"
+    if bim.is_file():
+        return bim
+    if (model_dir / "definition").is_dir():
+        warnings.append(
+            f"Semantic Model '{model_dir.name}' liegt im TMDL-Format vor – "
+            "Measures/Beziehungen nicht importiert (nur model.bim unterstuetzt)."
+        )
+    return None
+
+
+# ══════════════════════════════════════════════════════════════════
+# Dateien lesen (parallel, mit mtime-Abgleich)
+# ══════════════════════════════════════════════════════════════════
+
+class _FileReader:
+    """
+    Liest JSON-Dateien und wertet sie per ``convert`` aus; unveraenderte
+    Dateien liefern den ausgewerteten Eintrag aus ``previous``.
+    """
+
+    def __init__(self, root: Path, previous: Optional[PbirImportResult], result: PbirImportResult):
+        self._root = root
+        self._previous_state = previous.file_state if previous is not None else {}
+        self._previous_values = previous.file_values if previous is not None else {}
+        self._result = result
+
+    def _read(self, path: Path, convert: Callable[[Any], Any]) -> Tuple[str, Optional[Tuple[int, int]], Any, bool]:
+        rel = path.relative_to(self._root).as_posix()
+        try:
+            stat = path.stat()
+            state = (stat.st_mtime_ns, stat.st_size)
+            if self._previous_state.get(rel) == state and rel in self._previous_values:
+                return rel, state, self._previous_values[rel], False
+            return rel, state, convert(_load_json(path)), True
+        except (OSError, ValueError) as exc:
+            return rel, None, exc, True
+
+    def read_all(self, paths: List[Path], convert: Callable[[Any], Any]) -> List[Any]:
+        """Liest ``paths`` parallel; Ergebnis in derselben Reihenfolge."""
+        if len(paths) > 1:
+            with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(paths))) as pool:
+                entries = list(pool.map(lambda p: self._read(p, convert), paths))
+        else:
+            entries = [self._read(p, convert) for p in paths]
+
+        values: List[Any] = []
+        for rel, state, value, fresh in entries:
+            self._result.files_read += fresh
+            if state is None:
+                self._result.warnings.append(f"{rel}: nicht lesbar: {value}")
+                value = None
+            else:
+                self._result.file_state[rel] = state
+                self._result.file_values[rel] = value
+            values.append(value)
+        return values
+
+
+# ══════════════════════════════════════════════════════════════════
+# PBIR-Visual -> Visual
+# ══════════════════════════════════════════════════════════════════
+
+def _single_visual(visual_json: dict) -> dict:
+    """
+    Uebersetzt ein PBIR-visual.json in die ``singleVisual``-Struktur des
+    Layouts, damit ``_parse_visual_container`` beide Formate auswertet.
+    """
+    visual = visual_json.get("visual") or {}
+    query_state = (visual.get("query") or {}).get("queryState") or {}
+    projections = {
+        role: [
+            {"queryRef": p.get("queryRef") or p.get("nativeQueryRef", "")}
+            for p in (state or {}).get("projections", [])
+        ]
+        for role, state in query_state.items()
+    }
+    container = visual.get("visualContainerObjects") or {}
+    objects = visual.get("objects") or {}
+    title = container.get("title") or objects.get("title")
+    return {
+        "singleVisual": {
+            "visualType": visual.get("visualType", "unknown"),
+            "projections": projections,
+            "objects": {"title": title} if title else {},
+        }
+    }
+
+
+def _visual_entry(visual_json: Any) -> Tuple[List[Visual], List[str], str]:
+    """
+    visual.json -> (Visuals, Slicer, Fehlertext). Visual-Gruppen
+    (``visualGroup`` statt ``visual``) sind nur Container ihrer Kinder, die
+    eigene visual.json-Dateien haben, und werden uebersprungen.
+    """
+    visuals: List[Visual] = []
+    slicers: List[str] = []
+    if not isinstance(visual_json, dict) or "visual" not in visual_json:
+        return visuals, slicers, ""
+    try:
+        _parse_visual_container({"config": _single_visual(visual_json)}, visuals, slicers)
+    except Exception as exc:
+        return [], [], str(exc)
+    return visuals, slicers, ""
+
+
+def _page_name(page_json: Any) -> str:
+    if not isinstance(page_json, dict):
+        return ""
+    return page_json.get("displayName") or page_json.get("name") or ""
+
+
+def _page_order_entry(meta: Any) -> List[str]:
+    order = meta.get("pageOrder") if isinstance(meta, dict) else None
+    return [str(n) for n in order] if isinstance(order, list) else []
+
+
+def _page_order(pages_dir: Path, reader: _FileReader) -> List[str]:
+    names = sorted(p.name for p in pages_dir.iterdir() if p.is_dir())
+    meta_file = pages_dir / "pages.json"
+    if meta_file.is_file():
+        order = reader.read_all([meta_file], _page_order_entry)[0] or []
+        order = [n for n in order if n in names]
+        return order + [n for n in names if n not in order]
+    return names
+
+
+def _parse_definition(report_dir: Path, reader: _FileReader, result: PbirImportResult) -> None:
+    pages_dir = report_dir / "definition" / "pages"
+    if not pages_dir.is_dir():
+        result.warnings.append("PBIR: definition/pages nicht gefunden.")
+        return
+
+    page_names = _page_order(pages_dir, reader)
+    page_files = [pages_dir / name / "page.json" for name in page_names]
+    visual_files = [
+        sorted((pages_dir / name / "visuals").glob("*/visual.json"))
+        for name in page_names
+    ]
+
+    # Alle Dateien je Art in einem Durchgang durch den Pool
+    existing_pages = [p for p in page_files if p.is_file()]
+    flat_visuals = [v for files in visual_files for v in files]
+    names = dict(zip(existing_pages, reader.read_all(existing_pages, _page_name)))
+    entries = dict(zip(flat_visuals, reader.read_all(flat_visuals, _visual_entry)))
+
+    for name, page_file, files in zip(page_names, page_files, visual_files):
+        display_name = names.get(page_file) or name
+        visuals: List[Visual] = []
+        slicers: List[str] = []
+        for path in files:
+            entry = entries.get(path)
+            if entry is None:
+                continue
+            page_visuals, page_slicers, error = entry
+            if error:
+                result.warnings.append(f"Visual auf Seite '{display_name}' uebersprungen: {error}")
+            # Kopien: Eintraege werden von Folge-Importen wiederverwendet
+            visuals.extend(copy.copy(v) for v in page_visuals)
+            slicers.extend(page_slicers)
+        result.report_pages.append(_build_page(display_name, visuals, slicers))
+
+
+def _parse_legacy_report(report_dir: Path, result: PbirImportResult) -> None:
+    """PBIR-Legacy: report.json hat das Layout-Format der .pbix."""
+    with open(report_dir / "report.json", "rb") as fp:
+        reader = LayoutReader(fp, result.warnings)
+        result.report_pages.extend(reader.pages())
+    if reader.report_name:
+        result.report_name = reader.report_name
+
+
+# ══════════════════════════════════════════════════════════════════
+# Hauptfunktion
+# ══════════════════════════════════════════════════════════════════
+
+def parse_pbir(path: Path, previous: Optional[PbirImportResult] = None) -> PbirImportResult:
+    """
+    Parst ein Power-BI-Projekt (.pbip, definition.pbir oder Report-Ordner).
+
+    Mit ``previous`` (frueheres Ergebnis desselben Projekts) werden nur
+    Dateien neu gelesen, deren mtime oder Groesse sich geaendert hat.
+    """
+    result = PbirImportResult()
+    report_dir = resolve_report_dir(path, result.warnings)
+    if report_dir is None:
+        result.warnings.append(f"Kein PBIR-Report-Ordner gefunden: {path}")
+        return result
+
+    result.report_dir = report_dir
+    name = report_dir.name
+    result.report_name = name[:-len(".Report")] if name.endswith(".Report") else name
+
+    try:
+        if (report_dir / "definition").is_dir():
+            _parse_definition(report_dir, _FileReader(report_dir, previous, result), result)
+        elif (report_dir / "report.json").is_file():
+            _parse_legacy_report(report_dir, result)
+        else:
+            result.warnings.append("PBIR: weder definition/ noch report.json gefunden.")
+    except Exception as exc:
+        result.warnings.append(f"PBIR Lesefehler: {exc}")
+
+    result.semantic_model = _resolve_semantic_model(report_dir, result.warnings)
+    return result
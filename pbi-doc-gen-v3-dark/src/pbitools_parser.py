@@ -10,6 +10,10 @@ kann eine .pbix-Datei vollstaendig extrahiert werden, inklusive:
 pbi-tools ist NICHT erforderlich. Wenn nicht verfuegbar, wird der
 reine PBIX-Parser verwendet (eingeschraenkt: keine Measures/Relationships).
 
+Extraktionen werden optional in einem ``ExtractionCache`` abgelegt
+(database.json je ZIP-Fingerprint der .pbix); ein erneuter Import einer
+unveraenderten Datei startet pbi-tools dann gar nicht mehr.
+
 Download: https://pbi.tools
 """
 
@@ -21,9 +25,11 @@ import shutil
 import subprocess
 import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 from .bim_parser import BimImportResult, parse_bim
+from .instrumentation import StageStats, stage
+from .parse_cache import ParseCache, default_cache_dir, zip_fingerprint
 from .pbix_parser import PbixImportResult, parse_pbix, _parse_layout
 from .models import ReportPage
 
@@ -163,6 +169,7 @@ def parse_pbitools_output(extracted_dir: Path) -> BimImportResult:
         result.report_name = bim_result.report_name
         result.date_logic_notes = bim_result.date_logic_notes
         result.warnings.extend(bim_result.warnings)
+        result.stages.extend(bim_result.stages)
     else:
         result.warnings.append(
             f"Model/database.json nicht gefunden in: {extracted_dir}. "
@@ -172,17 +179,113 @@ def parse_pbitools_output(extracted_dir: Path) -> BimImportResult:
     return result
 
 
-def parse_pbix_with_pbitools(pbix_path: Path) -> BimImportResult:
+# ══════════════════════════════════════════════════════════════════
+# Extraktions-Cache
+# ══════════════════════════════════════════════════════════════════
+
+class ExtractionCache(ParseCache):
+    """
+    Ablage der extrahierten ``Model/database.json`` je .pbix-Inhalt.
+
+    Schluessel ist der ``zip_fingerprint`` der .pbix (Name, CRC32 und
+    Groesse aller Member aus dem Central Directory, wie beim Parse-Cache) –
+    die Datei wird dafuer nicht gelesen. Groessenbegrenzung und LRU wie
+    beim Parse-Cache. Der Fingerprint wird je (Pfad, Groesse, mtime) nur
+    einmal berechnet; ``shared`` liefert dafuer eine Instanz je Verzeichnis.
+    """
+
+    suffix = ".json"
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: int = 1024 * 1024 * 1024):
+        super().__init__(directory or default_cache_dir() / "pbitools", max_bytes)
+        self._keys: Dict[Tuple[str, int, int], str] = {}
+
+    @classmethod
+    def shared(cls) -> "ExtractionCache":
+        """Prozessweite Instanz fuer das Standardverzeichnis (behaelt ``key_for``-Memo)."""
+        directory = default_cache_dir() / "pbitools"
+        cache = _SHARED_CACHES.get(directory)
+        if cache is None:
+            cache = _SHARED_CACHES[directory] = cls(directory)
+        return cache
+
+    def key_for(self, pbix_path: Path) -> str:
+        stat = pbix_path.stat()
+        ident = (str(pbix_path.resolve()), stat.st_size, stat.st_mtime_ns)
+        if ident not in self._keys:
+            self._keys[ident] = zip_fingerprint(pbix_path)
+        return self._keys[ident]
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """Pfad der gecachten database.json (als zuletzt benutzt markiert) oder None."""
+        path = self._path(key)
+        if not path.is_file():
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def store(self, key: str, model_file: Path) -> Optional[Path]:
+        """Kopiert ``model_file`` atomar in den Cache."""
+        if not model_file.is_file():
+            return None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            os.close(fd)
+            try:
+                shutil.copyfile(model_file, tmp)
+                os.replace(tmp, self._path(key))
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        except OSError:
+            return None
+        self.evict()
+        return self.lookup(key)
+
+
+_SHARED_CACHES: Dict[Path, ExtractionCache] = {}
+
+
+def parse_pbix_with_pbitools(
+    pbix_path: Path,
+    cache: Optional[ExtractionCache] = None,
+) -> BimImportResult:
     """
     Kombinierte Funktion: Extrahiert .pbix mit pbi-tools und parst alles.
 
+    Mit ``cache`` wird pbi-tools nur aufgerufen, wenn fuer den Inhalt der
+    .pbix noch keine database.json abgelegt ist.
+
     Raises:
         FileNotFoundError: pbi-tools nicht gefunden
         RuntimeError: Extraktion fehlgeschlagen
     """
-    output_dir = extract_with_pbitools(pbix_path)
+    key = ""
+    if cache is not None:
+        key = cache.key_for(pbix_path)
+        model_file = cache.lookup(key)
+        if model_file is not None:
+            return parse_bim(model_file)
+
+    stages: List[StageStats] = []
+    with stage(stages, "pbitools.extract") as st:
+        output_dir = extract_with_pbitools(pbix_path)
+        database = output_dir / "Model" / "database.json"
+        st.bytes_read = database.stat().st_size if database.exists() else 0
     try:
-        return parse_pbitools_output(output_dir)
+        result: Optional[BimImportResult] = None
+        if cache is not None:
+            model_file = cache.store(key, database)
+            if model_file is not None:
+                result = parse_bim(model_file)
+        if result is None:
+            result = parse_pbitools_output(output_dir)
+        result.stages[:0] = stages
+        return result
     finally:
         # Temp-Verzeichnis aufraeumen
         try:
@@ -3,28 +3,37 @@ PBIX-Direkt-Import – pure Python, keine externen Tools.
 
 Eine .pbix-Datei ist ein ZIP-Archiv mit folgender Struktur:
   - Report/Layout          (JSON – Seiten, Visuals, Slicer)
-  - DataMashup             (ZIP-in-ZIP, OPC Package mit M-Code)
+  - DataMashup             (MS-QDEFF: OPC Package mit M-Code + Abfrage-Metadaten)
   - DataModelSchema        (JSON – optionales Tabellenschema, neuere Versionen)
+  - DataModel              (XPress9-komprimiertes VertiPaq-Backup, siehe datamodel_reader)
   - [Content_Types].xml    (OPC-Manifest, ignoriert)
 
-Hinweis: DAX-Measures und Relationships koennen aus .pbix NICHT ohne
-externes Tool (pbi-tools / Tabular Editor) extrahiert werden.
+Hinweis: DAX-Measures und Relationships stehen nur im DataModel. Dieser
+Parser liest es nicht; dafuer gibt es ``datamodel_reader`` (optional
+pbixray) bzw. pbi-tools.
 """
 
 from __future__ import annotations
 
-import io
 import json
 import re
 import zipfile
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Callable, Match
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Callable, Match
 
+from .datamashup import MemoryViewReader, QueryMetadata, read_datamashup
+from .instrumentation import StageStats, stage
+from .json_stream import JsonStream
+from .m_lexer import iter_shared_members
+from .source_scanner import SourceScanner
 from .models import (
     ReportPage, Visual, PowerQuery, DataSource, ModelTable, _new_id,
 )
 
+# Bei jeder Aenderung am Parse-Ergebnis erhoehen (invalidiert den Parse-Cache)
+PARSER_VERSION = "3.2"
+
 # ══════════════════════════════════════════════════════════════════
 # Visual-Type-Mapping
 # ══════════════════════════════════════════════════════════════════
@@ -144,6 +153,18 @@ SOURCE_PATTERNS = _make_source_patterns()
 # On-Premises-Quellen, die typischerweise ein Gateway erfordern
 _ONPREM_TYPES = {"SQL", "SAP HANA", "Oracle", "ODBC", "SSAS"}
 
+# Gemeinsamer Scanner fuer pbix_parser und bim_parser
+SOURCE_SCANNER = SourceScanner(SOURCE_PATTERNS, onprem_types=_ONPREM_TYPES)
+
+
+def register_source_pattern(
+    pattern: re.Pattern,
+    factory: Callable[[Match], DataSource],
+    prefix: Optional[str] = None,
+) -> None:
+    """Registriert einen zusaetzlichen Konnektor fuer die Quellerkennung."""
+    SOURCE_SCANNER.register(pattern, factory, prefix=prefix)
+
 
 # ══════════════════════════════════════════════════════════════════
 # Import-Ergebnis
@@ -158,25 +179,36 @@ class PbixImportResult:
     tables: List[ModelTable] = field(default_factory=list)
     report_name: str = ""
     warnings: List[str] = field(default_factory=list)
+    # Abfragename -> Metadaten aus dem DataMashup (Lade-Flags, Gruppen)
+    query_metadata: Dict[str, QueryMetadata] = field(default_factory=dict)
+    # Fuer inkrementelles Neu-Parsen: ZIP-Member -> "crc32:groesse",
+    # Warnungen je Teil ("layout", "mashup", "schema") und neu geparste Teile
+    member_fingerprints: Dict[str, str] = field(default_factory=dict)
+    part_warnings: Dict[str, List[str]] = field(default_factory=dict)
+    reparsed_parts: Set[str] = field(default_factory=set)
+    # Messwerte je neu geparstem Teil ("pbix.layout", ...)
+    stages: List[StageStats] = field(default_factory=list)
 
 
 # ══════════════════════════════════════════════════════════════════
 # Report/Layout parsen
 # ══════════════════════════════════════════════════════════════════
 
-def _parse_layout(layout_json: dict, warnings: List[str]) -> tuple[List[ReportPage], str]:
-    """Parst die Seitenstruktur aus dem Report/Layout JSON."""
-    pages: List[ReportPage] = []
-    report_name = ""
-
-    # Reportname aus Metadaten
+def _report_name_from_config(config) -> str:
+    """Reportname aus dem (als String serialisierten) Layout-config lesen."""
     try:
-        config = layout_json.get("config", "")
         if isinstance(config, str) and config:
             cfg = json.loads(config)
-            report_name = cfg.get("name", "") or cfg.get("displayName", "")
+            return cfg.get("name", "") or cfg.get("displayName", "")
     except Exception:
         pass
+    return ""
+
+
+def _parse_layout(layout_json: dict, warnings: List[str]) -> tuple[List[ReportPage], str]:
+    """Parst die Seitenstruktur aus dem Report/Layout JSON."""
+    pages: List[ReportPage] = []
+    report_name = _report_name_from_config(layout_json.get("config", ""))
 
     sections = layout_json.get("sections", [])
     if not sections:
@@ -184,16 +216,94 @@ def _parse_layout(layout_json: dict, warnings: List[str]) -> tuple[List[ReportPa
         return pages, report_name
 
     for section in sections:
-        try:
-            page = _parse_section(section, warnings)
+        page = _parse_section_safe(section, warnings)
+        if page:
             pages.append(page)
-        except Exception as exc:
-            sec_name = section.get("displayName", section.get("name", "?"))
-            warnings.append(f"Seite '{sec_name}' konnte nicht verarbeitet werden: {exc}")
 
     return pages, report_name
 
 
+def _parse_section_safe(section: dict, warnings: List[str]) -> Optional[ReportPage]:
+    """Wie _parse_section, Fehler werden als Warnung erfasst."""
+    try:
+        return _parse_section(section, warnings)
+    except Exception as exc:
+        sec_name = section.get("displayName", section.get("name", "?"))
+        warnings.append(f"Seite '{sec_name}' konnte nicht verarbeitet werden: {exc}")
+        return None
+
+
+class LayoutReader:
+    """
+    Inkrementeller Leser fuer Report/Layout.
+
+    Liest das Layout direkt aus dem ZIP-Member-Stream. ``pages`` betritt
+    jede Section und deren ``visualContainers``-Array ueber den
+    Pull-Parser und dekodiert jeweils nur einen Visual-Container; der
+    Speicherbedarf waechst damit mit dem groessten Visual, nicht mit der
+    Seite oder dem gesamten Bericht. Das Encoding (UTF-16-LE/UTF-8, mit
+    oder ohne BOM) wird einmalig aus den ersten Bytes bestimmt.
+
+    ``report_name`` ist erst nach vollstaendiger Iteration zuverlaessig
+    befuellt, da ``config`` im Layout nach ``sections`` stehen kann.
+    """
+
+    def __init__(self, fp: BinaryIO, warnings: List[str], chunk_size: int = 1 << 16):
+        self._stream = JsonStream(fp, chunk_size=chunk_size)
+        self._warnings = warnings
+        self.report_name = ""
+        self.section_count = 0
+
+    @property
+    def bytes_read(self) -> int:
+        return self._stream.bytes_read
+
+    def _read_page(self) -> Optional[ReportPage]:
+        stream = self._stream
+        if stream.peek() != "{":
+            stream.skip_value()
+            return None
+
+        meta: dict = {}
+        visuals: List[Visual] = []
+        slicers: List[str] = []
+        errors: List[Exception] = []
+        for key in stream.iter_object():
+            if key == "visualContainers" and stream.peek() == "[":
+                for vc in stream.iter_array_values():
+                    try:
+                        _parse_visual_container(vc, visuals, slicers)
+                    except Exception as exc:
+                        errors.append(exc)
+            elif key in ("name", "displayName"):
+                meta[key] = stream.read_value()
+            else:
+                stream.skip_value()
+
+        self.section_count += 1
+        # displayName kann im JSON nach visualContainers stehen -> Warnungen erst hier
+        display_name = meta.get("displayName", meta.get("name", "Unbenannt"))
+        for exc in errors:
+            self._warnings.append(f"Visual auf Seite '{display_name}' uebersprungen: {exc}")
+        return _build_page(display_name, visuals, slicers)
+
+    def pages(self) -> Iterator[ReportPage]:
+        """Liefert die Berichtsseiten, waehrend das Layout gelesen wird."""
+        stream = self._stream
+        for key in stream.iter_object():
+            if key == "sections":
+                for _ in stream.iter_array():
+                    page = self._read_page()
+                    if page is not None:
+                        yield page
+            elif key == "config":
+                self.report_name = _report_name_from_config(stream.read_value())
+            else:
+                stream.skip_value()
+        if not self.section_count:
+            self._warnings.append("Report/Layout enthaelt keine Seiten (sections).")
+
+
 def _parse_section(section: dict, warnings: List[str]) -> ReportPage:
     """Einzelne Berichtsseite parsen."""
     display_name = section.get("displayName", section.get("name", "Unbenannt"))
@@ -203,57 +313,14 @@ def _parse_section(section: dict, warnings: List[str]) -> ReportPage:
     containers = section.get("visualContainers", [])
     for vc in containers:
         try:
-            config_str = vc.get("config", "")
-            if not config_str:
-                continue
-            if isinstance(config_str, str):
-                config = json.loads(config_str)
-            else:
-                config = config_str
-
-            sv = config.get("singleVisual", {})
-            if not sv:
-                continue
-
-            visual_type_raw = sv.get("visualType", "unknown")
-            visual_type_label = _visual_type_label(visual_type_raw)
-
-            # Felder extrahieren
-            projections = sv.get("projections", {})
-            field_refs = _extract_field_refs(projections)
-            field_str = ", ".join(field_refs) if field_refs else ""
-
-            # Name zusammenbauen
-            title = ""
-            obj = sv.get("objects", {})
-            if obj:
-                title_props = obj.get("title", [{}])
-                if isinstance(title_props, list) and title_props:
-                    props = title_props[0].get("properties", {})
-                    text_prop = props.get("text", {})
-                    if isinstance(text_prop, dict):
-                        title = text_prop.get("expr", {}).get("Literal", {}).get("Value", "")
-                        if title.startswith("'") and title.endswith("'"):
-                            title = title[1:-1]
-
-            visual_name = title or visual_type_label
-            desc_parts = [f"Typ: {visual_type_label}"]
-            if field_str:
-                desc_parts.append(f"Felder: {field_str}")
-
-            if visual_type_raw == "slicer":
-                slicer_desc = f"{visual_name}"
-                if field_str:
-                    slicer_desc += f" ({field_str})"
-                slicers.append(slicer_desc)
-            else:
-                visuals.append(Visual(
-                    name=visual_name,
-                    description=" | ".join(desc_parts),
-                ))
+            _parse_visual_container(vc, visuals, slicers)
         except Exception as exc:
             warnings.append(f"Visual auf Seite '{display_name}' uebersprungen: {exc}")
 
+    return _build_page(display_name, visuals, slicers)
+
+
+def _build_page(display_name: str, visuals: List[Visual], slicers: List[str]) -> ReportPage:
     slicer_text = "; ".join(slicers) if slicers else ""
 
     return ReportPage(
@@ -263,6 +330,58 @@ def _parse_section(section: dict, warnings: List[str]) -> ReportPage:
     )
 
 
+def _parse_visual_container(vc: dict, visuals: List[Visual], slicers: List[str]) -> None:
+    """Einzelnen visualContainer auswerten; Ergebnis landet in visuals bzw. slicers."""
+    config_str = vc.get("config", "")
+    if not config_str:
+        return
+    if isinstance(config_str, str):
+        config = json.loads(config_str)
+    else:
+        config = config_str
+
+    sv = config.get("singleVisual", {})
+    if not sv:
+        return
+
+    visual_type_raw = sv.get("visualType", "unknown")
+    visual_type_label = _visual_type_label(visual_type_raw)
+
+    # Felder extrahieren
+    projections = sv.get("projections", {})
+    field_refs = _extract_field_refs(projections)
+    field_str = ", ".join(field_refs) if field_refs else ""
+
+    # Name zusammenbauen
+    title = ""
+    obj = sv.get("objects", {})
+    if obj:
+        title_props = obj.get("title", [{}])
+        if isinstance(title_props, list) and title_props:
+            props = title_props[0].get("properties", {})
+            text_prop = props.get("text", {})
+            if isinstance(text_prop, dict):
+                title = text_prop.get("expr", {}).get("Literal", {}).get("Value", "")
+                if title.startswith("'") and title.endswith("'"):
+                    title = title[1:-1]
+
+    visual_name = title or visual_type_label
+    desc_parts = [f"Typ: {visual_type_label}"]
+    if field_str:
+        desc_parts.append(f"Felder: {field_str}")
+
+    if visual_type_raw == "slicer":
+        slicer_desc = f"{visual_name}"
+        if field_str:
+            slicer_desc += f" ({field_str})"
+        slicers.append(slicer_desc)
+    else:
+        visuals.append(Visual(
+            name=visual_name,
+            description=" | ".join(desc_parts),
+        ))
+
+
 def _extract_field_refs(projections: dict) -> List[str]:
     """Feldnamen aus projections-Objekt extrahieren."""
     refs: List[str] = []
@@ -282,37 +401,51 @@ def _extract_field_refs(projections: dict) -> List[str]:
 # DataMashup parsen (ZIP-in-ZIP mit M-Code)
 # ══════════════════════════════════════════════════════════════════
 
-def _parse_datamashup(raw: bytes, warnings: List[str]) -> tuple[List[PowerQuery], List[DataSource]]:
+def _parse_datamashup(
+    raw: bytes,
+    warnings: List[str],
+) -> tuple[List[PowerQuery], List[DataSource], Dict[str, QueryMetadata]]:
     """
-    DataMashup ist ein OPC-Package (ZIP).
-    Darin: Formulas/Section1.m  enthaelt alle Power Query Abfragen.
+    DataMashup ist ein MS-QDEFF-Container; dessen Package Parts sind ein
+    OPC-Package (ZIP). Darin: Formulas/Section1.m  enthaelt alle Power Query
+    Abfragen. Der Metadaten-Abschnitt liefert Lade-Flags und Abfragegruppen.
     """
     queries: List[PowerQuery] = []
     sources: List[DataSource] = []
 
-    # DataMashup beginnt mit einem 4-byte oder 8-byte Header, danach kommt das ZIP.
-    # Wir suchen die ZIP-Signatur.
-    zip_start = raw.find(b"PK\x03\x04")
-    if zip_start < 0:
+    mashup = read_datamashup(raw, warnings)
+    if mashup.package_parts is None:
         warnings.append("DataMashup: Kein ZIP-Archiv gefunden.")
-        return queries, sources
+        return queries, sources, {}
 
-    mashup_bytes = raw[zip_start:]
     try:
-        with zipfile.ZipFile(io.BytesIO(mashup_bytes)) as inner_zip:
+        with zipfile.ZipFile(MemoryViewReader(mashup.package_parts)) as inner_zip:
             m_code = _read_section1_m(inner_zip, warnings)
     except zipfile.BadZipFile:
         warnings.append("DataMashup: ZIP konnte nicht gelesen werden.")
-        return queries, sources
+        return queries, sources, mashup.queries
 
     if not m_code:
         warnings.append("DataMashup: Kein M-Code (Section1.m) gefunden.")
-        return queries, sources
+        return queries, sources, mashup.queries
 
     queries = _split_m_queries(m_code)
     sources = _detect_sources(m_code)
+    _apply_query_metadata(queries, mashup.queries)
+
+    return queries, sources, mashup.queries
 
-    return queries, sources
+
+def _apply_query_metadata(queries: List[PowerQuery], metadata: Dict[str, QueryMetadata]) -> None:
+    """Abfragegruppe und deaktiviertes Laden an die Queries uebertragen."""
+    for query in queries:
+        meta = metadata.get(query.query_name)
+        if meta is None:
+            continue
+        query.query_group = meta.query_group
+        if meta.load_enabled is False:
+            note = "Laden deaktiviert (nur Zwischenabfrage)"
+            query.notes = f"{query.notes}; {note}" if query.notes else note
 
 
 def _read_section1_m(zf: zipfile.ZipFile, warnings: List[str]) -> str:
@@ -346,25 +479,21 @@ def _read_section1_m(zf: zipfile.ZipFile, warnings: List[str]) -> str:
 
 
 def _split_m_queries(m_code: str) -> List[PowerQuery]:
-    """Trennt shared-Statements in einzelne Queries auf."""
-    queries: List[PowerQuery] = []
+    """
+    Trennt shared-Statements in einzelne Queries auf.
 
-    # Pattern: shared QueryName = ... ;
-    # Erlaubt mehrzeiliges Matching bis zum naechsten ; auf Top-Level
-    pattern = re.compile(
-        r'shared\s+#?"?([^"=\s]+)"?\s*=\s*(.*?);',
-        re.DOTALL,
-    )
-    matches = list(pattern.finditer(m_code))
+    Die Member-Grenzen liefert der M-Lexer, damit Semikolons in Strings,
+    Kommentaren und ``#"..."``-Identifiern nicht als Trenner gelten.
+    """
+    queries: List[PowerQuery] = []
+    members = list(iter_shared_members(m_code))
 
-    if matches:
-        for match in matches:
-            name = match.group(1).strip().strip('"')
-            code = match.group(2).strip()
+    if members:
+        for member in members:
             queries.append(PowerQuery(
-                query_name=name,
-                m_code=code,
-                output_table=name,
+                query_name=member.name,
+                m_code=member.expression,
+                output_table=member.name,
             ))
     else:
         # Fallback: ganzen Code als eine Query
@@ -384,21 +513,7 @@ def _split_m_queries(m_code: str) -> List[PowerQuery]:
 
 def _detect_sources(m_code: str) -> List[DataSource]:
     """Erkennt Datenquellen aus dem M-Code anhand bekannter Muster."""
-    sources: List[DataSource] = []
-    seen: set[str] = set()  # Duplikaterkennung ueber connection_info
-
-    for pattern, factory in SOURCE_PATTERNS:
-        for match in pattern.finditer(m_code):
-            ds = factory(match)
-            key = f"{ds.source_type}::{ds.connection_info}"
-            if key not in seen:
-                seen.add(key)
-                # Gateway-Erkennung
-                if ds.source_type in _ONPREM_TYPES:
-                    ds.gateway_required = True
-                sources.append(ds)
-
-    return sources
+    return SOURCE_SCANNER.scan(m_code)
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -450,12 +565,100 @@ def _parse_data_model_schema(raw: bytes, warnings: List[str]) -> List[ModelTable
 # Hauptfunktion
 # ══════════════════════════════════════════════════════════════════
 
-def parse_pbix(pbix_path: Path) -> PbixImportResult:
+# ZIP-Member je Teilergebnis (verschiedene PBI-Versionen)
+PART_MEMBERS: Dict[str, tuple[str, ...]] = {
+    "layout": ("Report/Layout", "Report\\Layout"),
+    "mashup": ("DataMashup", "DataMashup/DataMashup"),
+    "schema": ("DataModelSchema", "DataModelSchema/DataModelSchema"),
+}
+
+
+def member_fingerprints(zf: zipfile.ZipFile) -> Dict[str, str]:
+    """Member -> ``"<crc32>:<groesse>"`` aus dem Central Directory (ohne Entpacken)."""
+    return {info.filename: f"{info.CRC:08x}:{info.file_size}" for info in zf.infolist()}
+
+
+def changed_parts(previous: PbixImportResult, current: PbixImportResult) -> Set[str]:
+    """Teile ("layout", "mashup", "schema"), deren ZIP-Member sich geaendert haben."""
+    changed: Set[str] = set()
+    for part, candidates in PART_MEMBERS.items():
+        before = [previous.member_fingerprints.get(c) for c in candidates]
+        after = [current.member_fingerprints.get(c) for c in candidates]
+        if before != after or part not in previous.part_warnings:
+            changed.add(part)
+    return changed
+
+
+def _find_member(names: List[str], part: str) -> Optional[str]:
+    for candidate in PART_MEMBERS[part]:
+        if candidate in names:
+            return candidate
+    return None
+
+
+def _member_size(zf: zipfile.ZipFile, member: Optional[str]) -> int:
+    """Unkomprimierte Groesse laut Central Directory (0 ohne Member)."""
+    return zf.getinfo(member).file_size if member else 0
+
+
+def _parse_layout_member(
+    zf: zipfile.ZipFile, member: Optional[str], warnings: List[str],
+) -> tuple[List[ReportPage], str]:
+    if member is None:
+        warnings.append("Report/Layout nicht gefunden oder nicht lesbar.")
+        return [], ""
+    pages: List[ReportPage] = []
+    reader: Optional[LayoutReader] = None
+    try:
+        with zf.open(member) as fp:
+            reader = LayoutReader(fp, warnings)
+            for page in reader.pages():
+                pages.append(page)
+    except Exception as exc:
+        warnings.append(f"Report/Layout Lesefehler: {exc}")
+    return pages, reader.report_name if reader else ""
+
+
+def _parse_mashup_member(
+    zf: zipfile.ZipFile, member: Optional[str], warnings: List[str],
+) -> tuple[List[PowerQuery], List[DataSource], Dict[str, QueryMetadata]]:
+    mashup_raw = None
+    if member is not None:
+        try:
+            mashup_raw = zf.read(member)
+        except Exception as exc:
+            warnings.append(f"DataMashup Lesefehler: {exc}")
+
+    if not mashup_raw:
+        warnings.append("DataMashup nicht gefunden – Power Queries nicht verfuegbar.")
+        return [], [], {}
+    return _parse_datamashup(mashup_raw, warnings)
+
+
+def _parse_schema_member(
+    zf: zipfile.ZipFile, member: Optional[str], warnings: List[str],
+) -> List[ModelTable]:
+    if member is None:
+        return []
+    try:
+        return _parse_data_model_schema(zf.read(member), warnings)
+    except Exception as exc:
+        warnings.append(f"DataModelSchema Lesefehler: {exc}")
+        return []
+
+
+def parse_pbix(pbix_path: Path, previous: Optional[PbixImportResult] = None) -> PbixImportResult:
     """
     Parst eine .pbix-Datei und gibt ein strukturiertes Ergebnis zurueck.
     Kein externes Tool noetig – pure Python mit zipfile + json.
 
     Unterstuetzt auch .pbit (Power BI Template, gleiche Struktur).
+
+    Mit ``previous`` (frueheres Ergebnis derselben Datei) werden nur die
+    Teile neu geparst, deren ZIP-Member laut CRC32 + Groesse geaendert
+    sind; unveraenderte Teile werden samt Warnungen aus ``previous``
+    uebernommen (dieselben Objekte, keine Kopie). ``result.reparsed_parts``
+    nennt die neu geparsten Teile.
     """
     result = PbixImportResult()
 
@@ -463,70 +666,67 @@ def parse_pbix(pbix_path: Path) -> PbixImportResult:
         result.warnings.append(f"Datei nicht gefunden: {pbix_path}")
         return result
 
+    general: List[str] = []
     try:
         with zipfile.ZipFile(str(pbix_path), "r") as zf:
             names = zf.namelist()
+            result.member_fingerprints = member_fingerprints(zf)
+            todo = set(PART_MEMBERS) if previous is None else changed_parts(previous, result)
 
             # ── Report/Layout ─────────────────────────────
-            layout_data = None
-            for candidate in ("Report/Layout", "Report\\Layout"):
-                if candidate in names:
-                    try:
-                        raw = zf.read(candidate)
-                        # Layout kann UTF-16-LE mit BOM sein
-                        for enc in ("utf-16-le", "utf-8-sig", "utf-8"):
-                            try:
-                                text = raw.decode(enc)
-                                layout_data = json.loads(text)
-                                break
-                            except (UnicodeDecodeError, json.JSONDecodeError):
-                                continue
-                    except Exception as exc:
-                        result.warnings.append(f"Report/Layout Lesefehler: {exc}")
-                    break
-
-            if layout_data:
-                pages, rname = _parse_layout(layout_data, result.warnings)
-                result.report_pages = pages
-                if rname:
-                    result.report_name = rname
+            if "layout" in todo:
+                warnings = result.part_warnings["layout"] = []
+                member = _find_member(names, "layout")
+                with stage(result.stages, "pbix.layout") as st:
+                    result.report_pages, result.report_name = _parse_layout_member(
+                        zf, member, warnings)
+                    st.bytes_read = _member_size(zf, member)
+                    st.objects = len(result.report_pages) + sum(
+                        len(p.visuals) for p in result.report_pages)
             else:
-                result.warnings.append("Report/Layout nicht gefunden oder nicht lesbar.")
+                result.report_pages = previous.report_pages
+                result.report_name = previous.report_name
+                result.part_warnings["layout"] = list(previous.part_warnings["layout"])
 
             # Fallback: Dateiname als Reportname
             if not result.report_name:
                 result.report_name = pbix_path.stem
 
             # ── DataMashup ────────────────────────────────
-            mashup_raw = None
-            for candidate in ("DataMashup", "DataMashup/DataMashup"):
-                if candidate in names:
-                    try:
-                        mashup_raw = zf.read(candidate)
-                    except Exception as exc:
-                        result.warnings.append(f"DataMashup Lesefehler: {exc}")
-                    break
-
-            if mashup_raw:
-                queries, sources = _parse_datamashup(mashup_raw, result.warnings)
-                result.power_queries = queries
-                result.data_sources = sources
+            if "mashup" in todo:
+                warnings = result.part_warnings["mashup"] = []
+                member = _find_member(names, "mashup")
+                with stage(result.stages, "pbix.mashup") as st:
+                    (result.power_queries, result.data_sources,
+                     result.query_metadata) = _parse_mashup_member(zf, member, warnings)
+                    st.bytes_read = _member_size(zf, member)
+                    st.objects = len(result.power_queries) + len(result.data_sources)
             else:
-                result.warnings.append("DataMashup nicht gefunden – Power Queries nicht verfuegbar.")
+                result.power_queries = previous.power_queries
+                result.data_sources = previous.data_sources
+                result.query_metadata = previous.query_metadata
+                result.part_warnings["mashup"] = list(previous.part_warnings["mashup"])
 
             # ── DataModelSchema (optional) ─────────────────
-            for candidate in ("DataModelSchema", "DataModelSchema/DataModelSchema"):
-                if candidate in names:
-                    try:
-                        schema_raw = zf.read(candidate)
-                        result.tables = _parse_data_model_schema(schema_raw, result.warnings)
-                    except Exception as exc:
-                        result.warnings.append(f"DataModelSchema Lesefehler: {exc}")
-                    break
+            if "schema" in todo:
+                warnings = result.part_warnings["schema"] = []
+                member = _find_member(names, "schema")
+                with stage(result.stages, "pbix.schema") as st:
+                    result.tables = _parse_schema_member(zf, member, warnings)
+                    st.bytes_read = _member_size(zf, member)
+                    st.objects = len(result.tables)
+            else:
+                result.tables = previous.tables
+                result.part_warnings["schema"] = list(previous.part_warnings["schema"])
+
+            result.reparsed_parts = todo
 
     except zipfile.BadZipFile:
-        result.warnings.append(f"'{pbix_path.name}' ist kein gueltiges ZIP-Archiv.")
+        general.append(f"'{pbix_path.name}' ist kein gueltiges ZIP-Archiv.")
     except Exception as exc:
-        result.warnings.append(f"Allgemeiner Fehler: {exc}")
+        general.append(f"Allgemeiner Fehler: {exc}")
 
+    for part in PART_MEMBERS:
+        result.warnings.extend(result.part_warnings.get(part, []))
+    result.warnings.extend(general)
     return result
@@ -0,0 +1,266 @@
+"""
+Schnell-Scan einer .pbix fuer die Import-Vorschau.
+
+``parse_pbix`` baut fuer jede Seite, jedes Visual und jede Abfrage Objekte
+auf – fuer die Zaehler im Import-Dialog ist das zu teuer. Der Scan liest
+stattdessen nur:
+
+  - das ZIP-Verzeichnis (Central Directory),
+  - die entpackten Bytes von Report/Layout und Section1.m als Stream und
+    zaehlt darin Tokens (``"visualContainers"``, ``singleVisual``,
+    ``shared ``), ohne das JSON bzw. den M-Code zu parsen,
+  - aus DataModelSchema nur die Tabellennamen (Pull-Parser, alle anderen
+    Werte werden uebersprungen).
+
+Alle Zaehler sind Naeherungen: Tokens in Texten (z.B. ein Titel
+"singleVisual") werden mitgezaehlt. Nach Ablauf des Zeitbudgets wird
+abgebrochen; der angefangene Member wird anhand der gelesenen Bytes
+hochgerechnet und das Ergebnis als Schaetzung markiert. Das gilt auch
+fuer das Lesen des DataMashup und die Datenquellen-Erkennung, die das
+Budget je Chunk bzw. je Abschnitt des M-Codes pruefen; Datenquellen
+werden nicht hochgerechnet (bisher gefundene = Untergrenze).
+"""
+
+from __future__ import annotations
+
+import time
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional
+
+from .datamashup import MemoryViewReader, read_datamashup
+from .json_stream import JsonStream, detect_encoding
+from .pbix_parser import PART_MEMBERS, SOURCE_SCANNER
+
+DEFAULT_TIME_BUDGET = 0.2
+_CHUNK = 1 << 16
+_SOURCE_SLICE = 1 << 20      # Zeichen M-Code je Datenquellen-Scan
+
+_LAYOUT_TOKENS = {
+    "pages": '"visualContainers"',
+    "visuals": "singleVisual",
+    # visualType steht im JSON-String ``config`` -> escapte Anfuehrungszeichen
+    "slicers": '\\"slicer\\"',
+}
+_M_TOKENS = {"queries": "shared "}
+
+
+@dataclass
+class PbixScan:
+    """Ergebnis des Schnell-Scans."""
+    page_count: int = 0
+    visual_count: int = 0
+    query_count: int = 0
+    source_count: int = 0
+    table_count: int = 0
+    is_estimate: bool = False
+    warnings: List[str] = field(default_factory=list)
+
+
+class _Deadline:
+    def __init__(self, budget: Optional[float]):
+        self._end = None if budget is None else time.perf_counter() + budget
+
+    def expired(self) -> bool:
+        return self._end is not None and time.perf_counter() >= self._end
+
+
+# ══════════════════════════════════════════════════════════════════
+# Token-Zaehlung
+# ══════════════════════════════════════════════════════════════════
+
+def count_tokens(
+    fp: BinaryIO,
+    tokens: Dict[str, str],
+    deadline: Optional[_Deadline] = None,
+    total_size: int = 0,
+    keep: Optional[List[bytes]] = None,
+) -> tuple[Dict[str, int], bool]:
+    """
+    Zaehlt Tokens in einem Byte-Stream, ohne ihn zu dekodieren.
+
+    Das Encoding (UTF-8/UTF-16) wird aus den ersten Bytes bestimmt und die
+    Tokens entsprechend kodiert. Treffer ueber Chunk-Grenzen werden ueber
+    einen Rest der Laenge ``len(token) - 1`` je Token erkannt.
+
+    Laeuft ``deadline`` ab, wird mit ``total_size`` hochgerechnet und
+    ``complete=False`` zurueckgegeben. Mit ``keep`` werden die gelesenen
+    Chunks gesammelt.
+    """
+    counts = {key: 0 for key in tokens}
+    first = fp.read(_CHUNK)
+    encoding = detect_encoding(first)
+    if encoding == "utf-8-sig":
+        encoding = "utf-8"
+    encoded = {key: text.encode(encoding) for key, text in tokens.items()}
+    tails = {key: b"" for key in tokens}
+
+    read = 0
+    chunk = first
+    complete = True
+    while chunk:
+        read += len(chunk)
+        if keep is not None:
+            keep.append(chunk)
+        for key, token in encoded.items():
+            data = tails[key] + chunk
+            counts[key] += data.count(token)
+            tails[key] = data[-(len(token) - 1):] if len(token) > 1 else b""
+        if deadline is not None and deadline.expired():
+            complete = fp.read(1) == b""
+            break
+        chunk = fp.read(_CHUNK)
+
+    if not complete and read and total_size > read:
+        factor = total_size / read
+        counts = {key: round(value * factor) for key, value in counts.items()}
+    return counts, complete
+
+
+# ══════════════════════════════════════════════════════════════════
+# Member-Scans
+# ══════════════════════════════════════════════════════════════════
+
+def _member(names: List[str], part: str) -> Optional[str]:
+    for candidate in PART_MEMBERS[part]:
+        if candidate in names:
+            return candidate
+    return None
+
+
+def _read_member(zf: zipfile.ZipFile, member: str, deadline: _Deadline) -> Optional[bytes]:
+    """Liest einen Member chunkweise; ``None``, wenn die Zeit vorher ablaeuft."""
+    chunks: List[bytes] = []
+    with zf.open(member) as fp:
+        for chunk in iter(lambda: fp.read(_CHUNK), b""):
+            chunks.append(chunk)
+            if deadline.expired() and fp.read(1):
+                return None
+    return b"".join(chunks)
+
+
+def _count_sources(m_code: str, deadline: _Deadline) -> tuple[int, bool]:
+    """
+    Zaehlt Datenquellen abschnittsweise (Schnitt nur vor ``shared``, damit
+    kein Konnektor-Aufruf geteilt wird) und prueft die Zeit je Abschnitt.
+    Bei Ablauf: bisher gefundene Quellen, ``complete=False``.
+    """
+    seen: set = set()
+    count = 0
+    start = 0
+    while start < len(m_code):
+        cut = m_code.find("\nshared ", start + _SOURCE_SLICE)
+        end = len(m_code) if cut < 0 else cut
+        count += len(SOURCE_SCANNER.scan(m_code[start:end], seen))
+        start = end
+        if start < len(m_code) and deadline.expired():
+            return count, False
+    return count, True
+
+
+def _scan_mashup(zf: zipfile.ZipFile, member: str, scan: PbixScan, deadline: _Deadline) -> bool:
+    raw = _read_member(zf, member, deadline)
+    if raw is None:
+        return False
+    mashup = read_datamashup(raw, scan.warnings)
+    if mashup.package_parts is None:
+        return True
+    with zipfile.ZipFile(MemoryViewReader(mashup.package_parts)) as inner:
+        m_name = next(
+            (n for n in inner.namelist() if n.lower().endswith("section1.m")), None
+        )
+        if m_name is None:
+            return True
+        chunks: List[bytes] = []
+        with inner.open(m_name) as fp:
+            counts, complete = count_tokens(
+                fp, _M_TOKENS, deadline, inner.getinfo(m_name).file_size, chunks,
+            )
+    scan.query_count = counts["queries"]
+    if deadline.expired():
+        return False
+    # Auch ein abgebrochener Section1.m liefert die Quellen des gelesenen Teils
+    m_code = b"".join(chunks).decode("utf-8", errors="replace")
+    scan.source_count, sources_complete = _count_sources(m_code, deadline)
+    return complete and sources_complete
+
+
+def _scan_schema(zf: zipfile.ZipFile, member: str, scan: PbixScan, deadline: _Deadline) -> bool:
+    """Zaehlt ``model.tables`` (ohne Auto-Datumstabellen), liest nur die Namen."""
+    with zf.open(member) as fp:
+        stream = JsonStream(fp)
+        for key in stream.iter_object():
+            if key != "model":
+                stream.skip_value()
+                continue
+            for model_key in stream.iter_object():
+                if model_key != "tables":
+                    stream.skip_value()
+                    continue
+                for _ in stream.iter_array():
+                    name = ""
+                    for table_key in stream.iter_object():
+                        if table_key == "name":
+                            name = stream.read_value()
+                        else:
+                            stream.skip_value()
+                    if name and not str(name).startswith(("LocalDateTable", "DateTableTemplate")):
+                        scan.table_count += 1
+                    if deadline.expired():
+                        total = zf.getinfo(member).file_size
+                        if stream.bytes_read and total > stream.bytes_read:
+                            scan.table_count = round(
+                                scan.table_count * total / stream.bytes_read
+                            )
+                        return False
+                return True
+    return True
+
+
+def _scan_layout(zf: zipfile.ZipFile, member: str, scan: PbixScan, deadline: _Deadline) -> bool:
+    with zf.open(member) as fp:
+        counts, complete = count_tokens(
+            fp, _LAYOUT_TOKENS, deadline, zf.getinfo(member).file_size,
+        )
+    scan.page_count = counts["pages"]
+    scan.visual_count = max(0, counts["visuals"] - counts["slicers"])
+    return complete
+
+
+def scan_pbix(pbix_path: Path, time_budget: Optional[float] = DEFAULT_TIME_BUDGET) -> PbixScan:
+    """
+    Zaehlt Seiten, Visuals, Abfragen, Datenquellen und Tabellen einer .pbix.
+
+    Reihenfolge: DataMashup und DataModelSchema (klein) vor dem meist
+    grossen Report/Layout. Nach Ablauf von ``time_budget`` Sekunden
+    (``None`` = unbegrenzt) werden restliche Member nicht mehr gelesen
+    und ``is_estimate`` gesetzt.
+    """
+    scan = PbixScan()
+    deadline = _Deadline(time_budget)
+    try:
+        with zipfile.ZipFile(str(pbix_path), "r") as zf:
+            names = zf.namelist()
+            steps = (
+                ("mashup", _scan_mashup),
+                ("schema", _scan_schema),
+                ("layout", _scan_layout),
+            )
+            for part, scan_member in steps:
+                member = _member(names, part)
+                if member is None:
+                    continue
+                if deadline.expired():
+                    scan.is_estimate = True
+                    break
+                try:
+                    if not scan_member(zf, member, scan, deadline):
+                        scan.is_estimate = True
+                except Exception as exc:
+                    scan.warnings.append(f"{member}: Schnell-Scan fehlgeschlagen: {exc}")
+    except zipfile.BadZipFile:
+        scan.warnings.append(f"'{pbix_path.name}' ist kein gueltiges ZIP-Archiv.")
+    except OSError as exc:
+        scan.warnings.append(f"Datei nicht lesbar: {exc}")
+    return scan
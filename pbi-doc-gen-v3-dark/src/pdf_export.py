@@ -3,9 +3,21 @@ PDF export with CI/Branding support.
 
 Uses ReportLab. Respects CIBranding settings from the Project for
 customer-specific documentation.
+
+Large-document mode (``large=True``, chosen automatically for big
+projects) keeps the export roughly linear in model size:
+
+- tables are emitted as ``LongTable`` blocks of ``TABLE_CHUNK_ROWS`` rows
+  with the header repeated; cell text is wrapped once against the fixed
+  column widths into plain strings instead of ``Paragraph`` objects
+- code is split into page-sized ``Preformatted`` chunks
+- code longer than ``APPENDIX_LINES`` is shortened in place and printed
+  in full (smaller font) in an appendix at the end
 """
 from __future__ import annotations
+import html
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
@@ -14,8 +26,9 @@ from reportlab.lib.enums import TA_LEFT, TA_CENTER
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+    SimpleDocTemplate, Paragraph, Spacer, Table, LongTable, TableStyle,
     PageBreak, Preformatted, KeepTogether, HRFlowable, Image,
 )
 
@@ -40,6 +53,13 @@ PDF_SECTIONS = [
     ("change_guidance","14. Aenderungshinweise"),
 ]
 
+# ── Large-document mode ─────────────────────────────────────────
+LARGE_MODE_ITEMS = 1000     # measures + queries + tables + relationships
+TABLE_CHUNK_ROWS = 250      # rows per LongTable block
+CODE_CHUNK_LINES = 60       # lines per code flowable (about one page)
+APPENDIX_LINES = 300        # longer code moves to the appendix
+CODE_PREVIEW_LINES = 25     # lines kept in place for appendix code
+
 def get_pdf_section_labels() -> list[tuple[str, str]]:
     """Return list of (key, label) tuples for section selection UI."""
     return list(PDF_SECTIONS)
@@ -54,7 +74,19 @@ def _esc(text):
     return str(text).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
 
+_STYLE_CACHE: dict = {}
+
+
 def _build_styles(ci: CIBranding):
+    """Style sheet per branding colours; built once and reused."""
+    key = (ci.primary_color, ci.secondary_color)
+    ss = _STYLE_CACHE.get(key)
+    if ss is None:
+        ss = _STYLE_CACHE[key] = _new_styles(ci)
+    return ss
+
+
+def _new_styles(ci: CIBranding):
     clr_p = _hex(ci.primary_color)
     clr_s = _hex(ci.secondary_color)
     ss = getSampleStyleSheet()
@@ -73,6 +105,9 @@ def _build_styles(ci: CIBranding):
         fontSize=8, leading=11, fontName="Courier", backColor=colors.HexColor("#F8FAFC"),
         borderColor=colors.HexColor("#CBD5E1"), borderWidth=0.5, borderPadding=6,
         spaceAfter=3*mm, leftIndent=4*mm, rightIndent=4*mm))
+    ss.add(ParagraphStyle("CodeChunk", parent=ss["CodeBlock"], spaceAfter=0))
+    ss.add(ParagraphStyle("CodeSmall", parent=ss["CodeBlock"], fontSize=7, leading=9))
+    ss.add(ParagraphStyle("CodeSmallChunk", parent=ss["CodeSmall"], spaceAfter=0))
     ss.add(ParagraphStyle("CellN", parent=ss["Normal"], fontSize=9, leading=12))
     ss.add(ParagraphStyle("CellB", parent=ss["Normal"], fontSize=9, leading=12, fontName="Helvetica-Bold"))
     ss.add(ParagraphStyle("MetaL", parent=ss["Normal"], fontSize=10, leading=14, textColor=colors.HexColor("#64748B")))
@@ -82,28 +117,72 @@ def _build_styles(ci: CIBranding):
     return ss
 
 
-def _make_table(headers, rows, col_widths, ci):
-    ss = _build_styles(ci)
-    clr_hdr = _hex(ci.primary_color)
-    hdr = [Paragraph("<b>{}</b>".format(h), ss["CellB"]) for h in headers]
-    data = [hdr] + [[Paragraph(str(c), ss["CellN"]) for c in row] for row in rows]
-    t = Table(data, colWidths=col_widths, repeatRows=1)
-    cmds = [
+def _table_style(clr_hdr):
+    return TableStyle([
         ("BACKGROUND", (0, 0), (-1, 0), clr_hdr),
         ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
         ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("FONTSIZE", (0, 0), (-1, 0), 9),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("LEADING", (0, 0), (-1, -1), 12),
         ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#CBD5E1")),
         ("VALIGN", (0, 0), (-1, -1), "TOP"),
         ("TOPPADDING", (0, 0), (-1, -1), 5),
         ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
         ("LEFTPADDING", (0, 0), (-1, -1), 4),
         ("RIGHTPADDING", (0, 0), (-1, -1), 4),
-    ]
-    for i in range(2, len(data), 2):
-        cmds.append(("BACKGROUND", (0, i), (-1, i), colors.HexColor("#F0F4F8")))
-    t.setStyle(TableStyle(cmds))
-    return t
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#F0F4F8")]),
+    ])
+
+
+@lru_cache(maxsize=65536)
+def _word_width(word):
+    return stringWidth(word, "Helvetica", 9)
+
+
+def _fast_cell(text, width, style):
+    """
+    Plain (multi-line) string wrapped once against the known column width;
+    table layout then only counts lines instead of re-wrapping Paragraphs
+    on every split. Text with markup stays a Paragraph.
+    """
+    text = str(text)
+    if "<" in text:
+        return Paragraph(text, style)
+    avail = width - 8       # LEFTPADDING + RIGHTPADDING
+    space = _word_width(" ")
+    lines = []
+    for para in html.unescape(text).split("\n"):
+        line, used = [], 0.0
+        for word in para.split(" "):
+            w = _word_width(word)
+            if line and used + space + w > avail:
+                lines.append(" ".join(line))
+                line, used = [], 0.0
+            used += (space if line else 0.0) + w
+            line.append(word)
+        lines.append(" ".join(line))
+    return "\n".join(lines)
+
+
+def _make_table(headers, rows, col_widths, ci):
+    ss = _build_styles(ci)
+    hdr = [Paragraph("<b>{}</b>".format(h), ss["CellB"]) for h in headers]
+    data = [hdr] + [[Paragraph(str(c), ss["CellN"]) for c in row] for row in rows]
+    return Table(data, colWidths=col_widths, repeatRows=1, style=_table_style(_hex(ci.primary_color)))
+
+
+def _make_tables(headers, rows, col_widths, ci, large=False):
+    """Flowables for one table; in large mode fixed-size LongTable blocks."""
+    if not large:
+        return [_make_table(headers, rows, col_widths, ci)]
+    ss = _build_styles(ci)
+    style = _table_style(_hex(ci.primary_color))
+    hdr = [Paragraph("<b>{}</b>".format(h), ss["CellB"]) for h in headers]
+    body = [[_fast_cell(c, w, ss["CellN"]) for c, w in zip(row, col_widths)] for row in rows]
+    # Splitting one huge table re-wraps the whole remainder on every page
+    return [LongTable([hdr] + body[i:i + TABLE_CHUNK_ROWS], colWidths=col_widths,
+                      repeatRows=1, style=style)
+            for i in range(0, max(len(body), 1), TABLE_CHUNK_ROWS)]
 
 
 def _hr():
@@ -111,9 +190,27 @@ def _hr():
                        spaceBefore=3*mm, spaceAfter=3*mm)
 
 
-def generate_pdf(project, output_path, sections=None):
+def _is_large(project):
+    items = (len(project.measures) + len(project.power_queries)
+             + len(project.data_model.tables) + len(project.data_model.relationships))
+    if items >= LARGE_MODE_ITEMS:
+        return True
+    codes = [m.dax_code for m in project.measures] + [q.m_code for q in project.power_queries]
+    return any(code.count("\n") >= APPENDIX_LINES for code in codes)
+
+
+def _code_chunks(code, style, chunk_style):
+    """Page-sized Preformatted flowables; splitting them is cheap."""
+    lines = code.split("\n")
+    parts = ["\n".join(lines[i:i + CODE_CHUNK_LINES]) for i in range(0, len(lines), CODE_CHUNK_LINES)]
+    return [Preformatted(part, chunk_style if i < len(parts) - 1 else style)
+            for i, part in enumerate(parts)]
+
+
+def generate_pdf(project, output_path, sections=None, large=None):
     """Generate PDF report. If *sections* is a set of keys, only those are included.
-    If None, all sections are included."""
+    If None, all sections are included. *large* switches the large-document
+    mode on/off; None decides by project size."""
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     ci = project.ci_branding
@@ -140,6 +237,21 @@ def generate_pdf(project, output_path, sections=None):
     ss = _build_styles(ci)
     story = []
     pw = A4[0] - 30*mm
+    if large is None:
+        large = _is_large(project)
+    appendix = []   # (title, code) of code blocks moved to the appendix
+
+    def _code(title, code):
+        if not large:
+            return [Preformatted(code, ss["CodeBlock"])]
+        lines = code.count("\n") + 1
+        if lines <= APPENDIX_LINES:
+            return _code_chunks(code, ss["CodeBlock"], ss["CodeChunk"])
+        appendix.append((title, code))
+        head = "\n".join(code.split("\n", CODE_PREVIEW_LINES)[:CODE_PREVIEW_LINES])
+        return [Preformatted(head, ss["CodeBlock"]),
+                Paragraph("<i>... {} weitere Zeilen, vollstaendiger Code in Anhang A{}.</i>".format(
+                    lines - CODE_PREVIEW_LINES, len(appendix)), ss["Body"])]
 
     # ── TITLE PAGE ──
     story.append(Spacer(1, 20*mm))
@@ -221,14 +333,14 @@ def generate_pdf(project, output_path, sections=None):
             story.append(Paragraph("<b>Power BI:</b> {}".format(_esc(project.meta.powerbi_service_url)), ss["Body"]))
         if project.meta.environments:
             er = [[e.name, e.workspace, e.url] for e in project.meta.environments]
-            story.append(_make_table(["Umgebung","Arbeitsbereich","URL"], er, [30*mm,50*mm,pw-84*mm], ci))
+            story.extend(_make_tables(["Umgebung","Arbeitsbereich","URL"], er, [30*mm,50*mm,pw-84*mm], ci, large))
 
     # 2. KPIs
     if _sec("kpis"):
         story.append(Paragraph("2. KPIs", ss["H1"]))
         if project.kpis:
             kr = [[str(i),_esc(k.name),_esc(k.granularity),_esc(k.business_description)] for i,k in enumerate(project.kpis,1)]
-            story.append(_make_table(["#","Name","Gran.","Beschreibung"], kr, [10*mm,35*mm,30*mm,pw-79*mm], ci))
+            story.extend(_make_tables(["#","Name","Gran.","Beschreibung"], kr, [10*mm,35*mm,30*mm,pw-79*mm], ci, large))
             for k in project.kpis:
                 story.extend([Paragraph(_esc(k.name), ss["H2"]),
                     Paragraph("<b>Beschreibung:</b> {}".format(_esc(k.business_description)), ss["Body"]),
@@ -243,8 +355,8 @@ def generate_pdf(project, output_path, sections=None):
         if project.data_sources:
             dr = [[_esc(s.name),_esc(s.source_type),_esc(s.connection_info),_esc(s.refresh_cadence),
                    _esc(s.gateway_name) if s.gateway_required else "-"] for s in project.data_sources]
-            story.append(_make_table(["Name","Typ","Verbindung","Refresh","Gateway"], dr,
-                                      [30*mm,22*mm,45*mm,30*mm,pw-131*mm], ci))
+            story.extend(_make_tables(["Name","Typ","Verbindung","Refresh","Gateway"], dr,
+                                      [30*mm,22*mm,45*mm,30*mm,pw-131*mm], ci, large))
         else:
             story.append(Paragraph("<i>Keine Quellen.</i>", ss["Body"]))
 
@@ -256,7 +368,7 @@ def generate_pdf(project, output_path, sections=None):
                 Paragraph("<b>Zweck:</b> {}".format(_esc(q.purpose)), ss["Body"])])
             if q.m_code:
                 story.append(Paragraph("<b>M-Code:</b>", ss["Body"]))
-                story.append(Preformatted(q.m_code, ss["CodeBlock"]))
+                story.extend(_code(q.query_name, q.m_code))
             story.append(_hr())
         if not project.power_queries:
             story.append(Paragraph("<i>Keine Abfragen.</i>", ss["Body"]))
@@ -267,12 +379,12 @@ def generate_pdf(project, output_path, sections=None):
         dm = project.data_model
         if dm.tables:
             tr = [[_esc(t.name),_esc(t.table_type),_esc(t.keys),_esc(t.description)] for t in dm.tables]
-            story.append(_make_table(["Tabelle","Typ","Schluessel","Beschreibung"], tr,
-                                      [35*mm,25*mm,40*mm,pw-104*mm], ci))
+            story.extend(_make_tables(["Tabelle","Typ","Schluessel","Beschreibung"], tr,
+                                      [35*mm,25*mm,40*mm,pw-104*mm], ci, large))
         if dm.relationships:
             rr = [["{}.{}".format(r.from_table,r.from_column),"{}.{}".format(r.to_table,r.to_column),
                    r.cardinality,r.filter_direction] for r in dm.relationships]
-            story.append(_make_table(["Von","Nach","Kard.","Filter"], rr, [40*mm,40*mm,30*mm,pw-114*mm], ci))
+            story.extend(_make_tables(["Von","Nach","Kard.","Filter"], rr, [40*mm,40*mm,30*mm,pw-114*mm], ci, large))
         if dm.date_logic_notes:
             story.extend([Paragraph("Datumslogik", ss["H2"]), Paragraph(_esc(dm.date_logic_notes), ss["Body"])])
         for sp in dm.screenshot_paths:
@@ -285,13 +397,14 @@ def generate_pdf(project, output_path, sections=None):
         story.append(Paragraph("6. Measures (DAX)", ss["H1"]))
         if project.measures:
             mr = [[str(i),_esc(m.name),_esc(m.display_folder),_esc(m.description)] for i,m in enumerate(project.measures,1)]
-            story.append(_make_table(["#","Name","Ordner","Beschreibung"], mr, [10*mm,40*mm,30*mm,pw-84*mm], ci))
+            story.extend(_make_tables(["#","Name","Ordner","Beschreibung"], mr, [10*mm,40*mm,30*mm,pw-84*mm], ci, large))
             story.append(Spacer(1, 4*mm))
             for ms in project.measures:
                 story.extend([Paragraph(_esc(ms.name), ss["H2"]),
                     Paragraph("<b>Beschreibung:</b> {}".format(_esc(ms.description)), ss["Body"]),
-                    Paragraph("<b>DAX:</b>", ss["Body"]),
-                    Preformatted(ms.dax_code, ss["CodeBlock"]), _hr()])
+                    Paragraph("<b>DAX:</b>", ss["Body"])])
+                story.extend(_code(ms.name, ms.dax_code))
+                story.append(_hr())
         else:
             story.append(Paragraph("<i>Keine Measures.</i>", ss["Body"]))
 
@@ -303,7 +416,7 @@ def generate_pdf(project, output_path, sections=None):
                 Paragraph("<b>Zweck:</b> {}".format(_esc(pg.purpose)), ss["Body"])])
             if pg.visuals:
                 vr = [[_esc(v.name),_esc(v.description)] for v in pg.visuals]
-                story.append(_make_table(["Visual","Beschreibung"], vr, [45*mm,pw-49*mm], ci))
+                story.extend(_make_tables(["Visual","Beschreibung"], vr, [45*mm,pw-49*mm], ci, large))
             sp = getattr(pg, 'screenshot_path', '')
             _add_screenshot(sp)
             story.append(_hr())
@@ -334,8 +447,8 @@ def generate_pdf(project, output_path, sections=None):
         if project.change_log:
             cr = [[_esc(c.version),c.date,_esc(c.description),_esc(c.author),_esc(c.impact),_esc(c.ticket_link)]
                   for c in project.change_log]
-            story.append(_make_table(["Ver.","Datum","Beschreibung","Autor","Impact","Ticket"], cr,
-                                      [16*mm,20*mm,pw-104*mm,20*mm,20*mm,24*mm], ci))
+            story.extend(_make_tables(["Ver.","Datum","Beschreibung","Autor","Impact","Ticket"], cr,
+                                      [16*mm,20*mm,pw-104*mm,20*mm,20*mm,24*mm], ci, large))
         else:
             story.append(Paragraph("<i>Keine Eintraege.</i>", ss["Body"]))
 
@@ -408,6 +521,14 @@ def generate_pdf(project, output_path, sections=None):
         if cg.notes:
             story.extend([Paragraph("Anmerkungen", ss["H2"]), Paragraph(_esc(cg.notes), ss["Body"])])
 
+    # Appendix: long code blocks in full
+    if appendix:
+        story.append(PageBreak())
+        story.append(Paragraph("Anhang: Lange Code-Bloecke", ss["H1"]))
+        for i, (title, code) in enumerate(appendix, 1):
+            story.append(Paragraph("A{} - {}".format(i, _esc(title)), ss["H2"]))
+            story.extend(_code_chunks(code, ss["CodeSmall"], ss["CodeSmallChunk"]))
+
     doc.build(story, onFirstPage=_footer, onLaterPages=_footer)
     return output_path
 
@@ -0,0 +1,172 @@
+"""
+Section store (``*.pbds`` directory) – incremental, crash-safe project saves.
+
+Every top-level field of ``Project`` (meta, kpis, measures, power_queries,
+data_model, ...) is stored in its own file. ``manifest.json`` ties them
+together:
+
+    project.pbds/
+      manifest.json               {"format": 1, "sections": {name: {"file", "sha256"}}}
+      meta-3f2a9c1d04be.json
+      measures-8b01e7c2aa90.json
+      ...
+
+Saving only serializes the sections passed as ``dirty`` (all sections if
+omitted) and only writes those whose content hash changed. Section files
+are content-addressed and written via temp file + ``os.replace``; the
+manifest is replaced last, then superseded files are removed. A crash at
+any point therefore leaves the previous manifest pointing at a complete,
+consistent set of files.
+
+``load(lazy=True)`` returns a ``LazyProject`` that reads a section on
+first attribute access, so tools that only need ``meta`` or ``measures``
+do not parse the rest.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .binary_store import encode_json
+from .models import Project
+
+SECTION_SUFFIX = ".pbds"
+MANIFEST_FILE = "manifest.json"
+FORMAT_VERSION = 1
+
+SECTIONS = tuple(f.name for f in fields(Project))
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class LazyProject(Project):
+    """Project whose sections are read from a ``SectionStore`` on first access."""
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not yet in __dict__
+        store = self.__dict__.get("_section_store")
+        if store is None or name not in SECTIONS:
+            raise AttributeError(name)
+        value = store.read_section(name)
+        self.__dict__[name] = value
+        return value
+
+    def loaded_sections(self) -> Set[str]:
+        return {name for name in SECTIONS if name in self.__dict__}
+
+
+class SectionStore:
+    """A project stored as one file per section plus a manifest."""
+
+    def __init__(self, directory: Path):
+        directory = Path(directory)
+        if directory.name == MANIFEST_FILE:
+            directory = directory.parent
+        self.directory = directory
+        self._manifest: Optional[dict] = None
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / MANIFEST_FILE
+
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+
+    @property
+    def manifest(self) -> dict:
+        if self._manifest is None:
+            if self.exists():
+                with open(self.manifest_path, encoding="utf-8") as fh:
+                    self._manifest = json.load(fh)
+                if self._manifest.get("format", 0) > FORMAT_VERSION:
+                    raise ValueError(f"Unsupported section store version: {self._manifest['format']}")
+            else:
+                self._manifest = {"format": FORMAT_VERSION, "sections": {}}
+        return self._manifest
+
+    # ── Save ──────────────────────────────────────
+
+    def save(self, project: Project, dirty: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Write the sections in ``dirty`` (all if None) whose content changed.
+        Sections missing from the store are always written. Returns the
+        names of the sections actually written.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries: Dict[str, dict] = self.manifest["sections"]
+        missing = set(SECTIONS) - set(entries)
+        candidates = set(SECTIONS if dirty is None else dirty) | missing
+        source = project.__dict__.get("_section_store")
+        if isinstance(project, LazyProject) and source is not None \
+                and source.directory.resolve() == self.directory.resolve():
+            # Sections never loaded from this store cannot have changed
+            candidates &= project.loaded_sections() | missing
+
+        written: List[str] = []
+        obsolete: List[Path] = []
+        updated = dict(entries)
+        for name in SECTIONS:
+            if name not in candidates:
+                continue
+            data = encode_json(getattr(project, name))
+            digest = hashlib.sha256(data).hexdigest()
+            old = entries.get(name)
+            if old is not None and old["sha256"] == digest:
+                continue
+            filename = f"{name}-{digest[:12]}.json"
+            _atomic_write(self.directory / filename, data)
+            updated[name] = {"file": filename, "sha256": digest}
+            written.append(name)
+            if old is not None and old["file"] != filename:
+                obsolete.append(self.directory / old["file"])
+
+        if written:
+            manifest = {"format": FORMAT_VERSION, "sections": updated}
+            _atomic_write(self.manifest_path,
+                          json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8"))
+            self._manifest = manifest
+            for path in obsolete:
+                path.unlink(missing_ok=True)
+        return written
+
+    # ── Load ──────────────────────────────────────
+
+    def read_section(self, name: str) -> Any:
+        """Build one section; sections missing from the store get their default."""
+        entry = self.manifest["sections"].get(name)
+        if entry is None:
+            return getattr(Project(), name)
+        with open(self.directory / entry["file"], "rb") as fh:
+            data = json.loads(fh.read())
+        return getattr(Project.from_dict({name: data}), name)
+
+    def load(self, lazy: bool = False) -> Project:
+        if not self.exists():
+            raise FileNotFoundError(f"Project file not found: {self.manifest_path}")
+        if not lazy:
+            return Project(**{name: self.read_section(name) for name in SECTIONS})
+        project = LazyProject.__new__(LazyProject)
+        project.__dict__["_section_store"] = self
+        return project
+
+
+def is_section_store(path: Path) -> bool:
+    path = Path(path)
+    return path.suffix == SECTION_SUFFIX or (path.name == MANIFEST_FILE and path.parent.suffix == SECTION_SUFFIX)
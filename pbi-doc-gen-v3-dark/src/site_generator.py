@@ -0,0 +1,585 @@
+"""
+Static HTML documentation site with a prebuilt client-side search index.
+
+Renders the same sections as ``generate_docs`` to HTML pages (streamed
+from the section generators, so measure pages never exist as one string)
+and adds an inverted search index over measure names, DAX tokens,
+table/column names, query names and page names:
+
+    site/
+      index.html, 01_overview/overview.html, ...
+      assets/site.css, assets/search.js
+      search/docs.js              symbol list + shard keys
+      search/t-<hex>.js           terms starting with one two-letter prefix
+
+Terms map to gap-encoded lists of symbol ids and are sharded by their
+first two characters, so a query only loads the shards of its words.
+Index and shards are JSON wrapped in a one-line ``pbiSearch.*(...)``
+call: browsers block ``fetch`` on ``file://``, script tags are not, so
+the site works offline straight from disk. Building the index is a
+single pass over all symbols.
+"""
+
+from __future__ import annotations
+
+import html
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .dax_lexer import tokenize
+from .generator import SECTIONS, _write_chunks, iter_section
+from .models import Project
+
+SITE_ROOT = Path("site")
+SEARCH_DIR = "search"
+SHARD_PREFIX = 2
+
+# Output page -> navigation label (same order as the Markdown index)
+NAV_LABELS: Dict[str, str] = {
+    "index.md": "Startseite",
+    "01_overview/overview.md": "Übersicht",
+    "01_overview/kpis.md": "KPIs & Kennzahlen",
+    "02_data_sources/data_sources.md": "Datenquellen",
+    "03_power_query/queries.md": "Power Query (M)",
+    "04_data_model/data_model.md": "Datenmodell",
+    "05_measures/measures.md": "Measures (DAX)",
+    "06_report_design/pages_visuals.md": "Berichtsseiten & Visuals",
+    "07_governance/refresh_gateway_rls.md": "Governance",
+    "07_governance/assumptions_limitations.md": "Annahmen & Einschränkungen",
+    "08_change_log/change_log.md": "Änderungsprotokoll",
+    "09_permissions/permissions.md": "Berechtigungen",
+    "10_storage/storage.md": "Ablagestruktur",
+    "11_naming/naming_conventions.md": "Namenskonzept",
+    "12_change_guidance/change_guidance.md": "Änderungshinweise",
+}
+
+KINDS = ("measure", "table", "column", "query", "page")
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def anchor(text: str) -> str:
+    """Heading id; matches the ``#name`` links written by ``gen_measures``."""
+    return text.strip().lower().replace(" ", "-")
+
+
+def _page_url(relpath: str) -> str:
+    return relpath[:-len(".md")] + ".html"
+
+
+# ===================================================================
+# Search index
+# ===================================================================
+
+@dataclass
+class SearchIndex:
+    """Symbols ``(kind, name, url)`` and term -> ascending symbol ids."""
+    docs: List[Tuple[str, str, str]] = field(default_factory=list)
+    postings: Dict[str, List[int]] = field(default_factory=dict)
+
+    def add(self, kind: str, name: str, url: str, extra_terms: Iterable[str] = ()) -> int:
+        doc_id = len(self.docs)
+        self.docs.append((kind, name, url))
+        for term in _terms(name, extra_terms):
+            ids = self.postings.get(term)
+            if ids is None:
+                self.postings[term] = [doc_id]
+            elif ids[-1] != doc_id:
+                ids.append(doc_id)
+        return doc_id
+
+    def shards(self) -> Dict[str, Dict[str, List[int]]]:
+        """Terms grouped by their first ``SHARD_PREFIX`` characters, ids gap-encoded."""
+        shards: Dict[str, Dict[str, List[int]]] = {}
+        for term, ids in self.postings.items():
+            gaps = [ids[0]] + [b - a for a, b in zip(ids, ids[1:])]
+            shards.setdefault(term[:SHARD_PREFIX], {})[term] = gaps
+        return shards
+
+    def search(self, query: str) -> List[int]:
+        """
+        Symbol ids matching every word of ``query`` as a term prefix –
+        the same semantics as the browser client (``assets/search.js``).
+        """
+        words = _WORD_RE.findall(query.lower())
+        result = None
+        for word in words:
+            if len(word) < SHARD_PREFIX:
+                continue
+            ids = set()
+            for term, postings in self.postings.items():
+                if term.startswith(word):
+                    ids.update(postings)
+            result = ids if result is None else result & ids
+        # Words shorter than a shard key only filter by the symbol name
+        short = [w for w in words if len(w) < SHARD_PREFIX]
+        return sorted(doc_id for doc_id in result or () if all(
+            any(n.startswith(w) for n in _WORD_RE.findall(self.docs[doc_id][1].lower())) for w in short))
+
+
+def _terms(name: str, extra_terms: Iterable[str]) -> List[str]:
+    words = _WORD_RE.findall(f"{name} {' '.join(extra_terms)}".lower())
+    return [w for w in dict.fromkeys(words) if len(w) >= SHARD_PREFIX]
+
+
+def _dax_terms(dax: str, columns: Dict[Tuple[str, str], None]) -> List[str]:
+    """
+    Identifiers, table and column names of a DAX expression (no strings or
+    comments) in one lexer pass. Qualified references (``Tabelle[Spalte]``,
+    same rule as ``iter_references``) are added to ``columns``.
+    """
+    terms: List[str] = []
+    prev = None
+    for token in tokenize(dax):
+        if token.kind in ("ident", "table"):
+            terms.append(token.text)
+        elif token.kind == "bracket":
+            terms.append(token.text)
+            if prev is not None and prev.kind in ("ident", "table") \
+                    and prev.start + len(prev.text) == token.start:
+                table = prev.text[1:-1].replace("''", "'") if prev.kind == "table" else prev.text
+                columns[(table, token.text[1:-1].replace("]]", "]"))] = None
+        prev = token
+    return terms
+
+
+def build_search_index(project: Project) -> SearchIndex:
+    """One pass over measures, tables, columns, queries and pages."""
+    index = SearchIndex()
+    measures_url = _page_url("05_measures/measures.md")
+    model_url = _page_url("04_data_model/data_model.md")
+    columns: Dict[Tuple[str, str], None] = {}
+
+    for ms in project.measures:
+        terms = _dax_terms(ms.dax_code, columns)
+        terms.append(ms.display_folder)
+        index.add("measure", ms.name, f"{measures_url}#{anchor(ms.name)}", terms)
+
+    for t in project.data_model.tables:
+        index.add("table", t.name, f"{model_url}#tabellen", [t.table_type])
+    for r in project.data_model.relationships:
+        columns[(r.from_table, r.from_column)] = None
+        columns[(r.to_table, r.to_column)] = None
+    for table, column in columns:
+        if table and column:
+            index.add("column", f"{table}[{column}]", f"{model_url}#tabellen")
+
+    queries_url = _page_url("03_power_query/queries.md")
+    for q in project.power_queries:
+        index.add("query", q.query_name, f"{queries_url}#{anchor(q.query_name)}",
+                  [q.query_group, q.output_table])
+
+    pages_url = _page_url("06_report_design/pages_visuals.md")
+    for pg in project.report_pages:
+        index.add("page", pg.page_name, f"{pages_url}#{anchor(pg.page_name)}",
+                  [v.name for v in pg.visuals])
+    return index
+
+
+def _shard_file(key: str) -> str:
+    return f"t-{key.encode('utf-8').hex()}.js"
+
+
+def _jsonp(call: str, *args) -> str:
+    payload = ",".join(json.dumps(a, ensure_ascii=False, separators=(",", ":")) for a in args)
+    return f"pbiSearch.{call}({payload});\n"
+
+
+# ===================================================================
+# Markdown -> HTML
+# ===================================================================
+
+_CODE_SPAN = re.compile(r"`([^`]+)`")
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_ITALIC = re.compile(r"\*(.+?)\*")
+_LINK = re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)")
+
+
+def _inline(text: str) -> str:
+    parts = _CODE_SPAN.split(text)
+    out = []
+    for i, part in enumerate(parts):
+        if i % 2:
+            out.append(f"<code>{html.escape(part)}</code>")
+            continue
+        part = html.escape(part, quote=False)
+        part = _LINK.sub(lambda m: f'<a href="{html.escape(_link_target(m.group(2)))}">{m.group(1)}</a>', part)
+        part = _BOLD.sub(r"<strong>\1</strong>", part)
+        part = _ITALIC.sub(r"<em>\1</em>", part)
+        out.append(part)
+    return "".join(out)
+
+
+def _link_target(target: str) -> str:
+    path, sep, frag = target.partition("#")
+    if path.endswith(".md") and "://" not in path:
+        path = path[:-len(".md")] + ".html"
+    return path + sep + frag
+
+
+def _cells(row: str) -> List[str]:
+    # Escaped pipes (``\|``) belong to the cell text
+    cells = re.split(r"(?<!\\)\|", row.strip().strip("|"))
+    return [c.strip().replace("\\|", "|") for c in cells]
+
+
+class _MarkdownRenderer:
+    """
+    Line-by-line converter for the Markdown subset the section generators
+    emit (headings, tables, fenced code, lists, quotes, rules).
+    """
+
+    def __init__(self):
+        self.in_code = False
+        self.in_table = False
+        self.in_list = False
+        self.ids: Dict[str, int] = {}
+
+    def _close_blocks(self) -> Iterator[str]:
+        if self.in_table:
+            yield "</tbody></table>"
+            self.in_table = False
+        if self.in_list:
+            yield "</ul>"
+            self.in_list = False
+
+    def _heading_id(self, text: str) -> str:
+        base = anchor(text)
+        n = self.ids.get(base, 0)
+        self.ids[base] = n + 1
+        return base if n == 0 else f"{base}-{n + 1}"
+
+    def feed(self, line: str) -> Iterator[str]:
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            if self.in_code:
+                self.in_code = False
+                yield "</code></pre>"
+            else:
+                yield from self._close_blocks()
+                lang = stripped[3:].strip()
+                self.in_code = True
+                yield f'<pre><code class="language-{html.escape(lang)}">'
+            return
+        if self.in_code:
+            yield html.escape(line) + "\n"
+            return
+
+        if stripped.startswith("|"):
+            cells = _cells(stripped)
+            if all(set(c) <= set("-:") for c in cells):
+                return
+            if not self.in_table:
+                yield from self._close_blocks()
+                self.in_table = True
+                yield "<table><thead><tr>" + "".join(f"<th>{_inline(c)}</th>" for c in cells) \
+                    + "</tr></thead><tbody>"
+                return
+            yield "<tr>" + "".join(f"<td>{_inline(c)}</td>" for c in cells) + "</tr>"
+            return
+
+        if stripped.startswith(("- ", "* ")) and not stripped.startswith("**"):
+            if not self.in_list:
+                yield from self._close_blocks()
+                self.in_list = True
+                yield "<ul>"
+            yield f"<li>{_inline(stripped[2:])}</li>"
+            return
+
+        yield from self._close_blocks()
+        if not stripped:
+            return
+        if stripped in ("---", "***", "___"):
+            yield "<hr>"
+            return
+        match = re.match(r"(#{1,6}) (.*)", stripped)
+        if match:
+            level, text = len(match.group(1)), match.group(2)
+            yield f'<h{level} id="{html.escape(self._heading_id(text))}">{_inline(text)}</h{level}>'
+            return
+        if stripped.startswith("> "):
+            yield f"<blockquote>{_inline(stripped[2:])}</blockquote>"
+            return
+        yield f"<p>{_inline(stripped)}</p>"
+
+    def close(self) -> Iterator[str]:
+        if self.in_code:
+            yield "</code></pre>"
+            self.in_code = False
+        yield from self._close_blocks()
+
+
+def _iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    rest = ""
+    for chunk in chunks:
+        lines = (rest + chunk).split("\n")
+        rest = lines.pop()
+        yield from lines
+    yield rest
+
+
+def markdown_to_html(chunks: Iterable[str]) -> Iterator[str]:
+    """Stream HTML for streamed Markdown; one output chunk per input line."""
+    renderer = _MarkdownRenderer()
+    for line in _iter_lines(chunks):
+        for out in renderer.feed(line):
+            # Code lines carry their own newline; none after the opening <pre>
+            yield out if renderer.in_code else out + "\n"
+    for out in renderer.close():
+        yield out + "\n"
+
+
+# ===================================================================
+# Pages
+# ===================================================================
+
+_ACTIVE = ' class="active"'
+
+
+def _page_chunks(project: Project, relpath: str) -> Iterator[str]:
+    base = "../" * relpath.count("/")
+    report = project.meta.report_name or "Power BI Report"
+    nav = "".join(
+        f'<li><a href="{base}{_page_url(page)}"{_ACTIVE if page == relpath else ""}>'
+        f"{html.escape(label)}</a></li>"
+        for page, label in NAV_LABELS.items()
+    )
+    yield (
+        "<!DOCTYPE html>\n"
+        '<html lang="de">\n<head>\n<meta charset="utf-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+        f"<title>{html.escape(NAV_LABELS[relpath])} – {html.escape(report)}</title>\n"
+        f'<link rel="stylesheet" href="{base}assets/site.css">\n'
+        f'</head>\n<body data-base="{base}">\n'
+        f'<header><a class="brand" href="{base}index.html">{html.escape(report)}</a>\n'
+        '<div class="search"><input id="search" type="search" autocomplete="off" '
+        'placeholder="Suchen: Measures, DAX, Tabellen, Spalten, Queries, Seiten">\n'
+        '<ol id="results" hidden></ol></div></header>\n'
+        f"<nav><ul>{nav}</ul></nav>\n<main>\n"
+    )
+    generate = SECTIONS[relpath][0]
+    yield from markdown_to_html(iter_section(generate, project))
+    yield f'</main>\n<script src="{base}assets/search.js"></script>\n</body>\n</html>\n'
+
+
+@dataclass
+class SiteBuild:
+    """Result of ``generate_site``."""
+    root: Path
+    changed: List[Path] = field(default_factory=list)
+    unchanged: List[Path] = field(default_factory=list)
+    removed: List[Path] = field(default_factory=list)
+    symbols: int = 0
+    terms: int = 0
+    shards: int = 0
+
+
+def _emit(build: SiteBuild, path: Path, chunks: Iterable[str]) -> None:
+    (build.changed if _write_chunks(path, chunks) else build.unchanged).append(path)
+
+
+def generate_site(project: Project, output_dir: Path | None = None) -> SiteBuild:
+    """
+    Write the HTML site and its search index to ``output_dir`` (default
+    ``site/``). Files are only rewritten when their content changed;
+    search shards that are no longer produced are removed.
+    """
+    root = output_dir or SITE_ROOT
+    build = SiteBuild(root)
+
+    for relpath in SECTIONS:
+        _emit(build, root / _page_url(relpath), _page_chunks(project, relpath))
+    _emit(build, root / "assets" / "site.css", (SITE_CSS,))
+    _emit(build, root / "assets" / "search.js", (SEARCH_JS,))
+
+    index = build_search_index(project)
+    shards = index.shards()
+    search_dir = root / SEARCH_DIR
+    docs = {"kinds": list(KINDS), "shards": sorted(shards),
+            "docs": [[KINDS.index(kind), name, url] for kind, name, url in index.docs]}
+    _emit(build, search_dir / "docs.js", (_jsonp("docs", docs),))
+    wanted = {"docs.js"}
+    for key, terms in shards.items():
+        name = _shard_file(key)
+        wanted.add(name)
+        _emit(build, search_dir / name, (_jsonp("shard", key, terms),))
+    for stale in search_dir.glob("t-*.js"):
+        if stale.name not in wanted:
+            stale.unlink()
+            build.removed.append(stale)
+
+    build.symbols, build.terms, build.shards = len(index.docs), len(index.postings), len(shards)
+    return build
+
+
+# ===================================================================
+# Static assets
+# ===================================================================
+
+SITE_CSS = """\
+:root { --bg:#1E1E2E; --surface:#252536; --border:#3A3A4F; --text:#E4E4EF;
+        --muted:#9A9AB0; --accent:#5B8DEF; --code:#1A1A28; }
+* { box-sizing: border-box; }
+body { margin:0; background:var(--bg); color:var(--text);
+       font:14px/1.6 "Segoe UI", system-ui, sans-serif;
+       display:grid; grid-template-columns:240px 1fr; grid-template-rows:auto 1fr; min-height:100vh; }
+header { grid-column:1 / 3; display:flex; gap:24px; align-items:center; padding:10px 20px;
+         background:var(--surface); border-bottom:1px solid var(--border); }
+.brand { color:var(--text); font-weight:700; text-decoration:none; white-space:nowrap; }
+.search { position:relative; flex:1; max-width:640px; }
+#search { width:100%; padding:7px 10px; border-radius:6px; border:1px solid var(--border);
+          background:var(--bg); color:var(--text); }
+#results { position:absolute; z-index:10; left:0; right:0; margin:4px 0 0; padding:0; list-style:none;
+           max-height:70vh; overflow:auto; background:var(--surface); border:1px solid var(--border);
+           border-radius:6px; }
+#results li a { display:flex; gap:10px; padding:6px 10px; color:var(--text); text-decoration:none; }
+#results li a:hover, #results li a.sel { background:var(--bg); }
+#results .kind { color:var(--muted); min-width:70px; font-size:12px; }
+nav { background:var(--surface); border-right:1px solid var(--border); padding:12px 0; }
+nav ul { list-style:none; margin:0; padding:0; }
+nav a { display:block; padding:5px 20px; color:var(--muted); text-decoration:none; }
+nav a.active, nav a:hover { color:var(--text); background:var(--bg); }
+main { padding:20px 32px; min-width:0; }
+h1 { color:var(--accent); border-bottom:1px solid var(--border); padding-bottom:6px; }
+a { color:var(--accent); }
+table { border-collapse:collapse; margin:8px 0; width:100%; }
+th, td { border:1px solid var(--border); padding:6px 8px; text-align:left; vertical-align:top; }
+th { background:var(--surface); }
+pre { background:var(--code); border:1px solid var(--border); border-radius:6px; padding:12px; overflow:auto; }
+code { font-family:Consolas, "Cascadia Code", monospace; font-size:12px; }
+blockquote { border-left:3px solid var(--accent); margin:8px 0; padding:4px 12px; color:var(--muted); }
+hr { border:none; border-top:1px solid var(--border); }
+"""
+
+SEARCH_JS = r"""// Offline search over the prebuilt index in ../search/ (see site_generator.py)
+(function () {
+  "use strict";
+  var base = document.body.getAttribute("data-base") || "";
+  var input = document.getElementById("search");
+  var list = document.getElementById("results");
+  var index = null, shards = {}, waiting = {};
+  var LIMIT = 50, PREFIX = 2;
+
+  function settle(key) {
+    (waiting[key] || []).forEach(function (cb) { cb(); });
+    delete waiting[key];
+  }
+  window.pbiSearch = {
+    docs: function (data) { index = data; index.keys = new Set(data.shards); settle(""); },
+    shard: function (key, terms) {
+      var decoded = {};
+      Object.keys(terms).forEach(function (term) {
+        var gaps = terms[term], ids = new Array(gaps.length), id = 0;
+        for (var i = 0; i < gaps.length; i++) { id += gaps[i]; ids[i] = id; }
+        decoded[term] = ids;
+      });
+      shards[key] = decoded;
+      settle(key);
+    }
+  };
+
+  function hex(key) {
+    return Array.from(new TextEncoder().encode(key), function (b) {
+      return b.toString(16).padStart(2, "0");
+    }).join("");
+  }
+  function load(key, file) {
+    return new Promise(function (resolve) {
+      if (key === "" ? index : shards[key]) { resolve(); return; }
+      if (waiting[key]) { waiting[key].push(resolve); return; }
+      waiting[key] = [resolve];
+      var script = document.createElement("script");
+      script.src = base + "search/" + file;
+      script.onerror = function () { shards[key] = {}; settle(key); };
+      document.head.appendChild(script);
+    });
+  }
+
+  function tokens(text) {
+    return text.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || [];
+  }
+  function words(query) {
+    return tokens(query).filter(function (w) { return w.length >= PREFIX; });
+  }
+  // Words shorter than a shard key only filter by the symbol name
+  function nameMatches(id, short) {
+    var names = tokens(index.docs[id][1]);
+    return short.every(function (w) {
+      return names.some(function (n) { return n.startsWith(w); });
+    });
+  }
+  function match(word) {
+    var ids = new Set(), terms = shards[word.slice(0, PREFIX)] || {};
+    Object.keys(terms).forEach(function (term) {
+      if (term.startsWith(word)) terms[term].forEach(function (id) { ids.add(id); });
+    });
+    return ids;
+  }
+
+  function search(query) {
+    var ws = words(query);
+    if (!ws.length) { render([], query); return; }
+    load("", "docs.js").then(function () {
+      var keys = ws.map(function (w) { return w.slice(0, PREFIX); })
+                   .filter(function (k) { return index.keys.has(k); });
+      return Promise.all(keys.map(function (k) { return load(k, "t-" + hex(k) + ".js"); }));
+    }).then(function () {
+      if (input.value !== query) return;
+      var result = null;
+      ws.forEach(function (w) {
+        var ids = match(w);
+        result = result === null ? ids : new Set(Array.from(result).filter(function (id) { return ids.has(id); }));
+      });
+      var short = tokens(query).filter(function (w) { return w.length < PREFIX; });
+      var q = query.trim().toLowerCase();
+      var hits = Array.from(result).filter(function (id) {
+        return nameMatches(id, short);
+      }).sort(function (a, b) {
+        return rank(a, q) - rank(b, q) || a - b;
+      });
+      render(hits.slice(0, LIMIT), query);
+    });
+  }
+  function rank(id, q) {
+    var doc = index.docs[id], name = doc[1].toLowerCase();
+    return (name === q ? 0 : name.startsWith(q) ? 1 : name.indexOf(q) >= 0 ? 2 : 3) * 10 + doc[0];
+  }
+
+  function render(hits, query) {
+    list.textContent = "";
+    hits.forEach(function (id) {
+      var doc = index.docs[id], li = document.createElement("li"), a = document.createElement("a");
+      var kind = document.createElement("span"), name = document.createElement("span");
+      a.href = base + doc[2];
+      kind.className = "kind"; kind.textContent = index.kinds[doc[0]];
+      name.textContent = doc[1];
+      a.appendChild(kind); a.appendChild(name); li.appendChild(a); list.appendChild(li);
+    });
+    if (!hits.length && words(query).length) {
+      var li = document.createElement("li");
+      li.innerHTML = '<a><span class="kind">–</span><span>Keine Treffer</span></a>';
+      list.appendChild(li);
+    }
+    list.hidden = !list.children.length;
+  }
+
+  var timer = null;
+  input.addEventListener("input", function () {
+    clearTimeout(timer);
+    timer = setTimeout(function () { search(input.value); }, 80);
+  });
+  input.addEventListener("keydown", function (e) {
+    if (e.key === "Enter" && list.querySelector("a[href]")) {
+      window.location.href = list.querySelector("a[href]").href;
+    } else if (e.key === "Escape") {
+      list.hidden = true;
+    }
+  });
+  document.addEventListener("click", function (e) {
+    if (!list.contains(e.target) && e.target !== input) list.hidden = true;
+  });
+})();
+"""
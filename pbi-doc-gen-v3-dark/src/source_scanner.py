@@ -0,0 +1,206 @@
+"""
+Datenquellen-Scanner fuer M-Code.
+
+Jeder Konnektor wird als Paar (Regex, Factory) registriert. Alle Regex
+beginnen mit einem literalen Funktionsnamen (``Sql.Database``,
+``Web.Contents``, …). Die Praefixe aller Konnektoren werden zu einer
+einzigen Alternation (als Praefixbaum) kompiliert; ein ``finditer``
+darueber liest den M-Code genau einmal, und nur an den Trefferstellen
+laeuft der vollstaendige Regex des Konnektors verankert per ``match``.
+
+Ueberlappende Praefixe (eines ist Anfang oder Teil eines anderen oder
+beginnt innerhalb eines anderen) entscheidet der Dispatch: je Praefix
+ist vorberechnet, welche anderen Praefixe an welchem Versatz innerhalb
+des Treffers beginnen koennen; diese werden per ``startswith`` geprueft.
+Die Quellen kommen so in Textreihenfolge.
+
+Wiederholte Treffer mit identischem Text (derselbe Server in vielen
+Abfragen) werden vor der Factory verworfen, statt jedes Mal eine
+``DataSource`` zu erzeugen.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, Dict, Iterable, List, Match, Optional, Tuple
+
+from .models import DataSource
+
+SourceFactory = Callable[[Match], DataSource]
+
+_REGEX_META = set(".^$*+?{}[]()|")
+
+# Nach so vielen verschiedenen Treffertexten ohne Wiederholung wird die
+# Deduplizierung ueber den Treffertext fuer das Pattern abgeschaltet.
+_MEMO_PROBE = 256
+
+
+def literal_prefix(pattern: str) -> str:
+    """
+    Liefert den fuehrenden Literal-Teil eines Regex-Patterns.
+
+    ``r'Sql\\.Database\\s*\\('`` -> ``'Sql.Database'``
+    """
+    out: List[str] = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            if i + 1 < len(pattern) and pattern[i + 1] in _REGEX_META | {"\\"}:
+                out.append(pattern[i + 1])
+                i += 2
+                continue
+            break  # \s, \d, … beenden das Literal
+        if char in _REGEX_META:
+            break
+        out.append(char)
+        i += 1
+    return "".join(out)
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Alternation der ``words`` als Praefixbaum: ``Sql.X|SapHana.Y`` ->
+    ``S(?:ql\\.X|apHana\\.Y)``. sre prueft so an jeder Stelle nur den
+    Zweig des aktuellen Zeichens statt jedes Wortes einzeln; laengere
+    Woerter gewinnen gegenueber ihren Praefixen.
+    """
+    root: dict = {}
+    for word in words:
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in node.items() if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return emit(root)
+
+
+class SourceScanner:
+    """
+    Mehrfach-Pattern-Scanner fuer Datenquellen in M-Code.
+
+    ``scan`` liefert die erkannten Quellen in Reihenfolge ihres Auftretens
+    im M-Code, dedupliziert
+    ueber ``source_type::connection_info``. On-Premises-Typen werden als
+    gateway-pflichtig markiert.
+    """
+
+    def __init__(
+        self,
+        patterns: Iterable[Tuple[re.Pattern, SourceFactory]] = (),
+        onprem_types: Iterable[str] = (),
+    ):
+        self.onprem_types = set(onprem_types)
+        self._dispatch: Dict[str, List[Tuple[re.Pattern, SourceFactory]]] = {}
+        self._prefilter: Optional[re.Pattern] = None
+        self._plan: Dict[str, List[Tuple[int, Optional[str], re.Pattern, SourceFactory]]] = {}
+        for pattern, factory in patterns:
+            self.register(pattern, factory)
+
+    def register(
+        self,
+        pattern: re.Pattern,
+        factory: SourceFactory,
+        prefix: Optional[str] = None,
+    ) -> None:
+        """
+        Registriert einen Konnektor.
+
+        Ohne explizites ``prefix`` wird der Literal-Anfang des Patterns
+        verwendet; er muss mindestens 3 Zeichen lang sein.
+        """
+        if prefix is None:
+            prefix = literal_prefix(pattern.pattern)
+        if len(prefix) < 3:
+            raise ValueError(
+                f"Pattern '{pattern.pattern}' hat kein eindeutiges Literal-Praefix."
+            )
+        self._dispatch.setdefault(prefix, []).append((pattern, factory))
+        self._prefilter = None
+
+    @property
+    def prefixes(self) -> List[str]:
+        return list(self._dispatch)
+
+    def _compile(self) -> re.Pattern:
+        # Ohne Capture-Groups; der Treffertext selbst ist der Dispatch-Schluessel.
+        ordered = sorted(self._dispatch, key=len, reverse=True)
+        # Je Praefix ein flacher Plan (Versatz, Pruef-Praefix, Pattern, Factory):
+        # zuerst die eigenen Konnektoren, dann alle Praefixe, die innerhalb
+        # des Treffers beginnen koennen – ueber die springt der finditer hinweg.
+        self._plan = {}
+        for prefix in ordered:
+            plan = [(0, None, pattern, factory) for pattern, factory in self._dispatch[prefix]]
+            for offset in range(len(prefix)):
+                tail = prefix[offset:]
+                for other in ordered:
+                    if offset == 0 and other == prefix:
+                        continue
+                    # ganz im Treffer enthalten oder darueber hinausreichend
+                    if tail.startswith(other) or (offset and other.startswith(tail)):
+                        plan.extend((offset, other, pattern, factory)
+                                    for pattern, factory in self._dispatch[other])
+            self._plan[prefix] = plan
+        return re.compile(_trie_pattern(ordered) or r"(?!)")
+
+    def scan(self, m_code: str, seen: Optional[set] = None) -> List[DataSource]:
+        """
+        Erkennt alle Datenquellen in ``m_code`` in einem Durchlauf.
+
+        ``seen`` kann ueber mehrere Aufrufe geteilt werden (z.B. Partitionen
+        eines BIM-Modells), damit Quellen global nur einmal geliefert werden.
+
+        Factories muessen deterministisch sein: ein bereits ausgewerteter
+        Treffertext desselben Patterns wird nicht erneut in eine
+        ``DataSource`` umgewandelt (solange sich Treffer wiederholen).
+        """
+        if self._prefilter is None:
+            self._prefilter = self._compile()
+        if seen is None:
+            seen = set()
+        sources: List[DataSource] = []
+        plans = self._plan
+        onprem_types = self.onprem_types
+        # Pattern -> bereits ausgewertete Treffertexte (False = abgeschaltet)
+        memo: Dict[re.Pattern, object] = {}
+        repeated: set = set()
+
+        for hit in self._prefilter.finditer(m_code):
+            start = hit.start()
+            for offset, check, pattern, factory in plans[hit.group()]:
+                if check is not None and not m_code.startswith(check, start + offset):
+                    continue
+                match = pattern.match(m_code, start + offset)
+                if not match:
+                    continue
+                texts = memo.get(pattern)
+                if texts is None:
+                    texts = memo[pattern] = set()
+                if texts is not False:
+                    text = match.group()
+                    if text in texts:
+                        repeated.add(pattern)
+                        continue
+                    texts.add(text)
+                    # Keine Wiederholungen -> Merken kostet nur Zeit
+                    if len(texts) >= _MEMO_PROBE and pattern not in repeated:
+                        memo[pattern] = False
+                ds = factory(match)
+                key = f"{ds.source_type}::{ds.connection_info}"
+                if key in seen:
+                    continue
+                seen.add(key)
+                if ds.source_type in onprem_types:
+                    ds.gateway_required = True
+                sources.append(ds)
+
+        return sources
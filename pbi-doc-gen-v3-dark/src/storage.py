@@ -2,17 +2,28 @@
 Storage helpers – load / save a Project to YAML.
 
 We use PyYAML (pyyaml) which is available on virtually every Python
-installation. If not installed the tool falls back to JSON.
+installation. If not installed the tool falls back to JSON. The libyaml
+C loader/dumper is used when PyYAML was built with it.
+
+Files ending in ``.pbdg`` use the binary store (see ``binary_store``),
+which is much faster for large projects; ``convert_project`` converts
+between the formats so YAML can stay the human-readable export.
+Directories ending in ``.pbds`` use the section store (see
+``section_store``): one file per section, only changed sections are
+written. All formats are written atomically (temp file + rename).
 """
 
 from __future__ import annotations
 
 import json
 import os
+import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
+from .binary_store import BINARY_SUFFIX, load_binary, save_binary
 from .models import Project
+from .section_store import SectionStore, is_section_store
 
 # Try YAML first, fall back to JSON
 try:
@@ -21,35 +32,75 @@ try:
 except ImportError:
     HAS_YAML = False
 
+if HAS_YAML:
+    try:
+        from yaml import CSafeDumper as _YamlDumper, CSafeLoader as _YamlLoader
+    except ImportError:
+        from yaml import SafeDumper as _YamlDumper, SafeLoader as _YamlLoader
+
 DEFAULT_DATA_DIR = Path("data")
 DEFAULT_PROJECT_FILE = DEFAULT_DATA_DIR / "project.yml"
+# Default of the GUI: only changed sections are written on save
+DEFAULT_SECTION_STORE = DEFAULT_DATA_DIR / "project.pbds"
 
 
 def _ensure_dir(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
-def save_project(project: Project, path: Optional[Path] = None) -> Path:
-    """Persist project to YAML (preferred) or JSON."""
+def _write_text_atomic(path: Path, text: str) -> None:
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def save_project(
+    project: Project,
+    path: Optional[Path] = None,
+    dirty: Optional[Iterable[str]] = None,
+) -> Path:
+    """
+    Persist project to YAML (preferred) or JSON; ``.pbdg`` writes the binary
+    store, ``.pbds`` the section store. ``dirty`` names the changed sections
+    (Project field names) and limits the work for the section store; the
+    single-file formats always write everything.
+    """
     path = path or DEFAULT_PROJECT_FILE
+    if is_section_store(path):
+        store = SectionStore(path)
+        store.save(project, dirty)
+        return store.directory
+    if path.suffix == BINARY_SUFFIX:
+        return save_binary(project, path)
     _ensure_dir(path)
     data = project.to_dict()
 
     if HAS_YAML and path.suffix in (".yml", ".yaml"):
-        with open(path, "w", encoding="utf-8") as f:
-            yaml.dump(data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        text = yaml.dump(data, Dumper=_YamlDumper, default_flow_style=False,
+                         allow_unicode=True, sort_keys=False)
     else:
         if not HAS_YAML:
             path = path.with_suffix(".json")
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        text = json.dumps(data, indent=2, ensure_ascii=False)
+    _write_text_atomic(path, text)
 
     return path
 
 
-def load_project(path: Optional[Path] = None) -> Project:
-    """Load project from YAML or JSON."""
+def load_project(path: Optional[Path] = None, lazy: bool = False) -> Project:
+    """
+    Load project from YAML, JSON, the binary store (``.pbdg``) or the
+    section store (``.pbds``). With ``lazy`` a section store reads each
+    section on first access.
+    """
     path = path or DEFAULT_PROJECT_FILE
+    if is_section_store(path):
+        return SectionStore(path).load(lazy=lazy)
     if not path.exists():
         # Try alternate extension
         alt = path.with_suffix(".json") if path.suffix in (".yml", ".yaml") else path.with_suffix(".yml")
@@ -58,11 +109,14 @@ def load_project(path: Optional[Path] = None) -> Project:
         else:
             raise FileNotFoundError(f"Project file not found: {path}")
 
+    if path.suffix == BINARY_SUFFIX:
+        return load_binary(path)
+
     with open(path, "r", encoding="utf-8") as f:
         if path.suffix in (".yml", ".yaml"):
             if not HAS_YAML:
                 raise ImportError("PyYAML is required to read .yml files. Install with: pip install pyyaml")
-            data = yaml.safe_load(f) or {}
+            data = yaml.load(f, Loader=_YamlLoader) or {}
         else:
             data = json.load(f)
 
@@ -71,7 +125,26 @@ def load_project(path: Optional[Path] = None) -> Project:
 
 def project_exists(path: Optional[Path] = None) -> bool:
     path = path or DEFAULT_PROJECT_FILE
+    if is_section_store(path):
+        return SectionStore(path).exists()
     if path.exists():
         return True
     alt = path.with_suffix(".json") if path.suffix in (".yml", ".yaml") else path.with_suffix(".yml")
     return alt.exists()
+
+
+def default_project_source() -> Path:
+    """
+    Where the GUI loads its default project from: the section store if it
+    exists, else a legacy ``data/project.yml`` (or .json). Saving always
+    goes to ``DEFAULT_SECTION_STORE``, so a legacy file is migrated on the
+    first save and left in place as a backup.
+    """
+    if project_exists(DEFAULT_SECTION_STORE) or not project_exists(DEFAULT_PROJECT_FILE):
+        return DEFAULT_SECTION_STORE
+    return DEFAULT_PROJECT_FILE
+
+
+def convert_project(source: Path, target: Path) -> Path:
+    """Convert between .yml/.yaml, .json, .pbdg and .pbds (format taken from the suffixes)."""
+    return save_project(load_project(source), target)
@@ -3,7 +3,7 @@ Main window – wires all pages, sidebar, toolbar, and actions together.
 """
 
 from __future__ import annotations
-import os, sys, traceback
+import multiprocessing, os, sys, traceback
 from pathlib import Path
 from typing import Optional
 
@@ -32,8 +32,12 @@ try:
         Permissions, StorageStructure, NamingConventions, ChangeGuidance,
         _new_id, _today,
     )
-    from ..storage import save_project, load_project, project_exists, DEFAULT_PROJECT_FILE
-    from ..generator import generate_docs
+    from ..storage import (
+        save_project, load_project, project_exists, default_project_source, DEFAULT_SECTION_STORE,
+    )
+    from ..section_store import SECTIONS as PROJECT_SECTIONS
+    from ..generator import update_docs
+    from ..site_generator import generate_site
     from ..pdf_export import generate_pdf, default_pdf_filename, get_pdf_section_labels
     from ..import_manager import (
         ImportOptions, ImportReport, ImportPreview,
@@ -59,8 +63,12 @@ except ImportError:
         Permissions, StorageStructure, NamingConventions, ChangeGuidance,
         _new_id, _today,
     )
-    from src.storage import save_project, load_project, project_exists, DEFAULT_PROJECT_FILE
-    from src.generator import generate_docs
+    from src.storage import (
+        save_project, load_project, project_exists, default_project_source, DEFAULT_SECTION_STORE,
+    )
+    from src.section_store import SECTIONS as PROJECT_SECTIONS
+    from src.generator import update_docs
+    from src.site_generator import generate_site
     from src.pdf_export import generate_pdf, default_pdf_filename, get_pdf_section_labels
     from src.import_manager import (
         ImportOptions, ImportReport, ImportPreview,
@@ -458,16 +466,17 @@ class PowerQueryPage(ListEditorPage):
         self.f_transforms = QTextEdit(); self.f_transforms.setMaximumHeight(60)
         self.f_mcode = CodeEditor("let\n    Source = ...\nin\n    Source")
         self.f_mcode.setMinimumHeight(150)
-        self.f_output = QLineEdit(); self.f_notes = QLineEdit()
+        self.f_output = QLineEdit(); self.f_group = QLineEdit(); self.f_notes = QLineEdit()
         form.addRow("Abfragename *:", self.f_name); form.addRow("Zweck:", self.f_purpose)
         form.addRow("Eingaben:", self.f_inputs); form.addRow("Transformationen:", self.f_transforms)
         form.addRow("M-Code:", self.f_mcode)
-        form.addRow("Ausgabetabelle:", self.f_output); form.addRow("Hinweise:", self.f_notes)
+        form.addRow("Ausgabetabelle:", self.f_output); form.addRow("Abfragegruppe:", self.f_group)
+        form.addRow("Hinweise:", self.f_notes)
     def _validate(self):
         if not self.f_name.text().strip(): return "Abfragename ist erforderlich."
         return None
     def _clear_form(self):
-        for w in (self.f_name, self.f_purpose, self.f_inputs, self.f_output, self.f_notes): w.clear()
+        for w in (self.f_name, self.f_purpose, self.f_inputs, self.f_output, self.f_group, self.f_notes): w.clear()
         self.f_transforms.clear(); self.f_mcode.clear()
     def _item_to_row(self, q): return [q.query_name, q.purpose, q.output_table]
     def form_to_item(self, existing=None):
@@ -475,13 +484,13 @@ class PowerQueryPage(ListEditorPage):
         q.query_name=self.f_name.text().strip(); q.purpose=self.f_purpose.text().strip()
         q.inputs=self.f_inputs.text().strip(); q.major_transformations=self.f_transforms.toPlainText().strip()
         q.m_code=self.f_mcode.toPlainText(); q.output_table=self.f_output.text().strip()
-        q.notes=self.f_notes.text().strip()
+        q.query_group=self.f_group.text().strip(); q.notes=self.f_notes.text().strip()
         return q
     def load_to_form(self, q):
         self.f_name.setText(q.query_name); self.f_purpose.setText(q.purpose)
         self.f_inputs.setText(q.inputs); self.f_transforms.setPlainText(q.major_transformations)
         self.f_mcode.setPlainText(q.m_code); self.f_output.setText(q.output_table)
-        self.f_notes.setText(q.notes)
+        self.f_group.setText(q.query_group); self.f_notes.setText(q.notes)
 
 
 class DataModelPage(FormPage):
@@ -990,6 +999,7 @@ class PdfSectionDialog:
 
 def _make_list_wiring(main_win, page, project_list_attr):
     """Generic wiring for ListEditorPage add/edit/delete to project model list."""
+    attr = project_list_attr
     def get_list(): return getattr(main_win.project, project_list_attr)
 
     def sync():
@@ -1004,6 +1014,8 @@ def _make_list_wiring(main_win, page, project_list_attr):
         if err: QMessageBox.warning(main_win, "Validierung", err); return
         item = page.form_to_item()
         get_list().append(item)
+        main_win.project.invalidate_indexes(get_list())
+        main_win._dirty.add(attr)
         page.load_items(get_list()); page._clear_form()
         main_win._toast(f"Hinzugefuegt")
 
@@ -1014,6 +1026,9 @@ def _make_list_wiring(main_win, page, project_list_attr):
         err = page._validate()
         if err: QMessageBox.warning(main_win, "Validierung", err); return
         page.form_to_item(lst[idx]); page.load_items(lst)
+        # Schluesselfeld (Name) kann geaendert sein -> Merge-Index neu aufbauen
+        main_win.project.invalidate_indexes(lst)
+        main_win._dirty.add(attr)
         main_win._toast("Aktualisiert")
 
     def delete():
@@ -1021,6 +1036,8 @@ def _make_list_wiring(main_win, page, project_list_attr):
         if idx < 0 or idx >= len(lst):
             QMessageBox.information(main_win, "Hinweis", "Bitte Zeile auswaehlen."); return
         del lst[idx]; page.load_items(lst); page._editing_row = -1; page._clear_form()
+        main_win.project.invalidate_indexes(lst)
+        main_win._dirty.add(attr)
         main_win._toast("Geloescht")
 
     page.table.itemSelectionChanged.connect(sync)
@@ -1108,12 +1125,15 @@ class ImportDialog(QMessageBox):
         self.rb_replace = QRadioButton("Bestehende Daten ersetzen")
         self.rb_replace.setChecked(True)
         self.rb_merge = QRadioButton("Nur fehlende ergaenzen (Merge)")
+        self.rb_update = QRadioButton("Ergaenzen und Geaendertes aktualisieren (Update)")
         self.rb_append = QRadioButton("An bestehende anhaengen (Append)")
         self.merge_group.addButton(self.rb_replace, 0)
         self.merge_group.addButton(self.rb_merge, 1)
         self.merge_group.addButton(self.rb_append, 2)
+        self.merge_group.addButton(self.rb_update, 3)
         merge_lay.addWidget(self.rb_replace)
         merge_lay.addWidget(self.rb_merge)
+        merge_lay.addWidget(self.rb_update)
         merge_lay.addWidget(self.rb_append)
         opt_lay.addWidget(merge_grp)
 
@@ -1158,7 +1178,7 @@ class ImportDialog(QMessageBox):
             self._dlg,
             "Power BI Datei waehlen",
             str(Path.cwd()),
-            "Power BI Dateien (*.pbix *.pbit *.bim);;JSON (*.json);;Alle (*)",
+            "Power BI Dateien (*.pbix *.pbit *.pbip *.pbir *.bim);;JSON (*.json);;Alle (*)",
         )
         if path:
             self._file_path = Path(path)
@@ -1179,6 +1199,8 @@ class ImportDialog(QMessageBox):
         type_labels = {
             "pbix": ".pbix (Power BI Desktop)",
             "pbit": ".pbit (Power BI Template)",
+            "pbip": ".pbip (Power BI Projekt)",
+            "pbir": "PBIR (Report-Ordner)",
             "bim": ".bim (Tabular Model)",
             "json_bim": ".json (BIM / Tabular Model)",
             "unknown": "Unbekannt",
@@ -1186,16 +1208,17 @@ class ImportDialog(QMessageBox):
         self.lbl_filetype.setText(f"Erkannt: {type_labels.get(ftype, ftype)}")
 
         try:
-            self._preview = preview_import(self._file_path)
+            self._preview = preview_import(self._file_path, use_cache=True, fast=True)
             self.preview_grp.setVisible(True)
 
+            ca = "ca. " if self._preview.is_estimate else ""
             lines = [
-                f"📊 {self._preview.page_count} Seiten, {self._preview.visual_count} Visuals",
-                f"⚙️  {self._preview.query_count} Power Queries",
-                f"🗄️  {self._preview.source_count} Datenquellen erkannt",
+                f"📊 {ca}{self._preview.page_count} Seiten, {ca}{self._preview.visual_count} Visuals",
+                f"⚙️  {ca}{self._preview.query_count} Power Queries",
+                f"🗄️  {ca}{self._preview.source_count} Datenquellen erkannt",
                 f"📐 {self._preview.measure_count} Measures",
                 f"🔗 {self._preview.relationship_count} Beziehungen",
-                f"🗃️  {self._preview.table_count} Tabellen",
+                f"🗃️  {ca}{self._preview.table_count} Tabellen",
             ]
             # Nicht-verfuegbare Elemente kennzeichnen
             for i, lbl_text in enumerate(lines):
@@ -1218,12 +1241,13 @@ class ImportDialog(QMessageBox):
     def get_options(self) -> ImportOptions:
         """Liefert die vom User gewaehlten Import-Optionen."""
         mode_id = self.merge_group.checkedId()
-        mode = {0: "replace", 1: "merge", 2: "append"}.get(mode_id, "replace")
+        mode = {0: "replace", 1: "merge", 2: "append", 3: "update"}.get(mode_id, "replace")
         return ImportOptions(
             merge_mode=mode,
             import_measures_as_kpis=self.chk_kpis.isChecked(),
             skip_hidden_tables=self.chk_skip_hidden.isChecked(),
             detect_table_types=self.chk_detect_types.isChecked(),
+            use_cache=True,
         )
 
     def get_file_path(self) -> Optional[Path]:
@@ -1240,7 +1264,10 @@ class MainWindow(QMainWindow):
         self.setMinimumSize(1150, 780)
         self.resize(1350, 870)
         self.project = Project()
-        self.project_path = DEFAULT_PROJECT_FILE
+        # Abschnitts-Speicher: beim Speichern nur geaenderte Abschnitte schreiben
+        self.project_path = DEFAULT_SECTION_STORE
+        # Seit dem letzten Speichern geaenderte Projektfelder (Abschnitts-Speicher)
+        self._dirty: set = set(PROJECT_SECTIONS)
 
         central = QWidget(); self.setCentralWidget(central)
         main_lay = QHBoxLayout(central)
@@ -1266,6 +1293,9 @@ class MainWindow(QMainWindow):
         self.btn_md = QPushButton("📄  Markdown"); self.btn_md.setCursor(Qt.PointingHandCursor)
         self.btn_md.clicked.connect(self._gen_md); tbl.addWidget(self.btn_md)
 
+        self.btn_site = QPushButton("🌐  HTML-Seite"); self.btn_site.setCursor(Qt.PointingHandCursor)
+        self.btn_site.clicked.connect(self._gen_site); tbl.addWidget(self.btn_site)
+
         self.btn_pdf = QPushButton("📕  PDF-Report"); self.btn_pdf.setObjectName("accent")
         self.btn_pdf.setCursor(Qt.PointingHandCursor); self.btn_pdf.clicked.connect(self._gen_pdf)
         tbl.addWidget(self.btn_pdf)
@@ -1341,6 +1371,11 @@ class MainWindow(QMainWindow):
             self._collect_all()
             self.pg_preview.set_project(self.project)
 
+    # Formular-Seiten schreiben bei jedem Sammeln zurueck -> beim Speichern immer pruefen;
+    # der Abschnitts-Speicher schreibt davon nur, was sich wirklich geaendert hat
+    _FORM_SECTIONS = {"meta", "ci_branding", "data_model", "governance", "permissions",
+                      "storage_structure", "naming_conventions", "change_guidance", "screenshots"}
+
     def _collect_all(self):
         self.pg_meta.save(self.project.meta)
         self.pg_ci.save(self.project.ci_branding)
@@ -1352,11 +1387,15 @@ class MainWindow(QMainWindow):
         self.pg_chg_guide.save(self.project.change_guidance)
 
     def _try_load(self):
-        if project_exists():
+        # Ein altes data/project.yml wird geladen und beim ersten Speichern
+        # in den Abschnitts-Speicher uebernommen (die .yml bleibt liegen)
+        source = default_project_source()
+        if project_exists(source):
             try:
-                self.project = load_project()
+                self.project = load_project(source)
+                self._dirty = set()
                 self._refresh_all()
-                self.statusBar().showMessage(f"Projekt geladen: {DEFAULT_PROJECT_FILE}")
+                self.statusBar().showMessage(f"Projekt geladen: {source}")
             except Exception as e:
                 self.statusBar().showMessage(f"Fehler: {e}")
         self.pg_dash.refresh(self.project, str(self.project_path))
@@ -1383,15 +1422,17 @@ class MainWindow(QMainWindow):
                                       QMessageBox.Yes | QMessageBox.No)
             if r != QMessageBox.Yes: return
         self.project = Project(); self.project.meta.date = _today()
+        self._dirty = set(PROJECT_SECTIONS)
         self._refresh_all(); self.sidebar.select(1); self.stack.setCurrentIndex(1)
 
     def _open_file(self):
         path, _ = QFileDialog.getOpenFileName(self, "Projektdatei oeffnen", str(Path.cwd()),
-                    "Projekte (*.yml *.yaml *.json);;Alle (*)")
+                    "Projekte (*.yml *.yaml *.json *.pbdg manifest.json);;Alle (*)")
         if path:
             try:
                 self.project = load_project(Path(path))
                 self.project_path = Path(path)
+                self._dirty = set()
                 self._refresh_all(); self.pg_dash.refresh(self.project, path)
                 self.sidebar.select(0); self.stack.setCurrentIndex(0)
                 self.statusBar().showMessage(f"Geladen: {path}")
@@ -1421,6 +1462,7 @@ class MainWindow(QMainWindow):
 
         try:
             report = import_file(file_path, self.project, options)
+            self._dirty |= report.changes.changed_project_fields()
             prog.close()
 
             self._refresh_all()
@@ -1451,8 +1493,10 @@ class MainWindow(QMainWindow):
         err = self.pg_meta.validate()
         if err: QMessageBox.warning(self, "Validierung", err); return
         try:
-            p = save_project(self.project, self.project_path)
+            p = save_project(self.project, self.project_path,
+                             dirty=self._dirty | self._FORM_SECTIONS)
             self.project_path = p
+            self._dirty = set()
             self.statusBar().showMessage(f"Gespeichert: {p}")
             self._toast("Projekt gespeichert")
         except Exception as e:
@@ -1461,9 +1505,22 @@ class MainWindow(QMainWindow):
     def _gen_md(self):
         self._save()
         try:
-            out = generate_docs(self.project)
+            update = update_docs(self.project)
+            QMessageBox.information(self, "Erfolg",
+                f"Markdown generiert:\n{update.root.resolve()}\n"
+                f"{len(update.changed)} Datei(en) geaendert, {len(update.unchanged)} unveraendert."
+                f"\n\nOeffne docs/index.md als Einstiegspunkt.")
+        except Exception as e:
+            QMessageBox.critical(self, "Fehler", str(e))
+
+    def _gen_site(self):
+        self._save()
+        try:
+            build = generate_site(self.project)
             QMessageBox.information(self, "Erfolg",
-                f"Markdown generiert:\n{out.resolve()}\n\nOeffne docs/index.md als Einstiegspunkt.")
+                f"HTML-Seite generiert:\n{build.root.resolve()}\n"
+                f"{build.symbols} Symbole im Suchindex ({build.shards} Shards)."
+                f"\n\nOeffne site/index.html im Browser (kein Server noetig).")
         except Exception as e:
             QMessageBox.critical(self, "Fehler", str(e))
 
@@ -1508,6 +1565,7 @@ class MainWindow(QMainWindow):
 # ══════════════════════════════════════════════════════════════════
 
 def run():
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     app.setStyleSheet(GLOBAL_QSS)
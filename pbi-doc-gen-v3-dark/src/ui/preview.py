@@ -19,6 +19,7 @@ from ..generator import (
     gen_index, gen_overview, gen_kpis, gen_data_sources, gen_queries,
     gen_data_model, gen_measures, gen_pages_visuals,
     gen_refresh_gateway_rls, gen_assumptions_limitations, gen_change_log,
+    preview_markdown,
 )
 
 
@@ -269,7 +270,7 @@ class PreviewPage(QWidget):
             self.raw_view.setPlainText("")
             return
         _, _, gen_fn = PREVIEW_SECTIONS[self._current_section]
-        md = gen_fn(self._project)
+        md = preview_markdown(gen_fn, self._project)
         self.raw_view.setPlainText(md)
         html = _md_to_html(md)
         full_html = f"""
@@ -287,7 +288,7 @@ class PreviewPage(QWidget):
             return
         all_md = []
         for _, label, gen_fn in PREVIEW_SECTIONS:
-            all_md.append(gen_fn(self._project))
+            all_md.append(preview_markdown(gen_fn, self._project))
             all_md.append("\n\n---\n\n")
         combined = "\n".join(all_md)
         self.raw_view.setPlainText(combined)
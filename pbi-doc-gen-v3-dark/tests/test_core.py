@@ -11,15 +11,31 @@ import sys
 import tempfile
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
 
 # Ensure src is on path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from src.models import Project, ProjectMeta, KPI, DataSource, Measure, ChangeLogEntry, Environment
-from src.storage import save_project, load_project
-from src.generator import gen_measures, gen_data_sources, gen_kpis, gen_change_log, generate_docs
+from src.models import (
+    Project, ProjectMeta, KPI, DataSource, Measure, ChangeLogEntry, Environment,
+    ModelTable, PowerQuery, ReportPage, Visual,
+)
+from src.storage import save_project, load_project, convert_project, default_project_source
+from src.binary_store import MAGIC
+from src.section_store import LazyProject, SectionStore, SECTIONS
+from src.site_generator import build_search_index, generate_site, markdown_to_html
+from src.generator import (
+    gen_measures, gen_data_sources, gen_kpis, gen_change_log, generate_docs, update_docs,
+    iter_measures, preview_markdown, section_fingerprint,
+)
 from src.importers import import_measures_from_file, export_measures_to_file
 
+try:
+    from src.ui.mainwindow import MainWindow
+except ImportError:     # PySide6 not installed
+    MainWindow = None
+
 
 class TestModelsRoundTrip(unittest.TestCase):
     """Test that Project can round-trip through dict serialization."""
@@ -93,6 +109,247 @@ class TestStorage(unittest.TestCase):
         with self.assertRaises(FileNotFoundError):
             load_project(Path("/nonexistent/path.yml"))
 
+    def _rich_project(self) -> Project:
+        from src.models import ModelTable, ModelRelationship, ReportPage, Visual
+        p = self._make_project()
+        p.meta.environments = [Environment(name="PROD", workspace="WS")]
+        p.measures.append(Measure(name="Ümlaut ✓", dax_code='VAR x = "a\nb"\nRETURN x'))
+        p.data_model.tables = [ModelTable(name="Fact", table_type="fact")]
+        p.data_model.relationships = [ModelRelationship(from_table="Fact", to_table="Dim")]
+        p.data_model.notes = "Sternschema"
+        p.report_pages = [ReportPage(page_name="P1", visuals=[Visual(name="Card")])]
+        p.change_log = [ChangeLogEntry(version="1.0", description="Init")]
+        return p
+
+    def test_save_load_binary(self):
+        p = self._rich_project()
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "test.pbdg"
+            save_project(p, path)
+            self.assertEqual(path.read_bytes()[:4], MAGIC)
+            p2 = load_project(path)
+        self.assertEqual(p2.to_dict(), p.to_dict())
+
+    def test_binary_rejects_truncated_file(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "test.pbdg"
+            save_project(self._rich_project(), path)
+            path.write_bytes(path.read_bytes()[:-3])
+            with self.assertRaises(ValueError):
+                load_project(path)
+
+    def test_convert_yaml_binary_roundtrip(self):
+        try:
+            import yaml
+        except ImportError:
+            self.skipTest("PyYAML not installed")
+        p = self._rich_project()
+        with tempfile.TemporaryDirectory() as td:
+            yml = save_project(p, Path(td) / "a.yml")
+            binary = convert_project(yml, Path(td) / "b.pbdg")
+            back = convert_project(binary, Path(td) / "c.yml")
+            self.assertEqual(load_project(back).to_dict(), p.to_dict())
+            self.assertEqual(back.read_text(encoding="utf-8"), yml.read_text(encoding="utf-8"))
+
+
+class TestSectionStore(unittest.TestCase):
+    """Test the incremental per-section project store."""
+
+    def setUp(self):
+        self._td = tempfile.TemporaryDirectory()
+        self.addCleanup(self._td.cleanup)
+        self.path = Path(self._td.name) / "project.pbds"
+        self.project = Project()
+        self.project.meta.report_name = "Sections"
+        self.project.measures = [Measure(name=f"M{i}", dax_code="1" * 500) for i in range(50)]
+        self.project.kpis = [KPI(name="KPI A")]
+
+    def _files(self):
+        return sorted(p.name for p in self.path.iterdir())
+
+    def test_first_save_writes_all_sections(self):
+        written = SectionStore(self.path).save(self.project)
+        self.assertEqual(sorted(written), sorted(SECTIONS))
+        self.assertEqual(len(self._files()), len(SECTIONS) + 1)
+        self.assertEqual(load_project(self.path).to_dict(), self.project.to_dict())
+
+    def test_only_dirty_changed_sections_written(self):
+        store = SectionStore(self.path)
+        store.save(self.project)
+        self.assertEqual(store.save(self.project), [])
+        before = self._files()
+        self.project.meta.owner = "Neu"
+        self.project.measures[0].dax_code = "2"     # not marked dirty -> not written
+        self.assertEqual(store.save(self.project, dirty={"meta"}), ["meta"])
+        after = self._files()
+        self.assertEqual(len(after), len(before))
+        self.assertEqual(len(set(after) - set(before)), 1)   # old meta file replaced
+        loaded = load_project(self.path)
+        self.assertEqual(loaded.meta.owner, "Neu")
+        self.assertEqual(loaded.measures[0].dax_code, "1" * 500)
+        # Without a dirty set every section is hashed and the change is found
+        self.assertEqual(store.save(self.project), ["measures"])
+
+    def test_crash_before_manifest_keeps_previous_state(self):
+        store = SectionStore(self.path)
+        store.save(self.project)
+        self.project.meta.owner = "Verloren"
+        real_replace = os.replace
+
+        def failing_replace(src, dst):
+            if Path(dst).name == "manifest.json":
+                raise OSError("disk full")
+            return real_replace(src, dst)
+
+        import src.section_store as section_store
+        section_store.os.replace = failing_replace
+        try:
+            with self.assertRaises(OSError):
+                SectionStore(self.path).save(self.project, dirty={"meta"})
+        finally:
+            section_store.os.replace = real_replace
+        self.assertEqual(load_project(self.path).meta.owner, "")
+        self.assertFalse(any(name.endswith(".tmp") for name in self._files()))
+
+    def test_lazy_load_reads_on_access(self):
+        save_project(self.project, self.path)
+        lazy = load_project(self.path, lazy=True)
+        self.assertIsInstance(lazy, LazyProject)
+        self.assertEqual(lazy.loaded_sections(), set())
+        self.assertEqual(lazy.meta.report_name, "Sections")
+        self.assertEqual(lazy.loaded_sections(), {"meta"})
+        # Saving a lazy project only considers loaded sections
+        lazy.meta.owner = "Lazy"
+        self.assertEqual(SectionStore(self.path).save(lazy), ["meta"])
+        self.assertEqual(lazy.to_dict(), load_project(self.path).to_dict())
+
+    def test_save_project_with_manifest_path(self):
+        saved = save_project(self.project, self.path / "manifest.json")
+        self.assertEqual(saved, self.path)
+        self.assertEqual(load_project(self.path / "manifest.json").kpis[0].name, "KPI A")
+
+
+@unittest.skipIf(MainWindow is None, "PySide6 not installed")
+class TestGuiSave(unittest.TestCase):
+    """MainWindow._save writes the section store incrementally."""
+
+    def setUp(self):
+        self._td = tempfile.TemporaryDirectory()
+        self.addCleanup(self._td.cleanup)
+        self.tmp = Path(self._td.name)
+
+    def _window(self, project, path):
+        return SimpleNamespace(
+            project=project, project_path=path, _dirty=set(),
+            _FORM_SECTIONS=MainWindow._FORM_SECTIONS, _collect_all=lambda: None,
+            pg_meta=SimpleNamespace(validate=lambda: ""),
+            statusBar=lambda: SimpleNamespace(showMessage=lambda msg: None),
+            _toast=lambda msg: None,
+        )
+
+    def test_save_after_one_section_edit_rewrites_only_that_section(self):
+        store = self.tmp / "project.pbds"
+        project = Project()
+        project.meta.report_name = "GUI"
+        project.measures = [Measure(name=f"M{i}", dax_code="1") for i in range(20)]
+        save_project(project, store)
+        before = {p.name: p.stat().st_mtime_ns for p in store.iterdir()}
+
+        window = self._window(load_project(store), store)
+        window.project.kpis.append(KPI(name="Neu"))     # as the list editor does
+        window._dirty.add("kpis")
+        MainWindow._save(window)
+
+        after = {p.name: p.stat().st_mtime_ns for p in store.iterdir()}
+        added = set(after) - set(before)
+        self.assertEqual([name.split("-")[0] for name in added], ["kpis"])
+        self.assertEqual([name.split("-")[0] for name in set(before) - set(after)], ["kpis"])
+        untouched = {name for name in before if name in after and name != "manifest.json"}
+        self.assertEqual({name: after[name] for name in untouched},
+                         {name: before[name] for name in untouched})
+        self.assertEqual(window._dirty, set())
+        self.assertEqual(load_project(store).kpis[0].name, "Neu")
+
+    def test_legacy_yml_is_migrated_on_first_save(self):
+        data = self.tmp / "data"
+        legacy, store = data / "project.yml", data / "project.pbds"
+        project = Project()
+        project.meta.report_name = "Alt"
+        save_project(project, legacy)
+        with mock.patch("src.storage.DEFAULT_PROJECT_FILE", legacy), \
+                mock.patch("src.storage.DEFAULT_SECTION_STORE", store):
+            source = default_project_source()
+            self.assertEqual(source.stem, "project")
+            window = self._window(load_project(source), store)
+            MainWindow._save(window)
+            self.assertEqual(default_project_source(), store)
+        self.assertEqual(load_project(store).meta.report_name, "Alt")
+        self.assertTrue(legacy.exists() or legacy.with_suffix(".json").exists())
+
+
+class TestSite(unittest.TestCase):
+
+    def _make_project(self) -> Project:
+        p = Project()
+        p.meta = ProjectMeta(report_name="Site Test")
+        p.measures = [
+            Measure(name="Total Sales", display_folder="Sales",
+                    dax_code="SUMX('Fact Sales', 'Fact Sales'[Amount]) // Kommentar xyz"),
+            Measure(name="Margin", dax_code="DIVIDE([Total Sales], Cost[Value])"),
+        ]
+        p.data_model.tables = [ModelTable(name="Fact Sales", table_type="fact")]
+        p.power_queries = [PowerQuery(query_name="Load Customers", query_group="Dim")]
+        p.report_pages = [ReportPage(page_name="Overview", visuals=[Visual(name="Revenue Card")])]
+        return p
+
+    def test_search_index_symbols_and_terms(self):
+        index = build_search_index(self._make_project())
+        names = lambda q: [index.docs[i][1] for i in index.search(q)]
+        self.assertEqual(names("sumx"), ["Total Sales"])
+        self.assertEqual(names("amount"), ["Total Sales", "Fact Sales[Amount]"])
+        self.assertEqual(names("cost val"), ["Margin", "Cost[Value]"])
+        self.assertEqual(names("revenue"), ["Overview"])
+        self.assertEqual(names("dim"), ["Load Customers"])
+        self.assertEqual(names("overview o"), ["Overview"])
+        self.assertEqual(names("overview x"), [])
+        self.assertEqual(names("xyz"), [])   # comments are not indexed
+        self.assertEqual(index.docs[0], ("measure", "Total Sales", "05_measures/measures.html#total-sales"))
+
+    def test_shards_are_gap_encoded(self):
+        index = build_search_index(self._make_project())
+        shards = index.shards()
+        self.assertEqual(shards["su"]["sumx"], [0])
+        # Total Sales, Margin (via [Total Sales]), Fact Sales, Fact Sales[Amount]
+        self.assertEqual(shards["sa"]["sales"], [0, 1, 1, 1])
+        self.assertEqual(sum(len(terms) for terms in shards.values()), len(index.postings))
+
+    def test_markdown_to_html_streamed(self):
+        out = "".join(markdown_to_html(["# A b\n\n```dax\nX <", " 1\n```\n| a | b \\| c |\n|---|---|\n",
+                                        "| [l](x/y.md#z) | `c` |\n"]))
+        self.assertIn('<h1 id="a-b">A b</h1>', out)
+        self.assertIn('<code class="language-dax">X &lt; 1\n</code></pre>', out)
+        self.assertIn("<th>b | c</th>", out)
+        self.assertIn('<td><a href="x/y.html#z">l</a></td><td><code>c</code></td>', out)
+
+    def test_generate_site(self):
+        p = self._make_project()
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td) / "site"
+            build = generate_site(p, root)
+            page = (root / "05_measures" / "measures.html").read_text(encoding="utf-8")
+            self.assertIn('<h2 id="total-sales">Total Sales</h2>', page)
+            self.assertIn('href="../assets/site.css"', page)
+            self.assertTrue((root / "index.html").exists())
+            docs = (root / "search" / "docs.js").read_text(encoding="utf-8")
+            self.assertTrue(docs.startswith("pbiSearch.docs({"))
+            self.assertEqual(build.symbols, 7)
+            self.assertTrue((root / "search" / f"t-{'to'.encode().hex()}.js").exists())
+
+            self.assertEqual(generate_site(p, root).changed, [])
+            p.power_queries = []
+            again = generate_site(p, root)
+            self.assertIn(root / "search" / f"t-{'lo'.encode().hex()}.js", again.removed)
+
 
 class TestGenerator(unittest.TestCase):
     """Test Markdown generation."""
@@ -150,6 +407,86 @@ class TestGenerator(unittest.TestCase):
             self.assertTrue((out / "02_data_sources" / "data_sources.md").exists())
             self.assertTrue((out / "08_change_log" / "change_log.md").exists())
 
+    def test_section_fingerprint_separates_fields(self):
+        def fingerprint(*measures):
+            p = Project()
+            p.measures = list(measures)
+            return section_fingerprint(p, "05_measures/measures.md")
+        base = fingerprint(Measure(id="1", name="ab", description=""))
+        self.assertEqual(base, fingerprint(Measure(id="1", name="ab", description="")))
+        self.assertNotEqual(base, fingerprint(Measure(id="1", name="a", description="b")))
+        self.assertNotEqual(base, fingerprint(Measure(id="1", name="ab"), Measure(id="1")))
+
+    def test_iter_measures_matches_gen_measures(self):
+        p = self._make_project()
+        chunks = list(iter_measures(p))
+        self.assertGreater(len(chunks), 2)
+        self.assertEqual("".join(chunks), gen_measures(p))
+        self.assertEqual("".join(iter_measures(Project())), gen_measures(Project()))
+
+    def test_preview_markdown_truncates(self):
+        p = self._make_project()
+        self.assertEqual(preview_markdown(gen_measures, p), gen_measures(p))
+        short = preview_markdown(gen_measures, p, limit=10)
+        self.assertIn("Vorschau gekürzt", short)
+        self.assertNotIn("Avg Hours", short)
+
+    def test_update_docs_skips_unchanged_sections(self):
+        p = self._make_project()
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td) / "docs"
+            first = update_docs(p, root)
+            self.assertEqual(len(first.changed), 15)
+            mtimes = {f: f.stat().st_mtime_ns for f in first.changed}
+            second = update_docs(p, root)
+            self.assertEqual(second.changed, [])
+            self.assertEqual({f: f.stat().st_mtime_ns for f in first.changed}, mtimes)
+
+    def test_update_docs_one_measure_edit(self):
+        p = self._make_project()
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td) / "docs"
+            update_docs(p, root)
+            p.measures[0].description = "Neu"
+            self.assertEqual(update_docs(p, root).changed, [root / "05_measures" / "measures.md"])
+
+    def test_update_docs_sharded(self):
+        p = self._make_project()
+        p.measures.append(Measure(name="Umsatz", dax_code="SUM(F[Amount])", display_folder="Sales"))
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td) / "docs"
+            first = update_docs(p, root, sharded=True, workers=2)
+            index = (root / "05_measures" / "measures.md").read_text(encoding="utf-8")
+            self.assertIn("**3 Measures in 2 Dateien**", index)
+            self.assertIn("| Time | 2 | [folders/time.md](folders/time.md) |", index)
+            time_md = (root / "05_measures" / "folders" / "time.md").read_text(encoding="utf-8")
+            self.assertIn("Total Hours", time_md)
+            self.assertNotIn("Umsatz", time_md)
+            self.assertIn(root / "05_measures" / "folders" / "sales.md", first.changed)
+
+            # Only the edited shard is rewritten; counts and index stay the same
+            p.measures[2].description = "Netto"
+            self.assertEqual(update_docs(p, root, sharded=True).changed,
+                             [root / "05_measures" / "folders" / "sales.md"])
+
+            # Back to the single-file layout: shards are removed
+            back = update_docs(p, root)
+            self.assertIn(root / "05_measures" / "folders" / "time.md", back.removed)
+            self.assertFalse((root / "05_measures" / "folders").exists())
+            self.assertIn("Umsatz", (root / "05_measures" / "measures.md").read_text(encoding="utf-8"))
+
+    def test_update_docs_restores_deleted_file_and_force(self):
+        p = self._make_project()
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td) / "docs"
+            update_docs(p, root)
+            (root / "index.md").unlink()
+            self.assertEqual(update_docs(p, root).changed, [root / "index.md"])
+            # force renders everything but still only writes differing content
+            forced = update_docs(p, root, force=True)
+            self.assertEqual(forced.changed, [])
+            self.assertEqual(len(forced.unchanged), 15)
+
 
 class TestImporters(unittest.TestCase):
     """Test measure import/export."""
@@ -8,11 +8,14 @@ Run:  python -m pytest tests/test_parsers.py -v
 import io
 import json
 import os
+import re
 import struct
 import sys
 import tempfile
+import threading
 import unittest
 import zipfile
+from unittest import mock
 from pathlib import Path
 
 # Ensure src is on path
@@ -24,17 +27,38 @@ from src.models import (
 )
 from src.pbix_parser import (
     PbixImportResult, parse_pbix, VISUAL_TYPE_MAP, _visual_type_label,
-    _split_m_queries, _detect_sources,
+    _split_m_queries, _detect_sources, _parse_datamashup, LayoutReader,
 )
+from src.datamashup import MemoryViewReader, read_datamashup
+from src.source_scanner import SourceScanner, literal_prefix
+from src.m_lexer import iter_shared_members
 from src.bim_parser import (
     BimImportResult, parse_bim, is_bim_format,
-    _detect_dependencies, _detect_filter_context,
+    _detect_filter_context,
 )
 from src.import_manager import (
     ImportOptions, ImportReport, ImportPreview,
-    import_file, preview_import, detect_file_type, _merge_list,
+    import_file, preview_import, detect_file_type, _merge_list, ImportSession,
+    _parse_session_source, _SessionSource,
+)
+from src.pbitools_parser import (
+    ExtractionCache, pbitools_available, parse_pbix_with_pbitools,
+)
+from src.datamodel_reader import (
+    HAS_PBIXRAY, XPRESS9_SIGNATURE, has_datamodel, model_to_bim, parse_datamodel,
+)
+from src.bim_parser import parse_bim_model
+from src.pbir_parser import parse_pbir
+from src.dax_lexer import iter_references
+from src.dependency_graph import build_dependency_graph
+from src.merge_engine import ChangeSet, merge_items
+from src.importers import import_measures_from_file
+from src.batch import BatchOptions, collect_inputs, run_batch
+from src.instrumentation import PROFILE_DIR_ENV
+from src.pbix_scan import _Deadline, _count_sources, _read_member, count_tokens, scan_pbix
+from src.parse_cache import (
+    CACHE_DIR_ENV, ParseCache, parse_bim_cached, parse_pbix_cached, zip_fingerprint,
 )
-from src.pbitools_parser import pbitools_available
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -467,6 +491,196 @@ class TestPbixParser(unittest.TestCase):
         self.assertEqual(len(result.report_pages), 0)
 
 
+class TestDataMashup(unittest.TestCase):
+    """Tests fuer den MS-QDEFF-Leser des DataMashup-Streams."""
+
+    _METADATA_XML = """<?xml version="1.0" encoding="utf-8"?>
+<LocalPackageMetadataFile xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+  <Items>
+    <Item>
+      <ItemLocation><ItemType>AllFormulas</ItemType><ItemPath /></ItemLocation>
+      <StableEntries>
+        <Entry Type="QueryGroups" Value="s[{&quot;queryGroupId&quot;:&quot;g1&quot;,&quot;name&quot;:&quot;Staging&quot;,&quot;parentId&quot;:null},{&quot;queryGroupId&quot;:&quot;g2&quot;,&quot;name&quot;:&quot;SQL&quot;,&quot;parentId&quot;:&quot;g1&quot;}]" />
+      </StableEntries>
+    </Item>
+    <Item>
+      <ItemLocation><ItemType>Formula</ItemType><ItemPath>Section1/Roh%20Daten</ItemPath></ItemLocation>
+      <StableEntries>
+        <Entry Type="FillEnabled" Value="l0" />
+        <Entry Type="QueryGroupID" Value="sg2" />
+      </StableEntries>
+    </Item>
+    <Item>
+      <ItemLocation><ItemType>Formula</ItemType><ItemPath>Section1/Fakten</ItemPath></ItemLocation>
+      <StableEntries><Entry Type="FillEnabled" Value="l1" /></StableEntries>
+    </Item>
+    <Item>
+      <ItemLocation><ItemType>Formula</ItemType><ItemPath>Section1/Fakten/Quelle</ItemPath></ItemLocation>
+      <StableEntries />
+    </Item>
+  </Items>
+</LocalPackageMetadataFile>"""
+
+    def _mashup_bytes(self) -> bytes:
+        inner = io.BytesIO()
+        with zipfile.ZipFile(inner, "w") as zf:
+            zf.writestr("Formulas/Section1.m", (
+                'section Section1;\n'
+                'shared #"Roh Daten" = Sql.Database("srv", "db");\n'
+                'shared Fakten = #"Roh Daten";\n'
+            ))
+        parts = inner.getvalue()
+        xml = self._METADATA_XML.encode("utf-8")
+        metadata = struct.pack("<I", 0) + struct.pack("<I", len(xml)) + xml + struct.pack("<I", 0)
+        permissions = b"<Permissions />"
+
+        def block(data: bytes) -> bytes:
+            return struct.pack("<I", len(data)) + data
+
+        return struct.pack("<I", 0) + block(parts) + block(permissions) + block(metadata) + block(b"")
+
+    def test_header_and_metadata(self):
+        """Test: Header wird dekodiert, Metadaten je Abfrage gelesen."""
+        warnings: list = []
+        mashup = read_datamashup(self._mashup_bytes(), warnings)
+        self.assertTrue(mashup.header_valid)
+        self.assertIsInstance(mashup.package_parts, memoryview)
+        self.assertEqual(set(mashup.queries), {"Roh Daten", "Fakten"})
+        self.assertFalse(mashup.queries["Roh Daten"].load_enabled)
+        self.assertTrue(mashup.queries["Fakten"].load_enabled)
+        self.assertEqual(mashup.queries["Roh Daten"].query_group, "Staging / SQL")
+        self.assertEqual(warnings, [])
+
+    def test_package_parts_not_copied(self):
+        """Test: Package Parts sind ein Slice auf den Originalpuffer."""
+        raw = bytearray(self._mashup_bytes())
+        mashup = read_datamashup(raw, [])
+        self.assertIs(mashup.package_parts.obj, raw)
+        with zipfile.ZipFile(MemoryViewReader(mashup.package_parts)) as zf:
+            self.assertIn("Formulas/Section1.m", zf.namelist())
+
+    def test_metadata_applied_to_queries(self):
+        """Test: Gruppe und Lade-Flag landen an den PowerQuery-Objekten."""
+        warnings: list = []
+        queries, sources, metadata = _parse_datamashup(self._mashup_bytes(), warnings)
+        by_name = {q.query_name: q for q in queries}
+        self.assertEqual(by_name["Roh Daten"].query_group, "Staging / SQL")
+        self.assertIn("Laden deaktiviert", by_name["Roh Daten"].notes)
+        self.assertEqual(by_name["Fakten"].notes, "")
+        self.assertEqual(len(sources), 1)
+        self.assertIn("Fakten", metadata)
+
+    def test_legacy_header_fallback(self):
+        """Test: Nicht konformer Header -> ZIP wird ueber die Signatur gefunden."""
+        inner = io.BytesIO()
+        with zipfile.ZipFile(inner, "w") as zf:
+            zf.writestr("Formulas/Section1.m", "section Section1;\nshared Q = 1;\n")
+        raw = struct.pack("<I", 12345) + inner.getvalue()
+        mashup = read_datamashup(raw, [])
+        self.assertFalse(mashup.header_valid)
+        queries, _, metadata = _parse_datamashup(raw, [])
+        self.assertEqual([q.query_name for q in queries], ["Q"])
+        self.assertEqual(metadata, {})
+
+
+class TestLayoutReader(unittest.TestCase):
+    """Tests fuer den inkrementellen Report/Layout-Leser."""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def _layout(self) -> dict:
+        return {
+            "sections": [
+                {"displayName": f"Seite {i}", "visualContainers": [
+                    {"config": json.dumps({"singleVisual": {"visualType": "card"}})},
+                ]}
+                for i in range(5)
+            ],
+            "config": json.dumps({"name": "Konzernbericht"}),
+        }
+
+    def _write_pbix(self, layout_bytes: bytes) -> Path:
+        pbix = self.tmp / "layout.pbix"
+        with zipfile.ZipFile(str(pbix), "w") as zf:
+            zf.writestr("Report/Layout", layout_bytes)
+        return pbix
+
+    def test_utf16_le_without_bom(self):
+        """Test: Layout als UTF-16-LE ohne BOM (Standard in .pbix)."""
+        pbix = self._write_pbix(json.dumps(self._layout()).encode("utf-16-le"))
+        result = parse_pbix(pbix)
+        self.assertEqual(len(result.report_pages), 5)
+        self.assertEqual(result.report_name, "Konzernbericht")
+
+    def test_utf16_with_bom(self):
+        """Test: Layout als UTF-16 mit BOM."""
+        pbix = self._write_pbix(json.dumps(self._layout()).encode("utf-16"))
+        result = parse_pbix(pbix)
+        self.assertEqual(len(result.report_pages), 5)
+
+    def test_utf8_sig(self):
+        """Test: Layout als UTF-8 mit BOM."""
+        pbix = self._write_pbix(json.dumps(self._layout()).encode("utf-8-sig"))
+        result = parse_pbix(pbix)
+        self.assertEqual(result.report_pages[4].page_name, "Seite 4")
+
+    def test_small_chunks(self):
+        """Test: Sections werden auch bei sehr kleinen Lesebloecken korrekt zusammengesetzt."""
+        raw = json.dumps(self._layout(), indent=1).encode("utf-16-le")
+        warnings: list = []
+        reader = LayoutReader(io.BytesIO(raw), warnings, chunk_size=16)
+        pages = list(reader.pages())
+        self.assertEqual([p.page_name for p in pages], [f"Seite {i}" for i in range(5)])
+        self.assertEqual(reader.report_name, "Konzernbericht")
+        self.assertEqual(warnings, [])
+
+    def test_pages_are_yielded_incrementally(self):
+        """Test: Die erste Seite ist verfuegbar, bevor das Layout vollstaendig gelesen ist."""
+        raw = json.dumps(self._layout()).encode("utf-8")
+        stream = io.BytesIO(raw)
+        reader = LayoutReader(stream, [], chunk_size=32)
+        first = next(reader.pages())
+        self.assertEqual(first.page_name, "Seite 0")
+        self.assertLess(stream.tell(), len(raw))
+
+    def test_truncated_layout(self):
+        """Test: Abgeschnittenes Layout liefert die lesbaren Seiten und eine Warnung."""
+        raw = json.dumps(self._layout()).encode("utf-8")
+        pbix = self._write_pbix(raw[: len(raw) // 2])
+        result = parse_pbix(pbix)
+        self.assertGreater(len(result.report_pages), 0)
+        self.assertTrue(any("Report/Layout" in w for w in result.warnings))
+
+    def test_malformed_container_stops_early(self):
+        """Test: Syntaxfehler am Anfang liest nicht den Rest des Layouts ein."""
+        padding = json.dumps([{"displayName": "x" * 1000}] * 2000)
+        raw = ('{"sections": [{"visualContainers": [{"config": "a" "b"}, '
+               + padding[1:] + '}]}').encode("utf-8")
+        stream = io.BytesIO(raw)
+        reader = LayoutReader(stream, [], chunk_size=1024)
+        with self.assertRaises(ValueError):
+            list(reader.pages())
+        self.assertLess(stream.tell(), 64 * 1024)
+
+    def test_visual_containers_before_display_name(self):
+        """Test: Container werden gestreamt, auch wenn displayName danach folgt."""
+        layout = {"sections": [{
+            "visualContainers": [
+                {"config": json.dumps({"singleVisual": {"visualType": "card"}})},
+                {"config": "{kaputt"},
+            ],
+            "displayName": "Spaet benannt",
+        }]}
+        warnings: list = []
+        reader = LayoutReader(io.BytesIO(json.dumps(layout).encode("utf-8")), warnings,
+                              chunk_size=16)
+        pages = list(reader.pages())
+        self.assertEqual(pages[0].page_name, "Spaet benannt")
+        self.assertEqual(len(pages[0].visuals), 1)
+        self.assertTrue(any("Spaet benannt" in w for w in warnings))
+
+
 class TestMCodeParsing(unittest.TestCase):
     """Tests fuer M-Code-Aufspaltung und Quellerkennung."""
 
@@ -489,6 +703,45 @@ in
         self.assertEqual(queries[0].query_name, "Query1")
         self.assertEqual(queries[1].query_name, "Query2")
 
+    def test_split_quoted_names(self):
+        """Test: #"..."-Namen bleiben vollstaendig erhalten."""
+        m_code = '''section Section1;
+shared #"My Query" = 1;
+shared #"Say ""Hi""" = 2;
+'''
+        queries = _split_m_queries(m_code)
+        self.assertEqual([q.query_name for q in queries], ["My Query", 'Say "Hi"'])
+        self.assertEqual(queries[0].m_code, "1")
+
+    def test_split_ignores_semicolons_in_strings_and_comments(self):
+        """Test: Semikolons in Strings, Kommentaren und Identifiern trennen nicht."""
+        m_code = '''section Section1;
+shared A = let
+    // Kommentar; mit Semikolon
+    Source = Csv.Document(File.Contents("C:\\a.csv"), [Delimiter=";"]),
+    #"Step; 2" = Source /* noch; eins */
+in
+    #"Step; 2";
+shared B = "x;y";
+'''
+        queries = _split_m_queries(m_code)
+        self.assertEqual([q.query_name for q in queries], ["A", "B"])
+        self.assertTrue(queries[0].m_code.endswith('#"Step; 2"'))
+        self.assertEqual(queries[1].m_code, '"x;y"')
+
+    def test_shared_member_spans(self):
+        """Test: Member-Spans zeigen exakt auf den Quelltext."""
+        m_code = 'section S;\nshared Q = 1 + 2;\n'
+        member = next(iter_shared_members(m_code))
+        self.assertEqual(m_code[member.start:member.end], "shared Q = 1 + 2;")
+        self.assertEqual(member.expression, "1 + 2")
+
+    def test_split_umlaut_names(self):
+        """Test: Unquotierte Namen mit Umlaut am Anfang werden erkannt."""
+        m_code = 'section Section1;\nshared Übersicht = 1;\nshared Änderungen_2024 = 2;\n'
+        queries = _split_m_queries(m_code)
+        self.assertEqual([q.query_name for q in queries], ["Übersicht", "Änderungen_2024"])
+
     def test_detect_multiple_sources(self):
         """Test: Mehrere Datenquellen aus einem M-Code-Block."""
         m_code = '''
@@ -525,11 +778,86 @@ Sql.Database("server", "db")
         sources = _detect_sources(m_code)
         self.assertEqual(len(sources), 1)
 
+    def test_sources_in_text_order(self):
+        """Test: Quellen werden in Reihenfolge des M-Codes geliefert."""
+        m_code = '''
+Web.Contents("https://api.example.com")
+Sql.Database("server", "db")
+'''
+        sources = _detect_sources(m_code)
+        self.assertEqual([s.source_type for s in sources], ["API/Web", "SQL"])
+
+
+class TestSourceScanner(unittest.TestCase):
+    """Tests fuer den Mehrfach-Pattern-Scanner."""
+
+    def _custom_scanner(self, **kwargs) -> SourceScanner:
+        scanner = SourceScanner(**kwargs)
+        scanner.register(
+            re.compile(r'Custom\.Source\s*\(\s*"([^"]+)"'),
+            lambda m: DataSource(source_type="Custom", connection_info=m.group(1)),
+        )
+        return scanner
+
+    def test_literal_prefix(self):
+        """Test: Literal-Anfang eines Patterns wird erkannt."""
+        self.assertEqual(literal_prefix(r'Sql\.Database\s*\('), "Sql.Database")
+        self.assertEqual(literal_prefix(r'(?:Excel|Csv)'), "")
+
+    def test_pattern_without_prefix_rejected(self):
+        """Test: Pattern ohne Literal-Praefix wird abgewiesen."""
+        with self.assertRaises(ValueError):
+            SourceScanner().register(re.compile(r'\w+\.Database'), lambda m: None)
+
+    def test_custom_connector(self):
+        """Test: Registrierter Konnektor wird erkannt und dedupliziert."""
+        scanner = self._custom_scanner(onprem_types={"Custom"})
+        sources = scanner.scan('x = Custom.Source("abc"), y = Custom.Source("abc")')
+        self.assertEqual(len(sources), 1)
+        self.assertEqual(sources[0].connection_info, "abc")
+        self.assertTrue(sources[0].gateway_required)
+
+    def test_shared_seen_set(self):
+        """Test: Gemeinsames seen-Set dedupliziert ueber mehrere Aufrufe."""
+        scanner = self._custom_scanner()
+        seen: set = set()
+        self.assertEqual(len(scanner.scan('Custom.Source("a")', seen)), 1)
+        self.assertEqual(len(scanner.scan('Custom.Source("a")', seen)), 0)
+
+    def test_overlapping_prefixes(self):
+        """Test: Ueberlappende Praefixe werden alle ausgewertet."""
+        scanner = SourceScanner()
+        for name in ("Data.Feed", "Data.FeedV2", "Feed"):
+            scanner.register(
+                re.compile(re.escape(name) + r'\s*\(\s*"([^"]+)"'),
+                lambda m, n=name: DataSource(source_type=n, connection_info=m.group(1)),
+            )
+        sources = scanner.scan('a = Data.Feed("x"), b = Data.FeedV2("y")')
+        self.assertEqual([(s.source_type, s.connection_info) for s in sources], [
+            ("Data.Feed", "x"), ("Feed", "x"), ("Data.FeedV2", "y"),
+        ])
+
+    def test_prefix_starting_inside_another(self):
+        """Test: Praefix, das innerhalb eines anderen beginnt und darueber hinausreicht."""
+        scanner = SourceScanner()
+        for name in ("Odbc.Query", "Query.Source"):
+            scanner.register(
+                re.compile(re.escape(name) + r'\s*\(\s*"([^"]+)"'),
+                lambda m, n=name: DataSource(source_type=n, connection_info=m.group(1)),
+            )
+        sources = scanner.scan('a = Odbc.Query.Source("x")')
+        self.assertEqual([s.source_type for s in sources], ["Query.Source"])
+
 
 # ══════════════════════════════════════════════════════════════════
 # BIM Parser Tests
 # ══════════════════════════════════════════════════════════════════
 
+def _crash_worker(*_args):
+    """Beendet den Worker-Prozess hart (-> BrokenProcessPool)."""
+    os._exit(1)
+
+
 class TestBimParser(unittest.TestCase):
 
     def setUp(self):
@@ -680,6 +1008,27 @@ class TestBimParser(unittest.TestCase):
         sql_sources = [s for s in result.data_sources if s.source_type == "SQL"]
         self.assertGreater(len(sql_sources), 0)
 
+    def test_partition_sources_deduplicated(self):
+        """Test: Gleiche Quelle in mehreren Partitionen wird nur einmal gelistet."""
+        m_expr = 'let Source = Sql.Database("srv", "db") in Source'
+        tables = [
+            {
+                "name": name,
+                "columns": [{"name": "ID", "dataType": "int64"}],
+                "partitions": [
+                    {"name": f"{name}-p{i}", "source": {"type": "m", "expression": m_expr}}
+                    for i in range(2)
+                ],
+            }
+            for name in ("A", "B")
+        ]
+        bim = self.tmp / "dedup.bim"
+        bim.write_text(json.dumps({"model": {"tables": tables}}), encoding="utf-8")
+        result = parse_bim(bim)
+        sql_sources = [s for s in result.data_sources if s.source_type == "SQL"]
+        self.assertEqual(len(sql_sources), 1)
+        self.assertIn("srv", sql_sources[0].connection_info)
+
     def test_rls_roles(self):
         """Test: RLS-Rollen werden geparst."""
         bim = _create_test_bim(self.tmp)
@@ -711,6 +1060,144 @@ class TestBimParser(unittest.TestCase):
         json_file.write_text('{"key": "value"}', encoding="utf-8")
         self.assertFalse(is_bim_format(json_file))
 
+    def test_is_bim_format_sniffs_head_only(self):
+        """Test: Formaterkennung liest nur den Dateianfang."""
+        big = {"model": {"tables": [
+            {"name": f"T{i}", "columns": [{"name": "C" * 200}] * 50} for i in range(200)
+        ]}}
+        path = self.tmp / "database.json"
+        path.write_text(json.dumps(big), encoding="utf-8")
+        self.assertGreater(path.stat().st_size, 1 << 20)
+
+        reads = []
+        real_open = open
+
+        def counting_open(*args, **kwargs):
+            fp = real_open(*args, **kwargs)
+            real_read = fp.read
+
+            def read(size=-1):
+                data = real_read(size)
+                reads.append(len(data))
+                return data
+            fp.read = read
+            return fp
+
+        with mock.patch("builtins.open", counting_open):
+            self.assertTrue(is_bim_format(path))
+        self.assertLessEqual(sum(reads), 1 << 16)
+
+    def test_streaming_matches_in_memory(self):
+        """Test: Gestreamtes parse_bim liefert dasselbe wie parse_bim_model."""
+        bim = _create_test_bim(self.tmp)
+        streamed = parse_bim(bim)
+        loaded = parse_bim_model(json.loads(bim.read_text(encoding="utf-8")), bim.stem)
+        self.assertEqual(streamed.report_name, loaded.report_name)
+        self.assertEqual([t.name for t in streamed.tables], [t.name for t in loaded.tables])
+        self.assertEqual(
+            [(m.name, m.dependencies) for m in streamed.measures],
+            [(m.name, m.dependencies) for m in loaded.measures],
+        )
+        self.assertEqual(len(streamed.relationships), len(loaded.relationships))
+        self.assertEqual(streamed.rls_notes, loaded.rls_notes)
+
+    def test_utf16_bim(self):
+        """Test: UTF-16-kodierte database.json wird gelesen."""
+        bim = _create_test_bim(self.tmp)
+        utf16 = self.tmp / "database.json"
+        utf16.write_bytes(bim.read_text(encoding="utf-8").encode("utf-16"))
+        self.assertTrue(is_bim_format(utf16))
+        self.assertIn("Fact_Sales", [t.name for t in parse_bim(utf16).tables])
+
+    def test_parallel_matches_serial(self):
+        """Test: Worker-Modus liefert dieselbe Reihenfolge und Quellen-Deduplizierung."""
+        m_code = 'let Source = Sql.Database("srv{}", "db") in Source'
+        tables = []
+        for i in range(100):
+            tables.append({
+                "name": f"Fact_{i}",
+                "columns": [{"name": "Date", "dataType": "dateTime"}],
+                "measures": [{"name": f"M{i}", "expression": f"[M{i - 1}] + SUM(Fact_{i}[V])",
+                              "isHidden": i % 7 == 0}],
+                "partitions": [
+                    {"source": {"type": "m", "expression": m_code.format(i % 5)}},
+                    {"source": {"type": "query", "expression": "SELECT 1",
+                                "dataSource": f"ds{i % 3}"}},
+                ],
+            })
+        tables[40]["columns"] = "kaputt"
+        path = self.tmp / "big.bim"
+        path.write_text(json.dumps({"model": {"name": "Big", "tables": tables}}), encoding="utf-8")
+
+        def snapshot(result):
+            return (
+                [t.name for t in result.tables],
+                [(m.name, m.dependencies) for m in result.measures],
+                [q.query_name for q in result.power_queries],
+                [(d.source_type, d.connection_info, d.gateway_required) for d in result.data_sources],
+                result.date_logic_notes,
+                result.warnings,
+            )
+
+        serial_result = parse_bim(path, skip_hidden_measures=True)
+        parallel_result = parse_bim(path, skip_hidden_measures=True, workers=2)
+        serial = snapshot(serial_result)
+        self.assertEqual(len(serial[3]), 8)
+        self.assertEqual(len(serial[5]), 1)
+        self.assertEqual(snapshot(parallel_result), serial)
+        self.assertEqual(list(parallel_result.model_index.tables), list(serial_result.model_index.tables))
+        self.assertEqual(parallel_result.model_index.hidden_measures,
+                         serial_result.model_index.hidden_measures)
+
+    def test_broken_pool_falls_back_to_serial(self):
+        """Test: Abstuerzender Worker -> Warnung und serielles Ergebnis statt Abbruch."""
+        tables = [{"name": f"T{i}", "measures": [{"name": f"M{i}", "expression": "1"}],
+                   "partitions": [{"source": {"type": "m", "expression":
+                                              f'Sql.Database("srv{i % 4}", "db")'}}]}
+                  for i in range(100)]
+        data = {"model": {"tables": tables}}
+        serial = parse_bim_model(data)
+        with mock.patch("src.bim_parser._parse_table_batch", _crash_worker):
+            result = parse_bim_model(data, workers=2)
+        self.assertEqual([t.name for t in result.tables], [t.name for t in serial.tables])
+        self.assertEqual([d.connection_info for d in result.data_sources],
+                         [d.connection_info for d in serial.data_sources])
+        self.assertEqual(len(result.warnings), 1)
+        self.assertIn("Prozess-Pool fehlgeschlagen", result.warnings[0])
+
+    def test_model_index(self):
+        """Test: ModelIndex enthaelt Tabellen und Measures je (Tabelle, Name)."""
+        result = parse_bim(_create_test_bim(self.tmp), skip_hidden_measures=True)
+        index = result.model_index
+        self.assertIs(index.tables["Fact_Sales"], result.tables[0])
+        self.assertEqual({name for _table, name in index.measures},
+                         {m.name for m in result.measures} | {name for _t, name in index.hidden_measures})
+        self.assertTrue(all(not index.is_hidden("Fact_Sales", m.name) for m in result.measures))
+
+    def test_model_index_same_measure_name_in_two_tables(self):
+        """Test: Gleichnamige Measures in zwei Tabellen ueberschreiben sich nicht."""
+        data = {"model": {"tables": [
+            {"name": "A", "measures": [{"name": "Total", "expression": "1"}]},
+            {"name": "B", "measures": [{"name": "Total", "expression": "2", "isHidden": True}]},
+        ]}}
+        result = parse_bim_model(data, skip_hidden_measures=True)
+        index = result.model_index
+        self.assertEqual(index.measures[("A", "Total")].dax_code, "1")
+        self.assertEqual(index.measures[("B", "Total")].dax_code, "2")
+        self.assertFalse(index.is_hidden("A", "Total"))
+        self.assertTrue(index.is_hidden("B", "Total"))
+        self.assertEqual([m.dax_code for m in result.measures], ["1"])
+
+    def test_model_without_wrapper(self):
+        """Test: Model-Objekt ohne "model"-Huelle wird gestreamt."""
+        path = self.tmp / "flat.bim"
+        path.write_text(json.dumps({
+            "name": "Flat", "tables": [{"name": "Dim_X", "columns": [{"name": "A"}]}],
+        }), encoding="utf-8")
+        result = parse_bim(path)
+        self.assertEqual(result.report_name, "Flat")
+        self.assertEqual([t.name for t in result.tables], ["Dim_X"])
+
     def test_nonexistent_bim(self):
         """Test: Nicht existierende BIM-Datei erzeugt Warnung."""
         result = parse_bim(self.tmp / "nonexistent.bim")
@@ -732,27 +1219,126 @@ class TestBimParser(unittest.TestCase):
 
 
 class TestDependencyDetection(unittest.TestCase):
-    """Tests fuer DAX-Dependency-Erkennung."""
+    """Tests fuer DAX-Dependency-Erkennung (Measure.dependencies ueber den Graphen)."""
+
+    @staticmethod
+    def _dependencies(measures: dict, target: str) -> str:
+        """Parst ``measures`` (Name -> DAX) als eine Tabelle und liefert die Abhaengigkeiten von ``target``."""
+        result = parse_bim_model({"model": {"tables": [{"name": "T", "measures": [
+            {"name": name, "expression": dax} for name, dax in measures.items()
+        ]}]}})
+        return next(m for m in result.measures if m.name == target).dependencies
 
     def test_measure_reference(self):
         """Test: Referenzierte Measures werden erkannt."""
-        dax = "DIVIDE([Total Revenue], [Total Quantity])"
-        deps = _detect_dependencies(dax, "Avg", {"Total Revenue", "Total Quantity", "Avg"})
+        deps = self._dependencies({
+            "Total Revenue": "1", "Total Quantity": "2",
+            "Avg": "DIVIDE([Total Revenue], [Total Quantity])",
+        }, "Avg")
         self.assertIn("Total Revenue", deps)
         self.assertIn("Total Quantity", deps)
 
     def test_column_reference(self):
         """Test: Spaltenreferenzen werden erkannt."""
-        dax = "SUM(Fact_Sales[Revenue])"
-        deps = _detect_dependencies(dax, "Total", set())
+        deps = self._dependencies({"Total": "SUM(Fact_Sales[Revenue])"}, "Total")
         self.assertIn("Fact_Sales[Revenue]", deps)
 
     def test_no_self_reference(self):
         """Test: Eigener Name wird nicht als Dependency gelistet."""
-        dax = "[MyMeasure] + 1"
-        deps = _detect_dependencies(dax, "MyMeasure", {"MyMeasure"})
+        deps = self._dependencies({"MyMeasure": "[MyMeasure] + 1"}, "MyMeasure")
         self.assertNotIn("MyMeasure", deps)
 
+    def test_quoted_table_and_spaces(self):
+        """Test: Quotierte Tabellennamen mit Leerzeichen werden erkannt."""
+        deps = self._dependencies({
+            "Total Cost": "1", "Margin": "SUM('Fact Sales'[Net Revenue]) + [Total Cost]",
+        }, "Margin")
+        self.assertEqual(deps, "Total Cost, 'Fact Sales'[Net Revenue]")
+
+    def test_strings_and_comments_ignored(self):
+        """Test: Referenzen in Strings und Kommentaren zaehlen nicht."""
+        graph = build_dependency_graph([
+            ("Total Cost", "T", "1"), ("Other", "T", "2"),
+            ("X", "T", 'SUM(T[A]) & "[Total Cost]" // [Other]\n/* T[B] */'),
+        ])
+        self.assertEqual(graph.dependencies("X"), ["T[A]"])
+
+
+class TestDaxLexer(unittest.TestCase):
+    """Tests fuer den DAX-Lexer."""
+
+    def test_escapes(self):
+        """Test: '' in Tabellen- und ]] in Spaltennamen werden aufgeloest."""
+        refs = list(iter_references("'It''s'[A]]b] + \"x\"\"[y]\""))
+        self.assertEqual(len(refs), 1)
+        self.assertEqual((refs[0].table, refs[0].name), ("It's", "A]b"))
+
+    def test_keyword_is_not_table(self):
+        """Test: RETURN [M] ist keine Tabelle RETURN."""
+        refs = list(iter_references("VAR x = 1\nRETURN [M]"))
+        self.assertEqual([(r.table, r.name) for r in refs], [("", "M")])
+
+
+class TestDependencyGraph(unittest.TestCase):
+    """Tests fuer den Measure-Abhaengigkeitsgraphen."""
+
+    def _graph(self):
+        return build_dependency_graph([
+            ("Revenue", "Sales", "SUM(Sales[Amount])"),
+            ("Cost", "Sales", "SUM(Sales[Unit Cost])"),
+            ("Margin", "Sales", "[revenue] - [Cost]"),
+            ("Margin %", "Sales", "DIVIDE([Margin], Sales[Revenue])"),
+        ])
+
+    def test_transitive_dependencies(self):
+        """Test: Transitive Huelle ueber mehrere Ebenen."""
+        graph = self._graph()
+        self.assertEqual(graph.dependencies("Margin"), ["Revenue", "Cost"])
+        self.assertEqual(
+            graph.dependencies("Margin %", transitive=True),
+            ["Cost", "Margin", "Revenue", "Sales[Amount]", "Sales[Unit Cost]"],
+        )
+
+    def test_impact(self):
+        """Test: Impact-Abfrage liefert alle abhaengigen Measures."""
+        graph = self._graph()
+        self.assertEqual(graph.impact("Sales[Amount]"), ["Margin", "Margin %", "Revenue"])
+        self.assertEqual(graph.dependents("Margin"), ["Margin %"])
+
+    def test_cycles(self):
+        """Test: Zirkulaere Referenzen werden gefunden."""
+        graph = build_dependency_graph([
+            ("A", "T", "[B] + 1"),
+            ("B", "T", "[C]"),
+            ("C", "T", "[A]"),
+            ("D", "T", "[A]"),
+        ])
+        self.assertEqual(graph.cycles(), [["A", "B", "C"]])
+        self.assertEqual(self._graph().cycles(), [])
+
+    def test_long_chain(self):
+        """Test: Tiefe Ketten ohne Rekursionsfehler."""
+        items = [(f"M{i}", "T", f"[M{i + 1}]") for i in range(5000)]
+        graph = build_dependency_graph(items)
+        self.assertEqual(len(graph.dependencies("M0", transitive=True)), 5000)
+        self.assertEqual(graph.cycles(), [])
+
+    def test_graph_on_bim_result(self):
+        """Test: parse_bim_model liefert den Graphen mit."""
+        result = parse_bim_model(self._bim())
+        graph = result.dependency_graph
+        self.assertIsNotNone(graph)
+        self.assertEqual(graph.impact("Base"), ["Derived"])
+
+    @staticmethod
+    def _bim():
+        return {"model": {"tables": [
+            {"name": "Fact", "columns": [{"name": "V", "dataType": "double"}], "measures": [
+                {"name": "Base", "expression": "SUM(Fact[V])"},
+                {"name": "Derived", "expression": "[Base] * 2"},
+            ]},
+        ]}}
+
 
 class TestFilterContextDetection(unittest.TestCase):
     """Tests fuer Filter-Kontext-Hinweise."""
@@ -883,6 +1469,21 @@ class TestImportManager(unittest.TestCase):
         kpi_names = [k.name for k in project.kpis]
         self.assertIn("Total Revenue", kpi_names)
 
+    def test_kpis_keep_user_descriptions_on_update(self):
+        """Test: Update-Import ueberschreibt gepflegte KPI-Texte nicht, fuellt leere."""
+        bim = _create_test_bim(self.tmp)
+        project = Project()
+        import_file(bim, project, ImportOptions(import_measures_as_kpis=True))
+        count = len(project.kpis)
+        kpi = next(k for k in project.kpis if k.name == "Total Revenue")
+        kpi.business_description = "Von Hand gepflegt"
+        kpi.technical_definition = ""
+        for mode in ("update", "replace"):
+            import_file(bim, project, ImportOptions(import_measures_as_kpis=True, merge_mode=mode))
+        self.assertEqual(len(project.kpis), count)
+        self.assertEqual(kpi.business_description, "Von Hand gepflegt")
+        self.assertTrue(kpi.technical_definition)
+
     def test_import_rls(self):
         """Test: RLS-Rollen werden in Governance uebernommen."""
         bim = _create_test_bim(self.tmp)
@@ -968,6 +1569,356 @@ class TestMergeList(unittest.TestCase):
         self.assertEqual(skipped, 1)
 
 
+class TestMergeEngine(unittest.TestCase):
+    """Tests fuer Upsert-Merge mit persistentem Index und Change-Set."""
+
+    def _project(self):
+        project = Project()
+        project.measures = [
+            Measure(name="Revenue", dax_code="SUM(T[A])", validation_notes="geprueft"),
+            Measure(name="Cost", dax_code="SUM(T[C])"),
+        ]
+        return project
+
+    def test_update_changed_fields(self):
+        """Test: Update-Modus aktualisiert geaenderte Felder und behaelt gepflegte."""
+        project = self._project()
+        revenue_id = project.measures[0].id
+        changes = ChangeSet()
+        skipped = merge_items(project, "measures", [
+            Measure(name="revenue", dax_code="SUM(T[B])"),
+            Measure(name="Cost", dax_code="SUM(T[C])"),
+            Measure(name="Margin", dax_code="[Revenue] - [Cost]"),
+        ], "update", changes)
+        self.assertEqual(skipped, 0)
+        self.assertEqual(len(project.measures), 3)
+        self.assertEqual(project.measures[0].id, revenue_id)
+        self.assertEqual(project.measures[0].dax_code, "SUM(T[B])")
+        self.assertEqual(project.measures[0].validation_notes, "geprueft")
+        # Schreibweise aus dem Modell wird uebernommen
+        self.assertEqual(project.measures[0].name, "revenue")
+        self.assertEqual(changes.updated["measures"], ["revenue"])
+        self.assertEqual(changes.unchanged["measures"], ["Cost"])
+        self.assertEqual(changes.added["measures"], ["Margin"])
+        self.assertEqual(changes.changed_project_fields(), {"measures"})
+
+    def test_merge_skips_existing(self):
+        """Test: Merge-Modus laesst bestehende Eintraege unveraendert."""
+        project = self._project()
+        changes = ChangeSet()
+        skipped = merge_items(project, "measures", [Measure(name="COST", dax_code="x")], "merge", changes)
+        self.assertEqual(skipped, 1)
+        self.assertEqual(project.measures[1].dax_code, "SUM(T[C])")
+        self.assertFalse(changes.has_changes)
+
+    def test_replace_records_removed(self):
+        """Test: Replace meldet entfernte und unveraenderte Eintraege."""
+        project = self._project()
+        changes = ChangeSet()
+        merge_items(project, "measures", [Measure(name="Cost", dax_code="SUM(T[C])")], "replace", changes)
+        self.assertEqual([m.name for m in project.measures], ["Cost"])
+        self.assertEqual(changes.removed["measures"], ["Revenue"])
+        self.assertEqual(changes.unchanged["measures"], ["Cost"])
+
+    def test_index_persists_and_heals(self):
+        """Test: Index bleibt zwischen Importen bestehen und erkennt ersetzte Listen."""
+        project = self._project()
+        merge_items(project, "measures", [Measure(name="A")], "merge", ChangeSet())
+        index = project.key_index("measures", None)
+        merge_items(project, "measures", [Measure(name="B")], "merge", ChangeSet())
+        self.assertIs(project.key_index("measures", None), index)
+
+        # Liste von aussen ersetzt (z.B. GUI) -> Index baut sich neu auf
+        project.measures = [Measure(name="Neu")]
+        changes = ChangeSet()
+        merge_items(project, "measures", [Measure(name="neu"), Measure(name="A")], "merge", changes)
+        self.assertEqual([m.name for m in project.measures], ["Neu", "A"])
+
+        # Umbenennung an Ort und Stelle -> invalidate_indexes fuer diese Liste
+        project.measures[0].name = "Umbenannt"
+        project.invalidate_indexes(project.measures)
+        merge_items(project, "measures", [Measure(name="Neu")], "merge", ChangeSet())
+        self.assertEqual(len(project.measures), 3)
+
+    def test_invalidate_after_rename_to_existing_key(self):
+        """Test: Umbenennung auf einen importierten Namen erzeugt kein Duplikat."""
+        project = self._project()
+        merge_items(project, "measures", [Measure(name="A")], "merge", ChangeSet())
+        other = project.key_index("kpis", None)
+        # Formular benennt "Cost" in "Margin" um (gleiche Liste, gleiche Laenge)
+        project.measures[1].name = "Margin"
+        project.invalidate_indexes(project.measures)
+        changes = ChangeSet()
+        merge_items(project, "measures", [Measure(name="Margin", dax_code="x")], "update", changes)
+        self.assertEqual([m.name for m in project.measures], ["Revenue", "Margin", "A"])
+        self.assertEqual(changes.updated["measures"], ["Margin"])
+        # Indizes anderer Listen bleiben bestehen
+        self.assertIs(project.key_index("kpis", None), other)
+
+    def test_changed_project_fields(self):
+        """Test: Change-Set nennt die geaenderten Projektfelder fuer das Speichern."""
+        changes = ChangeSet()
+        changes.record("added", "tables", "Sales")
+        changes.record("updated", "rls_notes", "rls_notes")
+        changes.record("unchanged", "measures", "Revenue")
+        self.assertEqual(changes.changed_project_fields(), {"data_model", "governance"})
+
+    def test_relationship_keys(self):
+        """Test: Beziehungen werden ueber (Tabelle, Spalte)-Paare zugeordnet."""
+        project = Project()
+        rel = ModelRelationship(from_table="F", from_column="k", to_table="D", to_column="k",
+                                cardinality="N:1")
+        merge_items(project, "relationships", [rel], "replace", ChangeSet())
+        changes = ChangeSet()
+        changed = ModelRelationship(from_table="F", from_column="k", to_table="D", to_column="k",
+                                    cardinality="1:1")
+        merge_items(project, "relationships", [changed], "update", changes)
+        self.assertEqual(project.data_model.relationships[0].cardinality, "1:1")
+        self.assertEqual(changes.changed_project_fields(), {"data_model"})
+
+    def test_import_report_changes(self):
+        """Test: import_file fuellt das Change-Set im Bericht."""
+        tmp = Path(tempfile.mkdtemp())
+        bim = _create_test_bim(tmp)
+        project = Project()
+        import_file(bim, project)
+        report = import_file(bim, project, ImportOptions(merge_mode="update"))
+        self.assertFalse(report.changes.has_changes)
+        self.assertTrue(report.changes.unchanged["measures"])
+
+    def test_large_import(self):
+        """Test: 50.000 Measures in ein bestehendes Projekt (Update-Modus)."""
+        project = Project()
+        project.measures = [Measure(name=f"M{i}", dax_code="1") for i in range(50_000)]
+        new = [Measure(name=f"M{i}", dax_code="2" if i % 10 == 0 else "1") for i in range(25_000, 75_000)]
+        changes = ChangeSet()
+        merge_items(project, "measures", new, "update", changes)
+        self.assertEqual(len(project.measures), 75_000)
+        self.assertEqual(changes.count("added", "measures"), 25_000)
+        self.assertEqual(changes.count("updated", "measures"), 2_500)
+
+
+
+def _write_measure_txt(path: Path, measures: dict) -> Path:
+    path.write_text("".join(
+        f"MEASURE: {name}\nDAX:\n{dax}\n\n" for name, dax in measures.items()
+    ), encoding="utf-8")
+    return path
+
+
+class TestImportSession(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.bim = _create_test_bim(self.tmp)
+        self.txt = _write_measure_txt(self.tmp / "measures.txt", {
+            "Total Revenue": "SUM(Override[Revenue])",
+            "Extra": "1",
+        })
+
+    def _dax(self, project, name):
+        return next(m.dax_code for m in project.measures if m.name == name)
+
+    def test_priority_resolves_conflicts(self):
+        """Test: Bei gleichem Schluessel gewinnt die Quelle mit hoeherer Prioritaet."""
+        project = Project()
+        session = ImportSession(project, max_workers=1)
+        session.add(self.bim, priority=0)
+        session.add(self.txt, priority=10)
+        report = session.run()
+        self.assertTrue(report.success)
+        self.assertEqual(self._dax(project, "Total Revenue"), "SUM(Override[Revenue])")
+        self.assertIn("Extra", [m.name for m in project.measures])
+        self.assertTrue(any("Konflikt" in w for w in report.warnings))
+        # Position bleibt die der ersten Quelle
+        self.assertEqual(project.measures[0].name, "Total Revenue")
+
+    def test_tie_keeps_first_registered(self):
+        """Test: Bei gleicher Prioritaet gewinnt die zuerst registrierte Quelle."""
+        project = Project()
+        session = ImportSession(project, max_workers=1)
+        session.add(self.bim)
+        session.add(self.txt)
+        session.run()
+        self.assertEqual(self._dax(project, "Total Revenue"), "SUM(Fact_Sales[Revenue])")
+
+    def test_parallel_matches_sequential_merge(self):
+        """Test: Session im Prozesspool = Einzelimporte nach Prioritaet (merge)."""
+        sequential = Project()
+        import_file(self.bim, sequential, ImportOptions(merge_mode="merge"))
+        merge_items(sequential, "measures", import_measures_from_file(self.txt), "merge", ChangeSet())
+
+        project = Project()
+        session = ImportSession(project, ImportOptions(merge_mode="merge"), max_workers=2)
+        session.add(self.txt, priority=-1)
+        session.add(self.bim, priority=5)
+        session.run()
+
+        def snapshot(p):
+            return (sorted((m.name, m.dax_code) for m in p.measures),
+                    [t.name for t in p.data_model.tables],
+                    len(p.data_model.relationships), p.meta.report_name)
+
+        self.assertEqual(snapshot(project), snapshot(sequential))
+
+    def test_report_has_file_timings(self):
+        """Test: Ein Bericht fuer alle Dateien, mit Parse-Dauer je Datei."""
+        project = Project()
+        session = ImportSession(project, max_workers=1)
+        session.add(self.bim)
+        session.add(self.txt)
+        report = session.run()
+        self.assertEqual(report.file_type, "session")
+        self.assertEqual(set(report.file_timings), {self.bim.name, self.txt.name})
+        self.assertIn("Dauer je Datei", report.summary_text())
+        self.assertGreater(report.changes.count("added", "measures"), 0)
+
+    def test_failed_source_is_reported(self):
+        """Test: Unlesbare Quellen erscheinen als Warnung, der Rest wird importiert."""
+        bad = self.tmp / "broken.bim"
+        bad.write_text("{ kein json", encoding="utf-8")
+        project = Project()
+        session = ImportSession(project, max_workers=1)
+        session.add(bad)
+        session.add(self.txt, kind="measures")
+        report = session.run()
+        self.assertTrue(report.success)
+        self.assertTrue(any(w.startswith("broken.bim:") for w in report.warnings))
+        self.assertEqual(len(project.measures), 2)
+
+    def test_worker_returns_payload_only(self):
+        """Test: Worker schickt keine vollstaendigen Parse-Ergebnisse zurueck."""
+        pbix = _create_test_pbix(self.tmp)
+        report, payload, _seconds = _parse_session_source(_SessionSource(pbix), ImportOptions())
+        self.assertTrue(report.success)
+        self.assertIsNone(report.pbix_result)
+        self.assertIsNone(report.pbir_result)
+        self.assertTrue(payload.collections.get("report_pages"))
+
+    def test_unknown_kind_rejected(self):
+        """Test: Unbekannte Quellart wird abgelehnt."""
+        with self.assertRaises(ValueError):
+            ImportSession(Project()).add(self.txt, kind="visuals")
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.src = self.tmp / "reports"
+        (self.src / "a").mkdir(parents=True)
+        (self.src / "b").mkdir()
+        self.bim_a = _create_test_bim(self.src / "a")
+        self.bim_b = _create_test_bim(self.src / "b")
+        self.out = self.tmp / "out"
+
+    def _run(self, **kwargs):
+        options = BatchOptions(output_dir=self.out, workers=1, **kwargs)
+        return run_batch(collect_inputs(self.src), options)
+
+    def test_collect_inputs_from_dir_and_manifest(self):
+        """Test: Ordner rekursiv und Manifest (relative Pfade, Kommentare)."""
+        self.assertEqual(collect_inputs(self.src), [self.bim_a, self.bim_b])
+        manifest = self.src / "reports.txt"
+        manifest.write_text("# Portfolio\na/test_model.bim\n\n", encoding="utf-8")
+        self.assertEqual(collect_inputs(manifest), [self.src / "a" / "test_model.bim"])
+
+    def test_batch_writes_docs_and_summary(self):
+        """Test: Je Report Doku-Ordner; gleiche Dateinamen kollidieren nicht."""
+        summary = self._run()
+        self.assertEqual(summary["totals"], {"ok": 2, "skipped": 0, "failed": 0})
+        outputs = {Path(r["output"]) for r in summary["reports"]}
+        self.assertEqual(len(outputs), 2)
+        for out in outputs:
+            self.assertTrue((out / "docs" / "05_measures" / "measures.md").exists())
+        on_disk = json.loads((self.out / "batch_summary.json").read_text(encoding="utf-8"))
+        self.assertIn("import", on_disk["reports"][0]["timings"])
+
+    def test_batch_resumes_unchanged(self):
+        """Test: Zweiter Lauf ueberspringt unveraenderte Reports, nicht geaenderte."""
+        self._run()
+        self.bim_b.write_text(self.bim_b.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+        summary = self._run()
+        status = {Path(r["input"]): r["status"] for r in summary["reports"]}
+        self.assertEqual(status, {self.bim_a: "skipped", self.bim_b: "ok"})
+        # Geaenderte Optionen erzwingen einen neuen Lauf
+        summary = self._run(import_options=ImportOptions(skip_hidden_measures=True))
+        self.assertEqual(summary["totals"]["ok"], 2)
+
+    def test_batch_failure_is_recorded(self):
+        """Test: Defekte Eingaben werden als failed protokolliert und nicht gemerkt."""
+        (self.src / "broken.bim").write_text("{ kein json", encoding="utf-8")
+        summary = self._run()
+        self.assertEqual(summary["totals"]["failed"], 1)
+        summary = self._run()
+        self.assertEqual(summary["totals"], {"ok": 0, "skipped": 2, "failed": 1})
+
+    def test_batch_process_pool(self):
+        """Test: Mehrere Worker liefern dieselben Ergebnisse."""
+        summary = run_batch(collect_inputs(self.src), BatchOptions(output_dir=self.out, workers=2))
+        self.assertEqual(summary["workers"], 2)
+        self.assertEqual(summary["totals"]["ok"], 2)
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def _stages(self, report):
+        return {st.name: st for st in report.stages}
+
+    def test_pbix_stages(self):
+        """Test: PBIX-Import misst Layout, DataMashup, Schema und Merge."""
+        pbix = _create_test_pbix(self.tmp, include_schema=True)
+        options = ImportOptions(use_pbitools=False, use_datamodel_reader=False)
+        report = import_file(pbix, Project(), options)
+        stages = self._stages(report)
+        for name in ("pbix.layout", "pbix.mashup", "pbix.schema", "import.parse", "import.merge"):
+            self.assertIn(name, stages)
+        with zipfile.ZipFile(str(pbix)) as zf:
+            self.assertEqual(stages["pbix.layout"].bytes_read, zf.getinfo("Report/Layout").file_size)
+        self.assertGreater(stages["pbix.layout"].objects, 0)
+        self.assertIn("Stufen: pbix.layout", report.summary_text())
+
+    def test_incremental_records_only_reparsed_parts(self):
+        """Test: Inkrementelles Parsen misst nur die neu geparsten Teile."""
+        pbix = _create_test_pbix(self.tmp, include_schema=True)
+        second = parse_pbix(pbix, previous=parse_pbix(pbix))
+        self.assertEqual(second.stages, [])
+
+    def test_bim_stages(self):
+        """Test: BIM-Import misst gelesene Bytes und Tabellen."""
+        bim = _create_test_bim(self.tmp)
+        result = parse_bim(bim)
+        stages = {st.name: st for st in result.stages}
+        self.assertEqual(stages["bim.read"].bytes_read, bim.stat().st_size)
+        self.assertEqual(stages["bim.read"].objects, 4)   # inkl. versteckter Tabelle
+        self.assertGreater(stages["bim.finish"].objects, 0)
+
+    def test_cache_hit_replaces_stages(self):
+        """Test: Ein Cache-Treffer meldet nur die Cache-Stufe."""
+        bim = _create_test_bim(self.tmp)
+        cache = ParseCache(self.tmp / "cache")
+        parse_bim_cached(bim, cache)
+        hit = parse_bim_cached(bim, cache)
+        self.assertEqual([st.name for st in hit.stages], ["cache.bim"])
+
+    def test_profile_dump_via_env(self):
+        """Test: $PBI_DOC_GEN_PROFILE schreibt einen pstats-Dump je Import."""
+        import pstats
+        bim = _create_test_bim(self.tmp)
+        target = self.tmp / "profiles"
+        os.environ[PROFILE_DIR_ENV] = str(target)
+        try:
+            report = import_file(bim, Project())
+        finally:
+            del os.environ[PROFILE_DIR_ENV]
+        self.assertIsNotNone(report.profile_path)
+        self.assertEqual(report.profile_path.parent, target)
+        self.assertGreater(pstats.Stats(str(report.profile_path)).total_calls, 0)
+        self.assertIsNone(import_file(bim, Project()).profile_path)
+
 class TestPreviewImport(unittest.TestCase):
     """Tests fuer die Preview-Funktion."""
 
@@ -992,6 +1943,641 @@ class TestPreviewImport(unittest.TestCase):
         self.assertGreater(preview.relationship_count, 0)
 
 
+def _rewrite_member(pbix: Path, member: str, data: bytes) -> None:
+    """Ersetzt ein ZIP-Member, alle anderen Member bleiben byte-gleich."""
+    with zipfile.ZipFile(str(pbix), "r") as zf:
+        members = [(info, zf.read(info.filename)) for info in zf.infolist()]
+    with zipfile.ZipFile(str(pbix), "w", zipfile.ZIP_DEFLATED) as zf:
+        for info, content in members:
+            zf.writestr(info, data if info.filename == member else content)
+
+
+class TestIncrementalParse(unittest.TestCase):
+    """Tests fuer das inkrementelle Neu-Parsen anhand der ZIP-CRCs."""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.pbix = _create_test_pbix(self.tmp, include_schema=True)
+        self.first = parse_pbix(self.pbix)
+
+    def _change_layout(self):
+        layout = {"sections": [{"name": "S", "displayName": "Neu", "visualContainers": []}]}
+        _rewrite_member(self.pbix, "Report/Layout", json.dumps(layout).encode("utf-16-le"))
+
+    def test_unchanged_file_reuses_everything(self):
+        """Test: Ohne Aenderung wird kein Teil neu geparst."""
+        second = parse_pbix(self.pbix, previous=self.first)
+        self.assertEqual(second.reparsed_parts, set())
+        self.assertIs(second.report_pages, self.first.report_pages)
+        self.assertIs(second.power_queries, self.first.power_queries)
+        self.assertIs(second.tables, self.first.tables)
+        self.assertEqual(second.warnings, self.first.warnings)
+
+    def test_only_changed_member_reparsed(self):
+        """Test: Geaendertes Layout -> nur 'layout' wird neu geparst."""
+        self._change_layout()
+        second = parse_pbix(self.pbix, previous=self.first)
+        self.assertEqual(second.reparsed_parts, {"layout"})
+        self.assertEqual([p.page_name for p in second.report_pages], ["Neu"])
+        self.assertIs(second.power_queries, self.first.power_queries)
+        self.assertIs(second.tables, self.first.tables)
+
+    def test_part_warnings_carried_over(self):
+        """Test: Warnungen unveraenderter Teile bleiben erhalten."""
+        sub = self.tmp / "ohne_mashup"
+        sub.mkdir()
+        pbix = _create_test_pbix(sub, include_mashup=False)
+        first = parse_pbix(pbix)
+        second = parse_pbix(pbix, previous=first)
+        self.assertTrue(any("DataMashup" in w for w in second.warnings))
+        self.assertEqual(second.warnings, first.warnings)
+
+    def test_import_merges_only_changed_parts(self):
+        """Test: import_file mit previous merged nur geaenderte Teile."""
+        project = Project()
+        options = ImportOptions(use_pbitools=False)
+        first = import_file(self.pbix, project, options)
+        project.power_queries[0].notes = "manuell ergaenzt"
+
+        self._change_layout()
+        report = import_file(self.pbix, project, options, previous=first.pbix_result)
+        self.assertEqual(report.unchanged_parts, ["mashup", "schema"])
+        self.assertNotIn("queries", report.imported)
+        self.assertEqual(report.imported.get("report_pages"), 1)
+        self.assertEqual([p.page_name for p in project.report_pages], ["Neu"])
+        self.assertEqual(project.power_queries[0].notes, "manuell ergaenzt")
+        self.assertIn("Unveraendert", report.summary_text())
+
+
+class _FakePbixRay:
+    """Stand-in fuer pbixray.PBIXRay (Listen statt DataFrames)."""
+
+    def __init__(self, path):
+        self.tables = ["Fact_Sales", "Dim_Date"]
+        self.schema = [
+            {"TableName": "Fact_Sales", "ColumnName": "DateKey", "PandasDataType": "int64"},
+            {"TableName": "Fact_Sales", "ColumnName": "Revenue", "PandasDataType": "float64"},
+            {"TableName": "Dim_Date", "ColumnName": "DateKey", "PandasDataType": "int64"},
+        ]
+        self.statistics = [
+            {"TableName": "Dim_Date", "ColumnName": "DateKey", "Cardinality": 365},
+        ]
+        self.dax_measures = [
+            {"TableName": "Fact_Sales", "Name": "Total Revenue",
+             "Expression": "SUM(Fact_Sales[Revenue])", "Description": None,
+             "DisplayFolder": float("nan")},
+            {"TableName": "Fact_Sales", "Name": "Revenue YTD",
+             "Expression": "TOTALYTD([Total Revenue], Dim_Date[Date])"},
+        ]
+        self.power_query = [
+            {"TableName": "Fact_Sales",
+             "Expression": 'let Source = Sql.Database("srv", "db") in Source'},
+        ]
+        self.relationships = [
+            {"FromTableName": "Fact_Sales", "FromColumnName": "DateKey",
+             "ToTableName": "Dim_Date", "ToColumnName": "DateKey",
+             "IsActive": True, "Cardinality": "M:1", "CrossFilteringBehavior": "Both"},
+        ]
+        self.rls = [
+            {"TableName": "Fact_Sales", "RoleName": "Nord", "FilterExpression": "[Region] = \"Nord\""},
+        ]
+
+
+def _create_datamodel_pbix(tmp_path: Path) -> Path:
+    pbix = _create_test_pbix(tmp_path)
+    with zipfile.ZipFile(str(pbix), "a") as zf:
+        zf.writestr("DataModel", XPRESS9_SIGNATURE.encode("utf-16-le") + b"\x00" * 64)
+    return pbix
+
+
+class TestDataModelReader(unittest.TestCase):
+    """Tests fuer den DataModel-Leser (pbixray optional, hier gemockt)."""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def test_detects_xpress9_member(self):
+        """Test: XPress9-Header im DataModel-Member wird erkannt."""
+        self.assertTrue(has_datamodel(_create_datamodel_pbix(self.tmp)))
+        sub = self.tmp / "ohne_datamodel"
+        sub.mkdir()
+        self.assertFalse(has_datamodel(_create_test_pbix(sub)))
+
+    def test_model_to_bim_mapping(self):
+        """Test: pbixray-Tabellen werden ins BIM-Schema uebersetzt."""
+        warnings: list = []
+        result = parse_bim_model(model_to_bim(_FakePbixRay("x"), warnings), "x")
+        self.assertEqual(warnings, [])
+        self.assertEqual({m.name for m in result.measures}, {"Total Revenue", "Revenue YTD"})
+        ytd = next(m for m in result.measures if m.name == "Revenue YTD")
+        self.assertIn("Total Revenue", ytd.dependencies)
+        rel = result.relationships[0]
+        self.assertEqual(rel.cardinality, "N:1")
+        self.assertEqual(rel.filter_direction, "Both")
+        self.assertIn("Nord", result.rls_notes)
+        self.assertEqual(len(result.power_queries), 1)
+        self.assertEqual(result.data_sources[0].source_type, "SQL")
+
+    def test_pandas_dtypes_mapped_to_tom(self):
+        """Test: pandas-Datentypen werden auf TOM abgebildet, Kalender erkannt."""
+        fake = _FakePbixRay("x")
+        fake.tables.append("Periods")
+        fake.schema += [
+            {"TableName": "Periods", "ColumnName": "Stichtag", "PandasDataType": "datetime64[ns]"},
+            {"TableName": "Periods", "ColumnName": "Jahr", "PandasDataType": "int64"},
+            {"TableName": "Periods", "ColumnName": "Monat", "PandasDataType": "int64"},
+        ]
+        data = model_to_bim(fake, [])
+        types = {(t["name"], c["name"]): c["dataType"]
+                 for t in data["model"]["tables"] for c in t["columns"]}
+        self.assertEqual(types[("Fact_Sales", "Revenue")], "double")
+        self.assertEqual(types[("Periods", "Stichtag")], "dateTime")
+        result = parse_bim_model(data, "x")
+        periods = next(t for t in result.tables if t.name == "Periods")
+        self.assertEqual(periods.table_type, "Kalender")
+
+    def test_hidden_flags_mapped_or_reported(self):
+        """Test: IsHidden wird uebernommen, fehlende Flags landen als Warnung im Bericht."""
+        fake = _FakePbixRay("x")
+        fake.dax_measures[1]["IsHidden"] = True
+        result = parse_bim_model(model_to_bim(fake, []), "x", skip_hidden_measures=True)
+        self.assertEqual([m.name for m in result.measures], ["Total Revenue"])
+
+        pbix = _create_datamodel_pbix(self.tmp)
+        with mock.patch("src.datamodel_reader.HAS_PBIXRAY", True), \
+             mock.patch("src.datamodel_reader.PBIXRay", _FakePbixRay, create=True):
+            result = parse_datamodel(pbix, skip_hidden_measures=True)
+        self.assertTrue(any("ausgeblendete Measures" in w for w in result.warnings))
+        self.assertTrue(any("ausgeblendete Tabellen" in w for w in result.warnings))
+
+    def test_missing_pbixray_raises(self):
+        """Test: Ohne pbixray meldet parse_datamodel einen RuntimeError."""
+        pbix = _create_datamodel_pbix(self.tmp)
+        with mock.patch("src.datamodel_reader.HAS_PBIXRAY", False):
+            with self.assertRaises(RuntimeError):
+                parse_datamodel(pbix)
+
+    def test_import_uses_datamodel_without_pbitools(self):
+        """Test: import_file liest Measures/Beziehungen ueber den DataModel-Leser."""
+        pbix = _create_datamodel_pbix(self.tmp)
+        project = Project()
+        with mock.patch("src.datamodel_reader.HAS_PBIXRAY", True), \
+             mock.patch("src.datamodel_reader.PBIXRay", _FakePbixRay, create=True), \
+             mock.patch("src.import_manager.pbitools_available",
+                        side_effect=AssertionError("kein pbi-tools")):
+            report = import_file(pbix, project, ImportOptions())
+        self.assertEqual(report.file_type, "datamodel")
+        self.assertEqual(len(project.measures), 2)
+        self.assertEqual(len(project.data_model.relationships), 1)
+        self.assertEqual(report.imported.get("report_pages"), 2)
+        self.assertNotIn("DAX Measures", report.not_available)
+
+    @unittest.skipUnless(HAS_PBIXRAY, "pbixray nicht installiert")
+    def test_real_reader_rejects_fake_backup(self):
+        """Test: Echter Leser meldet defektes DataModel als RuntimeError."""
+        with self.assertRaises(RuntimeError):
+            parse_datamodel(_create_datamodel_pbix(self.tmp))
+
+
+def _pbir_visual(name: str, visual_type: str, query_ref: str, title: str = "") -> dict:
+    visual = {
+        "visualType": visual_type,
+        "query": {"queryState": {"Values": {"projections": [{"queryRef": query_ref}]}}},
+    }
+    if title:
+        visual["visualContainerObjects"] = {"title": [{"properties": {"text": {
+            "expr": {"Literal": {"Value": f"'{title}'"}}}}}]}
+    return {"name": name, "position": {"x": 0, "y": 0}, "visual": visual}
+
+
+def _create_test_pbip(tmp_path: Path, with_model: bool = True) -> Path:
+    """Erzeugt ein minimales Power-BI-Projekt (PBIR) fuer Tests."""
+    def write(rel: str, data: dict) -> None:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data), encoding="utf-8")
+
+    write("Sales.pbip", {"version": "1.0", "artifacts": [{"report": {"path": "Sales.Report"}}]})
+    write("Sales.Report/definition.pbir", {
+        "version": "4.0",
+        "datasetReference": {"byPath": {"path": "../Sales.SemanticModel"}},
+    })
+    pages = "Sales.Report/definition/pages"
+    write(f"{pages}/pages.json", {"pageOrder": ["p1", "p2"], "activePageName": "p1"})
+    write(f"{pages}/p1/page.json", {"name": "p1", "displayName": "Uebersicht"})
+    write(f"{pages}/p1/visuals/v1/visual.json",
+          _pbir_visual("v1", "clusteredBarChart", "Sum(Fact_Sales.Revenue)", "Umsatz"))
+    write(f"{pages}/p1/visuals/v2/visual.json",
+          _pbir_visual("v2", "slicer", "Dim_Date.Year"))
+    write(f"{pages}/p2/page.json", {"name": "p2", "displayName": "Details"})
+    write(f"{pages}/p2/visuals/v3/visual.json", _pbir_visual("v3", "tableEx", "Dim_Product.Name"))
+    if with_model:
+        model_dir = tmp_path / "Sales.SemanticModel"
+        model_dir.mkdir()
+        _create_test_bim(model_dir).rename(model_dir / "model.bim")
+    return tmp_path / "Sales.pbip"
+
+
+class TestPbirParser(unittest.TestCase):
+    """Tests fuer den PBIP/PBIR-Ordner-Import."""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.pbip = _create_test_pbip(self.tmp)
+        self.report_dir = self.tmp / "Sales.Report"
+
+    def test_detect_file_type(self):
+        """Test: .pbip, definition.pbir und Report-Ordner werden erkannt."""
+        self.assertEqual(detect_file_type(self.pbip), "pbip")
+        self.assertEqual(detect_file_type(self.report_dir / "definition.pbir"), "pbir")
+        self.assertEqual(detect_file_type(self.report_dir), "pbir")
+        self.assertEqual(detect_file_type(self.tmp), "pbir")
+
+    def test_pages_and_visuals(self):
+        """Test: Seiten in pageOrder-Reihenfolge, Visuals und Slicer gemappt."""
+        result = parse_pbir(self.pbip)
+        self.assertEqual(result.report_name, "Sales")
+        self.assertEqual([p.page_name for p in result.report_pages], ["Uebersicht", "Details"])
+        overview = result.report_pages[0]
+        self.assertEqual(len(overview.visuals), 1)
+        self.assertEqual(overview.visuals[0].name, "Umsatz")
+        self.assertIn("Sum(Fact_Sales.Revenue)", overview.visuals[0].description)
+        self.assertIn("Dim_Date.Year", overview.slicers_filters)
+        self.assertEqual(result.semantic_model, (self.tmp / "Sales.SemanticModel" / "model.bim").resolve())
+
+    def test_reimport_reads_only_changed_files(self):
+        """Test: Mit previous werden nur geaenderte Dateien neu gelesen."""
+        first = parse_pbir(self.pbip)
+        self.assertEqual(first.files_read, 6)
+        second = parse_pbir(self.pbip, previous=first)
+        self.assertEqual(second.files_read, 0)
+
+        visual = self.report_dir / "definition/pages/p2/visuals/v3/visual.json"
+        visual.write_text(json.dumps(
+            _pbir_visual("v3", "tableEx", "Dim_Product.Name", "Produktliste")), encoding="utf-8")
+        third = parse_pbir(self.pbip, previous=second)
+        self.assertEqual(third.files_read, 1)
+        self.assertEqual(third.report_pages[1].visuals[0].name, "Produktliste")
+
+    def test_unreadable_file_becomes_warning(self):
+        """Test: Eine nicht lesbare visual.json wird Warnung, der Rest importiert."""
+        real_stat = Path.stat
+
+        def stat(path, *args, **kwargs):
+            # Nur der Leser (nicht glob/is_file) sieht den Fehler
+            if path.parent.name == "v3" and sys._getframe(1).f_code.co_name == "_read":
+                raise PermissionError(13, "Zugriff verweigert")
+            return real_stat(path, *args, **kwargs)
+
+        with mock.patch.object(Path, "stat", stat):
+            result = parse_pbir(self.pbip)
+        self.assertEqual([len(p.visuals) for p in result.report_pages], [1, 0])
+        self.assertTrue(any("v3/visual.json: nicht lesbar" in w for w in result.warnings))
+
+    def test_visual_group_skipped_and_no_json_kept(self):
+        """Test: Visual-Gruppen erscheinen nicht als Visual; JSON wird nicht aufbewahrt."""
+        group = self.report_dir / "definition/pages/p1/visuals/g1/visual.json"
+        group.parent.mkdir(parents=True)
+        group.write_text(json.dumps({"name": "g1", "visualGroup": {"displayName": "Gruppe"}}),
+                         encoding="utf-8")
+        result = parse_pbir(self.pbip)
+        self.assertEqual([v.name for v in result.report_pages[0].visuals], ["Umsatz"])
+        self.assertTrue(all(len(state) == 2 for state in result.file_state.values()))
+        self.assertFalse(any(isinstance(v, dict) for v in result.file_values.values()))
+
+    def test_tmdl_model_warns(self):
+        """Test: TMDL-Semantic-Model erzeugt eine Warnung statt Fehler."""
+        sub = self.tmp / "tmdl"
+        sub.mkdir()
+        pbip = _create_test_pbip(sub, with_model=False)
+        (sub / "Sales.SemanticModel" / "definition").mkdir(parents=True)
+        result = parse_pbir(pbip)
+        self.assertIsNone(result.semantic_model)
+        self.assertTrue(any("TMDL" in w for w in result.warnings))
+
+    def test_legacy_report_json(self):
+        """Test: PBIR-Legacy (report.json im Layout-Format) wird gelesen."""
+        sub = self.tmp / "legacy" / "Alt.Report"
+        sub.mkdir(parents=True)
+        (sub / "definition.pbir").write_text("{}", encoding="utf-8")
+        layout = {"sections": [{"displayName": "Seite A", "visualContainers": []}]}
+        (sub / "report.json").write_text(json.dumps(layout), encoding="utf-8")
+        result = parse_pbir(sub)
+        self.assertEqual([p.page_name for p in result.report_pages], ["Seite A"])
+        self.assertEqual(result.report_name, "Alt")
+
+    def test_import_pbip_with_model(self):
+        """Test: import_file uebernimmt Seiten aus PBIR und Measures aus model.bim."""
+        project = Project()
+        report = import_file(self.pbip, project, ImportOptions())
+        self.assertTrue(report.success)
+        self.assertEqual(report.file_type, "pbip")
+        self.assertEqual(len(project.report_pages), 2)
+        self.assertGreater(len(project.measures), 0)
+        self.assertGreater(len(project.data_model.relationships), 0)
+        self.assertIsNotNone(report.pbir_result)
+
+    def test_preview_pbip(self):
+        """Test: Vorschau zaehlt Seiten und Measures eines PBIP-Projekts."""
+        preview = preview_import(self.pbip)
+        self.assertEqual(preview.page_count, 2)
+        self.assertEqual(preview.visual_count, 2)
+        self.assertGreater(preview.measure_count, 0)
+
+
+class TestFastPreview(unittest.TestCase):
+    """Tests fuer die Schnell-Vorschau per Token-Scan."""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def test_counts_match_full_parse(self):
+        """Test: Schnell-Scan liefert dieselben Zahlen wie parse_pbix."""
+        pbix = _create_test_pbix(self.tmp, include_schema=True)
+        scan = scan_pbix(pbix, time_budget=None)
+        full = parse_pbix(pbix)
+        self.assertFalse(scan.is_estimate)
+        self.assertEqual(scan.page_count, len(full.report_pages))
+        self.assertEqual(scan.visual_count, sum(len(p.visuals) for p in full.report_pages))
+        self.assertEqual(scan.query_count, len(full.power_queries))
+        self.assertEqual(scan.source_count, len(full.data_sources))
+        self.assertEqual(scan.table_count, len(full.tables))
+
+    def test_fast_preview_builds_no_objects(self):
+        """Test: preview_import(fast=True) ruft parse_pbix nicht auf."""
+        pbix = _create_test_pbix(self.tmp)
+        with mock.patch("src.import_manager.parse_pbix",
+                        side_effect=AssertionError("kein Voll-Parse")), \
+             mock.patch("src.pbix_parser.Visual",
+                        side_effect=AssertionError("kein Visual")), \
+             mock.patch("src.pbix_parser.PowerQuery",
+                        side_effect=AssertionError("keine PowerQuery")):
+            preview = preview_import(pbix, fast=True)
+        self.assertEqual(preview.page_count, 2)
+        self.assertEqual(preview.query_count, 5)
+
+    def test_exhausted_budget_flags_estimate(self):
+        """Test: Abgelaufenes Zeitbudget liefert eine Schaetzung."""
+        pbix = _create_test_pbix(self.tmp)
+        preview = preview_import(pbix, fast=True, time_budget=0)
+        self.assertTrue(preview.is_estimate)
+
+    def test_tokens_across_chunk_boundary_utf16(self):
+        """Test: Tokens ueber Chunk-Grenzen werden in UTF-16 gezaehlt."""
+        text = "x" * 32760 + '"visualContainers"' + "y" * 100 + '"visualContainers"'
+        counts, complete = count_tokens(
+            io.BytesIO(text.encode("utf-16-le")), {"pages": '"visualContainers"'},
+        )
+        self.assertTrue(complete)
+        self.assertEqual(counts["pages"], 2)
+
+    def test_partial_count_extrapolated(self):
+        """Test: Abgebrochene Zaehlung wird auf die Member-Groesse hochgerechnet."""
+        data = (b"shared " + b"." * 1017) * 256   # 4 Treffer je 4 KiB, 4 Chunks
+        counts, complete = count_tokens(
+            io.BytesIO(data), {"q": "shared "}, _Deadline(0), total_size=len(data),
+        )
+        self.assertFalse(complete)
+        self.assertEqual(counts["q"], 256)
+
+    def test_mashup_read_respects_budget(self):
+        """Test: DataMashup wird bei abgelaufenem Budget nicht ganz gelesen."""
+        path = self.tmp / "large.pbix"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("DataMashup", os.urandom(300_000))
+        with zipfile.ZipFile(path) as zf:
+            self.assertIsNone(_read_member(zf, "DataMashup", _Deadline(0)))
+            self.assertEqual(_read_member(zf, "DataMashup", _Deadline(None)),
+                             zf.read("DataMashup"))
+
+    def test_source_scan_partial_on_deadline(self):
+        """Test: Datenquellen-Erkennung bricht je Abschnitt ab und liefert Teilzahlen."""
+        block = "".join(f'\nshared Q{i} = Sql.Database("srv{i}", "db");' for i in range(40_000))
+        count, complete = _count_sources(block, _Deadline(None))
+        self.assertTrue(complete)
+        self.assertEqual(count, 40_000)
+        count, complete = _count_sources(block, _Deadline(0))
+        self.assertFalse(complete)
+        self.assertGreater(count, 0)
+        self.assertLess(count, 40_000)
+
+
+class TestParseCache(unittest.TestCase):
+    """Tests fuer den content-adressierten Parse-Cache."""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.cache = ParseCache(self.tmp / "cache")
+
+    def test_pbix_hit_skips_parser(self):
+        """Test: Zweiter Aufruf liefert das Ergebnis aus dem Cache."""
+        pbix = _create_test_pbix(self.tmp)
+        first = parse_pbix_cached(pbix, self.cache)
+        with mock.patch("src.parse_cache.pbix_parser.parse_pbix",
+                        side_effect=AssertionError("nicht erneut parsen")):
+            second = parse_pbix_cached(pbix, self.cache)
+        self.assertEqual(len(second.report_pages), len(first.report_pages))
+        self.assertEqual(
+            [q.query_name for q in second.power_queries],
+            [q.query_name for q in first.power_queries],
+        )
+
+    def test_changed_member_misses(self):
+        """Test: Geaenderter ZIP-Inhalt ergibt einen neuen Schluessel."""
+        pbix = _create_test_pbix(self.tmp)
+        before = zip_fingerprint(pbix)
+        pbix = _create_test_pbix(self.tmp, include_mashup=False)
+        self.assertNotEqual(zip_fingerprint(pbix), before)
+        result = parse_pbix_cached(pbix, self.cache)
+        self.assertEqual(result.power_queries, [])
+
+    def test_parser_version_invalidates(self):
+        """Test: Neue Parser-Version fuehrt zu erneutem Parsen."""
+        pbix = _create_test_pbix(self.tmp)
+        parse_pbix_cached(pbix, self.cache)
+        with mock.patch("src.parse_cache.pbix_parser.PARSER_VERSION", "999"):
+            with mock.patch("src.parse_cache.pbix_parser.parse_pbix",
+                            wraps=parse_pbix) as spy:
+                parse_pbix_cached(pbix, self.cache)
+        spy.assert_called_once()
+
+    def test_bim_options_part_of_key(self):
+        """Test: Andere Parser-Optionen treffen keinen fremden Eintrag."""
+        bim = _create_test_bim(self.tmp)
+        with_hidden = parse_bim_cached(bim, self.cache, skip_hidden_tables=False)
+        without_hidden = parse_bim_cached(bim, self.cache, skip_hidden_tables=True)
+        self.assertGreaterEqual(len(with_hidden.tables), len(without_hidden.tables))
+        self.assertEqual(len(list(self.cache.directory.glob("*.pkl"))), 2)
+
+    def test_changed_file_parsed_incrementally(self):
+        """Test: Nach einer Aenderung dient der letzte Eintrag als previous."""
+        pbix = _create_test_pbix(self.tmp, include_schema=True)
+        first = parse_pbix_cached(pbix, self.cache)
+        layout = {"sections": [{"name": "S", "displayName": "Neu", "visualContainers": []}]}
+        _rewrite_member(pbix, "Report/Layout", json.dumps(layout).encode("utf-16-le"))
+        second = parse_pbix_cached(pbix, self.cache)
+        self.assertEqual(second.reparsed_parts, {"layout"})
+        self.assertEqual(
+            [q.query_name for q in second.power_queries],
+            [q.query_name for q in first.power_queries],
+        )
+
+    def test_eviction_respects_size_limit(self):
+        """Test: Aelteste Eintraege werden bei Ueberschreitung geloescht."""
+        cache = ParseCache(self.tmp / "small", max_bytes=3000)
+        for i in range(5):
+            cache.put(f"k{i}", "x" * 1000)
+            os.utime(cache.directory / f"k{i}.pkl", (i, i))
+        cache.evict()
+        self.assertIsNone(cache.get("k0"))
+        self.assertEqual(cache.get("k4"), "x" * 1000)
+        total = sum(p.stat().st_size for p in cache.directory.glob("*.pkl"))
+        self.assertLessEqual(total, 3000)
+
+    def test_corrupt_entry_discarded(self):
+        """Test: Defekter Eintrag wird verworfen statt Fehler zu werfen."""
+        self.cache.directory.mkdir(parents=True)
+        (self.cache.directory / "bad.pkl").write_bytes(b"kein pickle")
+        self.assertIsNone(self.cache.get("bad"))
+        self.assertFalse((self.cache.directory / "bad.pkl").exists())
+
+    def test_preview_then_import_parses_once(self):
+        """Test: Preview + Import mit Cache parsen die Datei nur einmal."""
+        pbix = _create_test_pbix(self.tmp)
+        with mock.patch.dict(os.environ, {CACHE_DIR_ENV: str(self.tmp / "env-cache")}):
+            with mock.patch("src.parse_cache.pbix_parser.parse_pbix",
+                            wraps=parse_pbix) as spy:
+                preview_import(pbix, use_cache=True)
+                options = ImportOptions(use_pbitools=False, use_cache=True)
+                report = import_file(pbix, Project(), options)
+        self.assertTrue(report.success)
+        self.assertEqual(report.imported.get("report_pages"), 2)
+        spy.assert_called_once()
+
+
+_FAKE_PBITOOLS = """#!{python}
+import os, shutil, sys
+from pathlib import Path
+
+args = sys.argv[1:]
+if args and args[0] == "info":
+    print("pbi-tools (Test-Stand-in)")
+    sys.exit(0)
+if args and args[0] == "extract":
+    out = Path(args[args.index("-extractFolder") + 1])
+    with open(os.environ["FAKE_PBITOOLS_LOG"], "a") as log:
+        log.write("extract\\n")
+    (out / "Model").mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(os.environ["FAKE_PBITOOLS_BIM"], out / "Model" / "database.json")
+    sys.exit(0)
+sys.exit(2)
+"""
+
+
+@unittest.skipIf(sys.platform == "win32", "Stand-in-Skript braucht einen Shebang")
+class TestPbiToolsCache(unittest.TestCase):
+    """Tests fuer die gecachte pbi-tools-Extraktion mit einem Stand-in-Programm."""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.bin = self.tmp / "bin"
+        self.bin.mkdir()
+        exe = self.bin / "pbi-tools"
+        exe.write_text(_FAKE_PBITOOLS.format(python=sys.executable), encoding="utf-8")
+        exe.chmod(0o755)
+        self.log = self.tmp / "calls.log"
+        self.log.write_text("", encoding="utf-8")
+        self.env = {
+            "PATH": f"{self.bin}{os.pathsep}{os.environ.get('PATH', '')}",
+            "FAKE_PBITOOLS_LOG": str(self.log),
+            "FAKE_PBITOOLS_BIM": str(_create_test_bim(self.tmp)),
+            CACHE_DIR_ENV: str(self.tmp / "cache"),
+        }
+        self.pbix = _create_test_pbix(self.tmp)
+
+    def _extract_calls(self) -> int:
+        return self.log.read_text(encoding="utf-8").count("extract")
+
+    def test_stand_in_is_discovered(self):
+        """Test: Stand-in im PATH wird als pbi-tools erkannt."""
+        with mock.patch.dict(os.environ, self.env):
+            self.assertTrue(pbitools_available())
+
+    def test_unchanged_pbix_extracted_once(self):
+        """Test: Zweiter Aufruf liest database.json aus dem Cache."""
+        with mock.patch.dict(os.environ, self.env):
+            cache = ExtractionCache()
+            first = parse_pbix_with_pbitools(self.pbix, cache)
+            second = parse_pbix_with_pbitools(self.pbix, cache)
+        self.assertEqual(self._extract_calls(), 1)
+        self.assertGreater(len(first.measures), 0)
+        self.assertEqual(len(second.measures), len(first.measures))
+
+    def test_cache_hit_needs_no_tool(self):
+        """Test: Import mit Cache-Treffer startet pbi-tools nicht mehr."""
+        options = ImportOptions(use_cache=True, use_datamodel_reader=False)
+        with mock.patch.dict(os.environ, self.env):
+            import_file(self.pbix, Project(), options)
+            env = dict(self.env, PATH=os.defpath)
+            with mock.patch.dict(os.environ, env):
+                report = import_file(self.pbix, Project(), options)
+        self.assertEqual(report.file_type, "pbitools")
+        self.assertGreater(report.imported.get("measures", 0), 0)
+        self.assertEqual(self._extract_calls(), 1)
+
+    def test_shared_cache_fingerprints_once(self):
+        """Test: Wiederholte Importe nutzen eine Cache-Instanz und den ZIP-Fingerprint einmal."""
+        options = ImportOptions(use_cache=True, use_datamodel_reader=False)
+        with mock.patch.dict(os.environ, self.env), \
+             mock.patch("src.pbitools_parser.zip_fingerprint",
+                        wraps=zip_fingerprint) as fingerprint:
+            self.assertIs(ExtractionCache.shared(), ExtractionCache.shared())
+            import_file(self.pbix, Project(), options)
+            import_file(self.pbix, Project(), options)
+        self.assertEqual(fingerprint.call_count, 1)
+        self.assertEqual(self._extract_calls(), 1)
+
+    def test_changed_pbix_extracted_again(self):
+        """Test: Geaenderter .pbix-Inhalt fuehrt zu neuer Extraktion."""
+        with mock.patch.dict(os.environ, self.env):
+            cache = ExtractionCache()
+            parse_pbix_with_pbitools(self.pbix, cache)
+            _rewrite_member(self.pbix, "Report/Layout", b'{"sections": []}')
+            parse_pbix_with_pbitools(self.pbix, cache)
+        self.assertEqual(self._extract_calls(), 2)
+
+    def test_size_limit_evicts(self):
+        """Test: Ueberschreitet der Cache max_bytes, wird der Eintrag verworfen."""
+        with mock.patch.dict(os.environ, self.env):
+            cache = ExtractionCache(max_bytes=10)
+            result = parse_pbix_with_pbitools(self.pbix, cache)
+        self.assertGreater(len(result.measures), 0)
+        self.assertEqual(list(cache.directory.glob("*.json")), [])
+
+
+class TestConcurrentModelExtraction(unittest.TestCase):
+    """Test: Modell-Extraktion laeuft parallel zum PBIX-Parser."""
+
+    def test_extraction_runs_during_parse(self):
+        """Test: parse_pbix wartet auf die bereits gestartete Extraktion."""
+        tmp = Path(tempfile.mkdtemp())
+        pbix = _create_test_pbix(tmp)
+        started = threading.Event()
+
+        def extract(file_path, options, warnings):
+            started.set()
+            return None, ""
+
+        def parse(file_path, options, previous=None):
+            self.assertTrue(started.wait(5), "Extraktion nicht parallel gestartet")
+            return parse_pbix(file_path)
+
+        with mock.patch("src.import_manager._extract_model", side_effect=extract), \
+             mock.patch("src.import_manager._parse_pbix_file", side_effect=parse):
+            report = import_file(pbix, Project(), ImportOptions())
+        self.assertEqual(report.imported.get("report_pages"), 2)
+
+
 class TestPbiToolsAvailability(unittest.TestCase):
     """Tests fuer pbi-tools Verfuegbarkeitspruefung."""
 
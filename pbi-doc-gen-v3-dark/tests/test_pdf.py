@@ -16,7 +16,11 @@ from src.models import (
 )
 
 try:
-    from src.pdf_export import generate_pdf, default_pdf_filename
+    from src.pdf_export import (
+        generate_pdf, default_pdf_filename, _build_styles, _fast_cell, _is_large, _make_tables,
+        APPENDIX_LINES, LARGE_MODE_ITEMS, TABLE_CHUNK_ROWS,
+    )
+    from reportlab.platypus import LongTable, Paragraph
     HAS_REPORTLAB = True
 except ImportError:
     HAS_REPORTLAB = False
@@ -73,6 +77,41 @@ class TestPDFExport(unittest.TestCase):
             result = generate_pdf(p, path)
             self.assertTrue(result.exists())
 
+    def test_generate_pdf_large_mode(self):
+        p = self._make_project()
+        p.power_queries.append(PowerQuery(query_name="qry_long", m_code="\n".join(
+            "    Step{0} = Table.AddColumn(Step, \"C{0}\", each {0}),".format(i)
+            for i in range(APPENDIX_LINES + 50))))
+        p.data_model.tables *= TABLE_CHUNK_ROWS + 10
+        with tempfile.TemporaryDirectory() as td:
+            result = generate_pdf(p, Path(td) / "large.pdf", large=True)
+            self.assertGreater(result.stat().st_size, 1000)
+
+    def test_is_large(self):
+        p = self._make_project()
+        self.assertFalse(_is_large(p))
+        p.power_queries[0].m_code = "x\n" * APPENDIX_LINES
+        self.assertTrue(_is_large(p))
+        p = self._make_project()
+        p.measures *= LARGE_MODE_ITEMS
+        self.assertTrue(_is_large(p))
+
+    def test_make_tables_chunks_rows(self):
+        p = self._make_project()
+        rows = [["1", "Name &amp; Co"]] * (2 * TABLE_CHUNK_ROWS + 1)
+        tables = _make_tables(["#", "Name"], rows, [20, 200], p.ci_branding, large=True)
+        self.assertEqual(len(tables), 3)
+        self.assertTrue(all(isinstance(t, LongTable) for t in tables))
+        self.assertEqual(len(_make_tables(["#"], [["1"]], [20], p.ci_branding)), 1)
+
+    def test_fast_cell_wraps_plain_text(self):
+        self.assertEqual(_fast_cell("a &amp; b", 200, None), "a & b")
+        wrapped = _fast_cell("Beschreibung " * 20, 100, None)
+        self.assertIsInstance(wrapped, str)
+        self.assertGreater(wrapped.count("\n"), 5)
+        style = _build_styles(Project().ci_branding)["CellN"]
+        self.assertIsInstance(_fast_cell("<b>x</b>", 100, style), Paragraph)
+
     def test_default_filename(self):
         p = Project()
         p.meta.report_name = "HR Zeitkonten Report"